@@ -0,0 +1,57 @@
+import argparse
+import time
+
+import numpy as np
+
+from minimax_algorithm import MinimaxAlgorithm
+from move_ordering import HistoryHeuristic, KillerMoves
+from reference_games import ConnectFourState
+
+WEIGHTS = np.random.default_rng(0).integers(-50, 50, size=128)
+
+
+def features(boards):
+    # One bit per square and player, from the two 64-bit bitboards of every position
+    return np.unpackbits(np.array(boards, dtype="<u8").view(np.uint8).reshape(len(boards), 16), axis=1,
+                         bitorder="little")
+
+
+class LinearConnectFour(ConnectFourState):
+    # A linear model over the board squares; integer weights keep batched and single scores identical
+
+    def evaluate(self):
+        return int(features([self.boards])[0] @ WEIGHTS)
+
+
+class BatchedLinearConnectFour(LinearConnectFour):
+
+    def evaluate_batch(self, states):
+        return (features([state.boards for state in states]) @ WEIGHTS).tolist()
+
+
+def timed_search(state, depth, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        minimax = MinimaxAlgorithm(None, move_ordering=[KillerMoves(), HistoryHeuristic()])
+        start = time.perf_counter()
+        result = minimax.alpha_beta(state, depth, True)
+        best = min(best, time.perf_counter() - start)
+    return result, minimax.nodes_searched, best
+
+
+def benchmark_batch_evaluation():
+    parser = argparse.ArgumentParser(description="Alpha-beta with one NumPy evaluation per leaf versus per frontier.")
+    parser.add_argument("--depth", type=int, nargs="+", default=[4, 5, 6], help="Search depths (default is 4 5 6).")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of timed runs per measurement (default is 3).")
+    args = parser.parse_args()
+
+    print(f"{'depth':>5} {'nodes':>8} {'per leaf (s)':>13} {'batched (s)':>12} {'speedup':>8}")
+    for depth in args.depth:
+        single, nodes, single_time = timed_search(LinearConnectFour(), depth, args.repeat)
+        batched, _, batched_time = timed_search(BatchedLinearConnectFour(), depth, args.repeat)
+        assert single == batched
+        print(f"{depth:>5} {nodes:>8} {single_time:>13.3f} {batched_time:>12.3f} {single_time / batched_time:>7.2f}x")
+
+
+if __name__ == "__main__":
+    benchmark_batch_evaluation()
@@ -0,0 +1,39 @@
+import argparse
+import time
+
+import numpy as np
+
+from batch_solver import solve_batch
+from game_theory_algorithm import Game, MinimaxAlgorithm
+from mixed_strategy_solver import MixedStrategySolver
+
+SHAPES = [(2, 2), (2, 10), (10, 2), (5, 5), (10, 10), (20, 20)]
+
+
+def games_per_second(function, count):
+    start = time.perf_counter()
+    function()
+    return count / (time.perf_counter() - start)
+
+
+def benchmark_batch_solver():
+    parser = argparse.ArgumentParser(description="Throughput of batched versus one-by-one matrix game solving.")
+    parser.add_argument("--games", type=int, default=20000, help="Games per batch (default is 20000).")
+    parser.add_argument("--one-by-one", type=int, default=1000,
+                        help="Games solved one by one for comparison (default is 1000).")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"{'shape':>7} {'pure, loop':>12} {'pure, batch':>12} {'mixed, loop':>12} {'mixed, batch':>13}  (games/s)")
+    for rows, columns in SHAPES:
+        matrices = rng.uniform(-1, 1, size=(args.games, rows, columns))
+        sample = matrices[:args.one_by_one]
+        pure_loop = games_per_second(lambda: [MinimaxAlgorithm(Game(matrix)).minimax() for matrix in sample], len(sample))
+        pure_batch = games_per_second(lambda: solve_batch(matrices), len(matrices))
+        mixed_loop = games_per_second(lambda: [MixedStrategySolver(matrix).solve_exact() for matrix in sample], len(sample))
+        mixed_batch = games_per_second(lambda: solve_batch(matrices, mixed=True), len(matrices))
+        print(f"{rows:>3}x{columns:<3} {pure_loop:>12,.0f} {pure_batch:>12,.0f} {mixed_loop:>12,.0f} {mixed_batch:>13,.0f}")
+
+
+if __name__ == "__main__":
+    benchmark_batch_solver()
@@ -0,0 +1,30 @@
+import argparse
+
+from cfr import ALGORITHMS, CFRSolver
+from reference_games import KuhnPokerState
+
+
+def benchmark_cfr():
+    parser = argparse.ArgumentParser(description="Exploitability over time of the CFR variants on Kuhn poker.")
+    parser.add_argument("--iterations", type=int, default=2000, help="Iterations per algorithm (default is 2000).")
+    parser.add_argument("--report-every", type=int, default=250,
+                        help="Iterations between exploitability measures (default is 250).")
+    parser.add_argument("--batch-size", type=int, default=10,
+                        help="Sampled traversals per player and iteration of the sampling variants (default is 10).")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes (default is 1).")
+    parser.add_argument("--algorithms", nargs="+", choices=ALGORITHMS, default=list(ALGORITHMS),
+                        help="Algorithms to compare (default is all).")
+    args = parser.parse_args()
+
+    print(f"{'algorithm':>18} {'iteration':>10} {'time (s)':>9} {'exploitability':>15} {'game value':>11}")
+    for algorithm in args.algorithms:
+        with CFRSolver(KuhnPokerState(), algorithm, workers=args.workers, batch_size=args.batch_size) as solver:
+            solver.solve(args.iterations, report_every=args.report_every)
+            for iteration, exploitability, elapsed in solver.history:
+                print(f"{algorithm:>18} {iteration:>10} {elapsed:>9.3f} {exploitability:>15.6f}")
+            print(f"{algorithm:>18} {'':>10} {'':>9} {'':>15} {solver.game_value():>11.5f}")
+    print(f"Equilibrium value: {KuhnPokerState.GAME_VALUE:.5f}")
+
+
+if __name__ == "__main__":
+    benchmark_cfr()
@@ -0,0 +1,63 @@
+import argparse
+import csv
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from dataset import PositionDataset, convert_csv
+
+DATASET = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "data", "dataset.csv")
+
+
+def load_csv_rows(path):
+    # How consumers of the CSV file read it: row by row, one string per cell
+    boards, labels = [], []
+    with open(path, newline="") as file:
+        reader = csv.reader(file)
+        next(reader)
+        for row in reader:
+            boards.append([{"b": 0, "x": 1, "o": 2}[cell] for cell in row[:-1]])
+            labels.append(row[-1] == "true")
+    return np.array(boards, dtype=np.uint8), np.array(labels)
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def benchmark_dataset():
+    parser = argparse.ArgumentParser(description="Loading position datasets from CSV and from the packed binary format.")
+    parser.add_argument("--copies", type=int, default=1000,
+                        help="Number of copies of data/dataset.csv in the test corpus (default is 1000).")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        csv_path = os.path.join(directory, "corpus.csv")
+        binary_path = os.path.join(directory, "corpus.bin")
+        with open(DATASET) as file:
+            header, *lines = file.read().splitlines(keepends=True)
+        with open(csv_path, "w") as file:
+            file.write(header)
+            for _ in range(args.copies):
+                file.writelines(lines)
+
+        (boards, _), csv_time = timed(load_csv_rows, csv_path)
+        count, convert_time = timed(convert_csv, csv_path, binary_path)
+        dataset, open_time = timed(PositionDataset, binary_path)
+        (decoded, _), decode_time = timed(lambda: dataset[:])
+        assert np.array_equal(decoded, boards)
+
+        print(f"{count:,} positions: CSV {os.path.getsize(csv_path) / 1e6:.1f} MB, "
+              f"binary {os.path.getsize(binary_path) / 1e6:.1f} MB")
+        print(f"{'CSV row by row':>24}: {csv_time:8.3f}s")
+        print(f"{'streaming conversion':>24}: {convert_time:8.3f}s (once)")
+        print(f"{'open memory map':>24}: {open_time * 1e3:8.3f}ms")
+        print(f"{'decode all boards':>24}: {decode_time:8.3f}s ({csv_time / (open_time + decode_time):.0f}x faster than CSV)")
+
+
+if __name__ == "__main__":
+    benchmark_dataset()
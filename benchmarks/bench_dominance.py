@@ -0,0 +1,54 @@
+import argparse
+import time
+
+import numpy as np
+
+from game_theory_algorithm import Game, MinimaxAlgorithm
+
+
+def generated_table(size, core, rng):
+    """
+    A payoff table like the generated ones: a core game, and strategies that are noisy copies of core
+    strategies made strictly worse for their player.
+    """
+    matrix = rng.integers(-50, 51, (core, core)).astype(float)
+    extra = size - core
+    rows = np.vstack([matrix, matrix[rng.integers(0, core, extra)] - rng.integers(1, 10, (extra, core))])
+    return np.hstack([rows, rows[:, rng.integers(0, core, extra)] + rng.integers(1, 10, (size, extra))])
+
+
+def timed_solve(matrix, **options):
+    start = time.perf_counter()
+    solution = MinimaxAlgorithm(Game(matrix)).mixed_strategies(**options)
+    return solution, time.perf_counter() - start
+
+
+def benchmark_dominance():
+    parser = argparse.ArgumentParser(description="Solve time with and without dominated strategy elimination.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 100, 200, 400],
+                        help="Sizes of the square payoff tables (default is 50 100 200 400).")
+    parser.add_argument("--core", type=float, default=0.1,
+                        help="Fraction of the strategies that are not dominated (default is 0.1).")
+    parser.add_argument("--dominance", choices=("strict", "weak"), default="strict",
+                        help="Dominance eliminated (default is strict).")
+    parser.add_argument("--mixed", action="store_true", help="Also eliminate strategies dominated by mixtures.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the generated tables (default is 0).")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    print(f"{'table':>16} {'reduced':>9} {'shrunk':>7} {'eliminate (s)':>14} {'solve (s)':>10} "
+          f"{'reduced (s)':>12} {'saved':>7}")
+    tables = [(f"generated {size}", generated_table(size, max(2, int(size * args.core)), rng)) for size in args.sizes]
+    tables += [(f"random {size}", rng.integers(-50, 51, (size, size)).astype(float)) for size in args.sizes[:2]]
+    for name, matrix in tables:
+        full, full_time = timed_solve(matrix)
+        reduced, reduced_time = timed_solve(matrix, dominance=args.dominance, mixed_dominance=args.mixed)
+        reduction = reduced.reduction
+        assert abs(full.value - reduced.value) < 1e-6 * max(1.0, abs(full.value))
+        print(f"{name:>16} {reduction.shape[0]:>4}x{reduction.shape[1]:<4} {reduction.shrinkage():>7.1%} "
+              f"{reduction.elapsed:>14.4f} {full_time:>10.4f} {reduced_time:>12.4f} "
+              f"{1 - reduced_time / full_time:>7.1%}")
+
+
+if __name__ == "__main__":
+    benchmark_dominance()
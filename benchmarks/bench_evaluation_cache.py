@@ -0,0 +1,57 @@
+import argparse
+import time
+
+from evaluation_cache import EvaluationCache
+from minimax_algorithm import MinimaxAlgorithm
+from move_ordering import HistoryHeuristic, KillerMoves, PreviousBestMove
+from reference_games import ConnectFourState
+
+
+class ExpensiveConnectFour(ConnectFourState):
+    # Stands in for an evaluator with feature extraction and a model: the same score, `cost` times slower
+    cost = 1
+
+    def evaluate(self):
+        for _ in range(self.cost - 1):
+            super().evaluate()
+        return super().evaluate()
+
+
+def play_game(depth, moves, cache_size):
+    """
+    Plays the first moves of a game with iterative deepening, one engine per side.
+    """
+    cache = EvaluationCache(cache_size) if cache_size else None
+    engines = [MinimaxAlgorithm(None, depth_limit=depth, evaluation_cache=cache,
+                                move_ordering=[PreviousBestMove(), KillerMoves(), HistoryHeuristic()])
+               for _ in range(2)]
+    state = ExpensiveConnectFour()
+    start = time.perf_counter()
+    nodes = 0
+    for ply in range(moves):
+        result = engines[ply % 2].search(state, ply % 2 == 0)
+        nodes += result.nodes
+        state.apply_move(result.move)
+    return time.perf_counter() - start, nodes, cache
+
+
+def benchmark_evaluation_cache():
+    parser = argparse.ArgumentParser(description="Self-play search time with and without an evaluation cache.")
+    parser.add_argument("--depth", type=int, default=5, help="Search depth of every move (default is 5).")
+    parser.add_argument("--moves", type=int, default=8, help="Moves played (default is 8).")
+    parser.add_argument("--cost", type=int, nargs="+", default=[1, 10, 50],
+                        help="Evaluation costs, in multiples of the plain evaluation (default is 1 10 50).")
+    parser.add_argument("--cache-size", type=int, default=1 << 16, help="Scores kept by the cache (default is 65536).")
+    args = parser.parse_args()
+
+    print(f"{'cost':>5} {'nodes':>8} {'uncached (s)':>13} {'cached (s)':>11} {'hit rate':>9} {'speedup':>8}")
+    for cost in args.cost:
+        ExpensiveConnectFour.cost = cost
+        uncached, nodes, _ = play_game(args.depth, args.moves, 0)
+        cached, _, cache = play_game(args.depth, args.moves, args.cache_size)
+        print(f"{cost:>5} {nodes:>8} {uncached:>13.3f} {cached:>11.3f} {cache.hit_rate():>9.1%} "
+              f"{uncached / cached:>7.2f}x")
+
+
+if __name__ == "__main__":
+    benchmark_evaluation_cache()
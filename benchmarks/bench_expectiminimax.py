@@ -0,0 +1,62 @@
+import argparse
+import random
+import time
+
+from expectiminimax import ExpectiminimaxAlgorithm
+from reference_games import DiceRaceState
+
+CONFIGURATIONS = (("full width", None, None), ("star1", "star1", None), ("star2", "star2", None),
+                  ("sampled", None, "error"), ("star2 sampled", "star2", "error"))
+
+
+def positions(count, target, dice, seed):
+    """
+    Dice race positions as they come up in games: both players to move, at every stage of the race.
+    """
+    rng = random.Random(seed)
+    return [DiceRaceState(target, dice, (rng.randrange(target), rng.randrange(target)), rng.choice((1, 2)))
+            for _ in range(count)]
+
+
+def benchmark_expectiminimax():
+    parser = argparse.ArgumentParser(description="Star1/Star2 pruning and chance sampling against full-width "
+                                                 "expectiminimax on a dice race.")
+    parser.add_argument("--depths", type=int, nargs="+", default=[2, 3, 4],
+                        help="Search depths, chance plies included (default is 2 3 4).")
+    parser.add_argument("--positions", type=int, default=10, help="Positions searched (default is 10).")
+    parser.add_argument("--target", type=int, default=30, help="Score that wins the race (default is 30).")
+    parser.add_argument("--dice", type=int, default=3, help="Most dice rolled in one turn (default is 3).")
+    parser.add_argument("--error-bound", type=float, default=10.0,
+                        help="Error bound of sampled expectations (default is 10).")
+    parser.add_argument("--confidence", type=float, default=0.9,
+                        help="Confidence of the error bound (default is 0.9).")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the positions and samples (default is 0).")
+    args = parser.parse_args()
+
+    states = positions(args.positions, args.target, args.dice, args.seed)
+    print(f"{'depth':>5} {'search':>14} {'nodes':>10} {'time (s)':>9} {'speedup':>8} {'same move':>10} "
+          f"{'score error':>12}")
+    for depth in args.depths:
+        baseline = None
+        for name, pruning, sampling in CONFIGURATIONS:
+            nodes = 0
+            elapsed = 0.0
+            results = []
+            for state in states:
+                search = ExpectiminimaxAlgorithm(None, state.bounds, pruning=pruning,
+                                                 error_bound=args.error_bound if sampling else None,
+                                                 confidence=args.confidence, seed=args.seed)
+                start = time.perf_counter()
+                results.append(search.alpha_beta(state, depth, state.current_player == 1))
+                elapsed += time.perf_counter() - start
+                nodes += search.nodes_searched
+            if baseline is None:
+                baseline = (elapsed, results)
+            same = sum(move == expected_move for (_, move), (_, expected_move) in zip(results, baseline[1]))
+            error = max(abs(score - expected) for (score, _), (expected, _) in zip(results, baseline[1]))
+            print(f"{depth:>5} {name:>14} {nodes:>10} {elapsed:>9.3f} {baseline[0] / elapsed:>7.1f}x "
+                  f"{same:>4}/{len(states):<5} {error:>12.3f}")
+
+
+if __name__ == "__main__":
+    benchmark_expectiminimax()
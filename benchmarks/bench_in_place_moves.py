@@ -0,0 +1,37 @@
+import argparse
+import time
+
+from minimax_algorithm import MinimaxAlgorithm
+from reference_games import UniformTreeState
+from self_play import GameStateExample
+
+GAMES = {
+    "uniform-tree": (lambda: UniformTreeState(branching=5, height=64), 7),
+    "self-play-example": (GameStateExample, 16),
+}
+
+
+def nodes_per_second(state, depth, in_place_moves, repeat):
+    minimax = MinimaxAlgorithm(None, in_place_moves=in_place_moves)
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        minimax.alpha_beta(state, depth, True)
+        best = min(best, time.perf_counter() - start)
+    return minimax.nodes_searched / best
+
+
+def benchmark_in_place_moves():
+    parser = argparse.ArgumentParser(description="Alpha-beta nodes per second with copy-on-move and in-place moves.")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of timed runs per measurement (default is 3).")
+    args = parser.parse_args()
+
+    print(f"{'game':>18} {'depth':>5} {'copy (nodes/s)':>15} {'in place (nodes/s)':>19} {'speedup':>8}")
+    for name, (make_state, depth) in GAMES.items():
+        copied = nodes_per_second(make_state(), depth, False, args.repeat)
+        in_place = nodes_per_second(make_state(), depth, True, args.repeat)
+        print(f"{name:>18} {depth:>5} {copied:>15,.0f} {in_place:>19,.0f} {in_place / copied:>7.2f}x")
+
+
+if __name__ == "__main__":
+    benchmark_in_place_moves()
@@ -0,0 +1,60 @@
+import argparse
+import time
+
+import numpy as np
+
+from game_theory_algorithm import Game, MinimaxAlgorithm
+from incremental_solver import IncrementalSolver
+
+
+def change(session, rng, kind, cells):
+    if kind == "add column":
+        session.add_column(rng.integers(-100, 101, session.rows))
+    elif kind == "add row":
+        session.add_row(rng.integers(-100, 101, session.columns))
+    else:
+        session.update_payoffs(rng.integers(0, session.rows, cells), rng.integers(0, session.columns, cells),
+                               rng.integers(-100, 101, cells))
+
+
+def benchmark_incremental_solver():
+    parser = argparse.ArgumentParser(description="Cost of updating a solved matrix game against solving it again.")
+    parser.add_argument("--size", type=int, default=200, help="Rows and columns of the initial game (default is 200).")
+    parser.add_argument("--steps", type=int, default=20, help="Changes of each kind (default is 20).")
+    parser.add_argument("--cells", type=int, default=5, help="Payoffs re-estimated per update (default is 5).")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the game and the changes (default is 0).")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    session = IncrementalSolver(rng.integers(-100, 101, (args.size, args.size)))
+    session.solve()
+    print(f"{'change':>14} {'pure update (ms)':>17} {'pure full (ms)':>15} {'mixed update (ms)':>18} "
+          f"{'mixed full (ms)':>16} {'speedup':>8}")
+    for kind in ("add column", "add row", "update cells"):
+        timings = np.zeros(4)
+        for _ in range(args.steps):
+            start = time.perf_counter()
+            change(session, rng, kind, args.cells)
+            pure = session.minimax()
+            timings[0] += time.perf_counter() - start
+            start = time.perf_counter()
+            solution = session.solve()
+            timings[2] += time.perf_counter() - start
+
+            matrix = session.matrix.copy()
+            start = time.perf_counter()
+            algorithm = MinimaxAlgorithm(Game(matrix))
+            assert algorithm.minimax() == pure
+            timings[1] += time.perf_counter() - start
+            start = time.perf_counter()
+            full = algorithm.mixed_strategies()
+            timings[3] += time.perf_counter() - start
+            assert abs(full.value - solution.value) < 1e-7
+        timings *= 1000 / args.steps
+        print(f"{kind:>14} {timings[0]:>17.3f} {timings[1]:>15.3f} {timings[2]:>18.2f} {timings[3]:>16.2f} "
+              f"{(timings[1] + timings[3]) / (timings[0] + timings[2]):>7.1f}x")
+    print(f"Final game: {session.rows}x{session.columns}, {session.restricted_solves} restricted solves")
+
+
+if __name__ == "__main__":
+    benchmark_incremental_solver()
@@ -0,0 +1,83 @@
+import argparse
+import asyncio
+import os
+import random
+import subprocess
+import sys
+import time
+
+from move_server import LatencyHistogram, MoveServer
+
+SOURCE = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "src")
+
+# A fresh interpreter per request, as with bin/run_game.py: start-up, imports and a cold search every time
+ONE_SHOT = """
+import sys
+from move_server import connect_four_position
+from minimax_algorithm import MinimaxAlgorithm
+state = connect_four_position([int(move) for move in sys.argv[1:]])
+print(MinimaxAlgorithm(None, depth_limit={depth}).search(state, state.current_player == 1).move)
+"""
+
+
+def positions(count, seed=0):
+    rng = random.Random(seed)
+    return [[rng.randrange(7) for _ in range(rng.randrange(2, 8))] for _ in range(count)]
+
+
+def one_shot_latencies(requests, depth):
+    histogram = LatencyHistogram()
+    environment = dict(os.environ, PYTHONPATH=SOURCE)
+    for position in requests:
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", ONE_SHOT.format(depth=depth)] + [str(move) for move in position],
+                       check=True, capture_output=True, env=environment)
+        histogram.record(time.perf_counter() - start)
+    return histogram
+
+
+async def served_latencies(requests, depth, workers, concurrency, matrices):
+    async with MoveServer(workers=workers) as server:
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def send(request):
+            async with semaphore:
+                return await server.handle(request)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(send({"command": "best_move", "game": "connect_four", "position": position,
+                                     "depth": depth}) for position in requests))
+        searches = time.perf_counter() - start
+        rng = random.Random(1)
+        start = time.perf_counter()
+        await asyncio.gather(*(send({"command": "solve_matrix",
+                                     "matrix": [[rng.randint(-9, 9) for _ in range(4)] for _ in range(4)]})
+                               for _ in range(matrices)))
+        solves = time.perf_counter() - start
+        return server.stats(), searches, solves
+
+
+def benchmark_move_server():
+    parser = argparse.ArgumentParser(description="Latency of one-shot processes against the resident move server.")
+    parser.add_argument("--requests", type=int, default=20, help="Best move requests (default is 20).")
+    parser.add_argument("--depth", type=int, default=5, help="Search depth (default is 5).")
+    parser.add_argument("--workers", type=int, default=2, help="Server worker processes (default is 2).")
+    parser.add_argument("--concurrency", type=int, default=8, help="Requests in flight at once (default is 8).")
+    parser.add_argument("--matrices", type=int, default=2000, help="4x4 matrix games solved (default is 2000).")
+    args = parser.parse_args()
+
+    requests = positions(args.requests)
+    one_shot = one_shot_latencies(requests, args.depth).to_dict()
+    stats, searches, solves = asyncio.run(served_latencies(requests, args.depth, args.workers, args.concurrency,
+                                                           args.matrices))
+    served = stats["latency"]["best_move"]
+    print(f"{'best move':>12} {'p50 (ms)':>9} {'p99 (ms)':>9} {'mean (ms)':>10}")
+    print(f"{'one-shot':>12} {one_shot['p50_ms']:>9.1f} {one_shot['p99_ms']:>9.1f} {one_shot['mean_ms']:>10.1f}")
+    print(f"{'server':>12} {served['p50_ms']:>9.1f} {served['p99_ms']:>9.1f} {served['mean_ms']:>10.1f}")
+    print(f"Server throughput: {args.requests / searches:.1f} moves/s, "
+          f"{args.matrices / solves:.0f} matrix games/s in batches of {stats['mean_batch_size']:.1f} on average "
+          f"(p99 {stats['latency']['solve_matrix']['p99_ms']:.1f} ms)")
+
+
+if __name__ == "__main__":
+    benchmark_move_server()
@@ -0,0 +1,67 @@
+import argparse
+import os
+import tempfile
+import time
+
+from minimax_algorithm import MinimaxAlgorithm
+from move_ordering import HistoryHeuristic, KillerMoves, PreviousBestMove
+from opening_book import OpeningBook, OpeningBookBuilder
+from reference_games import ConnectFourState
+from self_play import MinimaxPlayer, SelfPlay
+
+
+def play_game(depth, moves, book):
+    """
+    Plays the first moves of a game, one engine per side, and returns the time taken.
+    """
+    players = [MinimaxPlayer(MinimaxAlgorithm(None, opening_book=book,
+                                              move_ordering=[PreviousBestMove(), KillerMoves(), HistoryHeuristic()]),
+                             depth)
+               for _ in range(2)]
+    game = SelfPlay(ConnectFourState(), players=players, max_moves=moves)
+    start = time.perf_counter()
+    game.play()
+    return time.perf_counter() - start, game
+
+
+def benchmark_opening_book():
+    parser = argparse.ArgumentParser(description="Self-play time with and without an opening book, and probe time.")
+    parser.add_argument("--plies", type=int, default=2, help="Plies of the game tree in the book (default is 2).")
+    parser.add_argument("--book-depth", type=int, default=8, help="Search depth of book positions (default is 8).")
+    parser.add_argument("--depth", type=int, default=6, help="Search depth of the players (default is 6).")
+    parser.add_argument("--moves", type=int, default=8, help="Moves played per game (default is 8).")
+    parser.add_argument("--probes", type=int, default=100000, help="Probes timed (default is 100000).")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "connect_four.book")
+        builder = OpeningBookBuilder(max_ply=args.moves)
+        builder.add_tree(ConnectFourState(), args.plies)
+        _, game = play_game(args.depth, args.moves, None)
+        builder.add_self_play(game)
+        start = time.perf_counter()
+        positions = builder.build(path, args.book_depth)
+        print(f"Built a book of {positions} positions at depth {args.book_depth} in "
+              f"{time.perf_counter() - start:.1f}s ({os.path.getsize(path)} bytes)")
+
+        without_book, _ = play_game(args.depth, args.moves, None)
+        book = OpeningBook(path)
+        with_book, _ = play_game(args.depth, args.moves, book)
+        print(f"{args.moves} moves at depth {args.depth}: {without_book:.3f}s without the book, {with_book:.3f}s "
+              f"with it ({book.hit_rate():.0%} of probes hit, {without_book / with_book:.1f}x)")
+
+        state = ConnectFourState()
+        key = state.hash_key()
+        start = time.perf_counter()
+        for _ in range(args.probes):
+            book.lookup(key)
+        lookup = (time.perf_counter() - start) / args.probes
+        start = time.perf_counter()
+        for _ in range(args.probes):
+            book.probe(state)
+        probe = (time.perf_counter() - start) / args.probes
+        print(f"Lookup: {lookup * 1e6:.2f} us, probe with move decoding: {probe * 1e6:.2f} us")
+
+
+if __name__ == "__main__":
+    benchmark_opening_book()
@@ -0,0 +1,64 @@
+import argparse
+import os
+import time
+
+from minimax_algorithm import MinimaxAlgorithm
+from move_ordering import HistoryHeuristic, KillerMoves, PreviousBestMove
+from parallel_search import ParallelSearch
+from reference_games import UniformTreeState
+from transposition_table import TranspositionTable
+
+
+def make_algorithm():
+    return MinimaxAlgorithm(None, move_ordering=[PreviousBestMove(), KillerMoves(), HistoryHeuristic()],
+                            transposition_table=TranspositionTable(1 << 16))
+
+
+def time_to_depth(mode, workers, positions, depth, deterministic):
+    """
+    Returns the total time and nodes to search the positions with warm worker processes.
+    """
+    with ParallelSearch(make_algorithm(), workers=workers, mode=mode, deterministic=deterministic) as search:
+        search.search(positions[0], 2)  # Start the workers
+        start = time.perf_counter()
+        nodes = 0
+        for position in positions:
+            nodes += search.search(position, depth).nodes
+        return time.perf_counter() - start, nodes
+
+
+def benchmark_parallel_search():
+    parser = argparse.ArgumentParser(description="Parallel alpha-beta speedup against the number of worker processes.")
+    parser.add_argument("--depth", type=int, default=7, help="Search depth (default is 7).")
+    parser.add_argument("--branching", type=int, default=8, help="Branching factor of the reference tree (default is 8).")
+    parser.add_argument("--positions", type=int, default=4, help="Number of positions searched (default is 4).")
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count(),
+                        help="Largest number of workers measured (default is the number of CPUs).")
+    args = parser.parse_args()
+
+    positions = [UniformTreeState(branching=args.branching, height=64, seed=seed) for seed in range(args.positions)]
+    serial = make_algorithm()
+    start = time.perf_counter()
+    serial_nodes = 0
+    for position in positions:
+        serial.alpha_beta(position, args.depth, True)
+        serial_nodes += serial.nodes_searched
+    serial_time = time.perf_counter() - start
+    print(f"serial alpha-beta: {serial_time:.2f}s, {serial_nodes:,} nodes")
+
+    workers = [1]
+    while workers[-1] * 2 <= args.max_workers:
+        workers.append(workers[-1] * 2)
+    if workers[-1] != args.max_workers:
+        workers.append(args.max_workers)
+
+    print(f"{'mode':>26} {'workers':>7} {'time (s)':>9} {'nodes':>12} {'speedup':>8}")
+    for mode, deterministic in (("root_split", False), ("root_split", True), ("lazy_smp", False)):
+        label = mode + (" (deterministic)" if deterministic else "")
+        for count in workers:
+            elapsed, nodes = time_to_depth(mode, count, positions, args.depth, deterministic)
+            print(f"{label:>26} {count:>7} {elapsed:>9.2f} {nodes:>12,} {serial_time / elapsed:>7.2f}x")
+
+
+if __name__ == "__main__":
+    benchmark_parallel_search()
@@ -0,0 +1,50 @@
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from game_theory_algorithm import Game, MinimaxAlgorithm
+
+
+def per_cell_minimax(game, rows):
+    # The computation MinimaxAlgorithm.minimax did before payoffs were held in an array: one get_payoff call
+    # per cell and per pass, restricted to the first `rows` rows so that it finishes in reasonable time
+    row_minima = [min([game.get_payoff(row, col) for col in range(game.columns)]) for row in range(rows)]
+    column_maxima = [max([game.get_payoff(row, col) for row in range(rows)]) for col in range(game.columns)]
+    return row_minima.index(max(row_minima)), column_maxima.index(min(column_maxima))
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+
+def benchmark_payoff_matrix():
+    parser = argparse.ArgumentParser(description="Per-cell versus vectorized pure-strategy solving of a payoff matrix.")
+    parser.add_argument("--size", type=int, default=10000, help="Rows and columns of the matrix (default is 10000).")
+    parser.add_argument("--per-cell-rows", type=int, default=200,
+                        help="Rows timed on the per-cell path, extrapolated to the full matrix (default is 200).")
+    args = parser.parse_args()
+
+    matrix = np.random.default_rng(0).standard_normal((args.size, args.size))
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "payoffs.npy")
+        np.save(path, matrix)
+
+        print(f"{args.size}x{args.size} payoff matrix")
+        game = Game(matrix)
+        per_cell = timed(per_cell_minimax, game, args.per_cell_rows) * args.size / args.per_cell_rows
+        print(f"  per-cell get_payoff (extrapolated from {args.per_cell_rows} rows): {per_cell:9.2f} s")
+        minimax = MinimaxAlgorithm(game)
+        print(f"  vectorized minimax, in-memory array:                     {timed(minimax.minimax):9.2f} s")
+        print(f"  vectorized saddle point, in-memory array:                {timed(minimax.saddle_point):9.2f} s")
+        mapped = MinimaxAlgorithm(Game(path))
+        print(f"  vectorized minimax, memory-mapped .npy:                  {timed(mapped.minimax):9.2f} s")
+        del mapped
+
+
+if __name__ == "__main__":
+    benchmark_payoff_matrix()
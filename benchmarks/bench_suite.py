@@ -0,0 +1,257 @@
+import argparse
+import csv
+import datetime
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from game_theory_algorithm import Game, MinimaxAlgorithm as MatrixGameSolver
+from minimax_algorithm import MinimaxAlgorithm
+from move_ordering import HistoryHeuristic, KillerMoves, PreviousBestMove
+from reference_games import ConnectFourState, UniformTreeState
+from tic_tac_toe import CELL_NAMES, TicTacToeState
+from transposition_table import TranspositionTable
+
+FORMAT_VERSION = 1
+DATASET = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "data", "dataset.csv")
+MIN_LATENCY_TIME = 0.2  # Seconds of repeated solves per latency measurement
+MIN_DEPTH_TIME = 0.001  # Times to depth below this, in seconds, are not reported
+
+
+def metric(value, unit, better):
+    return {"value": value, "unit": unit, "better": better}
+
+
+def peak_memory(function):
+    """
+    Runs a function once under tracemalloc, apart from the timed runs since tracing slows everything down.
+    """
+    tracemalloc.start()
+    try:
+        function()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def tic_tac_toe_positions(count, removed, seed):
+    """
+    Mid-game positions derived from the end positions of data/dataset.csv: a seeded sample of rows,
+    each with `removed` of its last pieces taken back (alternately O and X when the board is full
+    after an X move). Positions that are already decided are kept, as they are in real searches.
+    """
+    with open(DATASET, newline="") as file:
+        rows = [[row[name] for name in CELL_NAMES] for row in csv.DictReader(file)]
+    rng = random.Random(seed)
+    positions = []
+    for cells in rng.sample(rows, count):
+        cells = list(cells)
+        # X moves first, so the last piece played is X's when X has more pieces
+        mark = "x" if cells.count("x") > cells.count("o") else "o"
+        for _ in range(removed):
+            occupied = [cell for cell, value in enumerate(cells) if value == mark]
+            if not occupied:
+                break
+            cells[rng.choice(occupied)] = "b"
+            mark = "o" if mark == "x" else "x"
+        positions.append(TicTacToeState.from_cells(cells))
+    return positions
+
+
+def connect_four_positions(count, opening_moves, seed):
+    """
+    Connect Four positions reached by a seeded number of random opening moves from the empty board.
+    """
+    rng = random.Random(seed)
+    positions = []
+    while len(positions) < count:
+        state = ConnectFourState()
+        for _ in range(opening_moves):
+            state.apply_move(rng.choice(state.get_possible_moves()))
+        if not state.is_terminal():
+            positions.append(state)
+    return positions
+
+
+def search_positions(positions, depth):
+    """
+    Searches every position by iterative deepening with move ordering and a transposition table,
+    the configuration of a real engine.
+
+    Returns:
+        int: The nodes searched.
+        list of float: The time taken to complete each depth, summed over the positions.
+    """
+    nodes = 0
+    time_to_depth = [0.0] * depth
+    for state in positions:
+        minimax = MinimaxAlgorithm(None, depth_limit=depth, transposition_table=TranspositionTable(1 << 16),
+                                   move_ordering=[PreviousBestMove(), KillerMoves(), HistoryHeuristic()])
+        iterations = []
+        result = minimax.search(state, state.current_player == 1, progress=iterations.append)
+        nodes += result.nodes
+        for iteration in iterations:
+            time_to_depth[iteration.depth - 1] += iteration.elapsed
+    return nodes, time_to_depth
+
+
+def benchmark_search(positions, depth, repeat):
+    best_elapsed = float('inf')
+    best_time_to_depth = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        nodes, time_to_depth = search_positions(positions, depth)
+        elapsed = time.perf_counter() - start
+        if elapsed < best_elapsed:
+            best_elapsed, best_time_to_depth = elapsed, time_to_depth
+    metrics = {"nodes": metric(nodes, "nodes", "lower"),
+               "nodes_per_second": metric(nodes / best_elapsed, "nodes/s", "higher")}
+    for completed, seconds in enumerate(best_time_to_depth, start=1):
+        # Searches that solve a position early never reach the deeper iterations, and the shallowest
+        # iterations are too quick to time reliably
+        if seconds >= MIN_DEPTH_TIME:
+            metrics[f"time_to_depth_{completed}"] = metric(seconds, "s", "lower")
+    metrics["peak_memory"] = metric(peak_memory(lambda: search_positions(positions, depth)), "bytes", "lower")
+    return metrics
+
+
+def benchmark_matrix(rows, columns, repeat, seed):
+    game = Game(np.random.default_rng(seed).standard_normal((rows, columns)))
+    solver = MatrixGameSolver(game)
+    solvers = {"pure": solver.minimax, "exact": solver.mixed_strategies}
+    metrics = {}
+    for name, solve in solvers.items():
+        # Fast solves are repeated for long enough that the best time is not just timer noise
+        latencies = []
+        while len(latencies) < repeat or sum(latencies) < MIN_LATENCY_TIME:
+            start = time.perf_counter()
+            solve()
+            latencies.append(time.perf_counter() - start)
+        metrics[f"{name}_latency"] = metric(min(latencies), "s", "lower")
+    metrics["peak_memory"] = metric(peak_memory(solver.mixed_strategies), "bytes", "lower")
+    return metrics
+
+
+def run_suite(args):
+    results = {}
+    positions = tic_tac_toe_positions(args.tic_tac_toe_positions, 4, args.seed)
+    results["tic-tac-toe"] = benchmark_search(positions, 9, args.repeat)
+    tree = UniformTreeState(branching=args.branching, height=args.depth, seed=args.seed)
+    results[f"uniform-tree-{args.branching}x{args.depth}"] = benchmark_search([tree], args.depth, args.repeat)
+    positions = connect_four_positions(args.connect_four_positions, 4, args.seed)
+    results["connect-four"] = benchmark_search(positions, args.connect_four_depth, args.repeat)
+    for size in args.matrix_sizes:
+        rows, columns = (int(value) for value in size.split("x"))
+        results[f"payoff-matrix-{size}"] = benchmark_matrix(rows, columns, args.repeat, args.seed)
+    return results
+
+
+def run(args):
+    if args.quick:
+        args.tic_tac_toe_positions = min(args.tic_tac_toe_positions, 10)
+        args.depth = min(args.depth, 6)
+        args.connect_four_positions = min(args.connect_four_positions, 2)
+        args.connect_four_depth = min(args.connect_four_depth, 5)
+        args.matrix_sizes = ["10x10", "50x40"]
+    results = run_suite(args)
+    report = {
+        "format": FORMAT_VERSION,
+        "created": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "settings": {name: value for name, value in vars(args).items() if name not in ("command", "output")},
+        "results": results,
+    }
+    for name, metrics in results.items():
+        print(name)
+        for metric_name, entry in metrics.items():
+            print(f"  {metric_name:>20} {entry['value']:>16,.6g} {entry['unit']}")
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(report, output, indent=2)
+            output.write("\n")
+        print(f"Results written to {args.output}")
+    return 0
+
+
+def compare_results(baseline, current, threshold):
+    """
+    Compares every metric present in both reports.
+
+    Returns:
+        list of tuple: (benchmark, metric, baseline value, current value, relative change, regression)
+                       with the change positive when the metric got worse.
+    """
+    rows = []
+    for name, metrics in baseline["results"].items():
+        for metric_name, entry in metrics.items():
+            other = current["results"].get(name, {}).get(metric_name)
+            if other is None or not entry["value"]:
+                continue
+            change = (other["value"] - entry["value"]) / entry["value"]
+            if entry["better"] == "higher":
+                change = -change
+            rows.append((name, metric_name, entry["value"], other["value"], change, change > threshold))
+    return rows
+
+
+def compare(args):
+    with open(args.baseline) as file:
+        baseline = json.load(file)
+    with open(args.current) as file:
+        current = json.load(file)
+    if baseline.get("format") != FORMAT_VERSION or current.get("format") != FORMAT_VERSION:
+        print(f"Only format {FORMAT_VERSION} results can be compared", file=sys.stderr)
+        return 2
+    if baseline.get("settings") != current.get("settings"):
+        print("Warning: the two runs used different settings", file=sys.stderr)
+    rows = compare_results(baseline, current, args.threshold)
+    print(f"{'benchmark':>24} {'metric':>20} {'baseline':>12} {'current':>12} {'worse by':>9}")
+    for name, metric_name, before, after, change, regression in rows:
+        flag = "  REGRESSION" if regression else ""
+        print(f"{name:>24} {metric_name:>20} {before:>12.4g} {after:>12.4g} {change:>8.1%}{flag}")
+    regressions = sum(row[5] for row in rows)
+    print(f"{regressions} regression(s) beyond {args.threshold:.0%}")
+    return 1 if regressions else 0
+
+
+def benchmark_suite():
+    parser = argparse.ArgumentParser(
+        description="Reference benchmarks for the search and the matrix game solvers, with regression tracking.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Run the suite and optionally store the results as a baseline.")
+    run_parser.add_argument("--output", help="JSON file to write the results to, to compare later runs against.")
+    run_parser.add_argument("--repeat", type=int, default=3, help="Timed runs per measurement (default is 3).")
+    run_parser.add_argument("--seed", type=int, default=0, help="Seed of the reference positions (default is 0).")
+    run_parser.add_argument("--quick", action="store_true", help="Smaller positions and matrices, for a smoke test.")
+    run_parser.add_argument("--tic-tac-toe-positions", type=int, default=50,
+                            help="Positions sampled from data/dataset.csv (default is 50).")
+    run_parser.add_argument("--branching", type=int, default=5, help="Branching of the uniform tree (default is 5).")
+    run_parser.add_argument("--depth", type=int, default=8, help="Height and search depth of the uniform tree (default is 8).")
+    run_parser.add_argument("--connect-four-positions", type=int, default=4,
+                            help="Connect Four positions searched (default is 4).")
+    run_parser.add_argument("--connect-four-depth", type=int, default=7,
+                            help="Search depth of the Connect Four positions (default is 7).")
+    run_parser.add_argument("--matrix-sizes", nargs="+", default=["10x10", "100x80", "300x300"],
+                            help="Payoff matrix sizes, as ROWSxCOLUMNS (default is 10x10 100x80 300x300).")
+
+    compare_parser = commands.add_parser("compare", help="Flag the metrics of a run that regressed from a baseline.")
+    compare_parser.add_argument("baseline", help="The baseline results.")
+    compare_parser.add_argument("current", help="The results to check.")
+    compare_parser.add_argument("--threshold", type=float, default=0.1,
+                                help="Relative change beyond which a metric is a regression (default is 0.1).")
+
+    args = parser.parse_args()
+    sys.exit(run(args) if args.command == "run" else compare(args))
+
+
+if __name__ == "__main__":
+    benchmark_suite()
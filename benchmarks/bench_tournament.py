@@ -0,0 +1,42 @@
+import argparse
+import os
+import time
+from functools import partial
+
+from reference_games import UniformTreeState
+from tournament import PlayerSettings, Tournament
+
+
+def games_per_second(workers, games, depth):
+    tournament = Tournament(partial(UniformTreeState, branching=5, height=12), PlayerSettings(depth=depth),
+                            opening_moves=2, workers=workers)
+    start = time.perf_counter()
+    for _ in tournament.play(games):
+        pass
+    return games / (time.perf_counter() - start)
+
+
+def benchmark_tournament():
+    parser = argparse.ArgumentParser(description="Self-play tournament throughput against the number of worker processes.")
+    parser.add_argument("--games", type=int, default=200, help="Number of games per measurement (default is 200).")
+    parser.add_argument("--depth", type=int, default=4, help="Search depth of both players (default is 4).")
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count(),
+                        help="Largest number of workers measured (default is the number of CPUs).")
+    args = parser.parse_args()
+
+    workers = [1]
+    while workers[-1] * 2 <= args.max_workers:
+        workers.append(workers[-1] * 2)
+    if workers[-1] != args.max_workers:
+        workers.append(args.max_workers)
+
+    print(f"{'workers':>7} {'games/s':>10} {'speedup':>8} {'efficiency':>10}")
+    serial = None
+    for count in workers:
+        rate = games_per_second(count, args.games, args.depth)
+        serial = serial or rate
+        print(f"{count:>7} {rate:>10,.1f} {rate / serial:>7.2f}x {rate / serial / count:>9.0%}")
+
+
+if __name__ == "__main__":
+    benchmark_tournament()
@@ -0,0 +1,69 @@
+import argparse
+import resource
+import subprocess
+import sys
+import time
+
+from game_tree import BoundedGameTree
+from minimax_algorithm import MinimaxAlgorithm, Node
+from reference_games import UniformTreeState
+
+REPRESENTATIONS = ["node", "bounded", "stateless"]
+
+
+def search(representation, depth, branching, max_nodes):
+    # Runs two searches from the same root, as a long-running engine would
+    root = UniformTreeState(branching=branching, height=depth)
+    minimax = MinimaxAlgorithm(None)
+    if representation == "node":
+        tree = Node(root)
+        for _ in range(2):
+            minimax.minimax(tree, depth, True)
+    elif representation == "bounded":
+        tree = BoundedGameTree(root, max_nodes=max_nodes)
+        for _ in range(2):
+            minimax.minimax(tree.root, depth, True)
+    else:
+        # Alpha-beta recurses on game states and keeps no tree at all (it also prunes, so it is faster too)
+        for _ in range(2):
+            minimax.alpha_beta(root, depth, True)
+
+
+def peak_rss_megabytes():
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1 << 20) if sys.platform == "darwin" else peak / 1024
+
+
+def run_child(args):
+    start = time.perf_counter()
+    search(args.representation, args.depth, args.branching, args.max_nodes)
+    print(f"{peak_rss_megabytes():.1f} {time.perf_counter() - start:.2f}")
+
+
+def benchmark_tree_memory():
+    # Every measurement runs in a fresh interpreter, since peak RSS can only grow within a process
+    parser = argparse.ArgumentParser(description="Peak RSS of searching a uniform tree with each tree representation.")
+    parser.add_argument("--depths", type=int, nargs="+", default=[4, 5, 6, 7, 8], help="Search depths to measure.")
+    parser.add_argument("--branching", type=int, default=5, help="Branching factor of the reference tree (default is 5).")
+    parser.add_argument("--max-nodes", type=int, default=10000, help="Node cap of the bounded tree (default is 10000).")
+    parser.add_argument("--child", nargs=2, metavar=("REPRESENTATION", "DEPTH"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        args.representation, args.depth = args.child[0], int(args.child[1])
+        run_child(args)
+        return
+
+    print(f"{'depth':>5} {'representation':>15} {'peak RSS (MB)':>14} {'time (s)':>9}")
+    for depth in args.depths:
+        for representation in REPRESENTATIONS:
+            output = subprocess.run(
+                [sys.executable, __file__, "--child", representation, str(depth),
+                 "--branching", str(args.branching), "--max-nodes", str(args.max_nodes)],
+                capture_output=True, text=True, check=True).stdout.split()
+            print(f"{depth:>5} {representation:>15} {float(output[0]):>14.1f} {float(output[1]):>9.2f}")
+
+
+if __name__ == "__main__":
+    benchmark_tree_memory()
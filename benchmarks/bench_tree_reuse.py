@@ -0,0 +1,58 @@
+import argparse
+
+from minimax_algorithm import MinimaxAlgorithm
+from move_ordering import HistoryHeuristic, KillerMoves, PreviousBestMove
+from reference_games import UniformTreeState
+from self_play import MinimaxPlayer, SelfPlay
+from tic_tac_toe import TicTacToeState
+from transposition_table import TranspositionTable
+
+GAMES = {
+    "tic-tac-toe": (lambda seed: TicTacToeState(), 6),
+    "uniform-tree": (lambda seed: UniformTreeState(branching=6, height=16, seed=seed), 5),
+}
+
+
+def make_player(depth, algorithm, reuse_search):
+    minimax = MinimaxAlgorithm(None, move_ordering=[PreviousBestMove(), KillerMoves(), HistoryHeuristic()],
+                               transposition_table=TranspositionTable(1 << 16))
+    return MinimaxPlayer(minimax, depth=depth, algorithm=algorithm, reuse_search=reuse_search)
+
+
+def nodes_per_game(make_state, depth, algorithm, seed):
+    """
+    Plays a game with warm searches, then searches every position of that game cold.
+    """
+    player = make_player(depth, algorithm, True)
+    self_play = SelfPlay(make_state(seed), players=(player, player))
+    self_play.play()
+    cold = make_player(depth, algorithm, False)
+    state = make_state(seed)
+    maximizing_player = True
+    cold_nodes = 0
+    for move in self_play.moves:
+        cold.select_move(state, maximizing_player)
+        cold_nodes += cold.nodes_searched
+        state = state.make_move(move)
+        maximizing_player = not maximizing_player
+    return sum(self_play.nodes_searched), cold_nodes
+
+
+def benchmark_tree_reuse():
+    parser = argparse.ArgumentParser(description="Nodes per self-play game with search state kept between moves.")
+    parser.add_argument("--games", type=int, default=5, help="Number of games per measurement (default is 5).")
+    args = parser.parse_args()
+
+    print(f"{'game':>14} {'search':>12} {'cold nodes/game':>16} {'warm nodes/game':>16} {'saved':>7}")
+    for name, (make_state, depth) in GAMES.items():
+        for algorithm in ("alpha_beta", "search"):
+            warm = cold = 0
+            for seed in range(args.games):
+                warm_nodes, cold_nodes = nodes_per_game(make_state, depth, algorithm, seed)
+                warm += warm_nodes / args.games
+                cold += cold_nodes / args.games
+            print(f"{name:>14} {algorithm:>12} {cold:>16,.0f} {warm:>16,.0f} {1 - warm / cold:>7.1%}")
+
+
+if __name__ == "__main__":
+    benchmark_tree_reuse()
@@ -0,0 +1,60 @@
+import argparse
+import asyncio
+import logging
+
+from move_server import MoveServer
+
+
+def run_server():
+    # Set up argument parser for command line interface
+    parser = argparse.ArgumentParser(
+        description="Serve best moves and matrix game solutions as JSON lines, from warm worker processes.")
+    parser.add_argument(
+        "--socket",
+        help="Listen on this Unix domain socket instead of answering the standard input on the standard output."
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=2,
+        help="Set the number of worker processes (default is 2)."
+    )
+    parser.add_argument(
+        "--queue-size",
+        type=int,
+        default=256,
+        help="Set the requests of each command that may wait for a worker before new ones are refused (default is 256)."
+    )
+    parser.add_argument(
+        "--deadline",
+        type=float,
+        default=5.0,
+        help="Set the deadline of requests that do not give one, in seconds (default is 5)."
+    )
+    parser.add_argument(
+        "--verbose",
+        action="store_true",
+        help="Flag to log the server's activity to the standard error."
+    )
+
+    args = parser.parse_args()
+    if args.verbose:
+        logging.basicConfig(level=logging.INFO)
+
+    async def serve():
+        async with MoveServer(workers=args.workers, queue_size=args.queue_size,
+                              default_deadline=args.deadline) as server:
+            if args.socket is None:
+                await server.serve_stdio()
+                return
+            listener = await server.serve_socket(args.socket)
+            async with listener:
+                await listener.serve_forever()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    run_server()
@@ -0,0 +1,290 @@
+# batch_solver.py
+
+import numpy as np
+
+# Payoff differences smaller than this are treated as ties by the closed-form solvers
+TIE_TOLERANCE = 1e-12
+
+# Number of games whose 2xn lower envelopes are evaluated at once, to bound temporary memory
+ENVELOPE_CHUNK = 4096
+
+# Reduced costs and pivot entries smaller than this are treated as zero by the batched simplex method
+SIMPLEX_TOLERANCE = 1e-12
+
+# After this many consecutive degenerate pivots a game switches to Bland's rule, which cannot cycle
+DEGENERATE_PIVOT_LIMIT = 20
+
+
+class BatchSolution:
+    """
+    The solutions of a batch of zero-sum matrix games of the same shape, one entry per game.
+    """
+
+    def __init__(self, player_1_strategies, player_2_strategies, lower_values, upper_values,
+                 values=None, row_strategies=None, column_strategies=None, exploitability=None):
+        """
+        Args:
+            player_1_strategies (numpy.ndarray): The maximin row of every game (first one in case of ties).
+            player_2_strategies (numpy.ndarray): The minimax column of every game (first one in case of ties).
+            lower_values (numpy.ndarray): The payoff Player 1 can guarantee with a pure strategy.
+            upper_values (numpy.ndarray): The payoff Player 2 can hold Player 1 to with a pure strategy.
+            values (numpy.ndarray, optional): The value of every game, if mixed equilibria were computed.
+            row_strategies (numpy.ndarray, optional): Player 1's optimal mixed strategies, one row per game.
+            column_strategies (numpy.ndarray, optional): Player 2's optimal mixed strategies, one row per game.
+            exploitability (numpy.ndarray, optional): The duality gap of every mixed equilibrium.
+        """
+        self.player_1_strategies = player_1_strategies
+        self.player_2_strategies = player_2_strategies
+        self.lower_values = lower_values
+        self.upper_values = upper_values
+        self.values = values
+        self.row_strategies = row_strategies
+        self.column_strategies = column_strategies
+        self.exploitability = exploitability
+
+    @property
+    def has_saddle_point(self):
+        """
+        numpy.ndarray: Whether each game has a pure-strategy equilibrium at
+        (player_1_strategies, player_2_strategies).
+        """
+        return self.lower_values == self.upper_values
+
+    def __len__(self):
+        return len(self.lower_values)
+
+
+def batch_exploitability(matrices, row_strategies, column_strategies):
+    """
+    Computes the duality gap of a batch of strategy pairs.
+
+    Args:
+        matrices (numpy.ndarray): The payoff matrices, of shape (games, rows, columns).
+        row_strategies (numpy.ndarray): Player 1's mixed strategies, of shape (games, rows).
+        column_strategies (numpy.ndarray): Player 2's mixed strategies, of shape (games, columns).
+
+    Returns:
+        numpy.ndarray: The gap of every game, zero at an exact equilibrium.
+    """
+    best_row = np.einsum('gij,gj->gi', matrices, column_strategies).max(axis=1)
+    best_column = np.einsum('gi,gij->gj', row_strategies, matrices).min(axis=1)
+    return best_row - best_column
+
+
+def _solve_two_by_two(matrices):
+    """
+    The closed-form equilibrium of 2x2 games without a saddle point.
+    """
+    a, b = matrices[:, 0, 0], matrices[:, 0, 1]
+    c, d = matrices[:, 1, 0], matrices[:, 1, 1]
+    denominator = a - b - c + d
+    p = (d - c) / denominator
+    q = (d - b) / denominator
+    values = (a * d - b * c) / denominator
+    return values, np.stack([p, 1 - p], axis=1), np.stack([q, 1 - q], axis=1)
+
+
+def _solve_two_rows(matrices):
+    """
+    The equilibrium of 2xn games without a saddle point.
+    Player 1 plays row 0 with probability p; each column is a line in p and Player 1 maximizes the lower
+    envelope of the lines. The maximum is at the crossing of a rising and a falling line, which Player 2
+    mixes so that Player 1 becomes indifferent between the rows.
+    """
+    games, _, columns = matrices.shape
+    top, bottom = matrices[:, 0, :], matrices[:, 1, :]
+    slopes = top - bottom
+
+    # Candidate p: the crossings of every pair of lines, clipped to [0, 1]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        crossings = (bottom[:, None, :] - bottom[:, :, None]) / (slopes[:, :, None] - slopes[:, None, :])
+    crossings = np.clip(np.nan_to_num(crossings, nan=0.0, posinf=0.0, neginf=0.0), 0.0, 1.0)
+    candidates = np.concatenate([crossings.reshape(games, -1), np.zeros((games, 1)), np.ones((games, 1))], axis=1)
+
+    best_p = np.empty(games)
+    values = np.empty(games)
+    for start in range(0, games, ENVELOPE_CHUNK):
+        chunk = slice(start, start + ENVELOPE_CHUNK)
+        envelope = (bottom[chunk, None, :] + candidates[chunk, :, None] * slopes[chunk, None, :]).min(axis=2)
+        best = envelope.argmax(axis=1)
+        best_p[chunk] = np.take_along_axis(candidates[chunk], best[:, None], axis=1)[:, 0]
+        values[chunk] = envelope[np.arange(envelope.shape[0]), best]
+
+    # Player 2 mixes the steepest rising and the steepest falling line through the optimum
+    active = np.abs(bottom + best_p[:, None] * slopes - values[:, None]) <= TIE_TOLERANCE * (1 + np.abs(values[:, None]))
+    rising = np.where(active, slopes, -np.inf).argmax(axis=1)
+    falling = np.where(active, slopes, np.inf).argmin(axis=1)
+    rising_slope = slopes[np.arange(games), rising]
+    falling_slope = slopes[np.arange(games), falling]
+    span = rising_slope - falling_slope
+    flat = span <= TIE_TOLERANCE
+    weight = np.where(flat, 1.0, -falling_slope / np.where(flat, 1.0, span))
+    column_strategies = np.zeros((games, columns))
+    column_strategies[np.arange(games), falling] += 1 - weight
+    column_strategies[np.arange(games), rising] += weight
+    return values, np.stack([best_p, 1 - best_p], axis=1), column_strategies
+
+
+def _solve_simplex(matrices):
+    """
+    Exact equilibria of a batch of games by the simplex method, run on all games in lockstep.
+    Every game has its own tableau (see `mixed_strategy_solver.simplex`); each step picks an entering
+    and a leaving variable per game and pivots all tableaus with one broadcast update. Games that are
+    already optimal are left unchanged by the update.
+    """
+    games, rows, columns = matrices.shape
+    shifts = 1.0 - matrices.min(axis=(1, 2))
+    tableaus = np.zeros((games, rows + 1, columns + rows + 1))
+    tableaus[:, :rows, :columns] = matrices + shifts[:, None, None]
+    tableaus[:, :rows, columns:columns + rows] = np.eye(rows)
+    tableaus[:, :rows, -1] = 1.0
+    tableaus[:, rows, :columns] = -1.0
+    basis = np.tile(np.arange(columns, columns + rows), (games, 1))
+    degenerate_pivots = np.zeros(games, dtype=int)
+    everything = np.arange(games)
+
+    while True:
+        costs = tableaus[:, rows, :-1]
+        negative = costs < -SIMPLEX_TOLERANCE
+        running = negative.any(axis=1)
+        if not running.any():
+            break
+        bland = degenerate_pivots >= DEGENERATE_PIVOT_LIMIT
+        entering = np.where(bland, negative.argmax(axis=1), costs.argmin(axis=1))
+
+        column = tableaus[everything, :rows, entering]
+        right_hand_side = tableaus[:, :rows, -1]
+        eligible = column > SIMPLEX_TOLERANCE
+        ratios = np.where(eligible, right_hand_side / np.where(eligible, column, 1.0), np.inf)
+        smallest = ratios.min(axis=1, keepdims=True)
+        # Bland's rule breaks ties in favour of the basic variable with the smallest index
+        tie_break = np.where(bland[:, None] & (ratios == smallest), basis, np.iinfo(basis.dtype).max)
+        leaving = np.where(bland, tie_break.argmin(axis=1), ratios.argmin(axis=1))
+        degenerate_pivots = np.where(smallest[:, 0] <= SIMPLEX_TOLERANCE, degenerate_pivots + 1, 0)
+
+        pivot_rows = tableaus[everything, leaving] / tableaus[everything, leaving, entering][:, None]
+        factors = tableaus[everything, :, entering]
+        factors[everything, leaving] = 0.0
+        factors[~running] = 0.0
+        tableaus -= factors[:, :, None] * pivot_rows[:, None, :]
+        tableaus[everything[running], leaving[running]] = pivot_rows[running]
+        basis[everything[running], leaving[running]] = entering[running]
+
+    totals = tableaus[:, rows, -1]
+    values = 1.0 / totals - shifts
+    column_strategies = np.zeros((games, columns + rows))
+    np.put_along_axis(column_strategies, basis, tableaus[:, :rows, -1], axis=1)
+    row_strategies = np.maximum(tableaus[:, rows, columns:columns + rows], 0.0)
+    return values, _normalized(row_strategies), _normalized(column_strategies[:, :columns])
+
+
+def _solve_regret_matching(matrices, epsilon, max_iterations, check_every=10):
+    """
+    Approximate equilibria of a batch of games by alternating regret matching+, vectorized over the batch.
+    Games stop being updated once their averaged strategies are within `epsilon` of an equilibrium.
+    """
+    games, rows, columns = matrices.shape
+    row_regrets = np.zeros((games, rows))
+    column_regrets = np.zeros((games, columns))
+    row_strategy = np.full((games, rows), 1.0 / rows)
+    column_strategy = np.full((games, columns), 1.0 / columns)
+    row_average = np.zeros((games, rows))
+    column_average = np.zeros((games, columns))
+    running = np.arange(games)
+    for iteration in range(1, max_iterations + 1):
+        payoffs = matrices[running]
+        row_payoffs = np.einsum('gij,gj->gi', payoffs, column_strategy[running])
+        expected = np.einsum('gi,gi->g', row_strategy[running], row_payoffs)
+        regrets = np.maximum(row_regrets[running] + row_payoffs - expected[:, None], 0.0)
+        row_regrets[running] = regrets
+        totals = regrets.sum(axis=1, keepdims=True)
+        row_strategy[running] = np.where(totals > 0, regrets / np.where(totals > 0, totals, 1.0), 1.0 / rows)
+
+        column_losses = np.einsum('gi,gij->gj', row_strategy[running], payoffs)
+        expected = np.einsum('gj,gj->g', column_strategy[running], column_losses)
+        regrets = np.maximum(column_regrets[running] + expected[:, None] - column_losses, 0.0)
+        column_regrets[running] = regrets
+        totals = regrets.sum(axis=1, keepdims=True)
+        column_strategy[running] = np.where(totals > 0, regrets / np.where(totals > 0, totals, 1.0), 1.0 / columns)
+
+        row_average[running] += iteration * row_strategy[running]
+        column_average[running] += iteration * column_strategy[running]
+        if iteration % check_every == 0:
+            gap = batch_exploitability(payoffs, _normalized(row_average[running]), _normalized(column_average[running]))
+            running = running[gap > epsilon]
+            if len(running) == 0:
+                break
+    row_average = _normalized(row_average)
+    column_average = _normalized(column_average)
+    values = np.einsum('gi,gij,gj->g', row_average, matrices, column_average)
+    return values, row_average, column_average
+
+
+def _normalized(weights):
+    return weights / weights.sum(axis=1, keepdims=True)
+
+
+def solve_batch(matrices, mixed=False, method="exact", epsilon=1e-4, max_iterations=10000):
+    """
+    Solves a batch of zero-sum matrix games of the same shape in one vectorized pass, instead of
+    building a `Game` and a `MinimaxAlgorithm` for each of them.
+    Pure-strategy maximin/minimax strategies and saddle points are always computed. With `mixed`,
+    the value and optimal mixed strategies are computed as well: games with a saddle point use it,
+    2x2 games a closed form, 2xn and nx2 games the lower envelope of the column lines, and larger
+    games a simplex method run on the whole batch in lockstep (or, for large games where an
+    approximation is enough, vectorized regret matching+ to within `epsilon`).
+
+    Args:
+        matrices (array-like): The payoff matrices for Player 1, of shape (games, rows, columns).
+        mixed (bool, optional): Whether to compute mixed equilibria. Defaults to False.
+        method (str, optional): "exact" or "regret_matching", for games larger than 2xn. Defaults to "exact".
+        epsilon (float, optional): The target exploitability of regret matching. Defaults to 1e-4.
+        max_iterations (int, optional): The iteration limit of regret matching. Defaults to 10000.
+
+    Returns:
+        BatchSolution: The solutions of all games.
+    """
+    matrices = np.asarray(matrices)
+    if matrices.ndim != 3:
+        raise ValueError(f"Expected a stack of payoff matrices of shape (games, rows, columns), got {matrices.shape}")
+    row_minima = matrices.min(axis=2)
+    column_maxima = matrices.max(axis=1)
+    player_1_strategies = row_minima.argmax(axis=1)
+    player_2_strategies = column_maxima.argmin(axis=1)
+    games = np.arange(len(matrices))
+    solution = BatchSolution(player_1_strategies, player_2_strategies,
+                             row_minima[games, player_1_strategies], column_maxima[games, player_2_strategies])
+    if not mixed:
+        return solution
+
+    matrices = matrices.astype(float, copy=False)
+    _, rows, columns = matrices.shape
+    values = solution.lower_values.astype(float)
+    row_strategies = np.zeros((len(matrices), rows))
+    column_strategies = np.zeros((len(matrices), columns))
+    row_strategies[games, player_1_strategies] = 1.0
+    column_strategies[games, player_2_strategies] = 1.0
+
+    unsolved = np.flatnonzero(~solution.has_saddle_point)
+    if len(unsolved):
+        if rows == 2 and columns == 2:
+            results = _solve_two_by_two(matrices[unsolved])
+        elif rows == 2:
+            results = _solve_two_rows(matrices[unsolved])
+        elif columns == 2:
+            # Seen from Player 2, an nx2 game is a 2xn game with negated, transposed payoffs
+            value, column_part, row_part = _solve_two_rows(-matrices[unsolved].transpose(0, 2, 1))
+            results = -value, row_part, column_part
+        elif method == "exact":
+            results = _solve_simplex(matrices[unsolved])
+        elif method == "regret_matching":
+            results = _solve_regret_matching(matrices[unsolved], epsilon, max_iterations)
+        else:
+            raise ValueError(f"Unknown solution method: {method!r}")
+        values[unsolved], row_strategies[unsolved], column_strategies[unsolved] = results
+
+    solution.values = values
+    solution.row_strategies = row_strategies
+    solution.column_strategies = column_strategies
+    solution.exploitability = batch_exploitability(matrices, row_strategies, column_strategies)
+    return solution
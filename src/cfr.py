@@ -0,0 +1,620 @@
+# cfr.py
+
+import logging
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from minimax_algorithm import GameState
+
+logger = logging.getLogger(__name__)
+
+# Node kinds of a compiled game tree
+TERMINAL = 0
+CHANCE = 1
+DECISION = 2
+
+ALGORITHMS = ("cfr", "cfr+", "outcome_sampling", "external_sampling")
+
+CHECKPOINT_VERSION = 1
+
+# The compiled game tree of each worker process, set up by `_initialize_worker`
+_worker_tree = None
+
+
+class InformationSetState(GameState):
+    """
+    A `GameState` of a two-player zero-sum game with hidden information and chance events, as needed by
+    `CFRSolver`. Chance events are the chance states of `GameState` (`is_chance` and `chance_outcomes`). On top of
+    them, a state tells which information set the player to move is in: the states that player cannot
+    tell apart, which must all have the same moves. `evaluate` is only called on terminal states and returns
+    the payoff of player 1, and `current_player` (1 or 2) is only read on decision states.
+    """
+
+    def information_set(self):
+        """
+        Identify what the player to move knows.
+        Should be implemented in the subclass.
+
+        Returns:
+            hashable: The same key for all the states the player to move cannot distinguish.
+        """
+        raise NotImplementedError
+
+
+class GameTree:
+    """
+    The game tree of an `InformationSetState` game, compiled once into flat lists so that solver iterations
+    walk node indices instead of creating states. Nodes are numbered breadth-first and the children of a node
+    are consecutive. The actions of every information set are numbered consecutively from its offset, which
+    is how the solver's flat regret and strategy tables are indexed.
+    """
+
+    def __init__(self, root):
+        """
+        Compiles the whole tree below a state.
+
+        Args:
+            root (InformationSetState): The initial state of the game.
+
+        Raises:
+            ValueError: If the states of an information set do not share their player and moves.
+        """
+        self.kinds = []
+        self.players = []  # 0 for player 1 and 1 for player 2, at decision nodes
+        self.first_child = []
+        self.child_count = []
+        self.probabilities = [1.0]  # The chance probability of every node given its parent
+        self.utilities = []  # The payoff of player 1 at terminal nodes
+        self.offsets = []  # The table offset of the information set of decision nodes
+        self.information_sets = []
+        self.moves = []  # The moves of every information set
+        self.information_set_players = []
+        self.information_set_nodes = []
+        self.information_set_offsets = []
+        self.identifiers = {}
+        self.actions = 0
+        states = [root]
+        index = 0
+        while index < len(states):
+            state = states[index]
+            states[index] = None
+            kind, player, offset, utility, children = TERMINAL, -1, -1, 0.0, []
+            if state.is_terminal():
+                utility = float(state.evaluate())
+            elif state.is_chance():
+                kind = CHANCE
+                for move, probability in state.chance_outcomes():
+                    children.append(state.make_move(move))
+                    self.probabilities.append(float(probability))
+            else:
+                kind = DECISION
+                player = state.current_player - 1
+                moves = list(state.get_possible_moves())
+                offset = self._information_set(state.information_set(), player, moves, index)
+                children = [state.make_move(move) for move in moves]
+                self.probabilities.extend([1.0] * len(children))
+            self.kinds.append(kind)
+            self.players.append(player)
+            self.first_child.append(len(states))
+            self.child_count.append(len(children))
+            self.utilities.append(utility)
+            self.offsets.append(offset)
+            states.extend(children)
+            index += 1
+        self.sizes = np.array([len(moves) for moves in self.moves], dtype=np.int64)
+        self.information_set_offsets = np.array(self.information_set_offsets, dtype=np.int64)
+
+    def _information_set(self, key, player, moves, node):
+        identifier = self.identifiers.get(key)
+        if identifier is None:
+            identifier = self.identifiers[key] = len(self.information_sets)
+            self.information_sets.append(key)
+            self.moves.append(moves)
+            self.information_set_players.append(player)
+            self.information_set_nodes.append([])
+            self.information_set_offsets.append(self.actions)
+            self.actions += len(moves)
+        elif self.moves[identifier] != moves or self.information_set_players[identifier] != player:
+            raise ValueError(f"The states of information set {key!r} differ in their player or moves")
+        self.information_set_nodes[identifier].append(node)
+        return self.information_set_offsets[identifier]
+
+    def __len__(self):
+        return len(self.kinds)
+
+
+def regret_matching(tree, regrets):
+    """
+    The strategy of every information set in proportion to its positive regrets, uniform where none is positive.
+
+    Args:
+        tree (GameTree): The game.
+        regrets (numpy.ndarray): The cumulative regret of every action.
+
+    Returns:
+        numpy.ndarray: The probability of every action.
+    """
+    return _normalize(tree, np.maximum(regrets, 0.0))
+
+
+def _normalize(tree, weights):
+    if not tree.actions:
+        return weights.copy()
+    totals = np.repeat(np.add.reduceat(weights, tree.information_set_offsets), tree.sizes)
+    uniform = np.repeat(1.0 / tree.sizes, tree.sizes)
+    return np.where(totals > 0, weights / np.where(totals > 0, totals, 1.0), uniform)
+
+
+def _cfr(tree, strategy, player, node, reach_player, reach_others, regrets, strategy_sum):
+    """
+    One vanilla CFR traversal below a node for `player`, adding the counterfactual regrets and the
+    reach-weighted strategies of the player's information sets to the tables. Returns the value of the node.
+    """
+    kind = tree.kinds[node]
+    if kind == TERMINAL:
+        return tree.utilities[node] if player == 0 else -tree.utilities[node]
+    first = tree.first_child[node]
+    count = tree.child_count[node]
+    value = 0.0
+    if kind == CHANCE:
+        for child in range(first, first + count):
+            probability = tree.probabilities[child]
+            value += probability * _cfr(tree, strategy, player, child, reach_player, reach_others * probability,
+                                        regrets, strategy_sum)
+        return value
+    offset = tree.offsets[node]
+    if tree.players[node] != player:
+        for action in range(count):
+            probability = strategy[offset + action]
+            # Actions the opponent never plays contribute nothing
+            if probability > 0.0:
+                value += probability * _cfr(tree, strategy, player, first + action, reach_player,
+                                            reach_others * probability, regrets, strategy_sum)
+        return value
+    values = []
+    for action in range(count):
+        probability = strategy[offset + action]
+        child_value = _cfr(tree, strategy, player, first + action, reach_player * probability, reach_others,
+                           regrets, strategy_sum)
+        values.append(child_value)
+        value += probability * child_value
+    for action in range(count):
+        regrets[offset + action] += reach_others * (values[action] - value)
+        strategy_sum[offset + action] += reach_player * strategy[offset + action]
+    return value
+
+
+def _sample(rng, probabilities):
+    threshold = rng.random()
+    total = 0.0
+    for index, probability in enumerate(probabilities):
+        total += probability
+        if threshold < total:
+            return index
+    return len(probabilities) - 1
+
+
+def _outcome_sampling(tree, strategy, player, node, reach_player, reach_others, sample, rng, exploration,
+                      regrets, strategy_sum):
+    """
+    One Monte Carlo outcome sampling traversal: a single path is sampled, with exploration at the player's
+    nodes, and the sampled regrets are importance-weighted by the probability of the path.
+    Returns the weighted utility of the sampled terminal node and the player's probability of reaching
+    it from this node.
+    """
+    kind = tree.kinds[node]
+    if kind == TERMINAL:
+        utility = tree.utilities[node] if player == 0 else -tree.utilities[node]
+        return utility / sample, 1.0
+    first = tree.first_child[node]
+    count = tree.child_count[node]
+    if kind == CHANCE:
+        # Chance is sampled on-policy, so its probability cancels out of the weights
+        child = first + _sample(rng, tree.probabilities[first:first + count])
+        return _outcome_sampling(tree, strategy, player, child, reach_player, reach_others, sample, rng,
+                                 exploration, regrets, strategy_sum)
+    offset = tree.offsets[node]
+    probabilities = strategy[offset:offset + count]
+    if tree.players[node] == player:
+        sampling = [exploration / count + (1.0 - exploration) * probability for probability in probabilities]
+        action = _sample(rng, sampling)
+        probability = probabilities[action]
+        utility, tail = _outcome_sampling(tree, strategy, player, first + action, reach_player * probability,
+                                          reach_others, sample * sampling[action], rng, exploration,
+                                          regrets, strategy_sum)
+        weight = utility * reach_others
+        for other in range(count):
+            if other == action:
+                regrets[offset + other] += weight * tail * (1.0 - probability)
+            else:
+                regrets[offset + other] -= weight * tail * probability
+        return utility, tail * probability
+    action = _sample(rng, probabilities)
+    probability = probabilities[action]
+    utility, tail = _outcome_sampling(tree, strategy, player, first + action, reach_player,
+                                      reach_others * probability, sample * probability, rng, exploration,
+                                      regrets, strategy_sum)
+    # The opponent's average strategy, weighted by the inverse probability of sampling this node
+    for other in range(count):
+        strategy_sum[offset + other] += reach_others / sample * probabilities[other]
+    return utility, tail * probability
+
+
+def _external_sampling(tree, strategy, player, node, rng, regrets, strategy_sum):
+    """
+    One Monte Carlo external sampling traversal: every action of the player is explored, while chance and
+    opponent actions are sampled. Returns the sampled value of the node for the player.
+    """
+    kind = tree.kinds[node]
+    if kind == TERMINAL:
+        return tree.utilities[node] if player == 0 else -tree.utilities[node]
+    first = tree.first_child[node]
+    count = tree.child_count[node]
+    if kind == CHANCE:
+        child = first + _sample(rng, tree.probabilities[first:first + count])
+        return _external_sampling(tree, strategy, player, child, rng, regrets, strategy_sum)
+    offset = tree.offsets[node]
+    probabilities = strategy[offset:offset + count]
+    if tree.players[node] != player:
+        for other in range(count):
+            strategy_sum[offset + other] += probabilities[other]
+        action = _sample(rng, probabilities)
+        return _external_sampling(tree, strategy, player, first + action, rng, regrets, strategy_sum)
+    values = [_external_sampling(tree, strategy, player, first + action, rng, regrets, strategy_sum)
+              for action in range(count)]
+    value = sum(probability * child_value for probability, child_value in zip(probabilities, values))
+    for action in range(count):
+        regrets[offset + action] += values[action] - value
+    return value
+
+
+def traverse(tree, algorithm, strategy, player, task, exploration=0.6):
+    """
+    Runs one unit of an iteration and returns its updates, so that units can run in any process and
+    their updates be added up in a fixed order.
+
+    Args:
+        tree (GameTree): The game.
+        algorithm (str): One of `ALGORITHMS`.
+        strategy (list of float): The current strategy of every action.
+        player (int): The player whose regrets are updated (0 or 1).
+        task (tuple): (node, chance reach) of a subtree for "cfr" and "cfr+", or a seed for the sampling variants.
+        exploration (float, optional): The exploration of outcome sampling. Defaults to 0.6.
+
+    Returns:
+        list of float: The regret update of every action.
+        list of float: The strategy sum update of every action.
+    """
+    regrets = [0.0] * tree.actions
+    strategy_sum = [0.0] * tree.actions
+    if algorithm in ("cfr", "cfr+"):
+        node, reach = task
+        _cfr(tree, strategy, player, node, 1.0, reach, regrets, strategy_sum)
+    elif algorithm == "outcome_sampling":
+        _outcome_sampling(tree, strategy, player, 0, 1.0, 1.0, 1.0, random.Random(task), exploration,
+                          regrets, strategy_sum)
+    else:
+        _external_sampling(tree, strategy, player, 0, random.Random(task), regrets, strategy_sum)
+    return regrets, strategy_sum
+
+
+def _initialize_worker(tree):
+    global _worker_tree
+    logging.disable(logging.INFO)
+    _worker_tree = tree
+
+
+def _traverse_in_worker(algorithm, strategy, player, task, exploration):
+    return traverse(_worker_tree, algorithm, strategy, player, task, exploration)
+
+
+def best_response_value(tree, strategy, player):
+    """
+    The value for `player` of the best response to the opponent's strategy. The best action of every
+    information set maximizes the value summed over its states, weighted by the probability that the
+    opponent and chance reach each of them.
+
+    Args:
+        tree (GameTree): The game.
+        strategy (list of float): The strategy of every action (only the opponent's are used).
+        player (int): The responding player (0 or 1).
+
+    Returns:
+        float: The expected payoff of the best response.
+    """
+    # Nodes are numbered breadth-first, so every parent comes before its children
+    reach = [0.0] * len(tree)
+    reach[0] = 1.0
+    for node in range(len(tree)):
+        first = tree.first_child[node]
+        for action in range(tree.child_count[node]):
+            child = first + action
+            if tree.kinds[node] == CHANCE:
+                reach[child] = reach[node] * tree.probabilities[child]
+            elif tree.players[node] != player:
+                reach[child] = reach[node] * strategy[tree.offsets[node] + action]
+            else:
+                reach[child] = reach[node]
+    values = {}
+    best_actions = {}
+
+    def value(node):
+        if node in values:
+            return values[node]
+        kind = tree.kinds[node]
+        first = tree.first_child[node]
+        count = tree.child_count[node]
+        if kind == TERMINAL:
+            result = tree.utilities[node] if player == 0 else -tree.utilities[node]
+        elif kind == CHANCE:
+            result = sum(tree.probabilities[child] * value(child) for child in range(first, first + count))
+        elif tree.players[node] != player:
+            offset = tree.offsets[node]
+            result = sum(strategy[offset + action] * value(first + action) for action in range(count))
+        else:
+            result = value(first + best_action(tree.offsets[node], node))
+        values[node] = result
+        return result
+
+    def best_action(offset, node):
+        if offset not in best_actions:
+            identifier = int(np.searchsorted(tree.information_set_offsets, offset))
+            totals = [0.0] * tree.child_count[node]
+            for member in tree.information_set_nodes[identifier]:
+                first = tree.first_child[member]
+                for action in range(len(totals)):
+                    totals[action] += reach[member] * value(first + action)
+            best_actions[offset] = totals.index(max(totals))
+        return best_actions[offset]
+
+    return value(0)
+
+
+class CFRSolver:
+    """
+    Solves two-player zero-sum games with hidden information by counterfactual regret minimization.
+    The game tree is compiled once (see `GameTree`), and the cumulative regrets and strategies are kept
+    in flat NumPy arrays indexed by information set offset. The average strategy converges to a Nash
+    equilibrium, and `exploitability` measures how far it still is from one.
+
+    Algorithms:
+    - "cfr": vanilla CFR, with regret matching and alternating updates.
+    - "cfr+": CFR+, which floors cumulative regrets at zero and weights the average strategy linearly
+      by iteration; usually much faster to converge.
+    - "outcome_sampling": Monte Carlo CFR sampling a single path per traversal, with exploration.
+    - "external_sampling": Monte Carlo CFR sampling chance and opponent actions and exploring all of
+      the player's own.
+
+    An iteration updates each player in turn. For "cfr" and "cfr+", a traversal is split into the subtrees
+    of the root's chance outcomes; the sampling variants run `batch_size` traversals per player against the
+    same strategy. These units run in a pool of worker processes when `workers` is above 1, and their updates
+    are added up in a fixed order, so the tables are the same whatever the number of workers.
+    """
+
+    def __init__(self, root, algorithm="cfr+", workers=1, batch_size=1, exploration=0.6, seed=0):
+        """
+        Compiles the game and initializes empty tables. The worker processes are started on the first iteration.
+
+        Args:
+            root (InformationSetState): The initial state of the game.
+            algorithm (str, optional): One of "cfr", "cfr+", "outcome_sampling" and "external_sampling".
+                                       Defaults to "cfr+".
+            workers (int, optional): The number of worker processes; 1 iterates in this process. Defaults to 1.
+            batch_size (int, optional): The sampled traversals per player and iteration. Defaults to 1.
+            exploration (float, optional): The probability of exploring a uniformly random action in outcome
+                                           sampling. Defaults to 0.6.
+            seed (int, optional): The seed of the sampling variants. Defaults to 0.
+        """
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"Unknown CFR algorithm: {algorithm!r}")
+        self.tree = GameTree(root)
+        self.algorithm = algorithm
+        self.workers = workers
+        self.batch_size = batch_size
+        self.exploration = exploration
+        self.seed = seed
+        self.iteration = 0
+        self.regrets = np.zeros(self.tree.actions)
+        self.strategy_sum = np.zeros(self.tree.actions)
+        self.history = []  # (iteration, exploitability, elapsed seconds) at every report
+        self.elapsed = 0.0
+        self._executor = None
+
+    def _pool(self):
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(self.workers, initializer=_initialize_worker,
+                                                 initargs=(self.tree,))
+        return self._executor
+
+    def _tasks(self, player):
+        if self.algorithm in ("cfr", "cfr+"):
+            tree = self.tree
+            if tree.kinds[0] != CHANCE:
+                return [(0, 1.0)]
+            first = tree.first_child[0]
+            return [(child, tree.probabilities[child]) for child in range(first, first + tree.child_count[0])]
+        return [random.Random(f"{self.seed}:{self.iteration}:{player}:{index}").getrandbits(63)
+                for index in range(self.batch_size)]
+
+    def _update(self, player):
+        strategy = regret_matching(self.tree, self.regrets).tolist()
+        tasks = self._tasks(player)
+        if self.workers == 1:
+            results = [traverse(self.tree, self.algorithm, strategy, player, task, self.exploration)
+                       for task in tasks]
+        else:
+            chunk_size = max(1, len(tasks) // (4 * self.workers))
+            results = self._pool().map(_traverse_in_worker, [self.algorithm] * len(tasks),
+                                       [strategy] * len(tasks), [player] * len(tasks), tasks,
+                                       [self.exploration] * len(tasks), chunksize=chunk_size)
+        regret_update = np.zeros(self.tree.actions)
+        strategy_update = np.zeros(self.tree.actions)
+        for regrets, strategy_sum in results:
+            regret_update += regrets
+            strategy_update += strategy_sum
+        self.regrets += regret_update
+        if self.algorithm == "cfr+":
+            np.maximum(self.regrets, 0.0, out=self.regrets)
+            # Linear averaging: later, better strategies weigh more
+            strategy_update *= self.iteration
+        self.strategy_sum += strategy_update
+
+    def iterate(self):
+        """
+        Runs one iteration: updates the regrets and average strategy of player 1, then of player 2.
+        """
+        self.iteration += 1
+        for player in (0, 1):
+            self._update(player)
+
+    def solve(self, iterations, report_every=None, progress=None, checkpoint_path=None, checkpoint_every=None):
+        """
+        Runs iterations, measuring the exploitability of the average strategy as it goes.
+
+        Args:
+            iterations (int): The number of iterations to run.
+            report_every (int, optional): Measures the exploitability every this many iterations, in `history`,
+                                          the `progress` callback and the module logger. Defaults to None,
+                                          which only measures it at the end.
+            progress (callable, optional): Called with (iteration, exploitability) at every report. Defaults to None.
+            checkpoint_path (str, optional): A file the solver is saved to every `checkpoint_every` iterations and
+                                             at the end. Defaults to None.
+            checkpoint_every (int, optional): The iterations between checkpoints. Defaults to None (only at the end).
+
+        Returns:
+            float: The exploitability of the average strategy after the iterations.
+        """
+        start = time.perf_counter()
+        elapsed = self.elapsed
+        last = self.iteration + iterations
+        while self.iteration < last:
+            self.iterate()
+            self.elapsed = elapsed + time.perf_counter() - start
+            if self.iteration == last or (report_every and self.iteration % report_every == 0):
+                self._report(progress)
+            if checkpoint_path is not None and (
+                    self.iteration == last or (checkpoint_every and self.iteration % checkpoint_every == 0)):
+                self.save(checkpoint_path)
+        if not self.history or self.history[-1][0] != self.iteration:
+            self._report(progress)
+        return self.history[-1][1]
+
+    def _report(self, progress):
+        exploitability = self.exploitability()
+        self.history.append((self.iteration, exploitability, self.elapsed))
+        logger.debug("Iteration %d: exploitability %.6f, %.3fs", self.iteration, exploitability, self.elapsed)
+        if progress is not None:
+            progress(self.iteration, exploitability)
+
+    def current_strategy(self):
+        """
+        Returns:
+            numpy.ndarray: The strategy of the last iteration, by regret matching, for every action.
+        """
+        return regret_matching(self.tree, self.regrets)
+
+    def average_strategy(self):
+        """
+        Returns:
+            numpy.ndarray: The average strategy over the iterations, for every action; it is the one that
+                           converges to an equilibrium. Information sets never reached are uniform.
+        """
+        return _normalize(self.tree, self.strategy_sum)
+
+    def strategy(self, information_set):
+        """
+        Args:
+            information_set (hashable): The key of an information set.
+
+        Returns:
+            dict: The probability of every move of the information set in the average strategy.
+        """
+        identifier = self.tree.identifiers[information_set]
+        offset = self.tree.information_set_offsets[identifier]
+        probabilities = self.average_strategy()[offset:offset + self.tree.sizes[identifier]]
+        return dict(zip(self.tree.moves[identifier], probabilities.tolist()))
+
+    def exploitability(self):
+        """
+        Returns:
+            float: How much a best-responding opponent gains against the average strategy, averaged over the two
+                   players: 0 exactly at a Nash equilibrium.
+        """
+        strategy = self.average_strategy().tolist()
+        return (best_response_value(self.tree, strategy, 0) + best_response_value(self.tree, strategy, 1)) / 2
+
+    def game_value(self):
+        """
+        Returns:
+            float: The expected payoff of player 1 when both players play the average strategy.
+        """
+        strategy = self.average_strategy().tolist()
+        tree = self.tree
+
+        def value(node):
+            first = tree.first_child[node]
+            count = tree.child_count[node]
+            if tree.kinds[node] == TERMINAL:
+                return tree.utilities[node]
+            if tree.kinds[node] == CHANCE:
+                return sum(tree.probabilities[child] * value(child) for child in range(first, first + count))
+            offset = tree.offsets[node]
+            return sum(strategy[offset + action] * value(first + action) for action in range(count))
+
+        return value(0)
+
+    def save(self, path):
+        """
+        Saves the tables and progress to a NumPy archive, replacing the file only once it is complete.
+
+        Args:
+            path (str): The checkpoint file, conventionally ending in ".npz".
+        """
+        temporary = path + ".tmp.npz"
+        np.savez(temporary, version=CHECKPOINT_VERSION, algorithm=self.algorithm, iteration=self.iteration,
+                 elapsed=self.elapsed, regrets=self.regrets, strategy_sum=self.strategy_sum,
+                 history=np.array(self.history, dtype=np.float64).reshape(-1, 3),
+                 sizes=self.tree.sizes)
+        os.replace(temporary, path)
+
+    def load(self, path):
+        """
+        Restores the tables and progress saved by `save`, to continue solving where it stopped.
+
+        Args:
+            path (str): The checkpoint file.
+
+        Raises:
+            ValueError: If the checkpoint was made with another algorithm or for another game.
+        """
+        with np.load(path) as checkpoint:
+            if int(checkpoint["version"]) != CHECKPOINT_VERSION:
+                raise ValueError(f"{path} is not a version {CHECKPOINT_VERSION} checkpoint")
+            if str(checkpoint["algorithm"]) != self.algorithm:
+                raise ValueError(f"{path} was made by {checkpoint['algorithm']}, not {self.algorithm}")
+            if not np.array_equal(checkpoint["sizes"], self.tree.sizes):
+                raise ValueError(f"{path} was made for another game")
+            self.iteration = int(checkpoint["iteration"])
+            self.elapsed = float(checkpoint["elapsed"])
+            self.regrets = checkpoint["regrets"].copy()
+            self.strategy_sum = checkpoint["strategy_sum"].copy()
+            self.history = [(int(iteration), exploitability, elapsed)
+                            for iteration, exploitability, elapsed in checkpoint["history"].tolist()]
+
+    def close(self):
+        """
+        Stops the worker processes.
+        """
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,209 @@
+# dataset.py
+
+import csv
+import struct
+
+import numpy as np
+
+# Cell values of the CSV layout (as in data/dataset.csv) and their 2-bit codes
+CELL_CODES = {"b": 0, "x": 1, "o": 2}
+CELL_VALUES = ("b", "x", "o")
+
+MAGIC = b"GTPD"
+VERSION = 1
+HEADER = struct.Struct("<4sHHQ")  # Magic, version, cells per record, number of records
+RECORD_DTYPE = np.dtype("<u4")
+MAX_CELLS = 15  # 2 bits per cell and the label bit must fit in a record
+
+DEFAULT_CHUNK_ROWS = 1 << 16
+
+
+def encode(boards, labels):
+    """
+    Packs positions into records: cell i takes bits 2i and 2i + 1, and the label takes the bit after the last cell.
+
+    Args:
+        boards (array-like): The cell codes (0 blank, 1 x, 2 o), one row per position.
+        labels (array-like): The label of every position.
+
+    Returns:
+        numpy.ndarray: The records, as little-endian 32-bit unsigned integers.
+    """
+    boards = np.asarray(boards, dtype=np.uint32)
+    if boards.ndim != 2 or boards.shape[1] > MAX_CELLS:
+        raise ValueError(f"Boards must be a 2D array of at most {MAX_CELLS} cells per row")
+    cells = boards.shape[1]
+    shifts = 2 * np.arange(cells, dtype=np.uint32)
+    records = np.bitwise_or.reduce(boards << shifts, axis=1) if cells else np.zeros(len(boards), np.uint32)
+    records |= np.asarray(labels, dtype=np.uint32) << np.uint32(2 * cells)
+    return records.astype(RECORD_DTYPE, copy=False)
+
+
+def decode(records, cells):
+    """
+    Unpacks records into boards and labels, for all records at once.
+
+    Args:
+        records (numpy.ndarray): The records.
+        cells (int): The number of cells per record.
+
+    Returns:
+        numpy.ndarray: The cell codes (0 blank, 1 x, 2 o), as an array of shape (records, cells) of uint8.
+        numpy.ndarray: The labels, as booleans.
+    """
+    records = np.asarray(records, dtype=np.uint32)
+    shifts = 2 * np.arange(cells, dtype=np.uint32)
+    boards = ((records[:, None] >> shifts) & np.uint32(3)).astype(np.uint8)
+    labels = (records >> np.uint32(2 * cells) & np.uint32(1)).astype(bool)
+    return boards, labels
+
+
+def _encode_rows(rows, cells):
+    table = np.asarray(rows, dtype=str)
+    if table.ndim != 2 or table.shape[1] != cells + 1:
+        raise ValueError(f"Every row must have {cells} cells and a label")
+    values = table[:, :cells]
+    boards = np.zeros(values.shape, dtype=np.uint32)
+    known = np.zeros(values.shape, dtype=bool)
+    for value, code in CELL_CODES.items():
+        matches = values == value
+        boards[matches] = code
+        known |= matches
+    if not known.all():
+        raise ValueError(f"Unknown cell value {values[~known][0]!r}, expected one of {sorted(CELL_CODES)}")
+    labels = table[:, cells]
+    positive = labels == "true"
+    unknown = ~positive & (labels != "false")
+    if unknown.any():
+        raise ValueError(f"Unknown label {labels[unknown][0]!r}, expected true or false")
+    return encode(boards, positive)
+
+
+def convert_csv(csv_path, output_path, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """
+    Converts a CSV file of positions (one column per cell with values x, o or b, then a true/false label,
+    with a header row) into the packed binary format. The CSV file is read and written a chunk of rows
+    at a time, so files of any size can be converted.
+
+    Args:
+        csv_path (str): The CSV file.
+        output_path (str): The binary file to write.
+        chunk_rows (int, optional): The number of rows encoded at a time. Defaults to 65536.
+
+    Returns:
+        int: The number of records written.
+    """
+    with open(csv_path, newline="") as source, open(output_path, "wb") as output:
+        reader = csv.reader(source)
+        header = next(reader)
+        cells = len(header) - 1
+        if not 0 < cells <= MAX_CELLS:
+            raise ValueError(f"Expected between 1 and {MAX_CELLS} cell columns, found {cells}")
+        output.write(HEADER.pack(MAGIC, VERSION, cells, 0))
+        count = 0
+        chunk = []
+        for row in reader:
+            chunk.append(row)
+            if len(chunk) == chunk_rows:
+                output.write(_encode_rows(chunk, cells).tobytes())
+                count += len(chunk)
+                chunk = []
+        if chunk:
+            output.write(_encode_rows(chunk, cells).tobytes())
+            count += len(chunk)
+        # The count is only known at the end
+        output.seek(0)
+        output.write(HEADER.pack(MAGIC, VERSION, cells, count))
+    return count
+
+
+def write_dataset(path, boards, labels):
+    """
+    Writes positions to a file in the packed binary format.
+
+    Args:
+        path (str): The file to write.
+        boards (array-like): The cell codes (0 blank, 1 x, 2 o), one row per position.
+        labels (array-like): The label of every position.
+    """
+    records = encode(boards, labels)
+    with open(path, "wb") as output:
+        output.write(HEADER.pack(MAGIC, VERSION, np.shape(boards)[1], len(records)))
+        output.write(records.tobytes())
+
+
+class PositionDataset:
+    """
+    A file of positions in the packed binary format, read through a memory map: opening it costs nothing,
+    records are only read from disk when used, and processes reading the same file share its pages.
+    """
+
+    def __init__(self, path):
+        """
+        Opens a dataset.
+
+        Args:
+            path (str): The binary file, as written by `convert_csv` or `write_dataset`.
+        """
+        with open(path, "rb") as file:
+            header = file.read(HEADER.size)
+        if len(header) != HEADER.size:
+            raise ValueError(f"{path} is not a position dataset")
+        magic, version, cells, count = HEADER.unpack(header)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} position dataset")
+        self.path = path
+        self.cells = cells
+        if count:
+            self.records = np.memmap(path, dtype=RECORD_DTYPE, mode="r", offset=HEADER.size, shape=(count,))
+        else:
+            self.records = np.zeros(0, dtype=RECORD_DTYPE)
+
+    def __len__(self):
+        return len(self.records)
+
+    def __getitem__(self, index):
+        """
+        Args:
+            index (int or slice): The positions to decode.
+
+        Returns:
+            numpy.ndarray: The cell codes of the positions (a single row for an integer index).
+            numpy.ndarray or bool: Their labels.
+        """
+        if isinstance(index, slice):
+            return decode(self.records[index], self.cells)
+        boards, labels = decode(np.atleast_1d(self.records[index]), self.cells)
+        return boards[0], bool(labels[0])
+
+    @property
+    def labels(self):
+        """
+        numpy.ndarray: The labels of all positions, as booleans.
+        """
+        return (self.records >> np.uint32(2 * self.cells) & np.uint32(1)).astype(bool)
+
+    def iter_chunks(self, chunk_size=DEFAULT_CHUNK_ROWS):
+        """
+        Decodes the positions a chunk at a time, so that only one chunk is in memory at once.
+
+        Args:
+            chunk_size (int, optional): The number of positions per chunk. Defaults to 65536.
+
+        Yields:
+            numpy.ndarray: The cell codes of the positions of the chunk.
+            numpy.ndarray: Their labels.
+        """
+        for start in range(0, len(self.records), chunk_size):
+            yield decode(self.records[start:start + chunk_size], self.cells)
+
+    def rows(self):
+        """
+        Yields the positions in the CSV layout, to convert a dataset back.
+
+        Yields:
+            list of str: The cell values followed by the label.
+        """
+        for boards, labels in self.iter_chunks():
+            for board, label in zip(boards.tolist(), labels.tolist()):
+                yield [CELL_VALUES[code] for code in board] + ["true" if label else "false"]
@@ -0,0 +1,185 @@
+# dominance.py
+
+import time
+
+import numpy as np
+
+from mixed_strategy_solver import payoff_array, simplex
+
+# Pairwise payoff comparisons made at once by the vectorized dominance test, to bound temporary memory
+DOMINANCE_CHUNK = 1 << 22
+
+# Strategies tested together against the undominated ones found so far
+DOMINANCE_BLOCK = 64
+
+# Mixed dominance margins below this fraction of the largest payoff are treated as zero
+MIXED_DOMINANCE_TOLERANCE = 1e-9
+
+
+class Reduction:
+    """
+    A payoff matrix after iterated elimination of dominated strategies, with the original index of every
+    remaining row and column, so that strategies of the reduced game map back to the original one.
+    """
+
+    def __init__(self, matrix, rows, columns, original_shape, rounds, elapsed):
+        """
+        Args:
+            matrix (numpy.ndarray): The reduced payoff matrix for Player 1.
+            rows (numpy.ndarray): The original index of every remaining row.
+            columns (numpy.ndarray): The original index of every remaining column.
+            original_shape (tuple): The shape of the original matrix.
+            rounds (int): The number of elimination rounds that removed strategies.
+            elapsed (float): The time taken by the elimination, in seconds.
+        """
+        self.matrix = matrix
+        self.rows = rows
+        self.columns = columns
+        self.original_shape = original_shape
+        self.rounds = rounds
+        self.elapsed = elapsed
+
+    @property
+    def shape(self):
+        """
+        tuple: The shape of the reduced matrix.
+        """
+        return self.matrix.shape
+
+    def shrinkage(self):
+        """
+        Returns:
+            float: The fraction of the cells of the original matrix that were eliminated.
+        """
+        cells = self.original_shape[0] * self.original_shape[1]
+        return 1.0 - self.matrix.size / cells if cells else 0.0
+
+    def expand(self, row_strategy, column_strategy):
+        """
+        Maps strategies of the reduced game back to the original one, where eliminated strategies get probability 0.
+
+        Args:
+            row_strategy (numpy.ndarray): Player 1's mixed strategy in the reduced game.
+            column_strategy (numpy.ndarray): Player 2's mixed strategy in the reduced game.
+
+        Returns:
+            numpy.ndarray: Player 1's strategy in the original game.
+            numpy.ndarray: Player 2's strategy in the original game.
+        """
+        full_row_strategy = np.zeros(self.original_shape[0])
+        full_row_strategy[self.rows] = row_strategy
+        full_column_strategy = np.zeros(self.original_shape[1])
+        full_column_strategy[self.columns] = column_strategy
+        return full_row_strategy, full_column_strategy
+
+    def __repr__(self):
+        return (f"Reduction({self.original_shape[0]}x{self.original_shape[1]} -> {self.shape[0]}x{self.shape[1]}, "
+                f"{self.shrinkage():.0%} of cells eliminated in {self.rounds} rounds, {self.elapsed:.3f}s)")
+
+
+def _dominates(dominators, candidates, weak):
+    # Whether each candidate row is dominated by one of the dominator rows: paid at least as much against
+    # every column, and more against all of them (strict dominance) or against one of them (weak dominance)
+    if not len(dominators):
+        return np.zeros(len(candidates), dtype=bool)
+    dominators = dominators[None, :, :]
+    candidates = candidates[:, None, :]
+    if weak:
+        return ((dominators >= candidates).all(axis=2) & (dominators > candidates).any(axis=2)).any(axis=1)
+    return (dominators > candidates).all(axis=2).any(axis=1)
+
+
+def _dominated_rows(matrix, weak):
+    # A dominating row has a larger sum, so rows are taken by decreasing sum and only compared with the rows
+    # found undominated so far (and those of their own block): by transitivity, a row dominated by any row is
+    # dominated by one of them. Games where most strategies are dominated need far fewer comparisons than
+    # all the pairs.
+    rows, columns = matrix.shape
+    order = np.argsort(-matrix.sum(axis=1), kind="stable")
+    dominated = np.zeros(rows, dtype=bool)
+    undominated = matrix[:0]
+    for start in range(0, rows, DOMINANCE_BLOCK):
+        indices = order[start:start + DOMINANCE_BLOCK]
+        block = matrix[indices]
+        beaten = _dominates(block, block, weak)
+        chunk = max(1, DOMINANCE_CHUNK // (len(block) * columns))
+        for first in range(0, len(undominated), chunk):
+            beaten |= _dominates(undominated[first:first + chunk], block, weak)
+        dominated[indices[beaten]] = True
+        undominated = np.concatenate([undominated, block[~beaten]])
+    if weak:
+        # Of identical rows, only the first one is kept
+        _, first = np.unique(matrix, axis=0, return_index=True)
+        duplicate = np.ones(rows, dtype=bool)
+        duplicate[first] = False
+        dominated |= duplicate
+    return dominated
+
+
+def _mixed_dominated_row(matrix, row, tolerance):
+    # Row `row` is strictly dominated by a mixture of the other rows exactly when the game whose payoffs are
+    # the other rows' gains over it has a positive value: some mixture then gains against every column
+    others = np.delete(matrix, row, axis=0)
+    value, _, _, _ = simplex(others - matrix[row])
+    return value > tolerance
+
+
+def eliminate_dominated(matrix, weak=False, mixed=False):
+    """
+    Removes dominated strategies of both players, round after round, until none are left, as a preprocessing
+    stage before solving a game: every equilibrium of the reduced game is an equilibrium of the original
+    one (once mapped back with `Reduction.expand`), with the same value.
+    Each round tests the rows, then the columns, in vectorized passes that compare every strategy with the
+    undominated ones only, which is quick when most strategies are dominated. Strict
+    dominance keeps every equilibrium of the game. Weak dominance (and the removal of duplicate strategies
+    it implies) shrinks more but may lose some equilibria, never all of them. With `mixed`, strategies
+    strictly dominated only by a mixture of other strategies are removed as well, once pure dominance
+    removes nothing more; each test solves a linear program, so on games with few dominated strategies it can
+    cost far more than solving the game.
+
+    Args:
+        matrix (Game or array-like): A game, or its payoff matrix for Player 1.
+        weak (bool, optional): Whether to remove weakly dominated strategies too. Defaults to False.
+        mixed (bool, optional): Whether to remove strategies strictly dominated by mixed strategies. Defaults to False.
+
+    Returns:
+        Reduction: The reduced matrix and the original indices of its rows and columns.
+    """
+    start = time.perf_counter()
+    matrix = payoff_array(matrix)
+    if matrix.ndim != 2 or not matrix.size:
+        raise ValueError(f"Expected a non-empty 2D payoff matrix, got shape {matrix.shape}")
+    tolerance = MIXED_DOMINANCE_TOLERANCE * max(1.0, float(np.abs(matrix).max()))
+    reduced = matrix
+    rows = np.arange(matrix.shape[0])
+    columns = np.arange(matrix.shape[1])
+    rounds = 0
+    while True:
+        # Player 2 minimizes Player 1's payoffs, so its dominated strategies are the dominated rows of -matrix.T
+        keep_rows = ~_dominated_rows(reduced, weak)
+        reduced, rows = reduced[keep_rows], rows[keep_rows]
+        keep_columns = ~_dominated_rows(-reduced.T, weak)
+        reduced, columns = reduced[:, keep_columns], columns[keep_columns]
+        removed = not keep_rows.all() or not keep_columns.all()
+        if not removed and mixed:
+            # With two strategies left, a mixture of the others is the other one, already tested
+            for player in (1, 2):
+                view = reduced if player == 1 else -reduced.T
+                if len(view) < 3:
+                    continue
+                # A strategy best against some column cannot be beaten there by any mixture
+                candidates = np.flatnonzero(~(view == view.max(axis=0)).any(axis=1))
+                for index in candidates.tolist():
+                    if _mixed_dominated_row(view, index, tolerance):
+                        if player == 1:
+                            reduced, rows = np.delete(reduced, index, axis=0), np.delete(rows, index)
+                        else:
+                            reduced, columns = np.delete(reduced, index, axis=1), np.delete(columns, index)
+                        removed = True
+                        break
+                if removed:
+                    break
+        if not removed:
+            break
+        rounds += 1
+    return Reduction(reduced, rows, columns, matrix.shape, rounds, time.perf_counter() - start)
@@ -0,0 +1,229 @@
+# evaluation_cache.py
+
+from collections import OrderedDict
+from multiprocessing import shared_memory
+
+from transposition_table import MASK_64
+
+# Slots per bucket of the shared cache, among which CLOCK chooses the one to evict
+WAYS = 4
+
+
+class EvaluationCache:
+    """
+    A bounded cache of `GameState.evaluate` results, keyed by `hash_key`, for evaluation functions
+    expensive enough that looking a score up is cheaper than computing it again. The same leaves come
+    back across siblings (transpositions), iterations of iterative deepening and games played by the
+    same player. The least recently used entry is evicted when the cache is full.
+    Passed as `evaluation_cache` to `MinimaxAlgorithm`, it serves every leaf of the search; states
+    without a hash are always evaluated.
+    """
+
+    def __init__(self, size=1 << 16):
+        """
+        Creates an empty cache.
+
+        Args:
+            size (int, optional): The number of scores kept. Defaults to 65536.
+        """
+        self.size = size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._scores = OrderedDict()
+
+    def evaluate(self, state):
+        """
+        Args:
+            state (GameState): The position to evaluate.
+
+        Returns:
+            float: The score of `state.evaluate()`, from the cache if the position is in it.
+        """
+        key = state.hash_key()
+        if key is None:
+            return state.evaluate()
+        score = self.probe(key)
+        if score is None:
+            score = state.evaluate()
+            self.store(key, score)
+        return score
+
+    def probe(self, key):
+        """
+        Args:
+            key (int): The hash of a position.
+
+        Returns:
+            float: The cached score of the position, or None if it is not cached.
+        """
+        score = self._scores.get(key)
+        if score is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._scores.move_to_end(key)
+        return score
+
+    def store(self, key, score):
+        """
+        Caches the score of a position, evicting the least recently used one if the cache is full.
+
+        Args:
+            key (int): The hash of the position.
+            score (float): Its score.
+        """
+        self._scores[key] = score
+        self._scores.move_to_end(key)
+        if len(self._scores) > self.size:
+            self._scores.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        """
+        Removes every score and resets the counters.
+        """
+        self._scores.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def hit_rate(self):
+        """
+        Returns:
+            float: The fraction of probes that found their position.
+        """
+        probes = self.hits + self.misses
+        return self.hits / probes if probes else 0.0
+
+    def __len__(self):
+        return len(self._scores)
+
+
+class SharedEvaluationCache(EvaluationCache):
+    """
+    An `EvaluationCache` kept in shared memory, so that worker processes (e.g. of a tournament or a
+    parallel search) reuse each other's evaluations. Positions are hashed to buckets of `WAYS` slots,
+    and a full bucket evicts with the CLOCK algorithm: every hit sets the reference bit of its slot,
+    and the bucket's hand skips (and clears) referenced slots to evict the first one not used since
+    its last pass, an approximation of LRU that needs no shared ordering.
+
+    As in `SharedTranspositionTable`, entries are written without locks and carry a check word (the XOR
+    of the key with the other words), so an entry torn by concurrent writers is a miss. Scores are stored
+    as floats, and the counters are kept per process.
+
+    The cache is pickled by name, so it can be passed to worker processes, which attach to the same memory.
+    The process that created it must call `close` to free the memory.
+    """
+
+    def __init__(self, size=1 << 16, name=None):
+        """
+        Creates an empty cache, or attaches to an existing one.
+
+        Args:
+            size (int, optional): The number of scores kept, rounded up to a multiple of `WAYS`. Defaults to 65536.
+            name (str, optional): The name of the shared memory of an existing cache. Defaults to None,
+                                  which creates a new cache.
+        """
+        self.buckets = max(1, -(-size // WAYS))
+        self.size = self.buckets * WAYS
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._owner = name is None
+        # Three words per slot (check, score, used), then a reference byte per slot and a hand per bucket
+        self._bytes = self.size * 3 * 8 + self.size + self.buckets
+        self._memory = shared_memory.SharedMemory(name=name, create=self._owner, size=self._bytes)
+        self._attach()
+        if self._owner:
+            self._memory.buf[:self._bytes] = bytes(self._bytes)
+
+    def _attach(self):
+        words = self.size * 3 * 8
+        self._words = self._memory.buf[:words].cast('Q')
+        self._scores = self._memory.buf[:words].cast('d')
+        self._references = self._memory.buf[words:words + self.size]
+        self._hands = self._memory.buf[words + self.size:self._bytes]
+
+    @property
+    def name(self):
+        """
+        str: The name of the shared memory, to attach to the cache from another process.
+        """
+        return self._memory.name
+
+    def _find(self, key, first):
+        words = self._words
+        for slot in range(first, first + WAYS):
+            base = 3 * slot
+            used = words[base + 2]
+            if used and words[base] ^ words[base + 1] ^ used == key:
+                return slot
+        return None
+
+    def probe(self, key):
+        key &= MASK_64
+        slot = self._find(key, key % self.buckets * WAYS)
+        if slot is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._references[slot] = 1
+        return self._scores[3 * slot + 1]
+
+    def store(self, key, score):
+        key &= MASK_64
+        bucket = key % self.buckets
+        first = bucket * WAYS
+        words = self._words
+        slot = self._find(key, first)
+        if slot is None:
+            slot = next((slot for slot in range(first, first + WAYS) if not words[3 * slot + 2]), None)
+        if slot is None:
+            # CLOCK: referenced slots get a second chance, so the hand stops within two turns of the bucket
+            hand = self._hands[bucket]
+            while self._references[first + hand]:
+                self._references[first + hand] = 0
+                hand = (hand + 1) % WAYS
+            slot = first + hand
+            self._hands[bucket] = (hand + 1) % WAYS
+            self.evictions += 1
+        base = 3 * slot
+        # The check word is written last, so the entry only matches its key once it is complete
+        words[base + 2] = 0
+        self._scores[base + 1] = score
+        words[base + 2] = 1
+        words[base] = key ^ words[base + 1] ^ 1
+        self._references[slot] = 0
+
+    def clear(self):
+        """
+        Removes every score (for all the processes sharing the cache) and resets the counters of this process.
+        """
+        self._memory.buf[:self._bytes] = bytes(self._bytes)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        words = self._words
+        return sum(1 for slot in range(self.size) if words[3 * slot + 2])
+
+    def close(self):
+        """
+        Detaches from the shared memory, and frees it if this process created the cache.
+        """
+        if self._memory is None:
+            return
+        for view in (self._words, self._scores, self._references, self._hands):
+            view.release()
+        self._memory.close()
+        if self._owner:
+            self._memory.unlink()
+        self._memory = None
+
+    def __getstate__(self):
+        return {"size": self.size, "name": self.name}
+
+    def __setstate__(self, state):
+        self.__init__(state["size"], state["name"])
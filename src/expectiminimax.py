@@ -0,0 +1,230 @@
+# expectiminimax.py
+
+import math
+import random
+from collections import Counter
+
+from minimax_algorithm import MinimaxAlgorithm
+
+PRUNING = (None, "star1", "star2")
+
+
+def sample_size(error_bound, confidence, bounds):
+    """
+    The number of chance outcomes to sample so that their average is within `error_bound` of the exact
+    expectation with probability `confidence`, by Hoeffding's inequality for values within `bounds`.
+
+    Args:
+        error_bound (float): The largest acceptable error, in payoff units.
+        confidence (float): The probability that the error stays within the bound, in (0, 1).
+        bounds (tuple): The lowest and highest values of the game.
+
+    Returns:
+        int: The number of samples.
+    """
+    if error_bound <= 0 or not 0 < confidence < 1:
+        raise ValueError(f"Invalid error bound {error_bound} or confidence {confidence}")
+    lower, upper = bounds
+    return max(1, math.ceil((upper - lower) ** 2 * math.log(2 / (1 - confidence)) / (2 * error_bound ** 2)))
+
+
+class ExpectiminimaxAlgorithm(MinimaxAlgorithm):
+    """
+    Alpha-beta search of games with chance states (`GameState.is_chance`), whose score is the expected score
+    of their outcomes. Chance states take one ply of the search depth like any other move, and the line of
+    play in `principal_variation` stops at the first one.
+
+    Expanding every outcome of every chance state multiplies the tree by the number of outcomes at each of
+    them, and an expectation cannot be cut off by plain alpha-beta. Knowing the lowest and highest scores of
+    the game, Star1 narrows the window of each outcome to the scores that can still move the expectation out
+    of the parent's window, and stops as soon as the outcomes searched so far decide it. Star2 first probes
+    one move of every outcome, which bounds each of their scores from one side, and cuts the chance state
+    off from the probes alone when they suffice. Both return the same scores as a full-width search.
+
+    With an `error_bound`, chance states with more outcomes than `sample_size` are scored from that many
+    outcomes drawn at random instead, which is no longer exact but keeps the error of each expectation
+    within the bound with the given confidence.
+
+    Decision states are searched as by `MinimaxAlgorithm.alpha_beta`, with all its options, and `alpha_beta`,
+    `search` and `iterative_deepening` handle chance states. The recursive `minimax` does not.
+    """
+
+    def __init__(self, game, bounds=None, pruning="star2", error_bound=None, confidence=0.95, seed=None, **options):
+        """
+        Initializes the search.
+
+        Args:
+            game (Game): An instance of the Game class that represents the zero-sum game.
+            bounds (tuple, optional): The lowest and highest scores `evaluate` can return, needed by pruning and
+                                      sampling. The tighter they are, the more Star1 and Star2 prune.
+                                      Defaults to None.
+            pruning (str, optional): "star1", "star2", or None to search every outcome of chance states with a
+                                     full window. Defaults to "star2".
+            error_bound (float, optional): If given, chance states are sampled so that each expectation is off
+                                           by at most this much. Defaults to None (exact expectations).
+            confidence (float, optional): The probability that a sampled expectation is within `error_bound`.
+                                          Defaults to 0.95.
+            seed (int, optional): The seed of the sampling. Defaults to None.
+            **options: The other options of `MinimaxAlgorithm`.
+        """
+        if pruning not in PRUNING:
+            raise ValueError(f"Unknown pruning {pruning!r}, expected one of {PRUNING}")
+        if bounds is None and (pruning is not None or error_bound is not None):
+            raise ValueError("Star pruning and chance sampling need the bounds of the scores")
+        super().__init__(game, **options)
+        self.bounds = bounds
+        self.pruning = pruning
+        self.error_bound = error_bound
+        self.confidence = confidence
+        self.samples = sample_size(error_bound, confidence, bounds) if error_bound is not None else None
+        self.random = random.Random(seed)
+
+    def _alpha_beta(self, state, depth, alpha, beta, maximizing_player, ply):
+        """
+        The recursive part of `alpha_beta`, which scores chance states by the expectation of their outcomes.
+        """
+        if depth == 0 or not state.is_chance():
+            return super()._alpha_beta(state, depth, alpha, beta, maximizing_player, ply)
+        self._count_node(ply)
+        self._pv[ply] = []
+        outcomes = self._outcomes(state)
+        if self.pruning is None:
+            score = 0.0
+            for move, probability in outcomes:
+                score += probability * self._search_child(state, move, depth, float('-inf'), float('inf'),
+                                                          maximizing_player, ply, False)
+            return score, None
+        return self._star(state, outcomes, depth, alpha, beta, maximizing_player, ply), None
+
+    def _count_node(self, ply):
+        self.nodes_searched += 1
+        if self.nodes_searched >= self._next_check:
+            self._check_budget()
+        if self._stats is not None:
+            self._stats.nodes_per_ply[ply] += 1
+
+    def _outcomes(self, state):
+        """
+        The outcomes of a chance state, sampled if it has too many, most likely first so that Star1 gets
+        tight bounds early.
+        """
+        outcomes = state.chance_outcomes()
+        if self.samples is not None and self.samples < len(outcomes):
+            # Outcomes are drawn by index, as moves need not be hashable
+            counts = Counter(self.random.choices(range(len(outcomes)), [probability for _, probability in outcomes],
+                                                 k=self.samples))
+            outcomes = [(outcomes[index][0], count / self.samples) for index, count in counts.items()]
+        return sorted(outcomes, key=lambda outcome: -outcome[1])
+
+    def _star(self, state, outcomes, depth, alpha, beta, maximizing_player, ply):
+        """
+        Scores a chance state with Star1 pruning, after a Star2 probing phase if enabled. Fail-soft: a score
+        at or below alpha is an upper bound and a score at or above beta a lower bound of the expectation.
+        """
+        lower, upper = self.bounds
+        lower_bounds = [lower] * len(outcomes)
+        upper_bounds = [upper] * len(outcomes)
+        # Probes bound the outcomes from one side only, so they cannot cut off a window open on that side
+        if self.pruning == "star2" and depth > 1 and not math.isinf(beta if maximizing_player else alpha):
+            score = self._probe(state, outcomes, depth, alpha, beta, maximizing_player, ply, lower_bounds,
+                                upper_bounds)
+            if score is not None:
+                return score
+        searched = 0.0
+        rest_lower = sum(probability * bound for (_, probability), bound in zip(outcomes, lower_bounds))
+        rest_upper = sum(probability * bound for (_, probability), bound in zip(outcomes, upper_bounds))
+        for index, (move, probability) in enumerate(outcomes):
+            rest_lower -= probability * lower_bounds[index]
+            rest_upper -= probability * upper_bounds[index]
+            # Cutoffs are decided on the bounds of the expectation itself rather than on the scaled windows,
+            # which rounding can leave empty or inverted when the parent's window is a null window
+            lowest = searched + probability * lower_bounds[index] + rest_lower
+            if lowest >= beta:
+                return self._chance_cutoff(lowest)
+            highest = searched + probability * upper_bounds[index] + rest_upper
+            if highest <= alpha:
+                return self._chance_cutoff(highest)
+            # The outcome's scores that decide the expectation whatever the outcomes after it score
+            child_alpha = max((alpha - searched - rest_upper) / probability, lower)
+            child_beta = min((beta - searched - rest_lower) / probability, upper)
+            if child_alpha >= child_beta:
+                child_alpha, child_beta = lower, upper
+            score = self._search_child(state, move, depth, child_alpha, child_beta, maximizing_player, ply, False)
+            if lower < child_alpha and score <= child_alpha:
+                # An upper bound of the outcome's score
+                highest = searched + probability * score + rest_upper
+                if highest <= alpha:
+                    return self._chance_cutoff(highest)
+                score = self._search_child(state, move, depth, lower, upper, maximizing_player, ply, False)
+            elif child_beta < upper and score >= child_beta:
+                # A lower bound of the outcome's score
+                lowest = searched + probability * score + rest_lower
+                if lowest >= beta:
+                    return self._chance_cutoff(lowest)
+                score = self._search_child(state, move, depth, lower, upper, maximizing_player, ply, False)
+            searched += probability * score
+        return searched
+
+    def _probe(self, state, outcomes, depth, alpha, beta, maximizing_player, ply, lower_bounds, upper_bounds):
+        """
+        The Star2 probing phase: searches one move of every outcome. The outcomes are decision states of the
+        player to move, so a probe is a lower bound of the outcome's score if that player maximizes and an
+        upper bound otherwise, whatever window it was searched with. The bounds are tightened in place for the
+        Star1 phase, and the fail-soft bound of the expectation is returned if the probes alone cut the chance
+        state off.
+        """
+        lower, upper = self.bounds
+        probed = 0.0
+        rest = sum(probability for _, probability in outcomes)
+        for index, (move, probability) in enumerate(outcomes):
+            rest -= probability
+            if maximizing_player:
+                child_beta = min((beta - probed - rest * lower) / probability, upper)
+                score = self._probe_child(state, move, depth, lower, child_beta, maximizing_player, ply)
+                if score is not None:
+                    lower_bounds[index] = max(lower, score)
+                lowest = probed + probability * lower_bounds[index] + rest * lower
+                if lowest >= beta:
+                    return self._chance_cutoff(lowest)
+                probed += probability * lower_bounds[index]
+            else:
+                child_alpha = max((alpha - probed - rest * upper) / probability, lower)
+                score = self._probe_child(state, move, depth, child_alpha, upper, maximizing_player, ply)
+                if score is not None:
+                    upper_bounds[index] = min(upper, score)
+                highest = probed + probability * upper_bounds[index] + rest * upper
+                if highest <= alpha:
+                    return self._chance_cutoff(highest)
+                probed += probability * upper_bounds[index]
+        return None
+
+    def _probe_child(self, state, move, depth, alpha, beta, maximizing_player, ply):
+        """
+        Searches the first move of the decision state reached by a chance move, or returns None if that state
+        is not a decision state.
+        """
+        if alpha >= beta:
+            return None
+        if self._in_place:
+            state.apply_move(move)
+            child = state
+        else:
+            child = state.make_move(move)
+        self._path.append(move)
+        try:
+            if child.is_terminal() or child.is_chance():
+                return None
+            self._count_node(ply + 1)
+            moves = child.get_possible_moves()
+            for orderer in reversed(self.move_ordering):
+                moves = orderer.order(moves, ply + 1, self._path)
+            return self._search_child(child, moves[0], depth - 1, alpha, beta, not maximizing_player, ply + 1, False)
+        finally:
+            if self._in_place:
+                state.undo_move(move)
+            self._path.pop()
+
+    def _chance_cutoff(self, score):
+        if self._stats is not None:
+            self._stats.cutoffs += 1
+        return score
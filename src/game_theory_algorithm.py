@@ -1,5 +1,12 @@
 # game_theory_algorithm.py
 
+import os
+
+import numpy as np
+
+from dominance import eliminate_dominated
+from mixed_strategy_solver import MixedStrategySolution, MixedStrategySolver, exploitability
+
 class Game:
     """
     A base class representing a generic two-player zero-sum game.
@@ -9,19 +16,27 @@ class Game:
         """
         Initializes the game with the given payoff matrix.
         This matrix represents the payoffs for player 1.
+        The payoffs are held as a 2D NumPy array. Arrays are used as they are, without copying,
+        and `.npy` files are memory-mapped read-only, so matrices larger than memory can be used.
         
         Args:
-            matrix (list of list): A 2D list representing the payoff matrix for player 1.
-                                   Player 2's payoffs are the negative of these values (zero-sum).
+            matrix (list of list, numpy.ndarray or str): A 2D list or array representing the payoff matrix for player 1,
+                                                         or the path of a `.npy` file holding it.
+                                                         Player 2's payoffs are the negative of these values (zero-sum).
         """
-        self.matrix = matrix
-        self.rows = len(matrix)    # Number of strategies for Player 1
-        self.columns = len(matrix[0])  # Number of strategies for Player 2
+        if isinstance(matrix, (str, os.PathLike)):
+            self.matrix = np.load(matrix, mmap_mode="r")
+        else:
+            self.matrix = np.asarray(matrix)
+        if self.matrix.ndim != 2:
+            raise ValueError(f"The payoff matrix must be 2D, got shape {self.matrix.shape}")
+        self.rows, self.columns = self.matrix.shape  # Number of strategies for Player 1 and Player 2
 
     def get_payoff(self, row, column):
         """
         Returns the payoff for player 1 given the row (strategy for player 1)
         and column (strategy for player 2) selected.
+        Reading the matrix one cell at a time is slow; the solvers work on whole rows and columns of `matrix`.
         
         Args:
             row (int): The row index representing Player 1's strategy.
@@ -30,7 +45,7 @@ class Game:
         Returns:
             float: The payoff for player 1.
         """
-        return self.matrix[row][column]
+        return self.matrix[row, column].item()
 
     def get_opponent_payoff(self, row, column):
         """
@@ -45,6 +60,37 @@ class Game:
         """
         return -self.get_payoff(row, column)
 
+    def row_minima(self):
+        """
+        Returns the worst payoff of each of Player 1's strategies.
+        
+        Returns:
+            numpy.ndarray: The minimum of every row.
+        """
+        return self.matrix.min(axis=1)
+
+    def column_maxima(self):
+        """
+        Returns the worst payoff (for Player 2) of each of Player 2's strategies.
+        
+        Returns:
+            numpy.ndarray: The maximum of every column.
+        """
+        return self.matrix.max(axis=0)
+
+    def eliminate_dominated(self, weak=False, mixed=False):
+        """
+        Removes dominated strategies of both players until none are left (see `dominance.eliminate_dominated`).
+        
+        Args:
+            weak (bool, optional): Whether to remove weakly dominated strategies too. Defaults to False.
+            mixed (bool, optional): Whether to remove strategies strictly dominated by mixed strategies. Defaults to False.
+        
+        Returns:
+            Reduction: The reduced matrix and the original indices of its rows and columns.
+        """
+        return eliminate_dominated(self.matrix, weak, mixed)
+
 
 class MinimaxAlgorithm:
     """
@@ -71,25 +117,76 @@ class MinimaxAlgorithm:
         # Player 1's optimal strategy is to minimize the maximum of the payoffs (maximize their own outcome)
         # Player 2's optimal strategy is to maximize the minimum of the payoffs (minimize Player 1's outcome)
         
-        # Calculate the minimax strategy for Player 1 (Row Player)
-        row_optimal_strategy = []
-        for row in range(self.game.rows):
-            row_payoffs = [self.game.get_payoff(row, col) for col in range(self.game.columns)]
-            row_optimal_strategy.append(min(row_payoffs))
+        # Nash equilibrium: Player 1 chooses the row with the highest minimal payoff,
+        # Player 2 chooses the column with the lowest maximal payoff (the first one in case of ties)
+        player_1_strategy = int(np.argmax(self.game.row_minima()))
+        player_2_strategy = int(np.argmin(self.game.column_maxima()))
         
-        # Calculate the minimax strategy for Player 2 (Column Player)
-        column_optimal_strategy = []
-        for col in range(self.game.columns):
-            col_payoffs = [self.game.get_payoff(row, col) for row in range(self.game.rows)]
-            column_optimal_strategy.append(max(col_payoffs))
+        return player_1_strategy, player_2_strategy
+
+    def saddle_point(self):
+        """
+        Finds a pure-strategy equilibrium: a cell that is the minimum of its row and the maximum of its column.
+        It exists exactly when the best row minimum equals the best column maximum.
+        
+        Returns:
+            tuple: The row and column of the saddle point, or None if the game has none.
+        """
+        row_minima = self.game.row_minima()
+        column_maxima = self.game.column_maxima()
+        row = int(np.argmax(row_minima))
+        column = int(np.argmin(column_maxima))
+        if row_minima[row] != column_maxima[column]:
+            return None
+        return row, column
+
+    def best_response(self, strategy, player=1):
+        """
+        Finds the pure strategy that answers the opponent's (pure or mixed) strategy best.
         
-        # Now, we calculate the Nash equilibrium by finding the optimal strategy pair
-        # Nash equilibrium: Player 1 chooses the row with the highest minimal payoff
-        # Player 2 chooses the column with the lowest maximal payoff
-        player_1_strategy = row_optimal_strategy.index(max(row_optimal_strategy))
-        player_2_strategy = column_optimal_strategy.index(min(column_optimal_strategy))
+        Args:
+            strategy (int or array-like): The opponent's strategy: an index, or a probability for each of their strategies.
+            player (int, optional): The player who responds, 1 (rows) or 2 (columns). Defaults to 1.
         
-        return player_1_strategy, player_2_strategy
+        Returns:
+            int: The index of the best response (the first one in case of ties).
+        """
+        matrix = self.game.matrix
+        if player == 1:
+            payoffs = matrix[:, strategy] if np.ndim(strategy) == 0 else matrix @ np.asarray(strategy)
+            return int(np.argmax(payoffs))
+        payoffs = matrix[strategy] if np.ndim(strategy) == 0 else np.asarray(strategy) @ matrix
+        return int(np.argmin(payoffs))
+
+    def mixed_strategies(self, method="exact", epsilon=1e-4, dominance=None, mixed_dominance=False):
+        """
+        Finds the value of the game and the optimal mixed strategies of both players.
+        Unlike `minimax`, this is correct for games without a saddle point.
+        Solving costs more than linearly in the size of the matrix, so dominated strategies can be eliminated
+        first: the smaller game is solved and its strategies are mapped back to the original one.
+        
+        Args:
+            method (str, optional): "exact", "regret_matching" or "multiplicative_weights". Defaults to "exact".
+            epsilon (float, optional): The target exploitability of the approximate methods. Defaults to 1e-4.
+            dominance (str, optional): "strict" or "weak" to eliminate strictly or weakly dominated strategies
+                                       before solving. Defaults to None (no elimination).
+            mixed_dominance (bool, optional): Whether the elimination also removes strategies strictly dominated
+                                              by mixed strategies. Defaults to False.
+        
+        Returns:
+            MixedStrategySolution: The value and the optimal mixed strategies, with the elimination in `reduction`.
+        """
+        if dominance is None:
+            return MixedStrategySolver(self.game).solve(method, epsilon)
+        if dominance not in ("strict", "weak"):
+            raise ValueError(f"Unknown dominance: {dominance!r}")
+        reduction = self.game.eliminate_dominated(dominance == "weak", mixed_dominance)
+        solution = MixedStrategySolver(reduction.matrix).solve(method, epsilon)
+        row_strategy, column_strategy = reduction.expand(solution.row_strategy, solution.column_strategy)
+        matrix = np.asarray(self.game.matrix, dtype=float)
+        return MixedStrategySolution(solution.value, row_strategy, column_strategy,
+                                     exploitability(matrix, row_strategy, column_strategy), solution.iterations,
+                                     reduction)
 
     def get_payoff_for_strategies(self, player_1_strategy, player_2_strategy):
         """
@@ -0,0 +1,124 @@
+# game_tree.py
+
+from collections import OrderedDict
+
+from minimax_algorithm import Node
+
+
+class BoundedNode(Node):
+    """
+    A node of a `BoundedGameTree`. It behaves like `Node`, so `MinimaxAlgorithm.minimax` can search it,
+    but its children may be released by the tree at any time.
+    """
+
+    __slots__ = ("tree",)
+
+    def __init__(self, state, tree, parent=None, move=None):
+        """
+        Initializes the node.
+
+        Args:
+            state (GameState): The current state of the game.
+            tree (BoundedGameTree): The tree the node belongs to.
+            parent (BoundedNode, optional): The parent node. Defaults to None.
+            move (optional): The move that leads from the parent node to this node. Defaults to None.
+        """
+        super().__init__(state, parent=parent, move=move)
+        self.tree = tree
+
+    def get_children(self):
+        """
+        Generate and return all possible child nodes from the current state.
+        Children are cached until the tree needs the memory back.
+
+        Returns:
+            list of BoundedNode: The list of child nodes.
+        """
+        if self.children:
+            self.tree._touch(self)
+            return self.children
+        return self.tree._expand(self)
+
+
+class BoundedGameTree:
+    """
+    A game tree that holds at most a fixed number of nodes.
+    When an expansion goes over the cap, the children of the least recently used nodes are released
+    (together with everything below them) until the tree is back to `release_fraction` of the cap.
+    Only subtrees off the principal variation are released: the nodes on the path being searched are
+    kept, and a node that is the best child found so far of its parent is kept for as long as its parent
+    is, so the chain of best moves from the root (and from every node still in the tree) survives the search.
+    """
+
+    def __init__(self, state, max_nodes=100000, release_fraction=0.75):
+        """
+        Initializes the tree with its root.
+
+        Args:
+            state (GameState): The state at the root of the tree.
+            max_nodes (int, optional): The maximum number of nodes kept in the tree. Defaults to 100000.
+            release_fraction (float, optional): The fraction of `max_nodes` the tree shrinks to when it
+                                                goes over the cap. Defaults to 0.75.
+        """
+        self.root = BoundedNode(state, self)
+        self.max_nodes = max_nodes
+        self.release_fraction = release_fraction
+        self.node_count = 1
+        self.released_nodes = 0
+        self._expanded = OrderedDict()
+
+    def principal_variation(self):
+        """
+        Returns:
+            list of BoundedNode: The nodes along the chain of best moves from the root, starting with the root.
+        """
+        nodes = [self.root]
+        node = self.root
+        while node.children and node.best_move() is not None:
+            node = next((child for child in node.children if child.move == node.best_move()), None)
+            if node is None:
+                break
+            nodes.append(node)
+        return nodes
+
+    def _touch(self, node):
+        self._expanded.move_to_end(node)
+
+    def _expand(self, node):
+        state = node.state
+        children = [BoundedNode(state.make_move(move), self, node, move) for move in state.get_possible_moves()]
+        if not children:
+            return children
+        node.children = children
+        self._expanded[node] = None
+        self.node_count += len(children)
+        if self.node_count > self.max_nodes:
+            self._release_least_recently_used(node)
+        return children
+
+    def _release_least_recently_used(self, current):
+        protected = set(self.principal_variation())
+        # The nodes being searched are the most recently expanded node and its ancestors
+        node = current
+        while node is not None:
+            protected.add(node)
+            node = node.parent
+        # Release the bulk of the tree at once so the principal variation is not walked on every expansion
+        target = self.max_nodes * self.release_fraction
+        for node in list(self._expanded):
+            if self.node_count <= target:
+                break
+            if node not in self._expanded or node in protected:
+                continue
+            if node.parent is not None and node.parent.best_move() == node.move:
+                continue
+            self._release(node)
+
+    def _release(self, node):
+        for child in node.children:
+            if child in self._expanded:
+                self._release(child)
+        self.node_count -= len(node.children)
+        self.released_nodes += len(node.children)
+        node.children = []
+        del self._expanded[node]
@@ -0,0 +1,262 @@
+# incremental_solver.py
+
+import numpy as np
+
+from mixed_strategy_solver import MixedStrategySolution, exploitability, payoff_array, simplex
+
+# Best responses must beat the restricted game's value by this fraction of the largest payoff to join the support
+ORACLE_TOLERANCE = 1e-9
+
+# The most strategies of each player added to the restricted game per oracle iteration
+ORACLE_BATCH = 16
+
+
+class IncrementalSolver:
+    """
+    A zero-sum matrix game that changes a little at a time (strategies added or removed, payoffs re-estimated),
+    kept solved without starting over after every change.
+
+    The pure-strategy results (`minimax`, `saddle_point`) come from the row minima and column maxima, which are
+    kept up to date by every change: adding a column lowers the row minima in a single pass over the column,
+    and only the rows and columns whose extreme value may have been lost are scanned again. The matrix lives in
+    a buffer with room to grow, so adding a strategy does not copy it.
+
+    The mixed-strategy solution comes from a double oracle: the game restricted to the strategies that support
+    the previous solution is solved exactly, then strategies that answer it better are added until none are
+    left. A small change typically needs one or two small simplex runs instead of a solve of the whole matrix.
+
+    Strategies are numbered as in the matrix: removing one renumbers those after it.
+    """
+
+    def __init__(self, game):
+        """
+        Starts a session on a game.
+
+        Args:
+            game (Game or array-like): The game, or its payoff matrix for Player 1. It is copied.
+        """
+        matrix = payoff_array(game)
+        if matrix.ndim != 2 or not matrix.size:
+            raise ValueError(f"Expected a non-empty 2D payoff matrix, got shape {matrix.shape}")
+        self.rows, self.columns = matrix.shape
+        self._buffer = np.empty((2 * self.rows, 2 * self.columns))
+        self._buffer[:self.rows, :self.columns] = matrix
+        self._row_minima = np.empty(2 * self.rows)
+        self._row_minima[:self.rows] = matrix.min(axis=1)
+        self._column_maxima = np.empty(2 * self.columns)
+        self._column_maxima[:self.columns] = matrix.max(axis=0)
+        self._row_support = []
+        self._column_support = []
+        self.solution = None
+        self.restricted_solves = 0
+
+    @property
+    def matrix(self):
+        """
+        numpy.ndarray: The current payoff matrix for Player 1, a view that is invalidated by the next change.
+        """
+        return self._buffer[:self.rows, :self.columns]
+
+    @property
+    def row_minima(self):
+        """
+        numpy.ndarray: The worst payoff of each of Player 1's strategies.
+        """
+        return self._row_minima[:self.rows]
+
+    @property
+    def column_maxima(self):
+        """
+        numpy.ndarray: The worst payoff (for Player 2) of each of Player 2's strategies.
+        """
+        return self._column_maxima[:self.columns]
+
+    def _reserve(self, rows, columns):
+        # The capacity doubles when exceeded, so adding strategies one at a time copies the matrix O(log n) times
+        capacity_rows, capacity_columns = self._buffer.shape
+        if rows <= capacity_rows and columns <= capacity_columns:
+            return
+        buffer = np.empty((capacity_rows if rows <= capacity_rows else max(rows, 2 * capacity_rows),
+                           capacity_columns if columns <= capacity_columns else max(columns, 2 * capacity_columns)))
+        buffer[:self.rows, :self.columns] = self.matrix
+        self._buffer = buffer
+        self._row_minima = np.resize(self._row_minima, buffer.shape[0])
+        self._column_maxima = np.resize(self._column_maxima, buffer.shape[1])
+
+    def add_row(self, payoffs):
+        """
+        Adds a strategy for Player 1, after the existing ones.
+
+        Args:
+            payoffs (array-like): Its payoff against each of Player 2's strategies.
+
+        Returns:
+            int: The index of the new row.
+        """
+        payoffs = np.asarray(payoffs, dtype=float)
+        if payoffs.shape != (self.columns,):
+            raise ValueError(f"Expected {self.columns} payoffs, got shape {payoffs.shape}")
+        self._reserve(self.rows + 1, self.columns)
+        row = self.rows
+        self._buffer[row, :self.columns] = payoffs
+        self._row_minima[row] = payoffs.min()
+        np.maximum(self.column_maxima, payoffs, out=self.column_maxima)
+        self.rows += 1
+        return row
+
+    def add_column(self, payoffs):
+        """
+        Adds a strategy for Player 2, after the existing ones.
+
+        Args:
+            payoffs (array-like): Player 1's payoff against it for each of Player 1's strategies.
+
+        Returns:
+            int: The index of the new column.
+        """
+        payoffs = np.asarray(payoffs, dtype=float)
+        if payoffs.shape != (self.rows,):
+            raise ValueError(f"Expected {self.rows} payoffs, got shape {payoffs.shape}")
+        self._reserve(self.rows, self.columns + 1)
+        column = self.columns
+        self._buffer[:self.rows, column] = payoffs
+        self._column_maxima[column] = payoffs.max()
+        np.minimum(self.row_minima, payoffs, out=self.row_minima)
+        self.columns += 1
+        return column
+
+    def remove_row(self, row):
+        """
+        Removes one of Player 1's strategies; the rows after it move up by one.
+
+        Args:
+            row (int): The index of the row.
+        """
+        if not 0 <= row < self.rows or self.rows == 1:
+            raise ValueError(f"Cannot remove row {row} of {self.rows}")
+        removed = self._buffer[row, :self.columns].copy()
+        self._buffer[row:self.rows - 1, :self.columns] = self._buffer[row + 1:self.rows, :self.columns]
+        self._row_minima[row:self.rows - 1] = self._row_minima[row + 1:self.rows]
+        self.rows -= 1
+        # Only the columns whose maximum was in the removed row can have a lower maximum
+        self._rescan_columns(np.flatnonzero(removed == self.column_maxima))
+        self._row_support = [index - (index > row) for index in self._row_support if index != row]
+
+    def remove_column(self, column):
+        """
+        Removes one of Player 2's strategies; the columns after it move left by one.
+
+        Args:
+            column (int): The index of the column.
+        """
+        if not 0 <= column < self.columns or self.columns == 1:
+            raise ValueError(f"Cannot remove column {column} of {self.columns}")
+        removed = self._buffer[:self.rows, column].copy()
+        self._buffer[:self.rows, column:self.columns - 1] = self._buffer[:self.rows, column + 1:self.columns]
+        self._column_maxima[column:self.columns - 1] = self._column_maxima[column + 1:self.columns]
+        self.columns -= 1
+        self._rescan_rows(np.flatnonzero(removed == self.row_minima))
+        self._column_support = [index - (index > column) for index in self._column_support if index != column]
+
+    def update_payoffs(self, rows, columns, values):
+        """
+        Changes some payoffs, e.g. after re-estimating them.
+
+        Args:
+            rows (int or array-like): The rows of the changed cells.
+            columns (int or array-like): Their columns.
+            values (float or array-like): Their new payoffs for Player 1.
+        """
+        rows = np.atleast_1d(np.asarray(rows, dtype=np.intp))
+        columns = np.atleast_1d(np.asarray(columns, dtype=np.intp))
+        values = np.broadcast_to(np.asarray(values, dtype=float), rows.shape)
+        if rows.size and (rows.min() < 0 or rows.max() >= self.rows or columns.min() < 0
+                          or columns.max() >= self.columns):
+            raise ValueError("Payoff updates outside the matrix")
+        # Of several updates of one cell, the last one wins
+        _, last = np.unique((rows * self.columns + columns)[::-1], return_index=True)
+        keep = rows.size - 1 - last
+        rows, columns, values = rows[keep], columns[keep], values[keep]
+        matrix = self.matrix
+        old = matrix[rows, columns]
+        # A lower payoff can only lower its row minimum, but raising the minimum of a row needs a rescan of
+        # the row; the same holds the other way for column maxima
+        rescanned_rows = np.unique(rows[(old == self.row_minima[rows]) & (values > old)])
+        rescanned_columns = np.unique(columns[(old == self.column_maxima[columns]) & (values < old)])
+        matrix[rows, columns] = values
+        np.minimum.at(self._row_minima, rows, values)
+        np.maximum.at(self._column_maxima, columns, values)
+        self._rescan_rows(rescanned_rows)
+        self._rescan_columns(rescanned_columns)
+
+    def _rescan_rows(self, rows):
+        if len(rows):
+            self._row_minima[rows] = self.matrix[rows].min(axis=1)
+
+    def _rescan_columns(self, columns):
+        if len(columns):
+            self._column_maxima[columns] = self.matrix[:, columns].max(axis=0)
+
+    def minimax(self):
+        """
+        The pure-strategy solution, as `game_theory_algorithm.MinimaxAlgorithm.minimax`.
+
+        Returns:
+            tuple: The maximin row of Player 1 and the minimax column of Player 2 (the first ones in case of ties).
+        """
+        return int(np.argmax(self.row_minima)), int(np.argmin(self.column_maxima))
+
+    def saddle_point(self):
+        """
+        Returns:
+            tuple: The row and column of a pure-strategy equilibrium, or None if the game has none.
+        """
+        row, column = self.minimax()
+        if self.row_minima[row] != self.column_maxima[column]:
+            return None
+        return row, column
+
+    def _add_responses(self, support, gains, tolerance):
+        gains[list(support)] = 0.0
+        better = np.flatnonzero(gains > tolerance)
+        if len(better) > ORACLE_BATCH:
+            better = better[np.argpartition(-gains[better], ORACLE_BATCH)[:ORACLE_BATCH]]
+        support.update(better.tolist())
+        return len(better) > 0
+
+    def solve(self):
+        """
+        Solves the game exactly, starting from the support of the previous solution (or from the pure
+        maximin and minimax strategies the first time).
+
+        Returns:
+            MixedStrategySolution: The value and optimal mixed strategies of the current game.
+        """
+        matrix = self.matrix
+        row, column = self.minimax()
+        row_support = set(self._row_support) or {row}
+        column_support = set(self._column_support) or {column}
+        tolerance = ORACLE_TOLERANCE * max(1.0, float(np.abs(matrix).max()))
+        pivots = 0
+        while True:
+            restricted_rows = sorted(row_support)
+            restricted_columns = sorted(column_support)
+            value, restricted_row_strategy, restricted_column_strategy, restricted_pivots = simplex(
+                matrix[np.ix_(restricted_rows, restricted_columns)])
+            self.restricted_solves += 1
+            pivots += restricted_pivots
+            row_strategy = np.zeros(self.rows)
+            row_strategy[restricted_rows] = restricted_row_strategy
+            column_strategy = np.zeros(self.columns)
+            column_strategy[restricted_columns] = restricted_column_strategy
+            # The responses that beat the restricted solution join the support, the best ones first
+            added = self._add_responses(row_support, matrix @ column_strategy - value, tolerance)
+            added |= self._add_responses(column_support, value - row_strategy @ matrix, tolerance)
+            if not added:
+                break
+        # The next solve starts from the strategies that are played
+        self._row_support = np.flatnonzero(row_strategy > 0).tolist()
+        self._column_support = np.flatnonzero(column_strategy > 0).tolist()
+        self.solution = MixedStrategySolution(value, row_strategy, column_strategy,
+                                              exploitability(matrix, row_strategy, column_strategy), pivots)
+        return self.solution
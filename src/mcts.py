@@ -0,0 +1,361 @@
+# mcts.py
+
+import math
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+INITIAL_CAPACITY = 1024
+
+
+def terminal_value(state):
+    """
+    Args:
+        state (GameState): A position.
+
+    Returns:
+        int: 1 if the position is good for player 1, -1 if it is good for player 2, 0 otherwise.
+    """
+    score = state.evaluate()
+    return (score > 0) - (score < 0)
+
+
+def rollout(state, seed, max_moves=1000):
+    """
+    Plays random moves from a position until the game ends.
+
+    Args:
+        state (GameState): The position to start from.
+        seed (int): The seed of the random moves.
+        max_moves (int, optional): The number of moves after which the position is scored as it is. Defaults to 1000.
+
+    Returns:
+        int: The `terminal_value` of the position reached.
+    """
+    rng = random.Random(seed)
+    for _ in range(max_moves):
+        if state.is_terminal():
+            break
+        state = state.make_move(rng.choice(state.get_possible_moves()))
+    return terminal_value(state)
+
+
+def _rollouts(states, seeds, max_moves):
+    return [rollout(state, seed, max_moves) for state, seed in zip(states, seeds)]
+
+
+class MCTS:
+    """
+    Monte Carlo Tree Search, with UCT or PUCT selection.
+
+    The tree is stored in flat NumPy arrays indexed by node number (parent, first child, number of children,
+    visits, total value, prior) plus a list of moves, and the children of a node occupy consecutive numbers,
+    so selection scores all the children of a node in one vectorized operation. States are not stored:
+    every iteration replays the moves from the root.
+
+    Leaves are evaluated in batches: `batch_size` leaves are selected before any of them is evaluated,
+    with a virtual loss added along each selected path so that the next selections explore other lines.
+    Without an `evaluator`, leaves are scored by random rollouts, which can run on a process pool.
+
+    Values are kept from the point of view of the player who made the move into each node, so the engine
+    works for any `GameState` whose `current_player` tells who moves. As a `SelfPlay` player, it keeps the
+    subtree of the move played between turns (see `advance`).
+    """
+
+    def __init__(self, iterations=1000, exploration=1.4, algorithm="uct", evaluator=None, batch_size=1,
+                 virtual_loss=1.0, rollout_workers=1, max_rollout_moves=1000, time_budget=None,
+                 max_nodes=1000000, seed=0):
+        """
+        Initializes the engine.
+
+        Args:
+            iterations (int, optional): The number of simulations per search. Defaults to 1000.
+            exploration (float, optional): The exploration constant. Defaults to 1.4.
+            algorithm (str, optional): "uct" or "puct" (which weighs exploration by the priors). Defaults to "uct".
+            evaluator (callable, optional): Called with a list of leaf states; returns one (value, priors) pair
+                                            per state, where the value in [-1, 1] is positive when player 1 is
+                                            ahead and the priors (or None for uniform priors) follow the order of
+                                            `get_possible_moves`. Defaults to random rollouts.
+            batch_size (int, optional): The number of leaves evaluated together. Defaults to 1.
+            virtual_loss (float, optional): The loss added to a path while its leaf waits for evaluation. Defaults to 1.
+            rollout_workers (int, optional): The number of processes running random rollouts. Defaults to 1 (no pool).
+            max_rollout_moves (int, optional): The length after which a rollout is scored as it is. Defaults to 1000.
+            time_budget (float, optional): The time per search, in seconds, which may end it before `iterations`.
+                                           Defaults to None.
+            max_nodes (int, optional): The size at which the tree stops growing. Defaults to 1000000.
+            seed (int, optional): The seed of the random rollouts. Defaults to 0.
+        """
+        if algorithm not in ("uct", "puct"):
+            raise ValueError(f"Unknown selection algorithm: {algorithm!r}")
+        self.iterations = iterations
+        self.exploration = exploration
+        self.algorithm = algorithm
+        self.evaluator = evaluator
+        self.batch_size = batch_size
+        self.virtual_loss = virtual_loss
+        self.rollout_workers = rollout_workers
+        self.max_rollout_moves = max_rollout_moves
+        self.time_budget = time_budget
+        self.max_nodes = max_nodes
+        self.rng = random.Random(seed)
+        self.nodes_searched = 0
+        self.reused_nodes = 0
+        self._executor = None
+        self._root_state = None
+        self._reusable = False
+        self._allocate(INITIAL_CAPACITY)
+
+    def _allocate(self, capacity):
+        self.parent = np.full(capacity, -1, dtype=np.int64)
+        self.first_child = np.full(capacity, -1, dtype=np.int64)
+        self.child_count = np.zeros(capacity, dtype=np.int32)
+        self.visits = np.zeros(capacity, dtype=np.float64)
+        self.value_sum = np.zeros(capacity, dtype=np.float64)
+        self.prior = np.zeros(capacity, dtype=np.float64)
+        self.moves = [None]
+        self.size = 1
+
+    def _grow(self, needed):
+        capacity = len(self.parent)
+        while capacity < needed:
+            capacity *= 2
+        for name in ("parent", "first_child", "child_count", "visits", "value_sum", "prior"):
+            old = getattr(self, name)
+            new = np.full(capacity, -1, dtype=old.dtype) if name in ("parent", "first_child") \
+                else np.zeros(capacity, dtype=old.dtype)
+            new[:self.size] = old[:self.size]
+            setattr(self, name, new)
+
+    def _expand(self, node, moves, priors):
+        count = len(moves)
+        if not count or self.size + count > self.max_nodes:
+            return
+        if self.size + count > len(self.parent):
+            self._grow(self.size + count)
+        start = self.size
+        self.parent[start:start + count] = node
+        self.prior[start:start + count] = priors if priors is not None else 1.0 / count
+        self.first_child[node] = start
+        self.child_count[node] = count
+        self.moves.extend(moves)
+        self.size += count
+
+    def _select_child(self, node):
+        start = self.first_child[node]
+        end = start + self.child_count[node]
+        visits = self.visits[start:end]
+        parent_visits = max(self.visits[node], 1.0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            values = np.where(visits > 0, self.value_sum[start:end] / visits, 0.0)
+            if self.algorithm == "uct":
+                scores = np.where(visits > 0, values + self.exploration * np.sqrt(math.log(parent_visits) / visits),
+                                  np.inf)
+            else:
+                scores = values + self.exploration * self.prior[start:end] * math.sqrt(parent_visits) / (1 + visits)
+        return start + int(np.argmax(scores))
+
+    def _select_leaf(self, state, root_player):
+        # Returns the path from the root, the player who moved into every node of it, and the leaf state
+        node = 0
+        path = [0]
+        movers = [None]
+        player = root_player
+        while self.child_count[node]:
+            node = self._select_child(node)
+            path.append(node)
+            movers.append(player)
+            state = state.make_move(self.moves[node])
+            player = state.current_player
+        return path, movers, state
+
+    def _add(self, path, movers, value, visits):
+        # Adds `visits` visits worth `value` (for player 1) per visit along a path
+        for node, mover in zip(path, movers):
+            self.visits[node] += visits
+            if mover is not None:
+                self.value_sum[node] += visits * (value if mover == 1 else -value)
+
+    def _evaluate(self, states):
+        if self.evaluator is not None:
+            return list(self.evaluator(states))
+        seeds = [self.rng.getrandbits(63) for _ in states]
+        if self.rollout_workers > 1 and len(states) > 1:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(self.rollout_workers)
+            chunk = -(-len(states) // self.rollout_workers)
+            futures = [self._executor.submit(_rollouts, states[start:start + chunk], seeds[start:start + chunk],
+                                             self.max_rollout_moves)
+                       for start in range(0, len(states), chunk)]
+            values = [value for future in futures for value in future.result()]
+        else:
+            values = _rollouts(states, seeds, self.max_rollout_moves)
+        return [(value, None) for value in values]
+
+    def search(self, state, maximizing_player=None):
+        """
+        Runs the simulations from a position, continuing the tree of the previous search if `advance`
+        has moved its root to this position. The position is checked with `hash_key`, so for states without
+        one every search starts a new tree.
+
+        Args:
+            state (GameState): The position to search.
+            maximizing_player (bool, optional): Whether player 1 is to move. Defaults to `state.current_player == 1`.
+
+        Returns:
+            The most visited move, or None for a terminal position.
+        """
+        if maximizing_player is None:
+            maximizing_player = state.current_player == 1
+        root_player = 1 if maximizing_player else 2
+        if not self._reusable or not self._same_position(state):
+            self._allocate(len(self.parent))
+        self.reused_nodes = self.size - 1
+        self._root_state = state
+        self._reusable = False
+        if state.is_terminal():
+            return None
+        deadline = None if self.time_budget is None else time.monotonic() + self.time_budget
+        done = 0
+        while done < self.iterations and (deadline is None or time.monotonic() < deadline):
+            batch = []
+            for _ in range(min(self.batch_size, self.iterations - done)):
+                path, movers, leaf = self._select_leaf(state, root_player)
+                # The virtual loss makes the path look worse to the player who chose it, until it is evaluated
+                for node, mover in zip(path, movers):
+                    self.visits[node] += self.virtual_loss
+                    if mover is not None:
+                        self.value_sum[node] -= self.virtual_loss
+                batch.append((path, movers, leaf))
+            done += len(batch)
+            pending = [index for index, (_, _, leaf) in enumerate(batch) if not leaf.is_terminal()]
+            evaluations = self._evaluate([batch[index][2] for index in pending])
+            values = {index: evaluation for index, evaluation in zip(pending, evaluations)}
+            for index, (path, movers, leaf) in enumerate(batch):
+                for node, mover in zip(path, movers):
+                    self.visits[node] -= self.virtual_loss
+                    if mover is not None:
+                        self.value_sum[node] += self.virtual_loss
+                if index in values:
+                    value, priors = values[index]
+                    leaf_node = path[-1]
+                    # The same leaf may have been selected twice in one batch
+                    if not self.child_count[leaf_node]:
+                        self._expand(leaf_node, leaf.get_possible_moves(), priors)
+                else:
+                    value = terminal_value(leaf)
+                self._add(path, movers, value, 1.0)
+        self.nodes_searched = done
+        return self.best_move()
+
+    def _same_position(self, state):
+        if self._root_state is None:
+            return False
+        # Without hashes the position cannot be checked, so the tree is rebuilt rather than trusted
+        key, root_key = state.hash_key(), self._root_state.hash_key()
+        return key is not None and key == root_key
+
+    def best_move(self):
+        """
+        Returns:
+            The most visited move at the root, or None if the root has no children.
+        """
+        count = self.child_count[0]
+        if not count:
+            return None
+        start = self.first_child[0]
+        return self.moves[start + int(np.argmax(self.visits[start:start + count]))]
+
+    def principal_variation(self):
+        """
+        Returns:
+            list: The moves along the most visited children from the root.
+        """
+        moves = []
+        node = 0
+        while self.child_count[node]:
+            start = self.first_child[node]
+            node = start + int(np.argmax(self.visits[start:start + self.child_count[node]]))
+            if not self.visits[node]:
+                break
+            moves.append(self.moves[node])
+        return moves
+
+    def select_move(self, game_state, maximizing_player):
+        """
+        Chooses a move, as a `SelfPlay` player.
+
+        Args:
+            game_state (GameState): The state to move from.
+            maximizing_player (bool): Whether the player to move maximizes the payoff.
+
+        Returns:
+            The chosen move.
+        """
+        return self.search(game_state, maximizing_player)
+
+    def advance(self, move):
+        """
+        Moves the root of the tree to the child reached by a move that was played, keeping its subtree
+        for the next search and dropping the rest of the tree.
+
+        Args:
+            move: The move played from the current root.
+        """
+        if self._root_state is None:
+            return
+        self._root_state = self._root_state.make_move(move)
+        self._reusable = True
+        count = self.child_count[0]
+        start = self.first_child[0]
+        child = next((start + offset for offset in range(count) if self.moves[start + offset] == move), None)
+        if child is None:
+            self._allocate(len(self.parent))
+            return
+        self._reroot(child)
+
+    def _reroot(self, new_root):
+        # Copies the subtree breadth first; the children of every node stay consecutive
+        order = [new_root]
+        new_first_child = [-1]
+        position = 0
+        while position < len(order):
+            node = order[position]
+            count = self.child_count[node]
+            if count:
+                new_first_child[position] = len(order)
+                start = self.first_child[node]
+                order.extend(range(start, start + count))
+                new_first_child.extend([-1] * count)
+            position += 1
+        order = np.array(order, dtype=np.int64)
+        renumber = np.full(self.size, -1, dtype=np.int64)
+        renumber[order] = np.arange(len(order))
+        parent = np.where(self.parent[order] >= 0, renumber[np.maximum(self.parent[order], 0)], -1)
+        parent[0] = -1
+        moves = [self.moves[node] for node in order.tolist()]
+        moves[0] = None
+        capacity = len(self.parent)
+        child_count = self.child_count[order]
+        visits = self.visits[order]
+        value_sum = self.value_sum[order]
+        prior = self.prior[order]
+        self._allocate(capacity)
+        size = len(order)
+        self.parent[:size] = parent
+        self.first_child[:size] = new_first_child
+        self.child_count[:size] = child_count
+        self.visits[:size] = visits
+        self.value_sum[:size] = value_sum
+        self.prior[:size] = prior
+        self.moves = moves
+        self.size = size
+
+    def close(self):
+        """
+        Stops the rollout processes, if any.
+        """
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
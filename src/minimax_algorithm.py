@@ -1,24 +1,135 @@
 # minimax_algorithm.py
 
+import logging
+import math
+import time
+
+from search_stats import SearchStats, TimedState
+from transposition_table import EXACT, LOWER_BOUND, SOLVED_DEPTH, UPPER_BOUND
+
+logger = logging.getLogger(__name__)
+
+# Budgeted searches look at the clock only once every this many nodes
+BUDGET_CHECK_INTERVAL = 1024
+
+# Deepest iteration of a budgeted search when no depth limit is set
+MAX_SEARCH_DEPTH = 64
+
+
+class SearchAborted(Exception):
+    """
+    Raised inside a budgeted search when its deadline or node budget is exhausted or it is cancelled.
+    """
+
+
+class SearchResult:
+    """
+    The outcome of a budgeted iterative deepening search: the result of the deepest completed iteration.
+    """
+
+    def __init__(self, score, move, depth, nodes, elapsed, principal_variation, completed):
+        """
+        Args:
+            score (float): The score of the best move.
+            move: The best move found.
+            depth (int): The depth of the deepest completed iteration.
+            nodes (int): The number of nodes searched by all iterations, including an aborted one.
+            elapsed (float): The wall-clock time spent searching, in seconds.
+            principal_variation (list): The expected line of play from the root.
+            completed (bool): Whether the search stopped on its own rather than on its budget or a cancellation.
+        """
+        self.score = score
+        self.move = move
+        self.depth = depth
+        self.nodes = nodes
+        self.elapsed = elapsed
+        self.principal_variation = principal_variation
+        self.completed = completed
+
+    def __repr__(self):
+        return (f"SearchResult(score={self.score!r}, move={self.move!r}, depth={self.depth}, "
+                f"nodes={self.nodes}, elapsed={self.elapsed:.3f})")
+
+
 class MinimaxAlgorithm:
     """
     A class to represent and solve a game using the Minimax algorithm.
     The Minimax algorithm is used for zero-sum games where one player's gain is another player's loss.
-    This implementation supports two main approaches:
+    This implementation supports three main approaches:
     1. Standard Minimax (Recursive)
-    2. Minimax with Iterative Deepening
+    2. Minimax with Alpha-Beta Pruning (optionally as Principal Variation Search)
+    3. Minimax with Iterative Deepening
     """
 
-    def __init__(self, game, depth_limit=None):
+    def __init__(self, game, depth_limit=None, move_ordering=None, principal_variation_search=False,
+                 transposition_table=None, in_place_moves=None, tablebase=None, collect_stats=False, hooks=None,
+                 evaluation_cache=None, batch_evaluation=None, opening_book=None):
         """
         Initializes the Minimax algorithm with the given game and depth limit.
         
         Args:
             game (Game): An instance of the Game class that represents the zero-sum game.
             depth_limit (int, optional): The maximum depth to search in the game tree for iterative deepening. Defaults to None.
+            move_ordering (list of MoveOrderer, optional): Move ordering heuristics used by alpha-beta search,
+                                                           highest priority first. Defaults to no reordering.
+            principal_variation_search (bool, optional): Whether alpha-beta search should search all but the first
+                                                         move of each node with a null window. Defaults to False.
+            transposition_table (TranspositionTable, optional): A table of earlier search results used by alpha-beta
+                                                                search for states that provide `hash_key`. It is kept
+                                                                between searches. Defaults to None.
+            in_place_moves (bool, optional): Whether alpha-beta search applies and undoes moves on a single state
+                                             (`apply_move`/`undo_move`) instead of creating a new state per move.
+                                             Defaults to None, which uses in-place moves whenever the state implements them.
+            tablebase (optional): An object with a `probe(state)` method returning the exact (score, best move) of
+                                  a solved position, or None for positions it does not know. Searches stop at
+                                  every position the tablebase knows. Defaults to None.
+            collect_stats (bool, optional): Whether `alpha_beta` and `search` collect a `SearchStats`, left in `stats`
+                                            after every search. Timing the state's methods slows the search down,
+                                            so statistics are off by default. Defaults to False.
+            hooks (list of SearchHooks, optional): Callbacks notified when searches and iterations complete.
+                                                   Setting hooks turns on `collect_stats`. Defaults to None.
+            evaluation_cache (EvaluationCache, optional): A cache of leaf evaluations, consulted instead of calling
+                                                          `evaluate` again on positions already evaluated. It is kept
+                                                          between searches. Defaults to None.
+            batch_evaluation (bool, optional): Whether the nodes just above the horizon create all their children
+                                               and score them with a single `evaluate_batch` call. Defaults to None,
+                                               which batches whenever the state implements `evaluate_batch` and no
+                                               tablebase is set.
+            opening_book (OpeningBook, optional): A book of positions searched deeply offline. `alpha_beta` and
+                                                  `search` answer the positions it knows with its move and score
+                                                  instead of searching them. Defaults to None.
         """
         self.game = game
         self.depth_limit = depth_limit
+        self.move_ordering = list(move_ordering) if move_ordering else []
+        self.principal_variation_search = principal_variation_search
+        self.transposition_table = transposition_table
+        self.in_place_moves = in_place_moves
+        self.tablebase = tablebase
+        self.evaluation_cache = evaluation_cache
+        self.batch_evaluation = batch_evaluation
+        self.opening_book = opening_book
+        self.hooks = list(hooks) if hooks else []
+        self.collect_stats = collect_stats or bool(self.hooks)
+        self.stats = None
+        self.nodes_searched = 0
+        self.principal_variation = []
+        self._path = []
+        self._pv = []
+        self._budgeted = False
+        self._next_check = float('inf')
+        self._deadline = None
+        self._node_budget = None
+        self._nodes_before = 0
+        self._cancelled = False
+        self._should_stop = None
+        self._horizon_reached = False
+        self._in_place = False
+        self._batch = False
+        self._searching = False
+        self._stats = None
+        self._stats_start = 0.0
+        self._table_counts = (0, 0)
 
     def minimax(self, node, depth, maximizing_player):
         """
@@ -34,32 +145,518 @@ class MinimaxAlgorithm:
             int: The best score found for the current player.
             int: The best move associated with the best score.
         """
+        if self.tablebase is not None:
+            entry = self.tablebase.probe(node.state)
+            if entry is not None:
+                return entry
         if depth == 0 or node.is_terminal():
+            if self.evaluation_cache is not None:
+                return self.evaluation_cache.evaluate(node.state), node.best_move()
             return node.evaluate(), node.best_move()
 
+        children = node.get_children()
+        leaf_scores = None
+        if depth == 1 and self._uses_batches(node.state):
+            # All the children are leaves: score them at once
+            leaf_scores = self._evaluate_leaves(node.state, [child.state for child in children])
+
         if maximizing_player:
             best_score = float('-inf')
             best_move = None
-            for child in node.get_children():
-                score, move = self.minimax(child, depth - 1, False)
+            for index, child in enumerate(children):
+                if leaf_scores is not None:
+                    score = leaf_scores[index]
+                else:
+                    score, _ = self.minimax(child, depth - 1, False)
                 if score > best_score:
                     best_score = score
-                    best_move = move
-            return best_score, best_move
+                    best_move = child.move
+                    node._best_move = best_move
         else:
             best_score = float('inf')
             best_move = None
-            for child in node.get_children():
-                score, move = self.minimax(child, depth - 1, True)
+            for index, child in enumerate(children):
+                if leaf_scores is not None:
+                    score = leaf_scores[index]
+                else:
+                    score, _ = self.minimax(child, depth - 1, True)
                 if score < best_score:
+                    best_score = score
+                    best_move = child.move
+                    node._best_move = best_move
+        return best_score, best_move
+
+    def alpha_beta(self, node, depth, maximizing_player, alpha=float('-inf'), beta=float('inf')):
+        """
+        Minimax with fail-soft alpha-beta pruning.
+        It returns the same score and best move as `minimax`, but skips the subtrees that cannot
+        change the result. The fewer nodes it visits, the better the move ordering is, so the
+        heuristics given as `move_ordering` are consulted at every node.
+        After the search, `nodes_searched` holds the number of visited nodes and
+        `principal_variation` the expected line of play.
+        If a transposition table is set, positions already searched deep enough (in this search or
+        an earlier one) are answered from the table instead of being searched again.
+
+        When several moves share the best score, the first one in search order is returned,
+        which may differ from `minimax` if move ordering changed the order of the moves.
+        With `collect_stats`, the statistics of the search are left in `stats`.
+        A position in the opening book is not searched: the book's move and score are returned.
+
+        Args:
+            node (Node or GameState): The current game state or node.
+            depth (int): The current depth of the search tree.
+            maximizing_player (bool): Whether the current player is trying to maximize (True) or minimize (False) their payoff.
+            alpha (float, optional): The score the maximizing player is already assured of. Defaults to -inf.
+            beta (float, optional): The score the minimizing player is already assured of. Defaults to inf.
+
+        Returns:
+            int: The best score found for the current player.
+            int: The best move associated with the best score.
+        """
+        state = node.state if isinstance(node, Node) else node
+        if self.opening_book is not None and not self._searching:
+            entry = self._probe_book(state, maximizing_player)
+            if entry is not None:
+                return entry[0], entry[1]
+        self._in_place = state.supports_in_place_moves() if self.in_place_moves is None else self.in_place_moves
+        self._batch = self._uses_batches(state)
+        # Within `search`, the statistics of every iteration go to the search's own
+        own_stats = self.collect_stats and self._stats is None
+        if own_stats:
+            self._start_stats(state)
+        stats = self._stats
+        if stats is not None:
+            state = TimedState(state, stats)
+            stats.nodes_per_ply.extend([0] * (depth + 1 - len(stats.nodes_per_ply)))
+        self.nodes_searched = 0
+        self._next_check = BUDGET_CHECK_INTERVAL if self._budgeted else float('inf')
+        self._horizon_reached = False
+        self._path = []
+        self._pv = [[] for _ in range(depth + 1)]
+        if self.transposition_table is not None:
+            self.transposition_table.new_search()
+        try:
+            best_score, best_move = self._alpha_beta(state, depth, alpha, beta, maximizing_player, 0)
+        finally:
+            if own_stats:
+                self._stats = None
+        self.principal_variation = self._pv[0]
+        for orderer in self.move_ordering:
+            orderer.search_completed(self.principal_variation)
+        if own_stats:
+            self._finish_stats(stats, best_score, best_move, depth, True)
+        return best_score, best_move
+
+    def _alpha_beta(self, state, depth, alpha, beta, maximizing_player, ply):
+        """
+        The recursive part of `alpha_beta`. Works directly on game states so that no tree is kept in memory.
+        """
+        self.nodes_searched += 1
+        if self.nodes_searched >= self._next_check:
+            self._check_budget()
+        if self._stats is not None:
+            self._stats.nodes_per_ply[ply] += 1
+        self._pv[ply] = []
+        if self.tablebase is not None:
+            entry = self.tablebase.probe(state)
+            if entry is not None:
+                # Solved positions are exact, so they are no horizon
+                if entry[1] is not None:
+                    self._pv[ply] = [entry[1]]
+                return entry
+        if depth == 0 or state.is_terminal():
+            if depth == 0:
+                self._horizon_reached = True
+            if self.evaluation_cache is not None:
+                return self.evaluation_cache.evaluate(state), None
+            return state.evaluate(), None
+
+        table = self.transposition_table
+        key = hash_move = None
+        if table is not None:
+            key = state.hash_key()
+        if key is not None:
+            # The same position is scored differently depending on who moves, so the side is part of the key
+            key = 2 * key + maximizing_player
+            entry = table.probe(key)
+            if entry is not None:
+                table_score, table_depth, flag, hash_move = entry
+                # The root is always searched so that it reports a best move and a full principal variation
+                if ply > 0 and table_depth >= depth and (
+                        flag == EXACT
+                        or (flag == LOWER_BOUND and table_score >= beta)
+                        or (flag == UPPER_BOUND and table_score <= alpha)):
+                    if hash_move is not None:
+                        self._pv[ply] = [hash_move]
+                    # Unless its subtree was searched to the end, the stored result stopped at a horizon
+                    if table_depth < SOLVED_DEPTH:
+                        self._horizon_reached = True
+                    return table_score, hash_move
+        alpha_original, beta_original = alpha, beta
+
+        moves = state.get_possible_moves()
+        for orderer in reversed(self.move_ordering):
+            moves = orderer.order(moves, ply, self._path)
+        if hash_move is not None and hash_move in moves:
+            moves = [hash_move] + [move for move in moves if move != hash_move]
+        leaf_scores = None
+        if depth == 1 and self._batch:
+            # Every child is a leaf: score them all at once, then visit them in order as the search would
+            leaf_scores = self._evaluate_leaves(state, [state.make_move(move) for move in moves])
+
+        # Whether the subtree of this node stops at a horizon decides how deep its table entry holds
+        horizon_reached, self._horizon_reached = self._horizon_reached, False
+        best_move = None
+        if maximizing_player:
+            best_score = float('-inf')
+            for index, move in enumerate(moves):
+                if leaf_scores is not None:
+                    score = self._visit_leaf(leaf_scores[index], alpha, beta, ply, index > 0)
+                else:
+                    score = self._search_child(state, move, depth, alpha, beta, False, ply, index > 0)
+                if score > best_score:
                     best_score = score
                     best_move = move
-            return best_score, best_move
+                    self._pv[ply] = [move] + self._pv[ply + 1]
+                    alpha = max(alpha, score)
+                    if alpha >= beta:
+                        self._record_cutoff(move, depth, ply, index)
+                        break
+        else:
+            best_score = float('inf')
+            for index, move in enumerate(moves):
+                if leaf_scores is not None:
+                    score = self._visit_leaf(leaf_scores[index], alpha, beta, ply, index > 0)
+                else:
+                    score = self._search_child(state, move, depth, alpha, beta, True, ply, index > 0)
+                if score < best_score:
+                    best_score = score
+                    best_move = move
+                    self._pv[ply] = [move] + self._pv[ply + 1]
+                    beta = min(beta, score)
+                    if alpha >= beta:
+                        self._record_cutoff(move, depth, ply, index)
+                        break
+
+        solved = not self._horizon_reached
+        self._horizon_reached = horizon_reached or self._horizon_reached
+        if key is not None:
+            if best_score <= alpha_original:
+                flag = UPPER_BOUND
+            elif best_score >= beta_original:
+                flag = LOWER_BOUND
+            else:
+                flag = EXACT
+            table.store(key, SOLVED_DEPTH if solved else min(depth, SOLVED_DEPTH - 1), best_score, flag, best_move)
+        return best_score, best_move
+
+    def _search_child(self, state, move, depth, alpha, beta, maximizing_player, ply, scout):
+        """
+        Searches the child reached by `move`, applied in place and undone afterwards when the state
+        supports it, or on a copy otherwise. With principal variation search enabled, every move but
+        the first is searched with a null window that only proves whether it beats the current best move,
+        and it is re-searched with the full window when it does.
+        """
+        if self._in_place:
+            state.apply_move(move)
+            child = state
+        else:
+            child = state.make_move(move)
+        self._path.append(move)
+        try:
+            if scout and self.principal_variation_search:
+                if maximizing_player:
+                    # The parent minimizes: only a score below beta improves on its best move
+                    score, _ = self._alpha_beta(child, depth - 1, math.nextafter(beta, float('-inf')), beta, True, ply + 1)
+                else:
+                    # The parent maximizes: only a score above alpha improves on its best move
+                    score, _ = self._alpha_beta(child, depth - 1, alpha, math.nextafter(alpha, float('inf')), False, ply + 1)
+                if alpha < score < beta:
+                    score, _ = self._alpha_beta(child, depth - 1, alpha, beta, maximizing_player, ply + 1)
+            else:
+                score, _ = self._alpha_beta(child, depth - 1, alpha, beta, maximizing_player, ply + 1)
+        finally:
+            # Undone even when a budgeted search is aborted, so the caller's state is left intact
+            if self._in_place:
+                state.undo_move(move)
+        self._path.pop()
+        return score
+
+    def _visit_leaf(self, score, alpha, beta, ply, scout):
+        """
+        Accounts for a visit of a leaf scored in advance by `_evaluate_leaves`, exactly as `_search_child`
+        would have visited it, re-search included, so that node counts and budgets are the same.
+        """
+        # A leaf scores the same in any window, so a null-window search is re-searched whenever the score is inside
+        visits = 2 if scout and self.principal_variation_search and alpha < score < beta else 1
+        for _ in range(visits):
+            self.nodes_searched += 1
+            if self.nodes_searched >= self._next_check:
+                self._check_budget()
+            if self._stats is not None:
+                self._stats.nodes_per_ply[ply + 1] += 1
+        self._pv[ply + 1] = []
+        self._horizon_reached = True
+        return score
+
+    def _uses_batches(self, state):
+        if self.tablebase is not None:
+            return False
+        return state.supports_batch_evaluation() if self.batch_evaluation is None else self.batch_evaluation
+
+    def _evaluate_leaves(self, state, leaves):
+        """
+        Scores leaves with one `evaluate_batch` call on their parent, for those not in the evaluation cache.
+        """
+        cache = self.evaluation_cache
+        if cache is None:
+            return state.evaluate_batch(leaves)
+        scores = [None] * len(leaves)
+        keys = [leaf.hash_key() for leaf in leaves]
+        missing = []
+        for index, key in enumerate(keys):
+            score = None if key is None else cache.probe(key)
+            if score is None:
+                missing.append(index)
+            else:
+                scores[index] = score
+        if missing:
+            for index, score in zip(missing, state.evaluate_batch([leaves[index] for index in missing])):
+                scores[index] = score
+                if keys[index] is not None:
+                    cache.store(keys[index], score)
+        return scores
+
+    def _record_cutoff(self, move, depth, ply, index):
+        for orderer in self.move_ordering:
+            orderer.record_cutoff(move, depth, ply)
+        if self._stats is not None:
+            self._stats.cutoffs += 1
+            if index == 0:
+                self._stats.first_move_cutoffs += 1
+
+    def _probe_book(self, state, maximizing_player):
+        """
+        Answers a root position from the opening book, as a search would, if the book knows it for the side to move.
+        """
+        entry = self.opening_book.probe(state, maximizing_player)
+        if entry is None:
+            return None
+        score, move, depth = entry
+        self.nodes_searched = 0
+        self.principal_variation = [move]
+        if self.collect_stats:
+            self._start_stats(state)
+            stats, self._stats = self._stats, None
+            stats.book_hit = True
+            self._finish_stats(stats, score, move, depth, True)
+        logger.debug("Opening book move %r, score %s, searched to depth %d", move, score, depth)
+        return entry
+
+    def _start_stats(self, state):
+        """
+        Starts collecting the statistics of a search.
+        """
+        self._stats = SearchStats()
+        self._stats_start = time.perf_counter()
+        table = self.transposition_table
+        self._table_counts = (table.hits, table.misses) if table is not None else (0, 0)
+        for hook in self.hooks:
+            hook.search_started(state, self._stats)
+
+    def _finish_stats(self, stats, score, move, depth, completed):
+        """
+        Completes the statistics of a search, leaves them in `stats` and passes them to the hooks.
+        """
+        stats.score = score
+        stats.move = move
+        stats.depth = depth
+        stats.principal_variation = list(self.principal_variation)
+        stats.completed = completed
+        stats.nodes = sum(stats.nodes_per_ply)
+        stats.elapsed = time.perf_counter() - self._stats_start
+        table = self.transposition_table
+        if table is not None:
+            hits, misses = self._table_counts
+            stats.table_hits = table.hits - hits
+            stats.table_probes = stats.table_hits + table.misses - misses
+        self.stats = stats
+        for hook in self.hooks:
+            hook.search_completed(stats)
+
+    def _check_budget(self):
+        """
+        Called every `BUDGET_CHECK_INTERVAL` nodes of a budgeted search; aborts it once the budget is spent.
+        """
+        self._next_check = self.nodes_searched + BUDGET_CHECK_INTERVAL
+        if self._cancelled or (self._should_stop is not None and self._should_stop()):
+            raise SearchAborted("search cancelled")
+        if self._node_budget is not None:
+            remaining = self._node_budget - self._nodes_before - self.nodes_searched
+            if remaining < 0:
+                # The node that triggered the check is abandoned, so it does not count as searched
+                self.nodes_searched -= 1
+                raise SearchAborted("node budget exhausted")
+            self._next_check = min(self._next_check, self.nodes_searched + remaining + 1)
+        if self._deadline is not None and time.monotonic() >= self._deadline:
+            raise SearchAborted("deadline reached")
+
+    def search(self, node=None, maximizing_player=True, time_budget=None, deadline=None, node_budget=None,
+               aspiration_window=None, progress=None, should_stop=None):
+        """
+        Budgeted iterative deepening: searches one ply deeper at a time until the deadline or the node budget
+        is spent, `depth_limit` is reached, or the whole game tree has been searched.
+        The budget is checked every `BUDGET_CHECK_INTERVAL` nodes, so an iteration in progress is abandoned
+        almost immediately once the budget is spent, and the result of the last completed iteration is
+        returned. The first iteration always completes so that a move is available.
+        Progress is reported through the `progress` callback, the hooks and the module logger after every
+        iteration, never from inside the search itself. With `collect_stats`, the statistics of all the
+        iterations are left in `stats`. A position in the opening book is answered from it without searching.
+
+        Args:
+            node (Node or GameState, optional): The position to search. Defaults to the root of the game.
+            maximizing_player (bool, optional): Whether the player to move maximizes the payoff. Defaults to True.
+            time_budget (float, optional): The wall-clock time available, in seconds. Defaults to None.
+            deadline (float, optional): An absolute `time.monotonic()` deadline. Defaults to None.
+            node_budget (int, optional): The maximum number of nodes to search over all iterations. Defaults to None.
+            aspiration_window (float, optional): If given, every iteration after the first is searched with a
+                                                 window of this half-width around the previous score and
+                                                 re-searched with a full window when the score falls outside it.
+                                                 Defaults to None.
+            progress (callable, optional): Called with a `SearchResult` after every completed iteration. Defaults to None.
+            should_stop (callable, optional): Polled with the budget; the search stops as if cancelled once it
+                                              returns True (e.g. when another process asks it to). Defaults to None.
+
+        Returns:
+            SearchResult: The result of the deepest completed iteration.
+
+        Raises:
+            ValueError: If `depth_limit` is less than 1, which leaves no iteration to search.
+        """
+        if self.depth_limit is not None and self.depth_limit < 1:
+            raise ValueError(f"depth_limit must be at least 1 to search, not {self.depth_limit}")
+        if node is None:
+            node = self.game.root
+        start = time.monotonic()
+        if time_budget is not None:
+            deadline = start + time_budget if deadline is None else min(deadline, start + time_budget)
+        max_depth = self.depth_limit if self.depth_limit is not None else MAX_SEARCH_DEPTH
+        self._nodes_before = 0
+        if self.opening_book is not None:
+            entry = self._probe_book(node.state if isinstance(node, Node) else node, maximizing_player)
+            if entry is not None:
+                self._cancelled = False
+                score, move, depth = entry
+                result = SearchResult(score, move, depth, 0, time.monotonic() - start, [move], True)
+                if progress is not None:
+                    progress(result)
+                return result
+        result = None
+        if self.collect_stats:
+            self._start_stats(node.state if isinstance(node, Node) else node)
+        self._searching = True
+        try:
+            for depth in range(1, max_depth + 1):
+                if depth == 2:
+                    # From here on, iterations may be aborted
+                    self._budgeted = True
+                    self._deadline = deadline
+                    self._node_budget = node_budget
+                    self._should_stop = should_stop
+                if depth > 1 and self._cancelled:
+                    logger.debug("Search cancelled before depth %d", depth)
+                    result.elapsed = time.monotonic() - start
+                    result.completed = False
+                    break
+                try:
+                    score, move = self._aspiration_search(node, depth, maximizing_player,
+                                                          result.score if result else None, aspiration_window)
+                except SearchAborted as reason:
+                    logger.debug("Search at depth %d aborted: %s", depth, reason)
+                    result.nodes = self._nodes_before + self.nodes_searched
+                    result.elapsed = time.monotonic() - start
+                    result.completed = False
+                    break
+                iteration_nodes = self.nodes_searched + self._nodes_before - (result.nodes if result else 0)
+                self._nodes_before += self.nodes_searched
+                result = SearchResult(score, move, depth, self._nodes_before, time.monotonic() - start,
+                                      self.principal_variation, True)
+                logger.debug("Depth %d: score %s, move %r, %d nodes, %.3fs",
+                             depth, score, move, result.nodes, result.elapsed)
+                if progress is not None:
+                    progress(result)
+                if self._stats is not None:
+                    self._stats.iterations.append({"depth": depth, "nodes": iteration_nodes, "score": score,
+                                                   "move": move, "elapsed": result.elapsed})
+                    for hook in self.hooks:
+                        hook.iteration_completed(self._stats)
+                if not self._horizon_reached:
+                    break
+        finally:
+            # A cancellation asked for before the search started stops it; it is forgotten once the search is over
+            self._cancelled = False
+            self._searching = False
+            self._budgeted = False
+            self._deadline = None
+            self._node_budget = None
+            self._should_stop = None
+            stats, self._stats = self._stats, None
+        if stats is not None:
+            self._finish_stats(stats, result.score, result.move, result.depth, result.completed)
+        return result
+
+    def _aspiration_search(self, node, depth, maximizing_player, previous_score, aspiration_window):
+        """
+        Runs one iteration of `search`, first with a narrow window around the previous score if requested.
+        """
+        if aspiration_window is None or previous_score is None or math.isinf(previous_score):
+            return self.alpha_beta(node, depth, maximizing_player)
+        alpha, beta = previous_score - aspiration_window, previous_score + aspiration_window
+        score, move = self.alpha_beta(node, depth, maximizing_player, alpha, beta)
+        if alpha < score < beta:
+            return score, move
+        logger.debug("Aspiration window failed at depth %d, re-searching", depth)
+        self._nodes_before += self.nodes_searched
+        return self.alpha_beta(node, depth, maximizing_player)
+
+    def advance(self, move):
+        """
+        Keeps the search state for the position reached by a move played from the root of the last search,
+        as in a game: the move ordering heuristics shift their per-ply tables by one ply, and the transposition
+        table is kept as it is, so the next search starts with the subtree already explored below the move.
+
+        Args:
+            move: The move played.
+        """
+        for orderer in self.move_ordering:
+            orderer.advance(move)
+        self.principal_variation = self.principal_variation[1:] if self.principal_variation[:1] == [move] else []
+
+    def clear(self):
+        """
+        Forgets everything learned from previous searches (the transposition table and move ordering heuristics),
+        so that the next search starts cold.
+        """
+        for orderer in self.move_ordering:
+            orderer.clear()
+        if self.transposition_table is not None:
+            self.transposition_table.clear()
+        self.principal_variation = []
+
+    def cancel(self):
+        """
+        Asks a running budgeted search (e.g. on another thread) to stop.
+        It stops within `BUDGET_CHECK_INTERVAL` nodes and returns the result of its last completed iteration.
+        Called before a search starts, it stops that search as soon as its first iteration is over.
+        """
+        self._cancelled = True
 
     def iterative_deepening(self):
         """
         Implements Iterative Deepening for the Minimax algorithm.
         This allows us to search deeper in the game tree over time, providing better moves as more time is available.
+        Every iteration is an alpha-beta search, so with a transposition table the scores and best moves
+        of the previous iterations are reused to order and cut off the next one.
         
         Returns:
             int: The best score found after the search.
@@ -67,8 +664,8 @@ class MinimaxAlgorithm:
         """
         best_move = None
         for depth in range(1, self.depth_limit + 1):
-            print(f"Searching at depth {depth}...")
-            best_score, best_move = self.minimax(self.game.root, depth, True)
+            logger.debug("Searching at depth %d...", depth)
+            best_score, best_move = self.alpha_beta(self.game.root, depth, True)
         return best_score, best_move
 
 
@@ -76,20 +673,26 @@ class Node:
     """
     A class representing a node in the game tree. Each node corresponds to a game state
     and has information about the state, its possible moves, and the associated payoffs.
+    Generated children are cached, so a tree of nodes keeps everything it has explored in memory;
+    see `game_tree.BoundedGameTree` for a tree with a memory cap.
     """
 
-    def __init__(self, state, parent=None):
+    __slots__ = ("state", "parent", "move", "children", "_best_move")
+
+    def __init__(self, state, parent=None, move=None):
         """
         Initializes the node with the game state and its parent node.
         
         Args:
             state (GameState): The current state of the game.
             parent (Node, optional): The parent node. Defaults to None.
+            move (optional): The move that leads from the parent node to this node. Defaults to None.
         """
         self.state = state
         self.parent = parent
+        self.move = move
         self.children = []
-        self.best_move = None
+        self._best_move = None
 
     def is_terminal(self):
         """
@@ -120,7 +723,7 @@ class Node:
             moves = self.state.get_possible_moves()
             for move in moves:
                 child_state = self.state.make_move(move)
-                child_node = Node(child_state, parent=self)
+                child_node = Node(child_state, parent=self, move=move)
                 self.children.append(child_node)
         return self.children
 
@@ -131,7 +734,7 @@ class Node:
         Returns:
             int: The best move for the current state.
         """
-        return self.best_move
+        return self._best_move
 
 
 class GameState:
@@ -184,3 +787,91 @@ class GameState:
             GameState: The new game state after the move.
         """
         raise NotImplementedError
+
+    def apply_move(self, move):
+        """
+        Optionally implemented by subclasses: apply the move to this state in place.
+        Together with `undo_move`, this lets the search walk the game tree with a single state object
+        instead of allocating a new state for every move. The hash returned by `hash_key` must be
+        updated as well.
+        
+        Args:
+            move: The move to apply.
+        """
+        raise NotImplementedError
+
+    def undo_move(self, move):
+        """
+        Optionally implemented by subclasses: take back the move most recently applied with `apply_move`,
+        restoring this state exactly as it was before.
+        
+        Args:
+            move: The move to take back.
+        """
+        raise NotImplementedError
+
+    def supports_in_place_moves(self):
+        """
+        Check whether the subclass implements `apply_move` and `undo_move`.
+        
+        Returns:
+            bool: True if moves can be applied in place, False if only `make_move` is available.
+        """
+        cls = type(self)
+        return cls.apply_move is not GameState.apply_move and cls.undo_move is not GameState.undo_move
+
+    def evaluate_batch(self, states):
+        """
+        Optionally implemented by subclasses: evaluate many states at once, e.g. with one vectorized call
+        of a model. The search calls it on a parent with all its children when they are leaves.
+        Every score must equal what `evaluate` returns for the same state.
+        
+        Args:
+            states (list of GameState): The states to evaluate.
+        
+        Returns:
+            list of float: The evaluation score of every state, in order.
+        """
+        return [state.evaluate() for state in states]
+
+    def supports_batch_evaluation(self):
+        """
+        Check whether the subclass implements `evaluate_batch`.
+        
+        Returns:
+            bool: True if states can be evaluated in batches.
+        """
+        return type(self).evaluate_batch is not GameState.evaluate_batch
+
+    def hash_key(self):
+        """
+        Return a 64-bit hash identifying the position, used as the transposition table key.
+        Subclasses can keep a Zobrist hash (see `transposition_table.ZobristHash`) and update it
+        incrementally in `make_move`. Positions without a hash are never stored in the table.
+        
+        Returns:
+            int: The hash of the position, or None if the state does not provide one.
+        """
+        return None
+
+    def is_chance(self):
+        """
+        Optionally implemented by subclasses with chance events (e.g. dice rolls or card draws): check whether
+        the next move is drawn by chance rather than chosen by a player. Chance moves do not change the player
+        to move: `current_player` at a chance state is the player who moves after it. Terminal states are not
+        chance states. Only `expectiminimax.ExpectiminimaxAlgorithm` and `cfr.CFRSolver` search chance states.
+
+        Returns:
+            bool: True at chance states. Defaults to False.
+        """
+        return False
+
+    def chance_outcomes(self):
+        """
+        The moves chance can make from this state, passed to `make_move` like any other move.
+        Should be implemented in subclasses with chance states.
+
+        Returns:
+            list of tuple: (move, probability) pairs, with probabilities summing to 1.
+        """
+        raise NotImplementedError
@@ -0,0 +1,319 @@
+# mixed_strategy_solver.py
+
+import numpy as np
+
+# Reduced costs and pivot entries smaller than this are treated as zero by the simplex method
+SIMPLEX_TOLERANCE = 1e-12
+
+# After this many consecutive degenerate pivots the simplex method switches to Bland's rule, which cannot cycle
+DEGENERATE_PIVOT_LIMIT = 50
+
+# Games with at most this many cells are solved exactly by a single simplex run on the whole matrix
+DIRECT_SIMPLEX_CELLS = 10000
+
+
+class MixedStrategySolution:
+    """
+    The value and optimal mixed strategies of a two-player zero-sum game.
+    """
+
+    def __init__(self, value, row_strategy, column_strategy, exploitability, iterations, reduction=None):
+        """
+        Args:
+            value (float): The value of the game for Player 1 (the row player).
+            row_strategy (numpy.ndarray): The probability of each row in Player 1's strategy.
+            column_strategy (numpy.ndarray): The probability of each column in Player 2's strategy.
+            exploitability (float): How much the best responses to the two strategies gain over each other;
+                                    zero at an exact equilibrium.
+            iterations (int): The number of simplex pivots or learning iterations used.
+            reduction (Reduction, optional): The elimination of dominated strategies done before solving, if any.
+        """
+        self.value = value
+        self.row_strategy = row_strategy
+        self.column_strategy = column_strategy
+        self.exploitability = exploitability
+        self.iterations = iterations
+        self.reduction = reduction
+
+    def __repr__(self):
+        return (f"MixedStrategySolution(value={self.value!r}, exploitability={self.exploitability:.3g}, "
+                f"iterations={self.iterations})")
+
+
+def payoff_array(game):
+    """
+    Returns the payoff matrix of a game as a 2D float array.
+
+    Args:
+        game (Game or array-like): A game, or its payoff matrix for Player 1.
+
+    Returns:
+        numpy.ndarray: The payoff matrix.
+    """
+    return np.asarray(getattr(game, "matrix", game), dtype=float)
+
+
+def exploitability(matrix, row_strategy, column_strategy):
+    """
+    Computes the duality gap of a pair of mixed strategies: what Player 1 gains by best responding to
+    the column strategy, plus what Player 2 gains by best responding to the row strategy.
+
+    Args:
+        matrix (numpy.ndarray): The payoff matrix for Player 1.
+        row_strategy (numpy.ndarray): Player 1's mixed strategy.
+        column_strategy (numpy.ndarray): Player 2's mixed strategy.
+
+    Returns:
+        float: The gap, which is zero exactly at an equilibrium.
+    """
+    return float((matrix @ column_strategy).max() - (row_strategy @ matrix).min())
+
+
+def simplex(matrix):
+    """
+    Solves a zero-sum matrix game exactly with the simplex method.
+    The payoffs are shifted to be positive, so the column player's problem becomes
+    maximize sum(y) subject to A y <= 1, y >= 0, whose optimum is 1 / value; the row player's
+    strategy is read from the dual values of the constraints. Entering columns are chosen by
+    steepest edge, which needs far fewer pivots than the textbook most-negative rule.
+
+    Args:
+        matrix (numpy.ndarray): The payoff matrix for Player 1.
+
+    Returns:
+        tuple: The value, the row strategy, the column strategy and the number of pivots.
+    """
+    rows, columns = matrix.shape
+    shift = 1.0 - matrix.min()
+    tableau = np.zeros((rows + 1, columns + rows + 1))
+    tableau[:rows, :columns] = matrix + shift
+    tableau[:rows, columns:columns + rows] = np.eye(rows)
+    tableau[:rows, -1] = 1.0
+    tableau[rows, :columns] = -1.0
+    basis = np.arange(columns, columns + rows)
+    body = tableau[:rows, :-1]
+    costs = tableau[rows, :-1]
+    right_hand_side = tableau[:rows, -1]
+
+    pivots = 0
+    degenerate_pivots = 0
+    while True:
+        negative = costs < -SIMPLEX_TOLERANCE
+        if not negative.any():
+            break
+        if degenerate_pivots < DEGENERATE_PIVOT_LIMIT:
+            norms = np.sqrt(1.0 + np.einsum('ij,ij->j', body, body))
+            entering = int(np.argmin(np.where(negative, costs / norms, 0.0)))
+        else:
+            entering = int(np.flatnonzero(negative)[0])
+
+        column = body[:, entering]
+        eligible = column > SIMPLEX_TOLERANCE
+        ratios = np.full(rows, np.inf)
+        ratios[eligible] = right_hand_side[eligible] / column[eligible]
+        if degenerate_pivots < DEGENERATE_PIVOT_LIMIT:
+            leaving = int(np.argmin(ratios))
+        else:
+            # Bland's rule: among the tied rows, the one whose basic variable has the smallest index
+            tied = np.flatnonzero(ratios == ratios.min())
+            leaving = int(tied[np.argmin(basis[tied])])
+        degenerate_pivots = degenerate_pivots + 1 if ratios[leaving] <= SIMPLEX_TOLERANCE else 0
+
+        tableau[leaving] /= tableau[leaving, entering]
+        factors = tableau[:, entering].copy()
+        factors[leaving] = 0.0
+        tableau -= np.outer(factors, tableau[leaving])
+        basis[leaving] = entering
+        pivots += 1
+
+    total = tableau[rows, -1]
+    column_strategy = np.zeros(columns)
+    in_basis = basis < columns
+    column_strategy[basis[in_basis]] = right_hand_side[in_basis]
+    row_strategy = np.maximum(tableau[rows, columns:columns + rows], 0.0)
+    value = float(1.0 / total - shift)
+    return value, row_strategy / row_strategy.sum(), column_strategy / column_strategy.sum(), pivots
+
+
+def regret_matching(matrix, epsilon, max_iterations=100000, check_every=10):
+    """
+    Approximates an equilibrium with alternating regret matching+ and linearly weighted averaging.
+    Every iteration costs two matrix-vector products, and the averaged strategies typically reach
+    a small gap in a few hundred iterations even on large matrices.
+
+    Args:
+        matrix (numpy.ndarray): The payoff matrix for Player 1.
+        epsilon (float): The target exploitability of the averaged strategies.
+        max_iterations (int, optional): The maximum number of iterations. Defaults to 100000.
+        check_every (int, optional): How often the exploitability is measured. Defaults to 10.
+
+    Returns:
+        tuple: The row strategy, the column strategy, the exploitability and the number of iterations.
+    """
+    rows, columns = matrix.shape
+    row_regrets = np.zeros(rows)
+    column_regrets = np.zeros(columns)
+    row_strategy = np.full(rows, 1.0 / rows)
+    column_strategy = np.full(columns, 1.0 / columns)
+    row_average = np.zeros(rows)
+    column_average = np.zeros(columns)
+    gap = np.inf
+    for iteration in range(1, max_iterations + 1):
+        row_payoffs = matrix @ column_strategy
+        row_regrets = np.maximum(row_regrets + row_payoffs - row_strategy @ row_payoffs, 0.0)
+        total = row_regrets.sum()
+        row_strategy = row_regrets / total if total > 0 else np.full(rows, 1.0 / rows)
+
+        column_losses = row_strategy @ matrix
+        column_regrets = np.maximum(column_regrets + column_losses @ column_strategy - column_losses, 0.0)
+        total = column_regrets.sum()
+        column_strategy = column_regrets / total if total > 0 else np.full(columns, 1.0 / columns)
+
+        row_average += iteration * row_strategy
+        column_average += iteration * column_strategy
+        if iteration % check_every == 0 or iteration == max_iterations:
+            gap = exploitability(matrix, row_average / row_average.sum(), column_average / column_average.sum())
+            if gap <= epsilon:
+                break
+    return row_average / row_average.sum(), column_average / column_average.sum(), gap, iteration
+
+
+def multiplicative_weights(matrix, epsilon, learning_rate=None, max_iterations=100000, check_every=10):
+    """
+    Approximates an equilibrium with optimistic multiplicative weights (Hedge) played by both players.
+
+    Args:
+        matrix (numpy.ndarray): The payoff matrix for Player 1.
+        epsilon (float): The target exploitability of the averaged strategies.
+        learning_rate (float, optional): The Hedge step size. Defaults to 5 divided by the payoff range.
+        max_iterations (int, optional): The maximum number of iterations. Defaults to 100000.
+        check_every (int, optional): How often the exploitability is measured. Defaults to 10.
+
+    Returns:
+        tuple: The row strategy, the column strategy, the exploitability and the number of iterations.
+    """
+    rows, columns = matrix.shape
+    if learning_rate is None:
+        learning_rate = 5.0 / max(float(np.ptp(matrix)), 1e-12)
+    row_totals = np.zeros(rows)
+    column_totals = np.zeros(columns)
+    row_last = np.zeros(rows)
+    column_last = np.zeros(columns)
+    row_average = np.zeros(rows)
+    column_average = np.zeros(columns)
+    gap = np.inf
+    for iteration in range(1, max_iterations + 1):
+        # Optimism: the last payoffs are counted twice, as a prediction of the next ones
+        logits = learning_rate * (row_totals + row_last)
+        row_strategy = np.exp(logits - logits.max())
+        row_strategy /= row_strategy.sum()
+        logits = learning_rate * (column_totals + column_last)
+        column_strategy = np.exp(logits - logits.max())
+        column_strategy /= column_strategy.sum()
+
+        row_last = matrix @ column_strategy
+        column_last = -(row_strategy @ matrix)
+        row_totals += row_last
+        column_totals += column_last
+        row_average += row_strategy
+        column_average += column_strategy
+        if iteration % check_every == 0 or iteration == max_iterations:
+            gap = exploitability(matrix, row_average / iteration, column_average / iteration)
+            if gap <= epsilon:
+                break
+    return row_average / iteration, column_average / iteration, gap, iteration
+
+
+class MixedStrategySolver:
+    """
+    Finds the value and optimal mixed strategies of a two-player zero-sum game.
+    Unlike the pure-strategy maximin/minimax of `game_theory_algorithm.MinimaxAlgorithm`, the result is
+    correct whether or not the payoff matrix has a saddle point.
+    """
+
+    def __init__(self, game):
+        """
+        Initializes the solver with the given game.
+
+        Args:
+            game (Game or array-like): The game to solve, or its payoff matrix for Player 1.
+        """
+        self.matrix = payoff_array(game)
+
+    def solve(self, method="exact", epsilon=1e-4):
+        """
+        Solves the game.
+
+        Args:
+            method (str, optional): "exact" for linear programming, "regret_matching" or
+                                    "multiplicative_weights" for an approximation. Defaults to "exact".
+            epsilon (float, optional): The target exploitability of the approximate methods. Defaults to 1e-4.
+
+        Returns:
+            MixedStrategySolution: The value and the optimal strategies.
+        """
+        if method == "exact":
+            return self.solve_exact()
+        if method in ("regret_matching", "multiplicative_weights"):
+            return self.solve_approximate(epsilon, method)
+        raise ValueError(f"Unknown solution method: {method!r}")
+
+    def solve_exact(self):
+        """
+        Solves the game exactly by linear programming.
+        Small games are solved by one simplex run. Larger ones first get an approximate equilibrium from
+        regret matching, whose support is solved exactly; strategies that turn out to be better responses
+        to that solution are added and the restricted game is solved again until none are left (a double
+        oracle), so the simplex method only ever sees the few hundred strategies that matter.
+
+        Returns:
+            MixedStrategySolution: The value and the optimal strategies.
+        """
+        matrix = self.matrix
+        rows, columns = matrix.shape
+        if rows * columns <= DIRECT_SIMPLEX_CELLS:
+            value, row_strategy, column_strategy, pivots = simplex(matrix)
+            return MixedStrategySolution(value, row_strategy, column_strategy,
+                                         exploitability(matrix, row_strategy, column_strategy), pivots)
+
+        scale = max(1.0, float(np.abs(matrix).max()))
+        row_strategy, column_strategy, _, _ = regret_matching(matrix, 1e-5 * scale)
+        row_support = set(np.flatnonzero(row_strategy > 1e-6).tolist())
+        column_support = set(np.flatnonzero(column_strategy > 1e-6).tolist())
+        tolerance = 1e-9 * scale
+        pivots = 0
+        while True:
+            restricted_rows = sorted(row_support)
+            restricted_columns = sorted(column_support)
+            value, restricted_row_strategy, restricted_column_strategy, restricted_pivots = simplex(
+                matrix[np.ix_(restricted_rows, restricted_columns)])
+            pivots += restricted_pivots
+            row_strategy = np.zeros(rows)
+            row_strategy[restricted_rows] = restricted_row_strategy
+            column_strategy = np.zeros(columns)
+            column_strategy[restricted_columns] = restricted_column_strategy
+
+            better_rows = set(np.flatnonzero(matrix @ column_strategy > value + tolerance).tolist()) - row_support
+            better_columns = set(np.flatnonzero(row_strategy @ matrix < value - tolerance).tolist()) - column_support
+            if not better_rows and not better_columns:
+                return MixedStrategySolution(value, row_strategy, column_strategy,
+                                             exploitability(matrix, row_strategy, column_strategy), pivots)
+            row_support |= better_rows
+            column_support |= better_columns
+
+    def solve_approximate(self, epsilon=1e-4, method="regret_matching"):
+        """
+        Approximates the equilibrium with a no-regret learning method.
+
+        Args:
+            epsilon (float, optional): The target exploitability. Defaults to 1e-4.
+            method (str, optional): "regret_matching" or "multiplicative_weights". Defaults to "regret_matching".
+
+        Returns:
+            MixedStrategySolution: The approximate value and strategies. The value is the payoff of the
+                                   strategies against each other, within `epsilon` of the true value.
+        """
+        learner = regret_matching if method == "regret_matching" else multiplicative_weights
+        row_strategy, column_strategy, gap, iterations = learner(self.matrix, epsilon)
+        value = float(row_strategy @ self.matrix @ column_strategy)
+        return MixedStrategySolution(value, row_strategy, column_strategy, gap, iterations)
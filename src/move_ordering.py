@@ -0,0 +1,146 @@
+# move_ordering.py
+
+class MoveOrderer:
+    """
+    Base class for pluggable move ordering heuristics used by alpha-beta search.
+    Alpha-beta prunes the most when the best move is searched first, so the search engine
+    asks each orderer to rearrange the moves of a node before they are searched.
+
+    Moves are used as dictionary keys by some orderers, so they must be hashable.
+    """
+
+    def order(self, moves, ply, path):
+        """
+        Return the moves rearranged so that the most promising ones come first.
+        Implementations must use a stable ordering so that several orderers can be chained.
+
+        Args:
+            moves (list): The legal moves of the current node.
+            ply (int): The distance of the current node from the root of the search.
+            path (list): The moves played from the root to reach the current node.
+
+        Returns:
+            list: The reordered moves.
+        """
+        return moves
+
+    def record_cutoff(self, move, depth, ply):
+        """
+        Called by the search when a move causes a beta (or alpha) cutoff.
+
+        Args:
+            move: The move that caused the cutoff.
+            depth (int): The remaining search depth at the node where the cutoff happened.
+            ply (int): The distance of that node from the root of the search.
+        """
+
+    def search_completed(self, principal_variation):
+        """
+        Called by the search once a complete search has finished.
+
+        Args:
+            principal_variation (list): The sequence of best moves found from the root.
+        """
+
+    def advance(self, move):
+        """
+        Called when a move is played from the root of the previous search, so that what was learned
+        about the positions below it can be kept for the next search, which starts one ply deeper.
+
+        Args:
+            move: The move played.
+        """
+
+    def clear(self):
+        """
+        Forget everything learned from previous searches.
+        """
+
+
+class KillerMoves(MoveOrderer):
+    """
+    The killer move heuristic: moves that caused a cutoff at a given ply are likely to cause
+    a cutoff in sibling positions at the same ply, so they are tried first.
+    """
+
+    def __init__(self, slots=2):
+        """
+        Initializes the killer move table.
+
+        Args:
+            slots (int, optional): The number of killer moves remembered per ply. Defaults to 2.
+        """
+        self.slots = slots
+        self.killers = {}
+
+    def order(self, moves, ply, path):
+        killers = self.killers.get(ply)
+        if not killers:
+            return moves
+        return sorted(moves, key=lambda move: killers.index(move) if move in killers else self.slots)
+
+    def record_cutoff(self, move, depth, ply):
+        killers = self.killers.setdefault(ply, [])
+        if move in killers:
+            killers.remove(move)
+        killers.insert(0, move)
+        del killers[self.slots:]
+
+    def advance(self, move):
+        # Ply 1 of the previous search is the root of the next one
+        self.killers = {ply - 1: killers for ply, killers in self.killers.items() if ply > 0}
+
+    def clear(self):
+        self.killers = {}
+
+
+class HistoryHeuristic(MoveOrderer):
+    """
+    The history heuristic: every cutoff credits the move with a bonus that grows with the
+    remaining depth, and moves are searched in order of decreasing accumulated credit.
+    """
+
+    def __init__(self):
+        self.scores = {}
+
+    def order(self, moves, ply, path):
+        if not self.scores:
+            return moves
+        scores = self.scores
+        return sorted(moves, key=lambda move: -scores.get(move, 0))
+
+    def record_cutoff(self, move, depth, ply):
+        self.scores[move] = self.scores.get(move, 0) + depth * depth
+
+    def clear(self):
+        self.scores = {}
+
+
+class PreviousBestMove(MoveOrderer):
+    """
+    Searches the principal variation of the previous search first.
+    Combined with iterative deepening, this means every iteration starts by re-examining the line
+    the previous (shallower) iteration considered best.
+    """
+
+    def __init__(self):
+        self.principal_variation = []
+
+    def order(self, moves, ply, path):
+        principal_variation = self.principal_variation
+        if ply >= len(principal_variation) or path != principal_variation[:ply]:
+            return moves
+        best_move = principal_variation[ply]
+        if best_move not in moves:
+            return moves
+        return [best_move] + [move for move in moves if move != best_move]
+
+    def search_completed(self, principal_variation):
+        self.principal_variation = list(principal_variation)
+
+    def advance(self, move):
+        principal_variation = self.principal_variation
+        self.principal_variation = principal_variation[1:] if principal_variation[:1] == [move] else []
+
+    def clear(self):
+        self.principal_variation = []
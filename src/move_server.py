@@ -0,0 +1,530 @@
+# move_server.py
+
+import asyncio
+import json
+import logging
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import numpy as np
+
+from batch_solver import solve_batch
+from evaluation_cache import EvaluationCache
+from minimax_algorithm import MinimaxAlgorithm
+from move_ordering import HistoryHeuristic, KillerMoves, PreviousBestMove
+from reference_games import ConnectFourState
+from tic_tac_toe import TicTacToeState
+from transposition_table import TranspositionTable
+
+logger = logging.getLogger(__name__)
+
+# The commands queued for the worker processes; "stats" is answered by the server itself
+QUEUED_COMMANDS = ("best_move", "solve_matrix")
+
+# The time kept from a search's deadline to finish the nodes searched between two budget checks and send
+# the result back: the larger of a fixed margin, in seconds, and a fraction of the time the request allows
+DEADLINE_MARGIN = 0.01
+DEADLINE_SLACK = 0.1
+
+# The longest request line accepted, in bytes (payoff matrices can be large)
+LINE_LIMIT = 1 << 24
+
+# The games and engines of each worker process, set up by `_initialize_worker`
+_worker_games = None
+_worker_settings = None
+_worker_engines = {}
+
+
+def tic_tac_toe_position(position):
+    """
+    Args:
+        position (str or list of str): The 9 cells row by row, each "x", "o" or "b" (blank), as in data/dataset.csv.
+
+    Returns:
+        TicTacToeState: The position.
+    """
+    if len(position) != 9:
+        raise ValueError(f"A tic-tac-toe position has 9 cells, got {len(position)}")
+    return TicTacToeState.from_cells(position)
+
+
+def connect_four_position(position):
+    """
+    Args:
+        position (list of int): The columns played since the empty board.
+
+    Returns:
+        ConnectFourState: The position.
+    """
+    state = ConnectFourState()
+    for move in position:
+        if state.is_terminal() or move not in state.get_possible_moves():
+            raise ValueError(f"Illegal Connect Four move: {move!r}")
+        state.apply_move(move)
+    return state
+
+
+# Request games by name, each with the function turning a JSON position into a `GameState`
+GAMES = {
+    "tic_tac_toe": tic_tac_toe_position,
+    "connect_four": connect_four_position,
+}
+
+
+class DeadlineExceeded(Exception):
+    """
+    Raised for a request that could not be answered before its deadline.
+    """
+
+
+class LatencyHistogram:
+    """
+    A histogram of latencies in logarithmic buckets, each `resolution` times finer than a doubling, so that
+    percentiles are known to within a few percent whatever their magnitude, in constant memory.
+    """
+
+    def __init__(self, smallest=1e-5, resolution=8, buckets=320):
+        """
+        Creates an empty histogram.
+
+        Args:
+            smallest (float, optional): The upper bound of the first bucket, in seconds. Defaults to 10 microseconds.
+            resolution (int, optional): The buckets per doubling of the latency. Defaults to 8 (9% wide buckets).
+            buckets (int, optional): The number of buckets; larger latencies go to the last one.
+                                     Defaults to 320 (up to 10 hours).
+        """
+        self.smallest = smallest
+        self.resolution = resolution
+        self.counts = [0] * buckets
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+
+    def record(self, seconds):
+        """
+        Args:
+            seconds (float): A latency.
+        """
+        bucket = 0
+        if seconds > self.smallest:
+            bucket = min(len(self.counts) - 1, math.ceil(math.log2(seconds / self.smallest) * self.resolution))
+        self.counts[bucket] += 1
+        self.count += 1
+        self.total += seconds
+        self.maximum = max(self.maximum, seconds)
+
+    def percentile(self, percent):
+        """
+        Args:
+            percent (float): The percentile, between 0 and 100.
+
+        Returns:
+            float: The upper bound of the bucket holding the percentile, in seconds (0 if nothing was recorded).
+        """
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(self.count * percent / 100))
+        seen = 0
+        for bucket, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return min(self.maximum, self.smallest * 2 ** (bucket / self.resolution))
+        return self.maximum
+
+    def to_dict(self):
+        """
+        Returns:
+            dict: The count and the mean, p50, p90, p99 and maximum latencies, in milliseconds.
+        """
+        return {
+            "count": self.count,
+            "mean_ms": 1000 * self.total / self.count if self.count else 0.0,
+            "p50_ms": 1000 * self.percentile(50),
+            "p90_ms": 1000 * self.percentile(90),
+            "p99_ms": 1000 * self.percentile(99),
+            "max_ms": 1000 * self.maximum,
+        }
+
+
+def _initialize_worker(games, settings):
+    global _worker_games, _worker_settings
+    logging.disable(logging.INFO)
+    _worker_games = games
+    _worker_settings = settings
+    _worker_engines.clear()
+
+
+def _warm_up():
+    return os.getpid()
+
+
+def _engine(game):
+    # One engine per game and process, whose tables and caches serve all the later requests
+    engine = _worker_engines.get(game)
+    if engine is None:
+        engine = _worker_engines[game] = MinimaxAlgorithm(
+            None, move_ordering=[PreviousBestMove(), KillerMoves(), HistoryHeuristic()],
+            transposition_table=TranspositionTable(_worker_settings["transposition_table_size"]),
+            evaluation_cache=EvaluationCache(_worker_settings["evaluation_cache_size"]))
+    return engine
+
+
+def _best_move(request):
+    if request["deadline"] is not None and time.monotonic() >= request["deadline"]:
+        # Its turn came too late in the batch
+        return "expired", None
+    state = _worker_games[request["game"]](request["position"])
+    if state.is_terminal():
+        raise ValueError("The game is over in this position")
+    if request["depth"] is None and request["deadline"] is None and request["time_budget"] is None \
+            and request["node_budget"] is None:
+        raise ValueError("A best move needs a depth, a time budget, a node budget or a deadline")
+    engine = _engine(request["game"])
+    engine.depth_limit = request["depth"]
+    result = engine.search(state, state.current_player == 1, time_budget=request["time_budget"],
+                           deadline=request["deadline"], node_budget=request["node_budget"])
+    return "result", {
+        "move": result.move,
+        "score": result.score,
+        "depth": result.depth,
+        "nodes": result.nodes,
+        "principal_variation": result.principal_variation,
+        "completed": result.completed,
+    }
+
+
+def _solve_matrices(requests):
+    # Games of the same shape are solved together in one vectorized pass
+    outcomes = [None] * len(requests)
+    shapes = {}
+    for index, request in enumerate(requests):
+        try:
+            matrix = np.asarray(request["matrix"], dtype=float)
+        except (TypeError, ValueError) as error:
+            outcomes[index] = "error", f"Invalid payoff matrix: {error}"
+            continue
+        if matrix.ndim != 2 or not matrix.size:
+            outcomes[index] = "error", f"The payoff matrix must be a non-empty 2D array, got shape {matrix.shape}"
+            continue
+        if not np.isfinite(matrix).all():
+            # JSON decoding accepts NaN and Infinity, which have no equilibrium
+            outcomes[index] = "error", "The payoff matrix must only contain finite payoffs"
+            continue
+        shapes.setdefault(matrix.shape, []).append((index, matrix))
+    for members in shapes.values():
+        solution = solve_batch(np.stack([matrix for _, matrix in members]), mixed=True)
+        for game, (index, _) in enumerate(members):
+            outcomes[index] = "result", {
+                "value": float(solution.values[game]),
+                "row_strategy": solution.row_strategies[game].tolist(),
+                "column_strategy": solution.column_strategies[game].tolist(),
+                "saddle_point": bool(solution.has_saddle_point[game]),
+            }
+    return outcomes
+
+
+def _run_batch(command, requests):
+    """
+    Runs a batch of requests in a worker process. A failing request does not fail the others.
+
+    Returns:
+        list of tuple: ("result", value), ("error", message) or ("expired", None) for every request.
+    """
+    if command == "solve_matrix":
+        return _solve_matrices(requests)
+    outcomes = []
+    for request in requests:
+        try:
+            outcomes.append(_best_move(request))
+        except (KeyError, TypeError, ValueError) as error:
+            outcomes.append(("error", str(error)))
+    return outcomes
+
+
+class MoveServer:
+    """
+    A resident service answering JSON-lines requests, so that clients do not pay the interpreter start-up,
+    the imports and a cold search for every move. CPU-bound work runs in a pool of worker processes started
+    once, whose engines keep their transposition tables, move ordering heuristics and evaluation caches
+    from one request to the next.
+
+    Every request is a JSON object on one line, with an optional "id" echoed in its response and a "command":
+    - "best_move": the best move of a position ("game" and "position", see `GAMES`) within an optional "depth",
+      "time_budget" (seconds) and "node_budget". The result holds the move, its score and the search depth.
+    - "solve_matrix": the value and optimal mixed strategies of the zero-sum game with payoff "matrix".
+    - "stats": the request counters, queue lengths and latency percentiles of every command.
+    Responses are {"id": ..., "result": ...} or {"id": ..., "error": message, "code": code}, and are written
+    as soon as they are ready, so a connection may receive them in another order than its requests.
+
+    Requests wait in one bounded queue per command. Whenever a worker is free, the queued requests of a
+    command (up to its batch size) are sent to it together: batches stay small when the server is idle and
+    grow under load, saving round trips, and matrix games of the same shape are then solved in one vectorized
+    pass. A request has a "deadline" (seconds, by default `default_deadline`): searches stop in time to meet
+    it, and requests not answered by then fail with the "deadline_exceeded" code. When a queue is full, new
+    requests are refused at once with the "overloaded" code instead of piling up.
+    """
+
+    def __init__(self, workers=2, games=None, queue_size=256, batch_sizes=None, default_deadline=5.0,
+                 transposition_table_size=1 << 16, evaluation_cache_size=1 << 16):
+        """
+        Configures the server; `start` (or `async with`) starts its workers.
+
+        Args:
+            workers (int, optional): The number of worker processes. Defaults to 2.
+            games (dict, optional): The games of "best_move" requests by name, each with a picklable function turning
+                                    a JSON position into a `GameState`. Defaults to `GAMES`.
+            queue_size (int, optional): The requests of each command that may wait for a worker. Defaults to 256.
+            batch_sizes (dict, optional): The most requests of each command sent to a worker at once. Defaults to
+                                          4 for "best_move" (the searches of a batch run one after another) and
+                                          64 for "solve_matrix".
+            default_deadline (float, optional): The deadline of requests that do not give one, in seconds.
+                                                None means no deadline. Defaults to 5.
+            transposition_table_size (int, optional): The buckets of the transposition table of every worker
+                                                      engine. Defaults to 65536.
+            evaluation_cache_size (int, optional): The scores cached by every worker engine. Defaults to 65536.
+        """
+        self.workers = workers
+        self.games = GAMES if games is None else games
+        self.queue_size = queue_size
+        self.batch_sizes = {"best_move": 4, "solve_matrix": 64, **(batch_sizes or {})}
+        self.default_deadline = default_deadline
+        self.settings = {"transposition_table_size": transposition_table_size,
+                         "evaluation_cache_size": evaluation_cache_size}
+        self.counters = dict.fromkeys(("requests", "completed", "rejected", "expired", "failed", "batches",
+                                       "batched_requests"), 0)
+        self.latencies = {command: LatencyHistogram() for command in QUEUED_COMMANDS + ("stats",)}
+        self._executor = None
+        self._queues = {}
+        self._batchers = []
+        self._slots = None
+        self._started = None
+
+    async def start(self):
+        """
+        Starts the worker processes, waits until they are ready, and starts taking requests.
+        """
+        loop = asyncio.get_running_loop()
+        self._executor = ProcessPoolExecutor(self.workers, initializer=_initialize_worker,
+                                             initargs=(self.games, self.settings))
+        # Start every worker now rather than on the first requests
+        await asyncio.gather(*(loop.run_in_executor(self._executor, _warm_up) for _ in range(self.workers)))
+        self._slots = asyncio.Semaphore(self.workers)
+        self._queues = {command: asyncio.Queue(self.queue_size) for command in QUEUED_COMMANDS}
+        self._batchers = [asyncio.create_task(self._dispatch(command)) for command in QUEUED_COMMANDS]
+        self._started = time.monotonic()
+        logger.info("Move server started with %d workers", self.workers)
+
+    async def close(self):
+        """
+        Stops taking requests and stops the worker processes.
+        """
+        for batcher in self._batchers:
+            batcher.cancel()
+        await asyncio.gather(*self._batchers, return_exceptions=True)
+        self._batchers = []
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def handle(self, request):
+        """
+        Answers one request.
+
+        Args:
+            request (dict): The decoded request.
+
+        Returns:
+            dict: The response.
+        """
+        received = time.monotonic()
+        self.counters["requests"] += 1
+        if not isinstance(request, dict):
+            return self._error(None, "invalid_request", "A request must be a JSON object")
+        request_id = request.get("id")
+        command = request.get("command")
+        try:
+            if command == "stats":
+                result = self.stats()
+            elif command in self._queues:
+                result = await self._submit(command, request, received)
+            else:
+                return self._error(request_id, "invalid_request", f"Unknown command: {command!r}")
+        except asyncio.QueueFull:
+            self.counters["rejected"] += 1
+            return self._error(request_id, "overloaded", f"Too many {command} requests are waiting")
+        except (DeadlineExceeded, asyncio.TimeoutError):
+            self.counters["expired"] += 1
+            return self._error(request_id, "deadline_exceeded", "The deadline passed before the answer was ready")
+        except (KeyError, TypeError, ValueError) as error:
+            return self._error(request_id, "invalid_request", str(error))
+        except Exception as error:
+            logger.exception("Request %r failed", request_id)
+            return self._error(request_id, "failed", f"{type(error).__name__}: {error}")
+        self.counters["completed"] += 1
+        self.latencies[command].record(time.monotonic() - received)
+        return {"id": request_id, "result": result}
+
+    def _error(self, request_id, code, message):
+        if code != "deadline_exceeded" and code != "overloaded":
+            self.counters["failed"] += 1
+        return {"id": request_id, "error": message, "code": code}
+
+    async def _submit(self, command, request, received):
+        timeout = request.get("deadline", self.default_deadline)
+        deadline = None if timeout is None else received + float(timeout)
+        if command == "best_move":
+            if request.get("game") not in self.games:
+                raise ValueError(f"Unknown game: {request.get('game')!r}")
+            work = {"game": request["game"], "position": request.get("position"),
+                    "depth": request.get("depth"), "time_budget": request.get("time_budget"),
+                    "node_budget": request.get("node_budget"),
+                    "deadline": None if deadline is None else
+                    deadline - max(DEADLINE_MARGIN, DEADLINE_SLACK * float(timeout))}
+        else:
+            work = {"matrix": request.get("matrix")}
+        future = asyncio.get_running_loop().create_future()
+        self._queues[command].put_nowait((work, deadline, future))
+        if deadline is None:
+            return await future
+        return await asyncio.wait_for(future, deadline - time.monotonic())
+
+    async def _dispatch(self, command):
+        # Sends the queued requests of a command to the workers, as many at once as the batch size allows
+        queue = self._queues[command]
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await queue.get()]
+            await self._slots.acquire()
+            while len(batch) < self.batch_sizes[command] and not queue.empty():
+                batch.append(queue.get_nowait())
+            now = time.monotonic()
+            pending = []
+            for work, deadline, future in batch:
+                if future.done():
+                    # Given up on while queued
+                    continue
+                if deadline is not None and deadline <= now:
+                    future.set_exception(DeadlineExceeded())
+                    continue
+                pending.append((work, future))
+            if not pending:
+                self._slots.release()
+                continue
+            self.counters["batches"] += 1
+            self.counters["batched_requests"] += len(pending)
+            outcomes = loop.run_in_executor(self._executor, _run_batch, command, [work for work, _ in pending])
+            outcomes.add_done_callback(partial(self._deliver, [future for _, future in pending]))
+
+    def _deliver(self, futures, outcomes):
+        self._slots.release()
+        if outcomes.cancelled():
+            return
+        error = outcomes.exception()
+        for index, future in enumerate(futures):
+            if future.done():
+                continue
+            if error is not None:
+                future.set_exception(error)
+                continue
+            kind, value = outcomes.result()[index]
+            if kind == "result":
+                future.set_result(value)
+            elif kind == "expired":
+                future.set_exception(DeadlineExceeded())
+            else:
+                future.set_exception(ValueError(value))
+
+    def stats(self):
+        """
+        Returns:
+            dict: The request counters, the mean batch size, the queue lengths and the latency of every command.
+        """
+        batches = self.counters["batches"]
+        return {
+            "uptime": time.monotonic() - self._started if self._started is not None else 0.0,
+            "workers": self.workers,
+            **self.counters,
+            "mean_batch_size": self.counters["batched_requests"] / batches if batches else 0.0,
+            "queued": {command: queue.qsize() for command, queue in self._queues.items()},
+            "latency": {command: histogram.to_dict() for command, histogram in self.latencies.items()},
+        }
+
+    async def handle_line(self, line):
+        """
+        Args:
+            line (bytes or str): A JSON-encoded request.
+
+        Returns:
+            dict: The response.
+        """
+        try:
+            request = json.loads(line)
+        except ValueError as error:
+            self.counters["requests"] += 1
+            return self._error(None, "invalid_request", f"Invalid JSON: {error}")
+        return await self.handle(request)
+
+    async def serve_stream(self, reader, writer):
+        """
+        Answers the requests read from a stream until its end, then closes the writer.
+
+        Args:
+            reader (asyncio.StreamReader): The requests, one JSON object per line.
+            writer (asyncio.StreamWriter): Where the responses are written, one per line.
+        """
+        lock = asyncio.Lock()
+        answers = set()
+
+        async def answer(line):
+            response = await self.handle_line(line)
+            async with lock:
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if line.strip():
+                    task = asyncio.create_task(answer(line))
+                    answers.add(task)
+                    task.add_done_callback(answers.discard)
+            # The requests read before the end are still answered
+            await asyncio.gather(*answers)
+        finally:
+            writer.close()
+
+    async def serve_socket(self, path):
+        """
+        Listens on a Unix domain socket, answering every connection with `serve_stream`.
+
+        Args:
+            path (str): The path of the socket.
+
+        Returns:
+            asyncio.Server: The listening server.
+        """
+        return await asyncio.start_unix_server(self.serve_stream, path, limit=LINE_LIMIT)
+
+    async def serve_stdio(self):
+        """
+        Answers the requests of the standard input on the standard output, until the input ends.
+        """
+        loop = asyncio.get_running_loop()
+        reader = asyncio.StreamReader(limit=LINE_LIMIT)
+        await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
+        transport, protocol = await loop.connect_write_pipe(asyncio.streams.FlowControlMixin, sys.stdout)
+        writer = asyncio.StreamWriter(transport, protocol, reader, loop)
+        await self.serve_stream(reader, writer)
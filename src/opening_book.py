@@ -0,0 +1,242 @@
+# opening_book.py
+
+import struct
+
+import numpy as np
+
+from minimax_algorithm import MinimaxAlgorithm
+from move_ordering import HistoryHeuristic, KillerMoves, PreviousBestMove
+from transposition_table import MASK_64, TranspositionTable
+
+MAGIC = b"GTOB"
+VERSION = 2
+HEADER = struct.Struct("<4sHHQ")  # Magic, version, bytes per record, number of records
+
+# One record per position and side to move, sorted by key. The move is stored as its index in
+# `get_possible_moves()`, so that records have a fixed size whatever the moves of the game are.
+RECORD = np.dtype([("key", "<u8"), ("score", "<f8"), ("visits", "<u4"), ("move", "<u2"), ("depth", "<u2")])
+
+
+def book_key(key, maximizing_player):
+    """
+    The key of a position in an opening book: its `hash_key` and the side to move, since the same position
+    has a different best move and score for each side (as in `MinimaxAlgorithm`'s transposition table keys).
+
+    Args:
+        key (int): The `hash_key` of the position.
+        maximizing_player (bool): Whether the player to move maximizes the payoff.
+
+    Returns:
+        int: A 64-bit key.
+    """
+    return ((key << 1) | bool(maximizing_player)) & MASK_64
+
+
+class OpeningBookBuilder:
+    """
+    Collects the early positions of a game, from self-play games and from the first plies of the game tree,
+    then searches each of them deeply once and writes the results to an opening book file.
+    Positions are identified by `hash_key`, so the game's states must provide one.
+    """
+
+    def __init__(self, max_ply=8):
+        """
+        Creates an empty builder.
+
+        Args:
+            max_ply (int, optional): Positions of games are collected up to this many moves from their start.
+                                     Defaults to 8.
+        """
+        self.max_ply = max_ply
+        self.positions = {}  # Book key: [state, maximizing player, visits]
+
+    def _add(self, state, maximizing_player, visits):
+        key = state.hash_key()
+        if key is None:
+            raise ValueError("Opening book positions must provide a hash_key")
+        if state.is_terminal():
+            return
+        key = book_key(key, maximizing_player)
+        entry = self.positions.get(key)
+        if entry is None:
+            self.positions[key] = [state, maximizing_player, visits]
+        else:
+            entry[2] += visits
+
+    def add_game(self, state, moves, maximizing_player=True):
+        """
+        Counts a visit of every position of a game, up to `max_ply`.
+
+        Args:
+            state (GameState): The initial state of the game.
+            moves (list): The moves played.
+            maximizing_player (bool, optional): Whether the player to move first maximizes the payoff. Defaults to True.
+        """
+        for move in moves[:self.max_ply]:
+            chance = state.is_chance()
+            if not chance:
+                self._add(state, maximizing_player, 1)
+            state = state.make_move(move)
+            if not chance:
+                maximizing_player = not maximizing_player
+
+    def add_self_play(self, self_play):
+        """
+        Counts the positions of a game played by a `SelfPlay`, after `play`.
+
+        Args:
+            self_play (SelfPlay): The finished self-play game.
+        """
+        self.add_game(self_play.game, self_play.moves)
+
+    def add_tree(self, state, plies, maximizing_player=True):
+        """
+        Adds every position within a number of moves of a state, so that the book also covers lines
+        that self-play never chose. Chance states are expanded but not added, and do not change the side to move.
+
+        Args:
+            state (GameState): The initial state.
+            plies (int): The number of moves to expand, chance moves included.
+            maximizing_player (bool, optional): Whether the player to move maximizes the payoff. Defaults to True.
+        """
+        frontier = [(state, maximizing_player)]
+        for _ in range(plies + 1):
+            next_frontier = []
+            for position, maximizing_player in frontier:
+                if position.is_terminal():
+                    continue
+                if position.is_chance():
+                    next_frontier.extend((position.make_move(move), maximizing_player)
+                                         for move, _ in position.chance_outcomes())
+                    continue
+                if book_key(position.hash_key(), maximizing_player) in self.positions:
+                    continue
+                self._add(position, maximizing_player, 0)
+                next_frontier.extend((position.make_move(move), not maximizing_player)
+                                     for move in position.get_possible_moves())
+            frontier = next_frontier
+
+    def build(self, path, depth, minimax_algorithm=None, min_visits=0, progress=None):
+        """
+        Searches every collected position and writes the book.
+
+        Args:
+            path (str): The file to write.
+            depth (int): The depth of the search of every position.
+            minimax_algorithm (MinimaxAlgorithm, optional): The search to use. Defaults to alpha-beta with move
+                                                            ordering and a transposition table shared by all the
+                                                            positions.
+            min_visits (int, optional): Positions visited fewer times by the games are left out. Defaults to 0.
+            progress (callable, optional): Called with (positions searched, positions to search) after every
+                                           search. Defaults to None.
+
+        Returns:
+            int: The number of positions in the book.
+        """
+        if depth >= 1 << 16:
+            raise ValueError(f"A search depth of {depth} does not fit in an opening book record")
+        if minimax_algorithm is None:
+            minimax_algorithm = MinimaxAlgorithm(None, move_ordering=[PreviousBestMove(), KillerMoves(),
+                                                                      HistoryHeuristic()],
+                                                 transposition_table=TranspositionTable())
+        selected = [(key, entry) for key, entry in self.positions.items() if entry[2] >= min_visits]
+        records = np.zeros(len(selected), dtype=RECORD)
+        for index, (key, (state, maximizing_player, visits)) in enumerate(selected):
+            score, move = minimax_algorithm.alpha_beta(state, depth, maximizing_player)
+            records[index] = (key, score, min(visits, (1 << 32) - 1), state.get_possible_moves().index(move), depth)
+            if progress is not None:
+                progress(index + 1, len(selected))
+        records.sort(order="key")
+        with open(path, "wb") as output:
+            output.write(HEADER.pack(MAGIC, VERSION, RECORD.itemsize, len(records)))
+            output.write(records.tobytes())
+        return len(records)
+
+
+class OpeningBook:
+    """
+    An opening book file written by `OpeningBookBuilder`, probed with a binary search over its sorted keys
+    through a memory map, so that opening it costs nothing whatever its size and processes probing the same
+    file share one copy of it. Passed as `opening_book` to `MinimaxAlgorithm`, it answers the positions it
+    knows before any search, with the move and score of a deeper search made once offline.
+    """
+
+    def __init__(self, path, min_depth=0):
+        """
+        Opens a book.
+
+        Args:
+            path (str): The book file.
+            min_depth (int, optional): Entries searched less deeply are ignored. Defaults to 0.
+        """
+        with open(path, "rb") as file:
+            header = file.read(HEADER.size)
+        if len(header) != HEADER.size:
+            raise ValueError(f"{path} is not an opening book")
+        magic, version, width, size = HEADER.unpack(header)
+        if magic != MAGIC or version != VERSION or width != RECORD.itemsize:
+            raise ValueError(f"{path} is not a version {VERSION} opening book")
+        self.path = path
+        self.min_depth = min_depth
+        self.records = np.memmap(path, dtype=RECORD, mode="r", offset=HEADER.size, shape=(size,)) if size else \
+            np.zeros(0, dtype=RECORD)
+        self._keys = self.records["key"]
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, key, maximizing_player=True):
+        """
+        Args:
+            key (int): The `hash_key` of a position.
+            maximizing_player (bool, optional): Whether the player to move maximizes the payoff. Defaults to True.
+
+        Returns:
+            numpy.void: The record of the position (key, score, visits, move index, depth), or None if
+                        the position is not in the book for that side.
+        """
+        key = np.uint64(book_key(key, maximizing_player))
+        index = int(np.searchsorted(self._keys, key))
+        if index < len(self._keys) and self._keys[index] == key:
+            return self.records[index]
+        return None
+
+    def probe(self, state, maximizing_player=True):
+        """
+        Looks up a position, for `MinimaxAlgorithm`.
+
+        Args:
+            state (GameState): A position.
+            maximizing_player (bool, optional): Whether the player to move maximizes the payoff. Defaults to True.
+
+        Returns:
+            tuple: (score, best move, search depth) of the position, or None if the book does not know it.
+        """
+        key = state.hash_key()
+        record = self.lookup(key, maximizing_player) if key is not None else None
+        if record is not None and record["depth"] >= self.min_depth:
+            moves = state.get_possible_moves()
+            index = int(record["move"])
+            # A move index out of range means another position with the same hash
+            if index < len(moves):
+                self.hits += 1
+                return float(record["score"]), moves[index], int(record["depth"])
+        self.misses += 1
+        return None
+
+    def hit_rate(self):
+        """
+        Returns:
+            float: The fraction of probes that found their position.
+        """
+        probes = self.hits + self.misses
+        return self.hits / probes if probes else 0.0
+
+    def __len__(self):
+        return len(self.records)
+
+    def __getstate__(self):
+        # Other processes map the file again instead of receiving a copy of it
+        return {"path": self.path, "min_depth": self.min_depth}
+
+    def __setstate__(self, state):
+        self.__init__(state["path"], state["min_depth"])
@@ -0,0 +1,264 @@
+# parallel_search.py
+
+import copy
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from minimax_algorithm import SearchResult
+from move_ordering import MoveOrderer
+from transposition_table import SharedTranspositionTable
+
+# The search of each worker process, set up by `_initialize_worker`
+_worker_algorithm = None
+_shared_bound = None
+_stop = None
+
+
+class RootRotation(MoveOrderer):
+    """
+    Rotates the moves of the root by a fixed offset, so that Lazy SMP helpers start their searches
+    on different moves and fill the shared transposition table with different subtrees.
+    """
+
+    def __init__(self, offset=0):
+        self.offset = offset
+
+    def order(self, moves, ply, path):
+        if ply > 0 or not moves:
+            return moves
+        offset = self.offset % len(moves)
+        return moves[offset:] + moves[:offset]
+
+
+def _initialize_worker(algorithm, shared_bound, stop, table):
+    global _worker_algorithm, _shared_bound, _stop
+    logging.disable(logging.INFO)
+    _worker_algorithm = algorithm
+    _shared_bound = shared_bound
+    _stop = stop
+    if table is not None:
+        algorithm.transposition_table = table
+        algorithm.move_ordering.insert(0, RootRotation())
+
+
+def _reset(algorithm):
+    for orderer in algorithm.move_ordering:
+        orderer.clear()
+    if algorithm.transposition_table is not None:
+        algorithm.transposition_table.clear()
+
+
+def _improves(score, bound, maximizing_player):
+    return score > bound if maximizing_player else score < bound
+
+
+def _search_root_moves(state, depth, maximizing_player, moves, bound, deterministic):
+    """
+    Searches some of the root moves in a worker. Each move is searched with a window that only
+    proves whether it beats the best root move known so far, which is shared between the workers
+    unless the search must be deterministic. Every result carries the bound its move was searched with:
+    a score that does not beat it is only a bound on the score of the move.
+    """
+    algorithm = _worker_algorithm
+    if deterministic:
+        _reset(algorithm)
+    results = []
+    nodes = 0
+    for move in moves:
+        if not deterministic:
+            shared = _shared_bound.value
+            if _improves(shared, bound, maximizing_player):
+                bound = shared
+        child = state.make_move(move)
+        if maximizing_player:
+            score, _ = algorithm.alpha_beta(child, depth - 1, False, alpha=bound)
+        else:
+            score, _ = algorithm.alpha_beta(child, depth - 1, True, beta=bound)
+        nodes += algorithm.nodes_searched
+        results.append((move, score, algorithm.principal_variation, bound))
+        if _improves(score, bound, maximizing_player):
+            bound = score
+            if not deterministic:
+                with _shared_bound.get_lock():
+                    if _improves(score, _shared_bound.value, maximizing_player):
+                        _shared_bound.value = score
+    return results, nodes
+
+
+def _stop_requested():
+    return _stop.value != 0
+
+
+def _lazy_smp_helper(state, depth, maximizing_player, helper):
+    """
+    Searches the root in a worker until the main search is done, filling the shared transposition table.
+    Odd helpers search one ply deeper than the main search, and each helper starts on a different root move.
+    """
+    algorithm = _worker_algorithm
+    algorithm.depth_limit = depth + helper % 2
+    algorithm.move_ordering[0].offset = helper
+    result = algorithm.search(state, maximizing_player, should_stop=_stop_requested)
+    return result.nodes
+
+
+class ParallelSearch:
+    """
+    Searches a position with alpha-beta on several worker processes.
+
+    Two modes are available:
+    1. "root_split": the first root move is searched in this process (the eldest brother, as in Young
+       Brothers Wait), then the other root moves are spread over the workers, which share the score of
+       the best root move found so far so that they prune each other's searches.
+    2. "lazy_smp": this process searches the position as usual while the workers search it too, in a
+       slightly different order and to different depths; all of them share a transposition table in
+       shared memory, so this process finds much of its tree already searched.
+
+    In "root_split" mode the score is the alpha-beta score of the position at the requested depth. With
+    `deterministic` set, the workers search fixed groups of moves without sharing bounds and start from
+    cleared heuristics, so the move, principal variation and node count are the same in every run (and the
+    move is the first root move with the best score). Otherwise, among moves with the same score, the one
+    returned depends on the timing of the workers.
+
+    In "lazy_smp" mode the main search probes the entries of helpers that searched one ply deeper, so its
+    score may come from those deeper searches and differ from a fixed-depth alpha-beta score, as it does
+    when a transposition table is kept between searches.
+    """
+
+    def __init__(self, minimax_algorithm, workers=None, mode="root_split", deterministic=False,
+                 shared_table_size=1 << 16):
+        """
+        Initializes the search. The worker processes are started on the first search.
+
+        Args:
+            minimax_algorithm (MinimaxAlgorithm): The search to run in parallel. Every worker gets its own copy,
+                                                  with the same move ordering and search options.
+            workers (int, optional): The number of worker processes. Defaults to the number of CPUs.
+            mode (str, optional): "root_split" or "lazy_smp". Defaults to "root_split".
+            deterministic (bool, optional): Whether "root_split" results must be reproducible. Defaults to False.
+            shared_table_size (int, optional): The number of buckets of the shared transposition table of
+                                               "lazy_smp". Defaults to 65536.
+        """
+        if mode not in ("root_split", "lazy_smp"):
+            raise ValueError(f"Unknown parallel search mode: {mode!r}")
+        if deterministic and mode == "lazy_smp":
+            raise ValueError("Lazy SMP results depend on the timing of the workers and cannot be deterministic")
+        self.workers = workers if workers is not None else os.cpu_count() or 1
+        self.mode = mode
+        self.deterministic = deterministic
+        self.algorithm = copy.deepcopy(minimax_algorithm)
+        self.table = None
+        if mode == "lazy_smp":
+            self.table = SharedTranspositionTable(shared_table_size)
+            self.algorithm.transposition_table = self.table
+        self.nodes_searched = 0
+        self.principal_variation = []
+        self._template = minimax_algorithm
+        self._shared_bound = multiprocessing.Value('d', 0.0)
+        self._stop = multiprocessing.Value('b', 0, lock=False)
+        self._executor = None
+
+    def _pool(self):
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                self.workers, initializer=_initialize_worker,
+                initargs=(self._template, self._shared_bound, self._stop, self.table))
+        return self._executor
+
+    def search(self, state, depth, maximizing_player=True):
+        """
+        Searches the position to a fixed depth.
+
+        Args:
+            state (GameState): The position to search. It must be picklable to be sent to the workers.
+            depth (int): The search depth.
+            maximizing_player (bool, optional): Whether the player to move maximizes the payoff. Defaults to True.
+
+        Returns:
+            SearchResult: The score, best move and principal variation, with the nodes searched by all processes.
+        """
+        start = time.monotonic()
+        if self.mode == "lazy_smp":
+            result = self._lazy_smp(state, depth, maximizing_player)
+        else:
+            result = self._root_split(state, depth, maximizing_player)
+        result.elapsed = time.monotonic() - start
+        self.nodes_searched = result.nodes
+        self.principal_variation = result.principal_variation
+        return result
+
+    def _root_split(self, state, depth, maximizing_player):
+        algorithm = self.algorithm
+        if self.deterministic:
+            _reset(algorithm)
+        if depth == 0 or state.is_terminal():
+            score, move = algorithm.alpha_beta(state, depth, maximizing_player)
+            return SearchResult(score, move, depth, algorithm.nodes_searched, 0.0, [], True)
+        moves = state.get_possible_moves()
+        for orderer in reversed(algorithm.move_ordering):
+            moves = orderer.order(moves, 0, [])
+
+        # The eldest brother is searched first, alone, to give the workers a bound to prune with
+        eldest = moves[0]
+        best_score, _ = algorithm.alpha_beta(state.make_move(eldest), depth - 1, not maximizing_player)
+        best_move = eldest
+        principal_variation = [eldest] + algorithm.principal_variation
+        nodes = 1 + algorithm.nodes_searched
+        self._shared_bound.value = best_score
+
+        others = moves[1:]
+        if self.deterministic:
+            groups = [others[worker::self.workers] for worker in range(self.workers)]
+        else:
+            groups = [[move] for move in others]
+        futures = [self._pool().submit(_search_root_moves, state, depth, maximizing_player, group, best_score,
+                                       self.deterministic)
+                   for group in groups if group]
+        results = {}
+        for future in futures:
+            group_results, group_nodes = future.result()
+            nodes += group_nodes
+            for move, score, variation, bound in group_results:
+                results[move] = (score, variation, bound)
+        # Combined in root move order, so equal scores go to the earliest move. A move that failed to beat its
+        # bound is no better than the move that set the bound, even when its score ties the best one
+        for move in others:
+            score, variation, bound = results[move]
+            if _improves(score, bound, maximizing_player) and _improves(score, best_score, maximizing_player):
+                best_score, best_move = score, move
+                principal_variation = [move] + variation
+        for orderer in algorithm.move_ordering:
+            orderer.search_completed(principal_variation)
+        return SearchResult(best_score, best_move, depth, nodes, 0.0, principal_variation, True)
+
+    def _lazy_smp(self, state, depth, maximizing_player):
+        self._stop.value = 0
+        helpers = [self._pool().submit(_lazy_smp_helper, state, depth, maximizing_player, helper)
+                   for helper in range(1, self.workers)]
+        try:
+            self.algorithm.depth_limit = depth
+            result = self.algorithm.search(state, maximizing_player)
+        finally:
+            self._stop.value = 1
+            helper_nodes = sum(future.result() for future in helpers)
+        result.nodes += helper_nodes
+        return result
+
+    def close(self):
+        """
+        Stops the worker processes and frees the shared transposition table.
+        """
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        if self.table is not None:
+            self.table.close()
+            self.table = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,299 @@
+# reference_games.py
+
+from itertools import permutations, product
+
+from cfr import InformationSetState
+from minimax_algorithm import GameState
+
+MASK_64 = (1 << 64) - 1
+
+
+def mix64(value):
+    """
+    Scrambles an integer into a well-distributed 64-bit value (the SplitMix64 finalizer).
+    Used to derive reproducible pseudo-random scores and hashes from node identifiers.
+
+    Args:
+        value (int): The value to scramble.
+
+    Returns:
+        int: A 64-bit scrambled value.
+    """
+    value = (value + 0x9E3779B97F4A7C15) & MASK_64
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & MASK_64
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & MASK_64
+    return value ^ (value >> 31)
+
+
+class UniformTreeState(GameState):
+    """
+    A synthetic game tree with a fixed branching factor and height, used as a reference for benchmarks.
+    Every node is identified by its index in breadth-first order, from which its pseudo-random score and
+    hash are derived, so states are tiny and cheap to create and the tree is the same in every run.
+    """
+
+    def __init__(self, branching=5, height=8, seed=0, node_id=0, ply=0):
+        """
+        Initializes a node of the tree (the root by default).
+
+        Args:
+            branching (int, optional): The number of moves at every non-terminal node. Defaults to 5.
+            height (int, optional): The ply at which every node is terminal. Defaults to 8.
+            seed (int, optional): Selects one of many different trees with the same shape. Defaults to 0.
+            node_id (int, optional): The breadth-first index of the node. Defaults to 0 (the root).
+            ply (int, optional): The distance of the node from the root. Defaults to 0.
+        """
+        super().__init__()
+        self.branching = branching
+        self.height = height
+        self.seed = seed
+        self.node_id = node_id
+        self.ply = ply
+        self.current_player = 1 if ply % 2 == 0 else 2
+
+    def is_terminal(self):
+        return self.ply >= self.height
+
+    def evaluate(self):
+        # Scores are integers in [-1000, 1000]
+        return mix64(self.node_id ^ (self.seed << 48)) % 2001 - 1000
+
+    def get_possible_moves(self):
+        return list(range(self.branching))
+
+    def make_move(self, move):
+        return UniformTreeState(self.branching, self.height, self.seed,
+                                self.node_id * self.branching + move + 1, self.ply + 1)
+
+    def apply_move(self, move):
+        self.node_id = self.node_id * self.branching + move + 1
+        self.ply += 1
+        self.current_player = 3 - self.current_player
+
+    def undo_move(self, move):
+        self.node_id = (self.node_id - move - 1) // self.branching
+        self.ply -= 1
+        self.current_player = 3 - self.current_player
+
+    def hash_key(self):
+        return mix64(self.node_id + (self.seed << 56))
+
+
+class ConnectFourState(GameState):
+    """
+    Connect Four on a bitboard, a reference game with the size and branching of a real board game.
+    Each column takes `rows + 1` bits, the extra one staying empty so that lines cannot wrap around
+    from one column to the next. Player 1 maximizes. Moves are applied in place or copied, and moves
+    are listed center columns first, which is what a good move ordering for Connect Four starts from.
+    """
+
+    WIN_SCORE = 1000
+
+    def __init__(self, columns=7, rows=6):
+        """
+        Initializes an empty board.
+
+        Args:
+            columns (int, optional): The number of columns. Defaults to 7.
+            rows (int, optional): The number of rows. Defaults to 6.
+        """
+        super().__init__()
+        self.columns = columns
+        self.rows = rows
+        self.boards = [0, 0]
+        self.heights = [column * (rows + 1) for column in range(columns)]
+        self.moves_played = 0
+        self.center = sum(1 << (columns // 2 * (rows + 1) + row) for row in range(rows))
+        self.move_order = sorted(range(columns), key=lambda column: abs(2 * column - columns + 1))
+
+    def _lines(self, board, length):
+        # The number of aligned runs of `length` pieces, in all four directions
+        count = 0
+        for shift in (1, self.rows + 1, self.rows, self.rows + 2):
+            run = board
+            for _ in range(length - 1):
+                run &= run >> shift
+            count += run.bit_count()
+        return count
+
+    def is_terminal(self):
+        return (self.moves_played == self.columns * self.rows
+                or self._lines(self.boards[0], 4) > 0 or self._lines(self.boards[1], 4) > 0)
+
+    def evaluate(self):
+        if self._lines(self.boards[0], 4):
+            return self.WIN_SCORE
+        if self._lines(self.boards[1], 4):
+            return -self.WIN_SCORE
+        # Center pieces and pairs of aligned pieces
+        first, second = self.boards
+        return (3 * ((first & self.center).bit_count() - (second & self.center).bit_count())
+                + self._lines(first, 2) - self._lines(second, 2))
+
+    def get_possible_moves(self):
+        top = self.rows + 1
+        return [column for column in self.move_order if self.heights[column] < column * top + self.rows]
+
+    def make_move(self, move):
+        child = object.__new__(type(self))
+        child.columns = self.columns
+        child.rows = self.rows
+        child.boards = list(self.boards)
+        child.heights = list(self.heights)
+        child.moves_played = self.moves_played
+        child.center = self.center
+        child.move_order = self.move_order
+        child.current_player = self.current_player
+        child.apply_move(move)
+        return child
+
+    def apply_move(self, move):
+        self.boards[self.current_player - 1] |= 1 << self.heights[move]
+        self.heights[move] += 1
+        self.moves_played += 1
+        self.current_player = 3 - self.current_player
+
+    def undo_move(self, move):
+        self.current_player = 3 - self.current_player
+        self.moves_played -= 1
+        self.heights[move] -= 1
+        self.boards[self.current_player - 1] &= ~(1 << self.heights[move])
+
+    def hash_key(self):
+        first, second = self.boards
+        return mix64(first) ^ mix64(second + (1 << 63))
+
+
+class KuhnPokerState(InformationSetState):
+    """
+    Kuhn poker, the smallest poker game with hidden information, as a reference for `CFRSolver`.
+    Each player antes 1 and is dealt one of three cards (jack, queen, king). Players then pass ("p") or
+    bet 1 ("b") in turn; a bet must be called ("b") or folded ("p"). The higher card wins a showdown.
+    Its equilibrium value for player 1 is `GAME_VALUE`.
+    """
+
+    CARDS = ("J", "Q", "K")
+    GAME_VALUE = -1 / 18
+    TERMINAL_HISTORIES = ("pp", "bp", "bb", "pbp", "pbb")
+
+    def __init__(self, cards=None, history=""):
+        """
+        Initializes a state (the deal by default).
+
+        Args:
+            cards (tuple, optional): The card of each player, as indices into `CARDS`. Defaults to None (not dealt).
+            history (str, optional): The actions played since the deal. Defaults to "".
+        """
+        super().__init__()
+        self.cards = cards
+        self.history = history
+        self.current_player = 1 + len(history) % 2
+
+    def is_terminal(self):
+        return self.history in self.TERMINAL_HISTORIES
+
+    def is_chance(self):
+        return self.cards is None
+
+    def chance_outcomes(self):
+        deals = list(permutations(range(len(self.CARDS)), 2))
+        return [(deal, 1 / len(deals)) for deal in deals]
+
+    def evaluate(self):
+        # A fold loses the ante to the bettor
+        if self.history == "bp":
+            return 1
+        if self.history == "pbp":
+            return -1
+        stake = 2 if self.history.endswith("bb") else 1
+        return stake if self.cards[0] > self.cards[1] else -stake
+
+    def get_possible_moves(self):
+        return ["p", "b"]
+
+    def make_move(self, move):
+        if self.cards is None:
+            return KuhnPokerState(move, self.history)
+        return KuhnPokerState(self.cards, self.history + move)
+
+    def information_set(self):
+        return self.CARDS[self.cards[self.current_player - 1]] + self.history
+
+
+class DiceRaceState(GameState):
+    """
+    A dice race with chance states, the reference game for `ExpectiminimaxAlgorithm`.
+    In turn, each player chooses how many dice to roll, from 1 to `max_dice`, and scores their sum unless
+    one of them shows a 1, in which case the roll scores nothing: more dice score more but bust more often.
+    The first player to reach `target` wins. Chance moves are the dice in the order they are rolled, so a
+    roll of three dice is a chance state with 216 equally likely outcomes.
+    Scores are within `bounds`: a win is worth `target` and other states are scored by the difference of
+    the players' scores, counting the expected score of dice about to be rolled.
+    """
+
+    def __init__(self, target=30, max_dice=3, scores=(0, 0), current_player=1, dice=0):
+        """
+        Initializes a state (the start of the game by default).
+
+        Args:
+            target (int, optional): The score that wins. Defaults to 30.
+            max_dice (int, optional): The most dice rolled in one turn. Defaults to 3.
+            scores (tuple, optional): The scores of player 1 and player 2. Defaults to (0, 0).
+            current_player (int, optional): The player to move (1 or 2). Defaults to 1.
+            dice (int, optional): The number of dice about to be rolled for the other player, at chance states.
+                                  Defaults to 0 (a decision state).
+        """
+        super().__init__()
+        self.target = target
+        self.max_dice = max_dice
+        self.scores = scores
+        self.current_player = current_player
+        self.dice = dice
+
+    @property
+    def bounds(self):
+        """
+        tuple: The lowest and highest scores `evaluate` can return.
+        """
+        return -self.target, self.target
+
+    def is_terminal(self):
+        return max(self.scores) >= self.target
+
+    def is_chance(self):
+        return self.dice > 0 and not self.is_terminal()
+
+    def chance_outcomes(self):
+        rolls = list(product(range(1, 7), repeat=self.dice))
+        return [(roll, 1 / len(rolls)) for roll in rolls]
+
+    def evaluate(self):
+        first, second = self.scores
+        if first >= self.target:
+            return self.target
+        if second >= self.target:
+            return -self.target
+        difference = first - second
+        if self.dice:
+            # The roller scores 4 on average per die, if none of them shows a 1
+            expected = 4 * self.dice * (5 / 6) ** self.dice
+            difference += expected if self.current_player == 2 else -expected
+        return max(-self.target + 1, min(self.target - 1, difference))
+
+    def get_possible_moves(self):
+        if self.dice:
+            return [roll for roll, _ in self.chance_outcomes()]
+        # Most dice first, usually the best move away from the end of the race
+        return list(range(self.max_dice, 0, -1))
+
+    def make_move(self, move):
+        if not self.dice:
+            return DiceRaceState(self.target, self.max_dice, self.scores, 3 - self.current_player, move)
+        points = 0 if 1 in move else sum(move)
+        scores = list(self.scores)
+        scores[2 - self.current_player] += points
+        return DiceRaceState(self.target, self.max_dice, tuple(scores), self.current_player)
+
+    def hash_key(self):
+        first, second = self.scores
+        return mix64(first + (second << 16) + (self.current_player << 32) + (self.dice << 40))
@@ -0,0 +1,212 @@
+# search_stats.py
+
+import json
+import time
+
+
+class SearchStats:
+    """
+    Statistics of one search by `MinimaxAlgorithm`, collected when it is created with `collect_stats=True`
+    (or with hooks). For an iterative deepening `search`, they cover all its iterations, and `iterations`
+    holds a summary of each one.
+    """
+
+    def __init__(self):
+        self.depth = 0
+        self.score = None
+        self.move = None
+        self.principal_variation = []
+        self.completed = True
+        self.book_hit = False
+        self.nodes = 0
+        self.nodes_per_ply = []
+        self.iterations = []
+        self.cutoffs = 0
+        self.first_move_cutoffs = 0
+        self.table_probes = 0
+        self.table_hits = 0
+        self.evaluate_calls = 0
+        self.evaluate_time = 0.0
+        self.move_generation_calls = 0
+        self.move_generation_time = 0.0
+        self.make_move_calls = 0
+        self.make_move_time = 0.0
+        self.elapsed = 0.0
+
+    def effective_branching_factor(self):
+        """
+        Returns:
+            float: The growth of the node count per ply: the ratio of the node counts of the last two
+                   iterations for an iterative deepening search, or the depth-th root of the node count
+                   otherwise. 0 if nothing was searched.
+        """
+        if len(self.iterations) >= 2 and self.iterations[-2]["nodes"]:
+            return self.iterations[-1]["nodes"] / self.iterations[-2]["nodes"]
+        if not self.nodes or not self.depth:
+            return 0.0
+        return self.nodes ** (1 / self.depth)
+
+    def table_hit_rate(self):
+        """
+        Returns:
+            float: The fraction of transposition table probes that found their position.
+        """
+        return self.table_hits / self.table_probes if self.table_probes else 0.0
+
+    def first_move_cutoff_rate(self):
+        """
+        Returns:
+            float: The fraction of cutoffs caused by the first move searched, a measure of move ordering quality.
+        """
+        return self.first_move_cutoffs / self.cutoffs if self.cutoffs else 0.0
+
+    def to_dict(self):
+        """
+        Returns:
+            dict: The statistics, with the derived rates, as JSON-serializable values.
+        """
+        values = dict(vars(self))
+        values["score"] = _json_number(self.score)
+        values["effective_branching_factor"] = self.effective_branching_factor()
+        values["table_hit_rate"] = self.table_hit_rate()
+        values["first_move_cutoff_rate"] = self.first_move_cutoff_rate()
+        values["iterations"] = [dict(iteration, score=_json_number(iteration["score"]))
+                                for iteration in self.iterations]
+        return values
+
+    def to_json(self):
+        """
+        Returns:
+            str: The statistics as a single line of JSON.
+        """
+        return json.dumps(self.to_dict(), default=repr)
+
+    def __repr__(self):
+        return (f"SearchStats(depth={self.depth}, nodes={self.nodes}, score={self.score}, move={self.move!r}, "
+                f"elapsed={self.elapsed:.4f})")
+
+
+def _json_number(value):
+    # JSON has no infinities
+    if isinstance(value, float) and value in (float('inf'), float('-inf')):
+        return repr(value)
+    return value
+
+
+class SearchHooks:
+    """
+    Base class for callbacks notified by `MinimaxAlgorithm` during its searches. Only the statistics
+    of completed searches and iterations are reported, never individual nodes, so hooks do not slow
+    the search down.
+    """
+
+    def search_started(self, state, stats):
+        """
+        Called before a search starts.
+
+        Args:
+            state (GameState): The position searched.
+            stats (SearchStats): The statistics the search will fill in.
+        """
+
+    def iteration_completed(self, stats):
+        """
+        Called after every completed iteration of an iterative deepening search.
+
+        Args:
+            stats (SearchStats): The statistics of the search so far; the last entry of `iterations` is the new one.
+        """
+
+    def search_completed(self, stats):
+        """
+        Called after a search, including a budgeted search that was stopped.
+
+        Args:
+            stats (SearchStats): The statistics of the search.
+        """
+
+
+class JsonLinesExporter(SearchHooks):
+    """
+    Appends the statistics of every completed search to a file, one JSON object per line.
+    """
+
+    def __init__(self, file, **fields):
+        """
+        Args:
+            file (str or file object): The path of the file to append to, or an open text file.
+            **fields: Fixed values added to every line, e.g. a release or a benchmark name.
+        """
+        self.file = file
+        self.fields = fields
+
+    def search_completed(self, stats):
+        line = json.dumps(dict(self.fields, **stats.to_dict()), default=repr)
+        if isinstance(self.file, str):
+            with open(self.file, "a") as output:
+                output.write(line + "\n")
+        else:
+            self.file.write(line + "\n")
+
+
+class TimedState:
+    """
+    Wraps a game state to time its `evaluate` (and `evaluate_batch`), `get_possible_moves` and move methods
+    into a `SearchStats`.
+    The search only wraps the root when statistics are collected; the children it creates are wrapped in turn.
+    Every other attribute is read from the wrapped state.
+    """
+
+    __slots__ = ("state", "stats")
+
+    def __init__(self, state, stats):
+        self.state = state
+        self.stats = stats
+
+    def __getattr__(self, name):
+        return getattr(self.state, name)
+
+    def is_terminal(self):
+        return self.state.is_terminal()
+
+    def hash_key(self):
+        return self.state.hash_key()
+
+    def evaluate(self):
+        start = time.perf_counter()
+        score = self.state.evaluate()
+        self.stats.evaluate_time += time.perf_counter() - start
+        self.stats.evaluate_calls += 1
+        return score
+
+    def evaluate_batch(self, states):
+        start = time.perf_counter()
+        scores = self.state.evaluate_batch([state.state for state in states])
+        self.stats.evaluate_time += time.perf_counter() - start
+        self.stats.evaluate_calls += len(states)
+        return scores
+
+    def get_possible_moves(self):
+        start = time.perf_counter()
+        moves = self.state.get_possible_moves()
+        self.stats.move_generation_time += time.perf_counter() - start
+        self.stats.move_generation_calls += 1
+        return moves
+
+    def make_move(self, move):
+        start = time.perf_counter()
+        child = self.state.make_move(move)
+        self.stats.make_move_time += time.perf_counter() - start
+        self.stats.make_move_calls += 1
+        return TimedState(child, self.stats)
+
+    def apply_move(self, move):
+        start = time.perf_counter()
+        self.state.apply_move(move)
+        self.stats.make_move_time += time.perf_counter() - start
+        self.stats.make_move_calls += 1
+
+    def undo_move(self, move):
+        start = time.perf_counter()
+        self.state.undo_move(move)
+        self.stats.make_move_time += time.perf_counter() - start
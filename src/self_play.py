@@ -1,6 +1,79 @@
 # self_play.py
 
-from minimax_algorithm import MinimaxAlgorithm, Game, Node
+import logging
+import random
+
+from minimax_algorithm import MinimaxAlgorithm, GameState, Node
+
+logger = logging.getLogger(__name__)
+
+
+class MinimaxPlayer:
+    """
+    A player that chooses its moves by searching the game tree with a `MinimaxAlgorithm`.
+    """
+
+    def __init__(self, minimax_algorithm=None, depth=3, time_budget=None, node_budget=None, algorithm="alpha_beta",
+                 reuse_search=True):
+        """
+        Initializes the player.
+
+        Args:
+            minimax_algorithm (MinimaxAlgorithm, optional): The search used to choose moves. Its transposition
+                                                            table and move ordering heuristics are kept between moves.
+                                                            Defaults to a plain alpha-beta search.
+            depth (int, optional): The search depth. With the "search" algorithm it is the deepest iteration
+                                   (no limit if None). Defaults to 3.
+            time_budget (float, optional): The time per move, in seconds, for the "search" algorithm. Defaults to None.
+            node_budget (int, optional): The nodes per move for the "search" algorithm. Defaults to None.
+            algorithm (str, optional): "alpha_beta" for a fixed-depth search, or "search" for iterative deepening
+                                       within the time and node budgets. Defaults to "alpha_beta".
+            reuse_search (bool, optional): Whether each search starts from what the previous ones learned, following
+                                           the game through `advance`. If False, every search starts cold.
+                                           Defaults to True.
+        """
+        if algorithm not in ("alpha_beta", "search"):
+            raise ValueError(f"Unknown search algorithm: {algorithm!r}")
+        self.minimax_algorithm = minimax_algorithm if minimax_algorithm is not None else MinimaxAlgorithm(None)
+        self.depth = depth
+        self.time_budget = time_budget
+        self.node_budget = node_budget
+        self.algorithm = algorithm
+        self.reuse_search = reuse_search
+        self.nodes_searched = 0
+
+    def select_move(self, game_state, maximizing_player):
+        """
+        Searches the game state and returns the move to play. The state is left unchanged.
+
+        Args:
+            game_state (GameState): The state to move from.
+            maximizing_player (bool): Whether the player to move maximizes the payoff.
+
+        Returns:
+            The chosen move.
+        """
+        if not self.reuse_search:
+            self.minimax_algorithm.clear()
+        if self.algorithm == "search":
+            self.minimax_algorithm.depth_limit = self.depth
+            result = self.minimax_algorithm.search(game_state, maximizing_player, time_budget=self.time_budget,
+                                                   node_budget=self.node_budget)
+            self.nodes_searched = result.nodes
+            return result.move
+        _, best_move = self.minimax_algorithm.alpha_beta(game_state, self.depth, maximizing_player)
+        self.nodes_searched = self.minimax_algorithm.nodes_searched
+        return best_move
+
+    def advance(self, move):
+        """
+        Follows a move played in the game, so that the next search starts from the tables of the previous ones.
+
+        Args:
+            move: The move played.
+        """
+        if self.reuse_search:
+            self.minimax_algorithm.advance(move)
 
 
 class SelfPlay:
@@ -10,49 +83,83 @@ class SelfPlay:
     to select the optimal move at each turn.
     """
 
-    def __init__(self, game, minimax_algorithm):
+    def __init__(self, game, minimax_algorithm=None, depth=3, players=None, max_moves=None, seed=None):
         """
         Initializes the SelfPlay simulation with a given game and the Minimax algorithm.
         
         Args:
             game (Game): An instance of the Game class that represents the zero-sum game.
-            minimax_algorithm (MinimaxAlgorithm): An instance of the MinimaxAlgorithm to be used for decision-making.
+            minimax_algorithm (MinimaxAlgorithm, optional): An instance of the MinimaxAlgorithm to be used for decision-making.
+            depth (int, optional): The search depth used with `minimax_algorithm`. Defaults to 3.
+            players (tuple, optional): The players of the two sides, each with a `select_move(game_state, maximizing_player)`
+                                       method, such as `MinimaxPlayer` or `MCTS`. Players with an `advance(move)`
+                                       method are told every move played. Defaults to both sides searching with
+                                       `minimax_algorithm` to `depth`.
+            max_moves (int, optional): The number of moves after which the game is stopped. Defaults to no limit.
+            seed (int, optional): The seed of the chance moves, drawn by the game itself at chance states.
+                                  Defaults to None.
         """
         self.game = game
         self.minimax_algorithm = minimax_algorithm
+        if players is None:
+            player = MinimaxPlayer(minimax_algorithm, depth)
+            players = (player, player)
+        self.players = players
+        self.max_moves = max_moves
         self.current_turn = 1  # Player 1 starts
+        self.moves = []
+        self.nodes_searched = []
+        self.final_state = None
+        self.random = random.Random(seed)
 
     def play(self):
         """
         Simulates a game between two players using the Minimax algorithm.
         It alternates between players, selecting the optimal move for each player
         based on the Minimax algorithm.
+        The moves played and the nodes searched for each of them are kept in `moves` and `nodes_searched`.
+        At chance states, the move is drawn from `chance_outcomes` and the turn does not change; it is
+        kept in `moves` like the others, with no nodes searched.
         
         Returns:
             str: The outcome of the game (win/loss/draw).
         """
         # Initialize the game state
         game_state = self.game
+        self.moves = []
+        self.nodes_searched = []
 
         # Loop to play the game until it ends
-        while not game_state.is_terminal():
-            # Print the current game state (optional)
-            print(f"Current game state:\n{game_state}")
-
-            if self.current_turn == 1:
-                print("Player 1's turn (Maximizing player)...")
-                best_score, best_move = self.minimax_algorithm.minimax(game_state, depth=3, maximizing_player=True)
+        while not game_state.is_terminal() and (self.max_moves is None or len(self.moves) < self.max_moves):
+            logger.debug("Current game state:\n%s", game_state)
+            chance = game_state.is_chance()
+            if chance:
+                moves, probabilities = zip(*game_state.chance_outcomes())
+                best_move = self.random.choices(moves, probabilities)[0]
+                logger.debug("Chance move: %r", best_move)
+                nodes = 0
             else:
-                print("Player 2's turn (Minimizing player)...")
-                best_score, best_move = self.minimax_algorithm.minimax(game_state, depth=3, maximizing_player=False)
+                logger.debug("Player %d's turn (%s player)...", self.current_turn,
+                             "Maximizing" if self.current_turn == 1 else "Minimizing")
+                player = self.players[self.current_turn - 1]
+                best_move = player.select_move(game_state, self.current_turn == 1)
+                nodes = getattr(player, "nodes_searched", 0)
+            self.moves.append(best_move)
+            self.nodes_searched.append(nodes)
 
             # Apply the chosen move to the game state
             game_state = game_state.make_move(best_move)
+            # Players that keep a search tree between moves follow the game with `advance`
+            for each_player in {id(each): each for each in self.players}.values():
+                if hasattr(each_player, "advance"):
+                    each_player.advance(best_move)
             
-            # Alternate between players
-            self.current_turn = 2 if self.current_turn == 1 else 1
+            # Alternate between players, whom chance moves do not change
+            if not chance:
+                self.current_turn = 2 if self.current_turn == 1 else 1
 
         # At the end of the game, return the outcome
+        self.final_state = game_state
         return self.get_game_outcome(game_state)
 
     def get_game_outcome(self, game_state):
@@ -73,7 +180,7 @@ class SelfPlay:
             return "Draw"
 
 
-class GameStateExample(Game):
+class GameStateExample(GameState):
     """
     An example of a specific game state for a zero-sum game.
     In this example, we use a simple 2x2 game for demonstration purposes.
@@ -85,7 +192,8 @@ class GameStateExample(Game):
             [3, -1],
             [-2, 4]
         ]
-        super().__init__(matrix)
+        super().__init__()
+        self.matrix = matrix
 
     def is_terminal(self):
         """
@@ -134,6 +242,24 @@ class GameStateExample(Game):
         new_state.current_player = 2 if self.current_player == 1 else 1
         return new_state
 
+    def apply_move(self, move):
+        """
+        Make the move for the current player on this state, without creating a new one.
+        
+        Args:
+            move (int): The move to make.
+        """
+        self.current_player = 2 if self.current_player == 1 else 1
+
+    def undo_move(self, move):
+        """
+        Take back the move most recently made with `apply_move`.
+        
+        Args:
+            move (int): The move to take back.
+        """
+        self.current_player = 2 if self.current_player == 1 else 1
+
 
 if __name__ == "__main__":
     # Create an instance of the game
@@ -143,7 +269,7 @@ if __name__ == "__main__":
     minimax_algorithm = MinimaxAlgorithm(game)
 
     # Create the self-play simulation
-    self_play_simulation = SelfPlay(game, minimax_algorithm)
+    self_play_simulation = SelfPlay(game, minimax_algorithm, depth=3, max_moves=10)
 
     # Start the self-play game and get the outcome
     result = self_play_simulation.play()
@@ -0,0 +1,254 @@
+# tablebase.py
+
+import struct
+from collections import OrderedDict
+
+import numpy as np
+
+# Results of a position for the player to move; 0 marks an index that is not a position
+LOSS = 1
+DRAW = 2
+WIN = 3
+
+MAGIC = b"GTTB"
+VERSION = 1
+HEADER = struct.Struct("<4sHHQ")  # Magic, version, bytes per record, number of records
+
+_MISSING = object()
+
+
+class TablebaseGame:
+    """
+    Base class for the description of a finite game needed to build a tablebase: a numbering of its
+    positions and the moves that lead to each of them. Implementations must override every method.
+    """
+
+    def size(self):
+        """
+        Returns:
+            int: The number of position indices; every position has an index in [0, size).
+        """
+        raise NotImplementedError("This method should be implemented by the specific game.")
+
+    def index(self, state):
+        """
+        Args:
+            state (GameState): A position of the game.
+
+        Returns:
+            int: The index of the position.
+        """
+        raise NotImplementedError("This method should be implemented by the specific game.")
+
+    def state(self, index):
+        """
+        Args:
+            index (int): A position index.
+
+        Returns:
+            GameState: The position with this index, or None if the index is not a legal position.
+        """
+        raise NotImplementedError("This method should be implemented by the specific game.")
+
+    def predecessors(self, state):
+        """
+        Args:
+            state (GameState): A position of the game.
+
+        Returns:
+            list of GameState: The non-terminal positions from which a move leads to this one, once per such move.
+        """
+        raise NotImplementedError("This method should be implemented by the specific game.")
+
+
+def _result(state):
+    # The result of a terminal position for the player to move
+    score = state.evaluate()
+    if state.current_player != 1:
+        score = -score
+    return WIN if score > 0 else LOSS if score < 0 else DRAW
+
+
+def build_tablebase(game, path):
+    """
+    Solves every position of a game by retrograde analysis and writes the results to a file.
+    Starting from the terminal positions, results are propagated backwards one move at a time:
+    a position is won as soon as one move leads to a position lost for the opponent, and lost once
+    all its moves lead to positions won for the opponent. Positions never resolved are draws.
+    Every won or lost position also gets its distance to the end of the game under perfect play
+    (the winner ends the game as soon as possible and the loser as late as possible).
+
+    Each record holds the result in its 2 low bits and the distance in the others, in one byte
+    when distances are below 64 and two bytes otherwise.
+
+    Args:
+        game (TablebaseGame): The game to solve.
+        path (str): The file to write.
+
+    Returns:
+        int: The number of positions solved.
+        int: The longest distance to the end.
+    """
+    size = game.size()
+    results = bytearray(size)
+    distances = [0] * size
+    remaining = [0] * size
+    frontier = []
+    positions = 0
+    for index in range(size):
+        state = game.state(index)
+        if state is None:
+            continue
+        positions += 1
+        if state.is_terminal():
+            results[index] = _result(state)
+            if results[index] != DRAW:
+                frontier.append(index)
+        else:
+            remaining[index] = len(state.get_possible_moves())
+
+    distance = 0
+    while frontier:
+        distance += 1
+        next_frontier = []
+        for index in frontier:
+            lost = results[index] == LOSS
+            for predecessor in game.predecessors(game.state(index)):
+                previous = game.index(predecessor)
+                if results[previous]:
+                    continue
+                if lost:
+                    results[previous] = WIN
+                else:
+                    remaining[previous] -= 1
+                    if remaining[previous]:
+                        continue
+                    results[previous] = LOSS
+                distances[previous] = distance
+                next_frontier.append(previous)
+        frontier = next_frontier
+    max_distance = distance - 1 if distance else 0
+
+    for index in range(size):
+        if remaining[index] and not results[index]:
+            results[index] = DRAW
+    dtype = np.dtype("<u1") if max_distance < 64 else np.dtype("<u2")
+    if max_distance >= 1 << 14:
+        raise ValueError(f"Distances up to {max_distance} do not fit in a tablebase record")
+    records = np.frombuffer(bytes(results), dtype=np.uint8).astype(dtype) | (np.array(distances, dtype=dtype) << 2)
+    with open(path, "wb") as output:
+        output.write(HEADER.pack(MAGIC, VERSION, dtype.itemsize, size))
+        output.write(records.tobytes())
+    return positions, max_distance
+
+
+class Tablebase:
+    """
+    A tablebase file written by `build_tablebase`, probed through a memory map so that processes
+    probing the same file share one copy of it, with the most recent probes kept in a small LRU cache.
+    Passed as `tablebase` to `MinimaxAlgorithm`, it ends the search at every solved position.
+    """
+
+    def __init__(self, path, game, cache_size=4096, win_score=1):
+        """
+        Opens a tablebase.
+
+        Args:
+            path (str): The tablebase file.
+            game (TablebaseGame): The game the tablebase was built for.
+            cache_size (int, optional): The number of probe results kept. Defaults to 4096.
+            win_score (float, optional): The score of a won position for the winner, in the units of
+                                         `evaluate`. Defaults to 1.
+        """
+        with open(path, "rb") as file:
+            header = file.read(HEADER.size)
+        if len(header) != HEADER.size:
+            raise ValueError(f"{path} is not a tablebase")
+        magic, version, width, size = HEADER.unpack(header)
+        if magic != MAGIC or version != VERSION or width not in (1, 2):
+            raise ValueError(f"{path} is not a version {VERSION} tablebase")
+        self.path = path
+        self.game = game
+        self.cache_size = cache_size
+        self.win_score = win_score
+        self.records = np.memmap(path, dtype=f"<u{width}", mode="r", offset=HEADER.size, shape=(size,))
+        self.hits = 0
+        self.misses = 0
+        self._cache = OrderedDict()
+
+    def lookup(self, state):
+        """
+        Args:
+            state (GameState): A position.
+
+        Returns:
+            tuple: (result, distance) of the position for the player to move, with a result of
+                   WIN, DRAW or LOSS, or None if the position is not in the tablebase.
+        """
+        index = self.game.index(state)
+        if not 0 <= index < len(self.records):
+            return None
+        record = int(self.records[index])
+        return (record & 3, record >> 2) if record & 3 else None
+
+    def probe(self, state):
+        """
+        Looks up a position, for `MinimaxAlgorithm`.
+
+        Args:
+            state (GameState): A position.
+
+        Returns:
+            tuple: (score, best move) of the position, with the score positive when player 1 wins and a best
+                   move of None for terminal positions, or None if the position is not in the tablebase.
+        """
+        index = self.game.index(state)
+        cached = self._cache.get(index, _MISSING)
+        if cached is not _MISSING:
+            self.hits += 1
+            self._cache.move_to_end(index)
+            return cached
+        self.misses += 1
+        entry = self.lookup(state)
+        if entry is None:
+            answer = None
+        else:
+            result = entry[0]
+            score = (self.win_score if result == WIN else -self.win_score if result == LOSS else 0)
+            if state.current_player != 1:
+                score = -score
+            answer = (score, None if state.is_terminal() else self._best_move(state, result))
+        self._cache[index] = answer
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return answer
+
+    def _best_move(self, state, result):
+        # The fastest win, the slowest loss, or any move that keeps the draw
+        wanted = {WIN: LOSS, LOSS: WIN, DRAW: DRAW}[result]
+        best_move = best_distance = None
+        for move in state.get_possible_moves():
+            entry = self.lookup(state.make_move(move))
+            if entry is None or entry[0] != wanted:
+                continue
+            distance = entry[1]
+            if result == DRAW:
+                return move
+            if (best_distance is None or (distance < best_distance if result == WIN else distance > best_distance)):
+                best_move, best_distance = move, distance
+        return best_move
+
+    def hit_rate(self):
+        """
+        Returns:
+            float: The fraction of probes answered from the cache.
+        """
+        probes = self.hits + self.misses
+        return self.hits / probes if probes else 0.0
+
+    def __getstate__(self):
+        # Other processes map the file again instead of receiving a copy of it
+        return {"path": self.path, "game": self.game, "cache_size": self.cache_size, "win_score": self.win_score}
+
+    def __setstate__(self, state):
+        self.__init__(state["path"], state["game"], state["cache_size"], state["win_score"])
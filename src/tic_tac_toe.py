@@ -0,0 +1,314 @@
+# tic_tac_toe.py
+
+import csv
+import os
+
+from minimax_algorithm import GameState
+from tablebase import TablebaseGame
+
+# Cells are numbered row by row from the top left corner, as in the columns of data/dataset.csv
+CELL_NAMES = ("TL", "TM", "TR", "ML", "MM", "MR", "BL", "BM", "BR")
+FULL_BOARD = (1 << 9) - 1
+
+WIN_MASKS = (
+    0b000000111, 0b000111000, 0b111000000,  # Rows
+    0b001001001, 0b010010010, 0b100100100,  # Columns
+    0b100010001, 0b001010100,               # Diagonals
+)
+
+# Whether a 9-bit board of one player's marks contains a line, for every possible board
+WINNING = tuple(any(board & mask == mask for mask in WIN_MASKS) for board in range(1 << 9))
+
+# The empty cells of every possible occupancy board
+EMPTY_CELLS = tuple(tuple(cell for cell in range(9) if not board >> cell & 1) for board in range(1 << 9))
+
+
+def _symmetry_tables():
+    # The 8 symmetries of the square, as maps from a cell (row, column) to its image
+    transforms = (
+        lambda row, column: (row, column),
+        lambda row, column: (column, 2 - row),
+        lambda row, column: (2 - row, 2 - column),
+        lambda row, column: (2 - column, row),
+        lambda row, column: (row, 2 - column),
+        lambda row, column: (2 - row, column),
+        lambda row, column: (column, row),
+        lambda row, column: (2 - column, 2 - row),
+    )
+    tables = []
+    for transform in transforms:
+        images = []
+        for cell in range(9):
+            row, column = transform(*divmod(cell, 3))
+            images.append(3 * row + column)
+        tables.append(tuple(sum(1 << images[cell] for cell in range(9) if board >> cell & 1)
+                            for board in range(1 << 9)))
+    return tuple(tables)
+
+
+# SYMMETRIES[s][board] is the board transformed by symmetry s
+SYMMETRIES = _symmetry_tables()
+
+
+class TicTacToeState(GameState):
+    """
+    A tic-tac-toe position stored as two 9-bit boards, one per player (bit i is cell i).
+    X is player 1 (maximizing) and moves first; O is player 2. Wins are scored 1 for X and -1 for O.
+    Terminal checks and move generation are lookups in tables precomputed for all 512 boards.
+    """
+
+    def __init__(self, x=0, o=0):
+        """
+        Initializes a position (the empty board by default).
+
+        Args:
+            x (int, optional): The 9-bit board of X's marks. Defaults to 0.
+            o (int, optional): The 9-bit board of O's marks. Defaults to 0.
+        """
+        super().__init__()
+        self.x = x
+        self.o = o
+        self.current_player = 1 if bin(x).count("1") == bin(o).count("1") else 2
+
+    @classmethod
+    def from_cells(cls, cells):
+        """
+        Creates a position from its cells, as in the rows of data/dataset.csv.
+
+        Args:
+            cells (sequence of str): The 9 cells row by row, each "x", "o" or "b" (blank).
+
+        Returns:
+            TicTacToeState: The position.
+        """
+        x = o = 0
+        for cell, mark in enumerate(cells):
+            if mark == "x":
+                x |= 1 << cell
+            elif mark == "o":
+                o |= 1 << cell
+            elif mark != "b":
+                raise ValueError(f"Unknown tic-tac-toe cell: {mark!r}")
+        return cls(x, o)
+
+    def is_terminal(self):
+        return WINNING[self.x] or WINNING[self.o] or self.x | self.o == FULL_BOARD
+
+    def evaluate(self):
+        if WINNING[self.x]:
+            return 1
+        if WINNING[self.o]:
+            return -1
+        return 0
+
+    def get_possible_moves(self):
+        return list(EMPTY_CELLS[self.x | self.o])
+
+    def make_move(self, move):
+        if self.current_player == 1:
+            return TicTacToeState(self.x | 1 << move, self.o)
+        return TicTacToeState(self.x, self.o | 1 << move)
+
+    def apply_move(self, move):
+        if self.current_player == 1:
+            self.x |= 1 << move
+        else:
+            self.o |= 1 << move
+        self.current_player = 3 - self.current_player
+
+    def undo_move(self, move):
+        self.current_player = 3 - self.current_player
+        if self.current_player == 1:
+            self.x &= ~(1 << move)
+        else:
+            self.o &= ~(1 << move)
+
+    def hash_key(self):
+        return self.x | self.o << 9
+
+    def canonical_key(self):
+        """
+        Returns:
+            int: The smallest `hash_key` among the 8 rotations and reflections of the position, so that
+                 equivalent positions share one key.
+        """
+        x, o = self.x, self.o
+        return min(symmetry[x] | symmetry[o] << 9 for symmetry in SYMMETRIES)
+
+    def __eq__(self, other):
+        return isinstance(other, TicTacToeState) and self.x == other.x and self.o == other.o
+
+    def __hash__(self):
+        return self.hash_key()
+
+    def __str__(self):
+        marks = ["X" if self.x >> cell & 1 else "O" if self.o >> cell & 1 else "." for cell in range(9)]
+        return "\n".join(" ".join(marks[row:row + 3]) for row in range(0, 9, 3))
+
+    def __repr__(self):
+        return f"TicTacToeState(x={self.x:#011b}, o={self.o:#011b})"
+
+
+class TicTacToeTable:
+    """
+    The perfect-play value of every tic-tac-toe position reachable from the empty board, with
+    equivalent positions stored once under their canonical key.
+    Passed as `tablebase` to `MinimaxAlgorithm`, it answers every search in constant time.
+    """
+
+    UNKNOWN = 255
+
+    def __init__(self, values):
+        """
+        Args:
+            values (bytearray): The value plus one of every canonical key (0 for an O win, 1 for a draw,
+                                2 for an X win), or `UNKNOWN` for keys of unreachable positions.
+        """
+        self.values = values
+
+    @classmethod
+    def solve(cls):
+        """
+        Solves tic-tac-toe by searching every position reachable from the empty board once.
+
+        Returns:
+            TicTacToeTable: The table of all reachable positions.
+        """
+        values = bytearray([cls.UNKNOWN]) * (1 << 18)
+
+        def solve_position(state):
+            key = state.canonical_key()
+            if values[key] != cls.UNKNOWN:
+                return values[key] - 1
+            if state.is_terminal():
+                value = state.evaluate()
+            else:
+                scores = [solve_position(state.make_move(move)) for move in state.get_possible_moves()]
+                value = max(scores) if state.current_player == 1 else min(scores)
+            values[key] = value + 1
+            return value
+
+        solve_position(TicTacToeState())
+        return cls(values)
+
+    def __len__(self):
+        return sum(1 for value in self.values if value != self.UNKNOWN)
+
+    def value(self, state):
+        """
+        Args:
+            state (TicTacToeState): A position.
+
+        Returns:
+            int: The value of the position under perfect play (1 if X wins, -1 if O wins, 0 for a draw),
+                 or None if the position cannot be reached.
+        """
+        value = self.values[state.canonical_key()]
+        return None if value == self.UNKNOWN else value - 1
+
+    def probe(self, state):
+        """
+        Looks up a position, for `MinimaxAlgorithm`.
+
+        Args:
+            state (TicTacToeState): A position.
+
+        Returns:
+            tuple: (value, best move) of the position, with a best move of None for terminal positions,
+                   or None if the position cannot be reached.
+        """
+        value = self.value(state)
+        if value is None or state.is_terminal():
+            return None if value is None else (value, None)
+        for move in state.get_possible_moves():
+            if self.value(state.make_move(move)) == value:
+                return value, move
+        return None
+
+    def validate(self, path=None):
+        """
+        Checks the table against a list of labelled end positions in the layout of data/dataset.csv:
+        every row must be a reachable terminal position, labelled "true" exactly when X has won,
+        and the rows must cover every reachable terminal position.
+
+        Args:
+            path (str, optional): The CSV file. Defaults to the data/dataset.csv of the repository.
+
+        Returns:
+            int: The number of rows checked.
+
+        Raises:
+            ValueError: If a row disagrees with the table or terminal positions are missing.
+        """
+        if path is None:
+            path = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "data", "dataset.csv")
+        positions = set()
+        rows = 0
+        with open(path, newline="") as file:
+            for line, row in enumerate(csv.DictReader(file), start=2):
+                rows += 1
+                state = TicTacToeState.from_cells([row[name] for name in CELL_NAMES])
+                value = self.value(state)
+                if value is None or not state.is_terminal():
+                    raise ValueError(f"Line {line} is not a reachable end position")
+                if (value == 1) != (row["class"] == "true"):
+                    raise ValueError(f"Line {line} is labelled {row['class']} but the position is worth {value}")
+                positions.add(state)
+        terminal = self._count_terminal_positions()
+        if len(positions) != terminal:
+            raise ValueError(f"{len(positions)} distinct end positions listed, {terminal} are reachable")
+        return rows
+
+    def _count_terminal_positions(self):
+        # Terminal positions are counted without symmetry reduction, as they are listed in the dataset
+        seen = set()
+        stack = [TicTacToeState()]
+        terminal = 0
+        while stack:
+            state = stack.pop()
+            if state in seen:
+                continue
+            seen.add(state)
+            if state.is_terminal():
+                terminal += 1
+            else:
+                stack.extend(state.make_move(move) for move in state.get_possible_moves())
+        return terminal
+
+
+class TicTacToeIndex(TablebaseGame):
+    """
+    Numbers tic-tac-toe positions in base 3 (cell i is digit i: 0 blank, 1 X, 2 O), for `build_tablebase`.
+    Only the 5478 positions reachable from the empty board are legal.
+    """
+
+    POWERS = tuple(3 ** cell for cell in range(9))
+
+    def size(self):
+        return 3 ** 9
+
+    def index(self, state):
+        powers = self.POWERS
+        return (sum(powers[cell] for cell in range(9) if state.x >> cell & 1)
+                + 2 * sum(powers[cell] for cell in range(9) if state.o >> cell & 1))
+
+    def state(self, index):
+        x = o = 0
+        for cell in range(9):
+            index, digit = divmod(index, 3)
+            if digit == 1:
+                x |= 1 << cell
+            elif digit == 2:
+                o |= 1 << cell
+        marks = bin(x).count("1") - bin(o).count("1")
+        # X moves first, and the game stops at the first line
+        if marks not in (0, 1) or (WINNING[x] and (WINNING[o] or marks != 1)) or (WINNING[o] and marks != 0):
+            return None
+        return TicTacToeState(x, o)
+
+    def predecessors(self, state):
+        if state.current_player == 2:
+            candidates = [TicTacToeState(state.x & ~(1 << cell), state.o) for cell in range(9) if state.x >> cell & 1]
+        else:
+            candidates = [TicTacToeState(state.x, state.o & ~(1 << cell)) for cell in range(9) if state.o >> cell & 1]
+        return [candidate for candidate in candidates if not candidate.is_terminal()]
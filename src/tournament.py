@@ -0,0 +1,260 @@
+# tournament.py
+
+import logging
+import os
+import random
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from mcts import MCTS
+from minimax_algorithm import MinimaxAlgorithm
+from move_ordering import HistoryHeuristic, KillerMoves, PreviousBestMove
+from self_play import MinimaxPlayer, SelfPlay
+from transposition_table import TranspositionTable
+
+
+class PlayerSettings:
+    """
+    The search settings of one side of a tournament. Settings are sent to the worker processes,
+    which build a fresh player from them for every game so that games do not depend on each other.
+    """
+
+    def __init__(self, depth=3, time_budget=None, node_budget=None, algorithm="alpha_beta",
+                 principal_variation_search=False, move_ordering=False, transposition_table_size=None,
+                 iterations=1000, evaluation_cache=None, opening_book=None):
+        """
+        Initializes the settings.
+
+        Args:
+            depth (int, optional): The search depth (the deepest iteration for "search"). Defaults to 3.
+            time_budget (float, optional): The time per move, in seconds, for the "search" algorithm. Defaults to None.
+            node_budget (int, optional): The nodes per move for the "search" algorithm. Defaults to None.
+            algorithm (str, optional): "alpha_beta" or "search", as for `MinimaxPlayer`, or "mcts" for Monte Carlo
+                                       Tree Search. Defaults to "alpha_beta".
+            principal_variation_search (bool, optional): Whether to search with null windows. Defaults to False.
+            move_ordering (bool, optional): Whether to order moves with the killer, history and previous best
+                                            move heuristics. Defaults to False.
+            transposition_table_size (int, optional): The number of buckets of the transposition table kept
+                                                      for the whole game. Defaults to None (no table).
+            iterations (int, optional): The simulations per move of "mcts". Defaults to 1000.
+            evaluation_cache (EvaluationCache, optional): A cache of leaf evaluations for the minimax players.
+                                                          Every worker receives a copy of it, except for a
+                                                          `SharedEvaluationCache`, which all the workers share.
+                                                          Defaults to None.
+            opening_book (OpeningBook, optional): A book answering the positions it knows without searching, for the
+                                                  minimax players. The workers map the same file. Defaults to None.
+        """
+        self.depth = depth
+        self.time_budget = time_budget
+        self.node_budget = node_budget
+        self.algorithm = algorithm
+        self.principal_variation_search = principal_variation_search
+        self.move_ordering = move_ordering
+        self.transposition_table_size = transposition_table_size
+        self.iterations = iterations
+        self.evaluation_cache = evaluation_cache
+        self.opening_book = opening_book
+
+    def create_player(self, seed=0):
+        """
+        Args:
+            seed (int, optional): The seed of players that make random choices. Defaults to 0.
+
+        Returns:
+            MinimaxPlayer or MCTS: A new player with these settings.
+        """
+        if self.algorithm == "mcts":
+            return MCTS(iterations=self.iterations, time_budget=self.time_budget, seed=seed)
+        move_ordering = [PreviousBestMove(), KillerMoves(), HistoryHeuristic()] if self.move_ordering else None
+        table = TranspositionTable(self.transposition_table_size) if self.transposition_table_size else None
+        minimax_algorithm = MinimaxAlgorithm(None, move_ordering=move_ordering,
+                                             principal_variation_search=self.principal_variation_search,
+                                             transposition_table=table, evaluation_cache=self.evaluation_cache,
+                                             opening_book=self.opening_book)
+        return MinimaxPlayer(minimax_algorithm, self.depth, self.time_budget, self.node_budget, self.algorithm)
+
+    def __repr__(self):
+        return (f"PlayerSettings(depth={self.depth}, time_budget={self.time_budget}, "
+                f"node_budget={self.node_budget}, algorithm={self.algorithm!r})")
+
+
+class GameRecord:
+    """
+    The result of one tournament game.
+    """
+
+    __slots__ = ("game", "seed", "moves", "outcome", "nodes", "elapsed")
+
+    def __init__(self, game, seed, moves, outcome, nodes, elapsed):
+        """
+        Args:
+            game (int): The index of the game in the tournament.
+            seed (int): The seed the opening of the game was drawn from.
+            moves (tuple): The moves played, opening moves included.
+            outcome (int): 1 if player 1 won, -1 if player 2 won, 0 for a draw.
+            nodes (tuple of int): The nodes searched by player 1 and by player 2 over the game.
+            elapsed (float): The time taken to play the game, in seconds.
+        """
+        self.game = game
+        self.seed = seed
+        self.moves = moves
+        self.outcome = outcome
+        self.nodes = nodes
+        self.elapsed = elapsed
+
+    def __repr__(self):
+        return (f"GameRecord(game={self.game}, seed={self.seed}, moves={self.moves}, outcome={self.outcome}, "
+                f"nodes={self.nodes}, elapsed={self.elapsed:.4f})")
+
+
+def game_seed(seed, game):
+    """
+    Derives the seed of one game from the seed of the tournament. The result only depends on the two
+    arguments, so a game is the same whichever worker plays it and in whatever order.
+
+    Args:
+        seed (int): The seed of the tournament.
+        game (int): The index of the game.
+
+    Returns:
+        int: The seed of the game.
+    """
+    return random.Random(f"{seed}:{game}").getrandbits(63)
+
+
+def play_game(game_factory, players, game, seed=0, opening_moves=0, max_moves=None):
+    """
+    Plays one tournament game: a number of random opening moves drawn from the game seed,
+    then self-play between the two sides. Chance moves, in the opening and in self-play, are drawn
+    from the game seed too.
+
+    Args:
+        game_factory (callable): Returns the initial state of the game.
+        players (tuple of PlayerSettings): The settings of player 1 and player 2.
+        game (int): The index of the game.
+        seed (int, optional): The seed of the tournament. Defaults to 0.
+        opening_moves (int, optional): The number of random moves played before the search takes over. Defaults to 0.
+        max_moves (int, optional): The number of moves (opening included) after which the game is stopped. Defaults to None.
+
+    Returns:
+        GameRecord: The record of the game.
+    """
+    start = time.perf_counter()
+    this_seed = game_seed(seed, game)
+    rng = random.Random(this_seed)
+    state = game_factory()
+    opening = []
+    while len(opening) < opening_moves and not state.is_terminal():
+        if state.is_chance():
+            moves, probabilities = zip(*state.chance_outcomes())
+            move = rng.choices(moves, probabilities)[0]
+        else:
+            move = rng.choice(state.get_possible_moves())
+        opening.append(move)
+        state = state.make_move(move)
+    remaining = None if max_moves is None else max(max_moves - len(opening), 0)
+    self_play = SelfPlay(state, players=tuple(settings.create_player(this_seed) for settings in players),
+                         max_moves=remaining, seed=this_seed)
+    # Keep the turn in step with the opening, which may end on a roll that leaves the same player to move
+    self_play.current_turn = state.current_player
+    self_play.play()
+    final_score = self_play.final_state.evaluate()
+    outcome = (final_score > 0) - (final_score < 0)
+    # Credit every search to the player who was to move; chance moves are not searched
+    nodes = [0, 0]
+    for move, count in zip(self_play.moves, self_play.nodes_searched):
+        if not state.is_chance():
+            nodes[state.current_player - 1] += count
+        state = state.make_move(move)
+    return GameRecord(game, this_seed, tuple(opening + self_play.moves), outcome, tuple(nodes),
+                      time.perf_counter() - start)
+
+
+def _play_games(game_factory, players, games, seed, opening_moves, max_moves):
+    return [play_game(game_factory, players, game, seed, opening_moves, max_moves) for game in games]
+
+
+def _initialize_worker():
+    # Per-move debug logging is not wanted in the workers, whatever the configuration inherited from the parent
+    logging.disable(logging.INFO)
+
+
+class Tournament:
+    """
+    Plays many self-play games between two search settings, spread over a pool of worker processes.
+    Games are dealt to the workers in chunks to keep the inter-process traffic low, and their records are
+    streamed back as chunks complete, so any number of games can be played in constant memory.
+    Every game is seeded from the tournament seed and its index, so a game's record (apart from its time)
+    does not depend on the number of workers, unless a side searches within a time budget.
+    """
+
+    def __init__(self, game_factory, player_1=None, player_2=None, seed=0, opening_moves=0, max_moves=None,
+                 workers=None, chunk_size=8):
+        """
+        Initializes the tournament.
+
+        Args:
+            game_factory (callable): Returns the initial state of a game. It must be picklable (e.g. a class
+                                     or a `functools.partial`), since it is sent to the worker processes.
+            player_1 (PlayerSettings, optional): The settings of player 1 (maximizing). Defaults to `PlayerSettings()`.
+            player_2 (PlayerSettings, optional): The settings of player 2 (minimizing). Defaults to the settings of player 1.
+            seed (int, optional): The seed the games are derived from. Defaults to 0.
+            opening_moves (int, optional): The number of random moves at the start of every game. Defaults to 0.
+            max_moves (int, optional): The number of moves after which a game is stopped. Defaults to None.
+            workers (int, optional): The number of worker processes; 1 plays the games in this process.
+                                     Defaults to the number of CPUs.
+            chunk_size (int, optional): The number of games sent to a worker at a time. Defaults to 8.
+        """
+        self.game_factory = game_factory
+        self.player_1 = player_1 if player_1 is not None else PlayerSettings()
+        self.player_2 = player_2 if player_2 is not None else self.player_1
+        self.seed = seed
+        self.opening_moves = opening_moves
+        self.max_moves = max_moves
+        self.workers = workers if workers is not None else os.cpu_count() or 1
+        self.chunk_size = chunk_size
+
+    def play(self, games, first_game=0):
+        """
+        Plays the games and yields their records as they complete (not necessarily in game order).
+
+        Args:
+            games (int): The number of games to play.
+            first_game (int, optional): The index of the first game, to continue an earlier tournament. Defaults to 0.
+
+        Yields:
+            GameRecord: The record of every game.
+        """
+        players = (self.player_1, self.player_2)
+        chunks = (range(start, min(start + self.chunk_size, first_game + games))
+                  for start in range(first_game, first_game + games, self.chunk_size))
+        arguments = (self.game_factory, players)
+        settings = (self.seed, self.opening_moves, self.max_moves)
+        if self.workers == 1:
+            for chunk in chunks:
+                yield from _play_games(*arguments, chunk, *settings)
+            return
+        with ProcessPoolExecutor(self.workers, initializer=_initialize_worker) as executor:
+            # Keep a couple of chunks queued per worker so none of them waits, without submitting everything at once
+            pending = set()
+            for chunk in chunks:
+                pending.add(executor.submit(_play_games, *arguments, chunk, *settings))
+                if len(pending) >= 2 * self.workers:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield from future.result()
+            for future in pending:
+                yield from future.result()
+
+    def run(self, games, first_game=0):
+        """
+        Plays the games and returns their records in game order.
+
+        Args:
+            games (int): The number of games to play.
+            first_game (int, optional): The index of the first game. Defaults to 0.
+
+        Returns:
+            list of GameRecord: The records of the games.
+        """
+        return sorted(self.play(games, first_game), key=lambda record: record.game)
@@ -0,0 +1,262 @@
+# transposition_table.py
+
+import random
+from multiprocessing import shared_memory
+
+# Bound flags stored with every entry
+EXACT = 0        # The stored score is the exact minimax value of the position
+LOWER_BOUND = 1  # The search failed high: the true value is at least the stored score
+UPPER_BOUND = 2  # The search failed low: the true value is at most the stored score
+
+# The depth stored for entries whose whole subtree was searched, without stopping at a horizon: their
+# scores hold whatever depth they are probed for. It fits the 8-bit depth of `SharedTranspositionTable`.
+SOLVED_DEPTH = 0xFF
+
+MASK_64 = (1 << 64) - 1
+
+
+class ZobristHash:
+    """
+    Random 64-bit keys for Zobrist hashing.
+    A position is hashed as the XOR of the keys of its features (e.g. "X on square 4", "O to move"),
+    so `make_move` can update the hash incrementally by XOR-ing in and out only the features it changes.
+    """
+
+    def __init__(self, features, seed=0):
+        """
+        Initializes the random keys.
+
+        Args:
+            features (int): The number of distinct features a position can have.
+            seed (int, optional): The seed of the random generator, so that hashes are reproducible. Defaults to 0.
+        """
+        rng = random.Random(seed)
+        self.keys = [rng.getrandbits(64) for _ in range(features)]
+
+    def hash(self, features):
+        """
+        Computes the hash of a position from scratch.
+
+        Args:
+            features (iterable of int): The features present in the position.
+
+        Returns:
+            int: The Zobrist hash of the position.
+        """
+        key = 0
+        for feature in features:
+            key ^= self.keys[feature]
+        return key
+
+
+class TranspositionTable:
+    """
+    A fixed-size table of search results keyed by position hash.
+    Every bucket holds two entries: a depth-preferred entry that is only replaced by a deeper search
+    (or by any search once it is left over from an earlier search), and an always-replace entry that
+    keeps the most recent result. The table is meant to outlive single searches, so it can be shared by
+    iterative deepening iterations and by consecutive calls in a long-running process.
+    """
+
+    def __init__(self, size=1 << 16):
+        """
+        Initializes an empty table.
+
+        Args:
+            size (int, optional): The number of buckets. Defaults to 65536.
+        """
+        self.size = size
+        self.keys = [None] * (2 * size)
+        self.scores = [0] * (2 * size)
+        self.depths = [0] * (2 * size)
+        self.flags = [EXACT] * (2 * size)
+        self.moves = [None] * (2 * size)
+        self.generations = [0] * (2 * size)
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.collisions = 0
+
+    def new_search(self):
+        """
+        Marks the start of a new search, so that entries of earlier searches can be replaced.
+        """
+        self.generation += 1
+
+    def probe(self, key):
+        """
+        Looks up a position.
+
+        Args:
+            key (int): The hash of the position.
+
+        Returns:
+            tuple: (score, depth, flag, move) of the stored entry, or None if the position is not stored.
+        """
+        index = 2 * (key % self.size)
+        keys = self.keys
+        if keys[index] != key:
+            index += 1
+            if keys[index] != key:
+                self.misses += 1
+                if keys[index - 1] is not None or keys[index] is not None:
+                    self.collisions += 1
+                return None
+        self.hits += 1
+        return self.scores[index], self.depths[index], self.flags[index], self.moves[index]
+
+    def store(self, key, depth, score, flag, move):
+        """
+        Stores the result of searching a position.
+
+        Args:
+            key (int): The hash of the position.
+            depth (int): The depth the position was searched to, or `SOLVED_DEPTH` if its subtree was searched
+                to the end.
+            score (float): The score found by the search.
+            flag (int): EXACT, LOWER_BOUND or UPPER_BOUND.
+            move: The best move found, or None.
+        """
+        index = 2 * (key % self.size)
+        keys = self.keys
+        if (keys[index] is None or keys[index] == key or depth >= self.depths[index]
+                or self.generations[index] != self.generation):
+            if keys[index + 1] == key:
+                keys[index + 1] = None
+        else:
+            index += 1
+        keys[index] = key
+        self.scores[index] = score
+        self.depths[index] = depth
+        self.flags[index] = flag
+        self.moves[index] = move
+        self.generations[index] = self.generation
+
+    def clear(self):
+        """
+        Removes every entry and resets the counters.
+        """
+        self.__init__(self.size)
+
+    def hit_rate(self):
+        """
+        Returns:
+            float: The fraction of probes that found their position.
+        """
+        probes = self.hits + self.misses
+        return self.hits / probes if probes else 0.0
+
+
+class SharedTranspositionTable(TranspositionTable):
+    """
+    A `TranspositionTable` kept in shared memory, so that searches running in several processes
+    (e.g. Lazy SMP helpers) see each other's results. It has the same buckets and replacement policy.
+
+    Entries are written without locks. Each entry is three 64-bit words (a check word, the score and the
+    packed depth, flag, generation and move), and the check word is the XOR of the key with the other two,
+    so an entry torn by two processes writing the same slot at once no longer matches its key and is
+    treated as a miss. Scores are stored as floats, moves must be None or non-negative integers below
+    2**40, and the hit and miss counters are kept per process.
+
+    The table is pickled by name, so it can be passed to worker processes, which attach to the same memory.
+    The process that created it must call `close` to free the memory.
+    """
+
+    def __init__(self, size=1 << 16, name=None):
+        """
+        Creates an empty table, or attaches to an existing one.
+
+        Args:
+            size (int, optional): The number of buckets. Defaults to 65536.
+            name (str, optional): The name of the shared memory of an existing table. Defaults to None,
+                                  which creates a new table.
+        """
+        self.size = size
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.collisions = 0
+        self._owner = name is None
+        self._memory = shared_memory.SharedMemory(name=name, create=self._owner, size=2 * size * 3 * 8)
+        self._attach()
+        if self._owner:
+            self._memory.buf[:2 * size * 3 * 8] = bytes(2 * size * 3 * 8)
+
+    def _attach(self):
+        self._words = self._memory.buf.cast('Q')
+        self._scores = self._memory.buf.cast('d')
+
+    @property
+    def name(self):
+        """
+        str: The name of the shared memory, to attach to the table from another process.
+        """
+        return self._memory.name
+
+    def probe(self, key):
+        index = 2 * (key % self.size)
+        key &= MASK_64
+        words = self._words
+        for base in (3 * index, 3 * index + 3):
+            info = words[base + 2]
+            if info and words[base] ^ words[base + 1] ^ info == key:
+                self.hits += 1
+                move = info >> 19
+                return (self._scores[base + 1], (info >> 3) & 0xFF, (info >> 1) & 3,
+                        move - 1 if move else None)
+        self.misses += 1
+        if words[3 * index + 2] or words[3 * index + 5]:
+            self.collisions += 1
+        return None
+
+    def store(self, key, depth, score, flag, move):
+        index = 2 * (key % self.size)
+        key &= MASK_64
+        words = self._words
+        base = 3 * index
+        info = words[base + 2]
+        if (not info or words[base] ^ words[base + 1] ^ info == key or depth >= (info >> 3) & 0xFF
+                or (info >> 11) & 0xFF != self.generation & 0xFF):
+            other = words[base + 5]
+            if other and words[base + 3] ^ words[base + 4] ^ other == key:
+                words[base + 5] = 0
+        else:
+            base += 3
+        if move is not None and not 0 <= move < 1 << 40:
+            raise ValueError(f"Moves of a shared table must be integers in [0, 2**40): {move!r}")
+        info = (1 | flag << 1 | min(depth, 0xFF) << 3 | (self.generation & 0xFF) << 11
+                | (0 if move is None else move + 1) << 19)
+        # The check word is written last, so the entry only matches its key once it is complete
+        self._scores[base + 1] = score
+        words[base + 2] = info
+        words[base] = key ^ words[base + 1] ^ info
+
+    def clear(self):
+        """
+        Removes every entry (for all the processes sharing the table) and resets the counters of this process.
+        """
+        self._memory.buf[:2 * self.size * 3 * 8] = bytes(2 * self.size * 3 * 8)
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.collisions = 0
+
+    def close(self):
+        """
+        Detaches from the shared memory, and frees it if this process created the table.
+        """
+        if self._memory is None:
+            return
+        self._words.release()
+        self._scores.release()
+        self._memory.close()
+        if self._owner:
+            self._memory.unlink()
+        self._memory = None
+
+    def __getstate__(self):
+        return {"size": self.size, "name": self.name, "generation": self.generation}
+
+    def __setstate__(self, state):
+        self.__init__(state["size"], state["name"])
+        self.generation = state["generation"]
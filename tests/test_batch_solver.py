@@ -0,0 +1,68 @@
+import unittest
+import numpy as np
+from batch_solver import solve_batch
+from game_theory_algorithm import Game, MinimaxAlgorithm
+from mixed_strategy_solver import MixedStrategySolver
+
+
+class TestBatchSolver(unittest.TestCase):
+
+    def random_games(self, shape, count=300, seed=0):
+        return np.random.default_rng(seed).integers(-5, 6, size=(count,) + shape)
+
+    def test_pure_strategies_match_minimax_algorithm(self):
+        matrices = self.random_games((4, 7))
+        solution = solve_batch(matrices)
+        for index, matrix in enumerate(matrices):
+            minimax = MinimaxAlgorithm(Game(matrix))
+            self.assertEqual((solution.player_1_strategies[index], solution.player_2_strategies[index]), minimax.minimax())
+            self.assertEqual(solution.has_saddle_point[index], minimax.saddle_point() is not None)
+        self.assertIsNone(solution.values)
+
+    def assert_mixed_matches_exact_solver(self, shape, places=9):
+        matrices = self.random_games(shape, seed=sum(shape))
+        solution = solve_batch(matrices, mixed=True)
+        for index, matrix in enumerate(matrices):
+            self.assertAlmostEqual(solution.values[index], MixedStrategySolver(matrix).solve_exact().value, places=places)
+        self.assertTrue(np.allclose(solution.row_strategies.sum(axis=1), 1.0))
+        self.assertTrue(np.allclose(solution.column_strategies.sum(axis=1), 1.0))
+        self.assertGreaterEqual(solution.row_strategies.min(), 0.0)
+        self.assertGreaterEqual(solution.column_strategies.min(), 0.0)
+        return solution
+
+    def test_two_by_two_closed_form(self):
+        solution = self.assert_mixed_matches_exact_solver((2, 2))
+        self.assertLess(solution.exploitability.max(), 1e-9)
+
+    def test_two_by_n_lower_envelope(self):
+        solution = self.assert_mixed_matches_exact_solver((2, 6))
+        self.assertLess(solution.exploitability.max(), 1e-9)
+
+    def test_n_by_two_lower_envelope(self):
+        solution = self.assert_mixed_matches_exact_solver((7, 2))
+        self.assertLess(solution.exploitability.max(), 1e-9)
+
+    def test_larger_games_by_batched_simplex(self):
+        solution = self.assert_mixed_matches_exact_solver((5, 6))
+        self.assertLess(solution.exploitability.max(), 1e-9)
+        solution = self.assert_mixed_matches_exact_solver((12, 9))
+        self.assertLess(solution.exploitability.max(), 1e-9)
+
+    def test_larger_games_by_regret_matching(self):
+        matrices = self.random_games((6, 5), count=50)
+        solution = solve_batch(matrices, mixed=True, method="regret_matching", epsilon=1e-2)
+        self.assertLessEqual(solution.exploitability.max(), 1e-2)
+        exact = solve_batch(matrices, mixed=True)
+        self.assertLessEqual(np.abs(solution.values - exact.values).max(), 1e-2)
+
+    def test_example_game(self):
+        solution = solve_batch([[[3, -1], [-2, 4]]], mixed=True)
+        self.assertAlmostEqual(solution.values[0], 1.0)
+        np.testing.assert_allclose(solution.row_strategies[0], [0.6, 0.4])
+
+    def test_rejects_single_matrix(self):
+        with self.assertRaises(ValueError):
+            solve_batch([[1, 2], [3, 4]])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from cfr import CFRSolver, GameTree, InformationSetState
+from reference_games import KuhnPokerState
+
+
+class HiddenMovesState(InformationSetState):
+    # Two states of one information set with different moves
+    def __init__(self, history=""):
+        super().__init__()
+        self.history = history
+        self.current_player = 1 if history == "" else 2
+
+    def is_terminal(self):
+        return len(self.history) == 2
+
+    def evaluate(self):
+        return 1 if self.history[1] == "x" else -1
+
+    def get_possible_moves(self):
+        return ["a", "b"] if self.history == "" else (["x", "y"] if self.history == "a" else ["x"])
+
+    def make_move(self, move):
+        return HiddenMovesState(self.history + move)
+
+    def information_set(self):
+        return self.history and "second"
+
+
+class TestCFRSolver(unittest.TestCase):
+
+    def test_tree_of_kuhn_poker(self):
+        tree = GameTree(KuhnPokerState())
+        # 6 deals, 12 information sets of 2 actions
+        self.assertEqual(len(tree.information_sets), 12)
+        self.assertEqual(tree.actions, 24)
+        self.assertEqual(tree.child_count[0], 6)
+
+    def test_inconsistent_information_sets_raise(self):
+        with self.assertRaises(ValueError):
+            GameTree(HiddenMovesState())
+
+    def test_algorithms_converge_on_kuhn_poker(self):
+        for algorithm, iterations, tolerance in (("cfr", 1000, 0.002), ("cfr+", 500, 0.001),
+                                                 ("outcome_sampling", 1000, 0.05),
+                                                 ("external_sampling", 500, 0.05)):
+            with self.subTest(algorithm=algorithm):
+                solver = CFRSolver(KuhnPokerState(), algorithm, batch_size=10)
+                exploitability = solver.solve(iterations, report_every=iterations // 4)
+                self.assertLess(exploitability, tolerance)
+                self.assertAlmostEqual(solver.game_value(), KuhnPokerState.GAME_VALUE, delta=3 * tolerance)
+                self.assertEqual([entry[0] for entry in solver.history],
+                                 [iterations // 4 * step for step in range(1, 5)])
+                # Player 2 always calls a bet with the king
+                self.assertAlmostEqual(solver.strategy("Kb")["b"], 1, delta=0.05)
+
+    def test_workers_do_not_change_the_tables(self):
+        for algorithm in ("cfr", "outcome_sampling"):
+            tables = []
+            for workers in (1, 2):
+                with CFRSolver(KuhnPokerState(), algorithm, workers=workers, batch_size=4, seed=3) as solver:
+                    solver.solve(10)
+                tables.append((solver.regrets, solver.strategy_sum))
+            np.testing.assert_array_equal(tables[0][0], tables[1][0])
+            np.testing.assert_array_equal(tables[0][1], tables[1][1])
+
+    def test_checkpoints_resume_solving(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "kuhn.npz")
+            uninterrupted = CFRSolver(KuhnPokerState(), "external_sampling")
+            uninterrupted.solve(40)
+            first = CFRSolver(KuhnPokerState(), "external_sampling")
+            first.solve(20, checkpoint_path=path, checkpoint_every=10)
+            resumed = CFRSolver(KuhnPokerState(), "external_sampling")
+            resumed.load(path)
+            self.assertEqual(resumed.iteration, 20)
+            self.assertEqual(resumed.history, first.history)
+            resumed.solve(20)
+            np.testing.assert_array_equal(resumed.strategy_sum, uninterrupted.strategy_sum)
+            with self.assertRaises(ValueError):
+                CFRSolver(KuhnPokerState(), "cfr").load(path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import csv
+import os
+import tempfile
+import unittest
+import numpy as np
+from dataset import HEADER, PositionDataset, convert_csv, decode, encode, write_dataset
+from tic_tac_toe import TicTacToeState
+
+DATASET = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "data", "dataset.csv")
+
+
+class TestDataset(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def test_encode_decode_round_trip(self):
+        rng = np.random.default_rng(0)
+        boards = rng.integers(0, 3, size=(1000, 15))
+        labels = rng.random(1000) < 0.5
+        records = encode(boards, labels)
+        self.assertEqual(records.dtype, np.dtype("<u4"))
+        decoded_boards, decoded_labels = decode(records, 15)
+        np.testing.assert_array_equal(decoded_boards, boards)
+        np.testing.assert_array_equal(decoded_labels, labels)
+
+    def test_convert_dataset(self):
+        path = os.path.join(self.directory, "dataset.bin")
+        # A small chunk size checks that chunks are joined correctly
+        self.assertEqual(convert_csv(DATASET, path, chunk_rows=100), 958)
+        self.assertEqual(os.path.getsize(path), HEADER.size + 4 * 958)
+        dataset = PositionDataset(path)
+        self.assertEqual((len(dataset), dataset.cells), (958, 9))
+        self.assertIsInstance(dataset.records, np.memmap)
+        with open(DATASET, newline="") as file:
+            rows = list(csv.reader(file))[1:]
+        self.assertEqual(list(dataset.rows()), rows)
+        self.assertEqual(int(dataset.labels.sum()), 626)
+        board, label = dataset[-1]
+        self.assertEqual(([("b", "x", "o")[code] for code in board], "true" if label else "false"),
+                         (rows[-1][:9], rows[-1][9]))
+
+    def test_chunked_iteration(self):
+        path = os.path.join(self.directory, "dataset.bin")
+        convert_csv(DATASET, path)
+        dataset = PositionDataset(path)
+        chunks = list(dataset.iter_chunks(chunk_size=300))
+        self.assertEqual([len(labels) for _, labels in chunks], [300, 300, 300, 58])
+        boards = np.concatenate([chunk_boards for chunk_boards, _ in chunks])
+        np.testing.assert_array_equal(boards, dataset[:][0])
+
+    def test_labels_match_tic_tac_toe_rules(self):
+        path = os.path.join(self.directory, "dataset.bin")
+        convert_csv(DATASET, path)
+        boards, labels = PositionDataset(path)[:]
+        weights = 1 << np.arange(9)
+        for x, o, label in zip((boards == 1) @ weights, (boards == 2) @ weights, labels):
+            self.assertEqual(TicTacToeState(int(x), int(o)).evaluate() == 1, label)
+
+    def test_write_dataset(self):
+        path = os.path.join(self.directory, "positions.bin")
+        write_dataset(path, [[0, 1, 2], [2, 2, 1]], [True, False])
+        boards, labels = PositionDataset(path)[:]
+        np.testing.assert_array_equal(boards, [[0, 1, 2], [2, 2, 1]])
+        np.testing.assert_array_equal(labels, [True, False])
+
+    def test_invalid_input(self):
+        path = os.path.join(self.directory, "bad.csv")
+        with open(path, "w") as file:
+            file.write("A,B,class\nx,y,true\n")
+        with self.assertRaises(ValueError):
+            convert_csv(path, os.path.join(self.directory, "bad.bin"))
+        with open(path, "w") as file:
+            file.write("A,B,class\nx,o,maybe\n")
+        with self.assertRaises(ValueError):
+            convert_csv(path, os.path.join(self.directory, "bad.bin"))
+        with self.assertRaises(ValueError):
+            PositionDataset(path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+import numpy as np
+from dominance import eliminate_dominated
+from game_theory_algorithm import Game, MinimaxAlgorithm
+
+
+def padded_game(seed=0, core=6, extra=30):
+    # A random core game, plus rows and columns that are copies of core strategies made strictly worse
+    rng = np.random.default_rng(seed)
+    matrix = rng.integers(-5, 6, (core, core)).astype(float)
+    rows = np.vstack([matrix, matrix[rng.integers(0, core, extra)] - rng.integers(1, 4, (extra, 1))])
+    return np.hstack([rows, rows[:, rng.integers(0, core, extra)] + rng.integers(1, 4, (1, extra))])
+
+
+class TestDominance(unittest.TestCase):
+
+    def test_iterated_strict_dominance(self):
+        # Row 1 is dominated by row 0; then column 0 by column 1; then row 0 by row 2
+        matrix = [[3, 0, 1], [2, -1, 0], [1, 2, 0]]
+        reduction = eliminate_dominated(matrix)
+        self.assertEqual(reduction.rows.tolist(), [0, 2])
+        self.assertEqual(reduction.columns.tolist(), [1, 2])
+        np.testing.assert_array_equal(reduction.matrix, [[0, 1], [2, 0]])
+        self.assertEqual(reduction.original_shape, (3, 3))
+        self.assertAlmostEqual(reduction.shrinkage(), 5 / 9)
+        self.assertEqual(eliminate_dominated([[3, -1], [-2, 4]]).shape, (2, 2))
+
+    def test_weak_dominance_and_duplicates(self):
+        reduction = eliminate_dominated([[1, 1], [1, 0], [1, 1]], weak=True)
+        self.assertEqual((reduction.rows.tolist(), reduction.columns.tolist()), ([0], [0]))
+        self.assertEqual(eliminate_dominated([[1, 1], [1, 0], [1, 1]]).shape, (3, 2))
+
+    def test_mixed_dominance(self):
+        matrix = [[1, 0], [0, 1], [0.4, 0.4]]
+        self.assertEqual(eliminate_dominated(matrix).shape, (3, 2))
+        self.assertEqual(eliminate_dominated(matrix, mixed=True).rows.tolist(), [0, 1])
+
+    def test_solutions_map_back_to_the_original_game(self):
+        matrix = padded_game()
+        full = MinimaxAlgorithm(Game(matrix)).mixed_strategies()
+        for dominance, mixed in (("strict", False), ("weak", False), ("strict", True)):
+            solution = MinimaxAlgorithm(Game(matrix)).mixed_strategies(dominance=dominance, mixed_dominance=mixed)
+            self.assertLessEqual(solution.reduction.shape[0], 6)
+            self.assertAlmostEqual(solution.value, full.value)
+            self.assertEqual(len(solution.row_strategy), 36)
+            self.assertLess(solution.exploitability, 1e-9)
+            eliminated = np.setdiff1d(np.arange(36), solution.reduction.rows)
+            self.assertTrue(np.all(solution.row_strategy[eliminated] == 0))
+        with self.assertRaises(ValueError):
+            MinimaxAlgorithm(Game(matrix)).mixed_strategies(dominance="very")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from evaluation_cache import EvaluationCache, SharedEvaluationCache, WAYS
+from minimax_algorithm import MinimaxAlgorithm, Node
+from reference_games import ConnectFourState, UniformTreeState
+from self_play import GameStateExample
+from tournament import PlayerSettings, Tournament
+
+
+def fill(cache, keys):
+    for key in keys:
+        cache.store(key, key / 2)
+
+
+class TestEvaluationCache(unittest.TestCase):
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = EvaluationCache(3)
+        fill(cache, [1, 2, 3])
+        self.assertEqual(cache.probe(1), 0.5)
+        cache.store(4, 2.0)
+        self.assertIsNone(cache.probe(2))
+        self.assertEqual([cache.probe(key) for key in (1, 3, 4)], [0.5, 1.5, 2.0])
+        self.assertEqual((len(cache), cache.evictions), (3, 1))
+        self.assertEqual(cache.hit_rate(), 4 / 5)
+
+    def test_states_without_hash_are_evaluated(self):
+        cache = EvaluationCache()
+        self.assertEqual(cache.evaluate(GameStateExample()), GameStateExample().evaluate())
+        self.assertEqual((len(cache), cache.hits, cache.misses), (0, 0, 0))
+
+    def test_search_results_are_unchanged(self):
+        for root in (ConnectFourState(), UniformTreeState(branching=4, height=6)):
+            expected = MinimaxAlgorithm(None).alpha_beta(root, 5, True)
+            cache = EvaluationCache()
+            minimax = MinimaxAlgorithm(None, evaluation_cache=cache, collect_stats=True)
+            self.assertEqual(minimax.alpha_beta(root, 5, True), expected)
+            misses = minimax.stats.evaluate_calls
+            self.assertEqual(minimax.alpha_beta(root, 5, True), expected)
+            # The second search finds every leaf in the cache
+            self.assertEqual(minimax.stats.evaluate_calls, 0)
+            self.assertEqual(cache.misses, misses)
+            self.assertEqual(MinimaxAlgorithm(None, evaluation_cache=cache).minimax(Node(root), 3, True),
+                             MinimaxAlgorithm(None).minimax(Node(root), 3, True))
+
+    def test_tournament_records_are_unchanged(self):
+        small_tree = partial(UniformTreeState, branching=3, height=6)
+        plain = Tournament(small_tree, PlayerSettings(depth=3), seed=2, opening_moves=1, workers=1).run(4)
+        cached = Tournament(small_tree, PlayerSettings(depth=3, evaluation_cache=EvaluationCache(1 << 10)),
+                            seed=2, opening_moves=1, workers=1).run(4)
+        self.assertEqual([(record.moves, record.outcome, record.nodes) for record in plain],
+                         [(record.moves, record.outcome, record.nodes) for record in cached])
+
+
+def evaluate_leaves(cache, depth):
+    minimax = MinimaxAlgorithm(None, evaluation_cache=cache)
+    result = minimax.alpha_beta(UniformTreeState(branching=3, height=depth), depth, True)
+    return result, cache.misses
+
+
+class TestSharedEvaluationCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = SharedEvaluationCache(64)
+        self.addCleanup(self.cache.close)
+
+    def test_probe_and_store(self):
+        self.assertIsNone(self.cache.probe(12345))
+        self.cache.store(12345, -7)
+        self.cache.store(12345, 3.5)
+        self.assertEqual(self.cache.probe(12345), 3.5)
+        self.assertEqual(len(self.cache), 1)
+        self.cache.clear()
+        self.assertIsNone(self.cache.probe(12345))
+
+    def test_clock_keeps_referenced_entries(self):
+        buckets = self.cache.buckets
+        keys = [bucket * buckets for bucket in range(WAYS)]  # All in bucket 0
+        fill(self.cache, keys)
+        self.cache.probe(keys[0])
+        self.cache.probe(keys[2])
+        self.cache.store(WAYS * buckets, 0.0)
+        # The hand passes the referenced first slot and evicts the second
+        self.assertIsNone(self.cache.probe(keys[1]))
+        self.assertEqual(self.cache.probe(keys[0]), keys[0] / 2)
+        self.assertEqual(self.cache.probe(keys[2]), keys[2] / 2)
+        self.assertEqual(self.cache.evictions, 1)
+
+    def test_torn_entries_miss(self):
+        self.cache.store(99, 1.0)
+        slot = 99 % self.cache.buckets * WAYS
+        self.cache._scores[3 * slot + 1] = 2.0
+        self.assertIsNone(self.cache.probe(99))
+
+    def test_shared_between_processes(self):
+        cache = SharedEvaluationCache(1 << 12)
+        self.addCleanup(cache.close)
+        with ProcessPoolExecutor(1) as executor:
+            result, misses = executor.submit(evaluate_leaves, cache, 4).result()
+        self.assertGreater(misses, 0)
+        self.assertEqual(evaluate_leaves(cache, 4), (result, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
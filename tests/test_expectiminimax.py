@@ -0,0 +1,164 @@
+import random
+import unittest
+from itertools import product
+from expectiminimax import ExpectiminimaxAlgorithm, sample_size
+from minimax_algorithm import GameState
+from move_ordering import HistoryHeuristic, KillerMoves, PreviousBestMove
+from reference_games import DiceRaceState, mix64
+from self_play import MinimaxPlayer, SelfPlay
+from transposition_table import TranspositionTable
+
+
+def expectiminimax(state, depth, maximizing_player):
+    # The definition, searched without any pruning
+    if depth == 0 or state.is_terminal():
+        return state.evaluate()
+    if state.is_chance():
+        return sum(probability * expectiminimax(state.make_move(move), depth - 1, maximizing_player)
+                   for move, probability in state.chance_outcomes())
+    scores = [expectiminimax(state.make_move(move), depth - 1, not maximizing_player)
+              for move in state.get_possible_moves()]
+    return max(scores) if maximizing_player else min(scores)
+
+
+class RandomChanceTreeState(GameState):
+    # Decision and chance plies alternate; chance outcomes have uneven probabilities and leaves score in [0, 5]
+
+    def __init__(self, seed, height, node_id=0, ply=0):
+        super().__init__()
+        self.seed = seed
+        self.height = height
+        self.node_id = node_id
+        self.ply = ply
+
+    def _random(self, salt):
+        return mix64(self.node_id ^ (self.seed << 40) ^ (salt << 56))
+
+    def is_terminal(self):
+        return self.ply >= self.height
+
+    def is_chance(self):
+        return self.ply % 2 == 1 and not self.is_terminal()
+
+    def chance_outcomes(self):
+        weights = [1 + self._random(1 + move) % 9 for move in range(3)]
+        return [(move, weight / sum(weights)) for move, weight in enumerate(weights)]
+
+    def evaluate(self):
+        return self._random(0) % 1001 / 200
+
+    def get_possible_moves(self):
+        return [0, 1, 2]
+
+    def make_move(self, move):
+        return RandomChanceTreeState(self.seed, self.height, 3 * self.node_id + move + 1, self.ply + 1)
+
+    def hash_key(self):
+        return self._random(7)
+
+
+def random_positions(count, seed=0):
+    rng = random.Random(seed)
+    for _ in range(count):
+        scores = (rng.randrange(20), rng.randrange(20))
+        yield DiceRaceState(20, 2, scores, rng.choice((1, 2)), rng.choice((0, 0, 1, 2)))
+
+
+class TestExpectiminimaxAlgorithm(unittest.TestCase):
+
+    def test_pruning_keeps_the_exact_scores(self):
+        for state in random_positions(12):
+            maximizing_player = state.current_player == 1
+            for depth in range(1, 5):
+                expected = expectiminimax(state, depth, maximizing_player)
+                for pruning, table, scout in product((None, "star1", "star2"), (False, True), (False, True)):
+                    with self.subTest(scores=state.scores, dice=state.dice, depth=depth, pruning=pruning,
+                                      table=table, principal_variation_search=scout):
+                        search = ExpectiminimaxAlgorithm(None, state.bounds, pruning=pruning,
+                                                         transposition_table=TranspositionTable() if table else None,
+                                                         principal_variation_search=scout)
+                        score, _ = search.alpha_beta(state, depth, maximizing_player)
+                        self.assertAlmostEqual(score, expected)
+
+    def test_pruning_with_null_windows(self):
+        # Principal variation search hands chance states one-ulp windows, which scaling by the probabilities
+        # must not turn into wrong bounds
+        for seed in range(40):
+            state = RandomChanceTreeState(seed, 6)
+            expected = expectiminimax(state, 6, True)
+            for pruning in ("star1", "star2"):
+                for window in ((float('-inf'), float('inf')), (1.5, 4.5)):
+                    with self.subTest(seed=seed, pruning=pruning, window=window):
+                        search = ExpectiminimaxAlgorithm(None, (0, 5), pruning=pruning,
+                                                         principal_variation_search=True,
+                                                         transposition_table=TranspositionTable(),
+                                                         move_ordering=[KillerMoves(), HistoryHeuristic()])
+                        score, _ = search.alpha_beta(state, 6, True, *window)
+                        if window[0] < expected < window[1]:
+                            self.assertAlmostEqual(score, expected)
+                        elif expected <= window[0]:
+                            self.assertLessEqual(score, window[0] + 1e-9)
+                        else:
+                            self.assertGreaterEqual(score, window[1] - 1e-9)
+
+    def test_star_pruning_searches_fewer_nodes(self):
+        state = DiceRaceState(30, 3, (22, 25))
+        nodes = {}
+        for pruning in (None, "star1", "star2"):
+            search = ExpectiminimaxAlgorithm(None, state.bounds, pruning=pruning)
+            search.alpha_beta(state, 4, True)
+            nodes[pruning] = search.nodes_searched
+        self.assertLess(nodes["star1"], nodes[None])
+        self.assertLess(nodes["star2"], nodes[None])
+
+    def test_sampling(self):
+        self.assertEqual(sample_size(10, 0.9, (-30, 30)), 54)
+        with self.assertRaises(ValueError):
+            sample_size(0, 0.9, (-30, 30))
+        state = DiceRaceState(30, 3, (10, 14))
+        exact, _ = ExpectiminimaxAlgorithm(None, state.bounds).alpha_beta(state, 4, True)
+        scores = [ExpectiminimaxAlgorithm(None, state.bounds, error_bound=10, confidence=0.9, seed=1)
+                  .alpha_beta(state, 4, True)[0] for _ in range(2)]
+        self.assertEqual(scores[0], scores[1])
+        self.assertLess(abs(scores[0] - exact), 10)
+        # Chance states with fewer outcomes than samples are expanded exactly
+        small = DiceRaceState(30, 1, (10, 14))
+        sampled = ExpectiminimaxAlgorithm(None, small.bounds, error_bound=10, confidence=0.9, seed=1)
+        self.assertAlmostEqual(sampled.alpha_beta(small, 4, True)[0], expectiminimax(small, 4, True))
+
+    def test_pruning_and_sampling_need_bounds(self):
+        with self.assertRaises(ValueError):
+            ExpectiminimaxAlgorithm(None)
+        with self.assertRaises(ValueError):
+            ExpectiminimaxAlgorithm(None, pruning=None, error_bound=1)
+        with self.assertRaises(ValueError):
+            ExpectiminimaxAlgorithm(None, (-1, 1), pruning="star3")
+
+    def test_iterative_deepening(self):
+        state = DiceRaceState(20, 2, (8, 11))
+        search = ExpectiminimaxAlgorithm(None, state.bounds, depth_limit=5, move_ordering=[PreviousBestMove()])
+        result = search.search(state, True)
+        self.assertEqual(result.depth, 5)
+        self.assertAlmostEqual(result.score, expectiminimax(state, 5, True))
+        self.assertEqual(result.principal_variation[:1], [result.move])
+        self.assertTrue(result.completed)
+
+    def test_self_play_draws_chance_moves(self):
+        state = DiceRaceState(20, 2)
+        player = MinimaxPlayer(ExpectiminimaxAlgorithm(None, state.bounds), depth=2)
+        games = [SelfPlay(state, players=(player, player), seed=3) for _ in range(2)]
+        outcomes = [game.play() for game in games]
+        self.assertEqual(outcomes[0], outcomes[1])
+        self.assertEqual(games[0].moves, games[1].moves)
+        self.assertTrue(games[0].final_state.is_terminal())
+        # Decisions and rolls alternate, and only decisions are searched
+        moves = games[0].moves
+        self.assertTrue(all(move in (1, 2) for move in moves[::2]))
+        self.assertTrue(all(isinstance(roll, tuple) and len(roll) == dice
+                            for dice, roll in zip(moves[::2], moves[1::2])))
+        self.assertTrue(all(nodes == 0 for nodes in games[0].nodes_searched[1::2]))
+        self.assertTrue(all(nodes > 0 for nodes in games[0].nodes_searched[::2]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from game_theory_algorithm import Game, MinimaxAlgorithm
+
+
+def legacy_minimax(game):
+    # The per-cell computation Game and MinimaxAlgorithm used before the payoffs were held in an array
+    row_minima = [min(game.get_payoff(row, col) for col in range(game.columns)) for row in range(game.rows)]
+    column_maxima = [max(game.get_payoff(row, col) for row in range(game.rows)) for col in range(game.columns)]
+    return row_minima.index(max(row_minima)), column_maxima.index(min(column_maxima))
+
+
+class TestGame(unittest.TestCase):
+
+    def test_accepts_lists(self):
+        game = Game([[3, -1], [-2, 4]])
+        self.assertIsInstance(game.matrix, np.ndarray)
+        self.assertEqual((game.rows, game.columns), (2, 2))
+        self.assertEqual(game.get_payoff(1, 0), -2)
+        self.assertIsInstance(game.get_payoff(1, 0), int)
+        self.assertEqual(game.get_opponent_payoff(1, 0), 2)
+
+    def test_arrays_are_not_copied(self):
+        matrix = np.arange(12.0).reshape(3, 4)
+        self.assertTrue(np.shares_memory(Game(matrix).matrix, matrix))
+
+    def test_memory_mapped_file(self):
+        matrix = np.random.default_rng(0).normal(size=(30, 40))
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "payoffs.npy")
+            np.save(path, matrix)
+            game = Game(path)
+            self.assertIsInstance(game.matrix, np.memmap)
+            self.assertEqual(MinimaxAlgorithm(game).minimax(), MinimaxAlgorithm(Game(matrix)).minimax())
+            del game
+
+    def test_rejects_non_matrices(self):
+        with self.assertRaises(ValueError):
+            Game([1, 2, 3])
+
+    def test_minimax_matches_per_cell_computation(self):
+        rng = np.random.default_rng(1)
+        for _ in range(20):
+            game = Game(rng.integers(-3, 3, size=(rng.integers(1, 9), rng.integers(1, 9))))
+            self.assertEqual(MinimaxAlgorithm(game).minimax(), legacy_minimax(game))
+
+    def test_saddle_point(self):
+        self.assertEqual(MinimaxAlgorithm(Game([[4, 2, 3], [1, 0, -1]])).saddle_point(), (0, 1))
+        self.assertIsNone(MinimaxAlgorithm(Game([[3, -1], [-2, 4]])).saddle_point())
+
+    def test_best_response(self):
+        minimax = MinimaxAlgorithm(Game([[3, -1], [-2, 4]]))
+        self.assertEqual(minimax.best_response(0), 0)
+        self.assertEqual(minimax.best_response(1), 1)
+        self.assertEqual(minimax.best_response([0.2, 0.8]), 1)
+        self.assertEqual(minimax.best_response(0, player=2), 1)
+        self.assertEqual(minimax.best_response([0.1, 0.9], player=2), 0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+import unittest
+from game_tree import BoundedGameTree
+from minimax_algorithm import MinimaxAlgorithm, Node
+from reference_games import UniformTreeState
+
+
+class TestBoundedGameTree(unittest.TestCase):
+
+    def test_same_result_as_unbounded_tree(self):
+        for seed in range(5):
+            root = UniformTreeState(branching=4, height=6, seed=seed)
+            tree = BoundedGameTree(root, max_nodes=200)
+            expected = MinimaxAlgorithm(None).minimax(Node(root), 6, True)
+            self.assertEqual(MinimaxAlgorithm(None).minimax(tree.root, 6, True), expected)
+            self.assertGreater(tree.released_nodes, 0)
+
+    def test_node_count_stays_under_cap(self):
+        tree = BoundedGameTree(UniformTreeState(branching=4, height=6), max_nodes=200)
+        peak = 0
+        expand = tree._expand
+
+        def tracked_expand(node):
+            nonlocal peak
+            children = expand(node)
+            peak = max(peak, tree.node_count)
+            return children
+
+        tree._expand = tracked_expand
+        MinimaxAlgorithm(None).minimax(tree.root, 6, True)
+        self.assertLessEqual(peak, 200)
+
+    def test_principal_variation_is_kept(self):
+        root = UniformTreeState(branching=4, height=6)
+        tree = BoundedGameTree(root, max_nodes=500)
+        score, move = MinimaxAlgorithm(None).minimax(tree.root, 6, True)
+        self.assertGreater(tree.released_nodes, 0)
+        principal_variation = tree.principal_variation()
+        self.assertEqual(principal_variation[1].move, move)
+        self.assertEqual(len(principal_variation), 7)
+        self.assertEqual(principal_variation[-1].evaluate(), score)
+
+    def test_uncapped_tree_keeps_everything(self):
+        tree = BoundedGameTree(UniformTreeState(branching=3, height=4), max_nodes=10 ** 6)
+        MinimaxAlgorithm(None).minimax(tree.root, 4, True)
+        self.assertEqual(tree.node_count, 1 + 3 + 9 + 27 + 81)
+        self.assertEqual(tree.released_nodes, 0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import unittest
+import numpy as np
+from game_theory_algorithm import Game, MinimaxAlgorithm
+from incremental_solver import IncrementalSolver
+from mixed_strategy_solver import MixedStrategySolver
+
+
+class TestIncrementalSolver(unittest.TestCase):
+
+    def assert_solved(self, session):
+        matrix = session.matrix.copy()
+        np.testing.assert_array_equal(session.row_minima, matrix.min(axis=1))
+        np.testing.assert_array_equal(session.column_maxima, matrix.max(axis=0))
+        game = MinimaxAlgorithm(Game(matrix))
+        self.assertEqual(session.minimax(), game.minimax())
+        self.assertEqual(session.saddle_point(), game.saddle_point())
+        solution = session.solve()
+        self.assertAlmostEqual(solution.value, MixedStrategySolver(matrix).solve().value)
+        self.assertLess(solution.exploitability, 1e-9)
+        self.assertEqual(solution.row_strategy.shape, (session.rows,))
+
+    def test_changes_keep_the_game_solved(self):
+        rng = np.random.default_rng(0)
+        session = IncrementalSolver(rng.integers(-9, 10, (4, 5)))
+        self.assert_solved(session)
+        for step in range(60):
+            change = step % 5
+            if change == 0:
+                session.add_column(rng.integers(-9, 10, session.rows))
+            elif change == 1:
+                session.add_row(rng.integers(-9, 10, session.columns))
+            elif change == 2:
+                count = 3
+                session.update_payoffs(rng.integers(0, session.rows, count), rng.integers(0, session.columns, count),
+                                       rng.integers(-9, 10, count))
+            elif change == 3 and session.columns > 2:
+                session.remove_column(int(rng.integers(session.columns)))
+            elif change == 4 and session.rows > 2:
+                session.remove_row(int(rng.integers(session.rows)))
+            self.assert_solved(session)
+
+    def test_removing_the_extreme_value(self):
+        session = IncrementalSolver([[1, 5], [2, 3]])
+        session.remove_row(0)
+        np.testing.assert_array_equal(session.column_maxima, [2, 3])
+        session.update_payoffs(0, 0, 4)
+        np.testing.assert_array_equal(session.row_minima, [3])
+        self.assertEqual(session.saddle_point(), (0, 1))
+        with self.assertRaises(ValueError):
+            session.remove_row(0)
+        with self.assertRaises(ValueError):
+            session.add_row([1, 2, 3])
+
+    def test_new_strategies_join_the_support(self):
+        # Matching pennies: adding a column that beats both rows makes it the only one played
+        session = IncrementalSolver([[1, -1], [-1, 1]])
+        self.assertAlmostEqual(session.solve().value, 0.0)
+        session.add_column([-2, -2])
+        solution = session.solve()
+        self.assertAlmostEqual(solution.value, -2.0)
+        np.testing.assert_allclose(solution.column_strategy, [0, 0, 1])
+
+
+if __name__ == '__main__':
+    unittest.main()
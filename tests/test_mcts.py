@@ -0,0 +1,119 @@
+import unittest
+from mcts import MCTS, rollout, terminal_value
+from minimax_algorithm import MinimaxAlgorithm
+from reference_games import UniformTreeState
+from self_play import MinimaxPlayer, SelfPlay
+from tic_tac_toe import TicTacToeState, TicTacToeTable
+from tournament import PlayerSettings, Tournament
+
+
+class UnhashedTreeState(UniformTreeState):
+
+    def make_move(self, move):
+        return UnhashedTreeState(self.branching, self.height, self.seed,
+                                 self.node_id * self.branching + move + 1, self.ply + 1)
+
+    def hash_key(self):
+        return None
+
+
+class TestMCTS(unittest.TestCase):
+
+    def test_finds_immediate_win_and_block(self):
+        engine = MCTS(iterations=400)
+        self.assertEqual(engine.search(TicTacToeState.from_cells("x x b o o b b b b".split())), 2)
+        # O threatens the middle row, X must block
+        self.assertEqual(engine.search(TicTacToeState.from_cells("x b b o o b x b b".split())), 5)
+
+    def test_tree_is_array_backed(self):
+        engine = MCTS(iterations=300)
+        engine.search(TicTacToeState())
+        self.assertEqual(len(engine.moves), engine.size)
+        self.assertEqual(engine.visits[0], 300)
+        # Children are consecutive, and every node's visits are its children's visits plus its own evaluation
+        for node in range(engine.size):
+            count = engine.child_count[node]
+            if count:
+                start = engine.first_child[node]
+                self.assertTrue((engine.parent[start:start + count] == node).all())
+                self.assertEqual(engine.visits[node], engine.visits[start:start + count].sum() + 1)
+
+    def test_batches_and_virtual_loss(self):
+        engine = MCTS(iterations=800, batch_size=16)
+        self.assertEqual(engine.search(TicTacToeState.from_cells("x x b o o b b b b".split())), 2)
+        self.assertEqual(engine.nodes_searched, 800)
+        # No virtual loss is left behind; the whole first batch stopped at the unexpanded root
+        start, count = engine.first_child[0], engine.child_count[0]
+        self.assertEqual(engine.visits[0], 800)
+        self.assertEqual(engine.visits[start:start + count].sum(), 800 - 16)
+        self.assertTrue((abs(engine.value_sum[:engine.size]) <= engine.visits[:engine.size]).all())
+
+    def test_batched_evaluator_and_puct(self):
+        batches = []
+
+        def evaluator(states):
+            batches.append(len(states))
+            priors = [[1.0 if move == 4 else 0.0 for move in state.get_possible_moves()] for state in states]
+            return [(0.0, prior) for prior in priors]
+
+        engine = MCTS(iterations=64, algorithm="puct", evaluator=evaluator, batch_size=8)
+        self.assertEqual(engine.search(TicTacToeState()), 4)
+        self.assertEqual(max(batches), 8)
+
+    def test_rollouts_on_a_process_pool_are_reproducible(self):
+        serial = MCTS(iterations=400, batch_size=16, seed=3)
+        parallel = MCTS(iterations=400, batch_size=16, seed=3, rollout_workers=2)
+        self.addCleanup(parallel.close)
+        state = UniformTreeState(branching=4, height=8)
+        self.assertEqual(serial.search(state), parallel.search(state))
+        self.assertTrue((serial.visits[:serial.size] == parallel.visits[:parallel.size]).all())
+
+    def test_rollout(self):
+        state = TicTacToeState.from_cells("x x b o o b b b b".split())
+        self.assertIn(rollout(state, 1), (-1, 0, 1))
+        self.assertEqual(terminal_value(TicTacToeState.from_cells("x x x o o b b b b".split())), 1)
+
+    def test_tree_reuse(self):
+        engine = MCTS(iterations=500)
+        state = TicTacToeState()
+        move = engine.search(state)
+        engine.advance(move)
+        engine.advance(0 if move != 0 else 1)
+        self.assertGreater(engine.size, 1)
+        size = engine.size
+        engine.search(state.make_move(move).make_move(0 if move != 0 else 1))
+        self.assertEqual(engine.reused_nodes, size - 1)
+        # A search of another position starts afresh
+        engine.search(TicTacToeState().make_move(8))
+        self.assertEqual(engine.reused_nodes, 0)
+
+    def test_tree_is_not_reused_without_hashes(self):
+        engine = MCTS(iterations=200)
+        state = UnhashedTreeState(branching=3, height=6)
+        engine.advance(engine.search(state))
+        # Another position cannot be told apart from the expected one, so the tree starts afresh
+        engine.search(state.make_move(2).make_move(0))
+        self.assertEqual(engine.reused_nodes, 0)
+
+    def test_self_play_player(self):
+        engine = MCTS(iterations=2000, seed=1)
+        self_play = SelfPlay(TicTacToeState(), players=(engine, engine))
+        self.assertEqual(self_play.play(), "Draw")
+        # Against perfect play, MCTS does not lose
+        table = TicTacToeTable.solve()
+        perfect = MinimaxPlayer(MinimaxAlgorithm(None, tablebase=table), depth=9)
+        self.assertNotEqual(SelfPlay(TicTacToeState(), players=(perfect, MCTS(iterations=2000))).play(),
+                            "Player 1 wins")
+
+    def test_tournament_player(self):
+        records = Tournament(TicTacToeState, PlayerSettings(algorithm="mcts", iterations=50), PlayerSettings(depth=2),
+                             workers=1).run(2)
+        self.assertTrue(all(record.nodes[0] > 0 for record in records))
+
+    def test_unknown_algorithm(self):
+        with self.assertRaises(ValueError):
+            MCTS(algorithm="ucb")
+
+
+if __name__ == '__main__':
+    unittest.main()
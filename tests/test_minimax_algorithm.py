@@ -1,5 +1,54 @@
+import io
+import random
+import threading
 import unittest
-from minimax_algorithm import MinimaxAlgorithm
+from contextlib import redirect_stdout
+from minimax_algorithm import MinimaxAlgorithm, Node, GameState
+from move_ordering import KillerMoves, HistoryHeuristic, PreviousBestMove
+from reference_games import UniformTreeState
+from transposition_table import TranspositionTable
+
+
+class RandomTreeState(GameState):
+    # A random game tree: every node has a random number of moves and a random evaluation
+    def __init__(self, seed, branching=4, height=5, path=()):
+        super().__init__()
+        self.seed = seed
+        self.branching = branching
+        self.height = height
+        self.path = path
+
+    def is_terminal(self):
+        return len(self.path) == self.height
+
+    def evaluate(self):
+        return random.Random(f"{self.seed}:{self.path}:score").uniform(-100, 100)
+
+    def get_possible_moves(self):
+        return list(range(random.Random(f"{self.seed}:{self.path}").randint(1, self.branching)))
+
+    def make_move(self, move):
+        return RandomTreeState(self.seed, self.branching, self.height, self.path + (move,))
+
+
+class BatchedTreeState(UniformTreeState):
+    # A uniform tree that scores its leaves in batches, recording the size of every batch
+    batches = []
+
+    def make_move(self, move):
+        return BatchedTreeState(self.branching, self.height, self.seed, self.node_id * self.branching + move + 1,
+                                self.ply + 1)
+
+    def evaluate_batch(self, states):
+        BatchedTreeState.batches.append(len(states))
+        return [state.evaluate() for state in states]
+
+
+def count_nodes(state, depth):
+    if depth == 0 or state.is_terminal():
+        return 1
+    return 1 + sum(count_nodes(state.make_move(move), depth - 1) for move in state.get_possible_moves())
+
 
 class TestMinimaxAlgorithm(unittest.TestCase):
     
@@ -40,5 +89,229 @@ class TestMinimaxAlgorithm(unittest.TestCase):
         is_terminal = minimax.is_terminal_state(terminal_state)
         self.assertTrue(is_terminal)
 
+
+class TestAlphaBeta(unittest.TestCase):
+
+    def assert_matches_minimax(self, minimax, seeds, depth=5):
+        for seed in seeds:
+            root = RandomTreeState(seed)
+            for maximizing_player in (True, False):
+                expected = MinimaxAlgorithm(None).minimax(Node(root), depth, maximizing_player)
+                self.assertEqual(minimax.alpha_beta(root, depth, maximizing_player), expected)
+
+    def test_matches_plain_minimax(self):
+        self.assert_matches_minimax(MinimaxAlgorithm(None), range(30))
+
+    def test_matches_plain_minimax_at_partial_depth(self):
+        self.assert_matches_minimax(MinimaxAlgorithm(None), range(30), depth=3)
+
+    def test_principal_variation_search_matches_plain_minimax(self):
+        self.assert_matches_minimax(MinimaxAlgorithm(None, principal_variation_search=True), range(30))
+
+    def test_move_ordering_matches_plain_minimax(self):
+        ordering = [PreviousBestMove(), KillerMoves(), HistoryHeuristic()]
+        minimax = MinimaxAlgorithm(None, move_ordering=ordering, principal_variation_search=True)
+        for seed in range(30):
+            root = RandomTreeState(seed)
+            expected = MinimaxAlgorithm(None).minimax(Node(root), 5, True)
+            for depth in range(1, 6):
+                result = minimax.alpha_beta(root, depth, True)
+            self.assertEqual(result, expected)
+
+    def test_principal_variation_starts_with_best_move(self):
+        minimax = MinimaxAlgorithm(None)
+        score, move = minimax.alpha_beta(Node(RandomTreeState(7)), 5, True)
+        self.assertEqual(minimax.principal_variation[0], move)
+        state = RandomTreeState(7)
+        for pv_move in minimax.principal_variation:
+            state = state.make_move(pv_move)
+        self.assertEqual(state.evaluate(), score)
+
+    def test_searches_fewer_nodes(self):
+        minimax = MinimaxAlgorithm(None, move_ordering=[KillerMoves(), HistoryHeuristic()])
+        total_pruned = total_full = 0
+        for seed in range(10):
+            root = RandomTreeState(seed, branching=6)
+            minimax.alpha_beta(root, 5, True)
+            total_pruned += minimax.nodes_searched
+            total_full += count_nodes(root, 5)
+            self.assertLessEqual(minimax.nodes_searched, count_nodes(root, 5))
+        self.assertLess(total_pruned, total_full)
+
+class TestBudgetedSearch(unittest.TestCase):
+
+    def test_unbudgeted_search_reaches_depth_limit(self):
+        root = RandomTreeState(3, height=8)
+        result = MinimaxAlgorithm(None, depth_limit=5).search(root)
+        self.assertEqual((result.score, result.move), MinimaxAlgorithm(None).alpha_beta(root, 5, True))
+        self.assertEqual(result.depth, 5)
+        self.assertTrue(result.completed)
+
+    def test_depth_limit_below_one(self):
+        root = RandomTreeState(3, height=4)
+        for collect_stats in (False, True):
+            with self.assertRaises(ValueError):
+                MinimaxAlgorithm(None, depth_limit=0, collect_stats=collect_stats).search(root)
+        # The first iteration is still a full search
+        self.assertEqual(MinimaxAlgorithm(None, depth_limit=1).search(root).depth, 1)
+
+    def test_search_stops_when_tree_is_exhausted(self):
+        root = RandomTreeState(3, height=4)
+        result = MinimaxAlgorithm(None).search(root)
+        self.assertTrue(result.completed)
+        self.assertLessEqual(result.depth, 5)
+        self.assertEqual((result.score, result.move), MinimaxAlgorithm(None).minimax(Node(root), 4, True))
+
+    def test_node_budget_returns_last_completed_depth(self):
+        root = RandomTreeState(3, branching=6, height=20)
+        result = MinimaxAlgorithm(None).search(root, node_budget=3000)
+        self.assertFalse(result.completed)
+        self.assertLessEqual(result.nodes, 3000)
+        self.assertEqual((result.score, result.move), MinimaxAlgorithm(None).alpha_beta(root, result.depth, True))
+
+    def test_time_budget(self):
+        root = RandomTreeState(3, branching=6, height=20)
+        result = MinimaxAlgorithm(None).search(root, time_budget=0.2)
+        self.assertFalse(result.completed)
+        self.assertLess(result.elapsed, 0.4)
+        self.assertIsNotNone(result.move)
+
+    def test_aspiration_windows_give_the_same_result(self):
+        for seed in range(10):
+            root = RandomTreeState(seed, height=6)
+            plain = MinimaxAlgorithm(None, depth_limit=6).search(root)
+            aspiration = MinimaxAlgorithm(None, depth_limit=6).search(root, aspiration_window=5)
+            self.assertEqual((aspiration.score, aspiration.move), (plain.score, plain.move))
+
+    def test_progress_is_reported_without_printing(self):
+        depths = []
+        output = io.StringIO()
+        with redirect_stdout(output):
+            MinimaxAlgorithm(None, depth_limit=4).search(RandomTreeState(1, height=6),
+                                                         progress=lambda result: depths.append(result.depth))
+        self.assertEqual(depths, [1, 2, 3, 4])
+        self.assertEqual(output.getvalue(), "")
+
+    def test_cancel(self):
+        minimax = MinimaxAlgorithm(None)
+        timer = threading.Timer(0.1, minimax.cancel)
+        timer.start()
+        result = minimax.search(RandomTreeState(3, branching=6, height=20))
+        timer.join()
+        self.assertFalse(result.completed)
+        self.assertIsNotNone(result.move)
+        # A cancellation that arrives before the search starts is not lost, and applies to that search only
+        minimax.cancel()
+        result = minimax.search(RandomTreeState(3, branching=6, height=20))
+        self.assertEqual((result.depth, result.completed), (1, False))
+        result = minimax.search(RandomTreeState(3, branching=6, height=6))
+        self.assertTrue(result.completed)
+
+class TestInPlaceMoves(unittest.TestCase):
+
+    def test_detects_in_place_support(self):
+        self.assertTrue(UniformTreeState().supports_in_place_moves())
+        self.assertFalse(RandomTreeState(0).supports_in_place_moves())
+
+    def test_same_result_as_copy_on_move(self):
+        for seed in range(5):
+            root = UniformTreeState(branching=4, height=6, seed=seed)
+            copied = MinimaxAlgorithm(None, in_place_moves=False, transposition_table=TranspositionTable())
+            in_place = MinimaxAlgorithm(None, transposition_table=TranspositionTable())
+            self.assertEqual(in_place.alpha_beta(root, 6, True), copied.alpha_beta(root, 6, True))
+            self.assertEqual(in_place.nodes_searched, copied.nodes_searched)
+            self.assertEqual((root.node_id, root.ply), (0, 0))
+
+    def test_state_is_restored_after_abort(self):
+        root = UniformTreeState(branching=6, height=30)
+        result = MinimaxAlgorithm(None).search(root, node_budget=5000)
+        self.assertFalse(result.completed)
+        self.assertEqual((root.node_id, root.ply, root.current_player), (0, 0, 1))
+
+
+class TestSearchReuse(unittest.TestCase):
+
+    def test_orderers_follow_the_played_move(self):
+        killers = KillerMoves()
+        killers.record_cutoff(3, 2, 0)
+        killers.record_cutoff(4, 2, 1)
+        killers.record_cutoff(5, 1, 2)
+        killers.advance(0)
+        self.assertEqual(killers.killers, {0: [4], 1: [5]})
+        previous = PreviousBestMove()
+        previous.search_completed([1, 2, 3])
+        previous.advance(1)
+        self.assertEqual(previous.principal_variation, [2, 3])
+        previous.advance(0)
+        self.assertEqual(previous.principal_variation, [])
+
+    def test_warm_searches_search_fewer_nodes(self):
+        def engine():
+            return MinimaxAlgorithm(None, depth_limit=4, transposition_table=TranspositionTable(),
+                                    move_ordering=[PreviousBestMove(), KillerMoves(), HistoryHeuristic()])
+
+        warm = engine()
+        state = UniformTreeState(branching=5, height=10, seed=3)
+        warm_nodes = cold_nodes = 0
+        maximizing_player = True
+        while not state.is_terminal():
+            cold_nodes += engine().search(state, maximizing_player).nodes
+            result = warm.search(state, maximizing_player)
+            warm_nodes += result.nodes
+            warm.advance(result.move)
+            state = state.make_move(result.move)
+            maximizing_player = not maximizing_player
+        self.assertLess(warm_nodes, cold_nodes)
+
+    def test_clear(self):
+        minimax = MinimaxAlgorithm(None, move_ordering=[KillerMoves()], transposition_table=TranspositionTable())
+        minimax.alpha_beta(UniformTreeState(branching=4, height=6), 6, True)
+        minimax.clear()
+        self.assertEqual(minimax.move_ordering[0].killers, {})
+        self.assertIsNone(minimax.transposition_table.probe(2 * UniformTreeState().hash_key() + 1))
+
+
+
+class TestBatchEvaluation(unittest.TestCase):
+
+    def setUp(self):
+        BatchedTreeState.batches = []
+
+    def test_detects_batch_support(self):
+        self.assertTrue(BatchedTreeState().supports_batch_evaluation())
+        self.assertFalse(UniformTreeState().supports_batch_evaluation())
+
+    def test_same_search_as_one_leaf_at_a_time(self):
+        configurations = [dict, lambda: {"principal_variation_search": True}, lambda: {"in_place_moves": False},
+                          lambda: {"transposition_table": TranspositionTable()},
+                          lambda: {"move_ordering": [PreviousBestMove(), KillerMoves(), HistoryHeuristic()],
+                                   "principal_variation_search": True}]
+        for settings in configurations:
+            for seed in range(3):
+                root = BatchedTreeState(branching=4, height=6, seed=seed)
+                results = []
+                for batch_evaluation in (False, True):
+                    minimax = MinimaxAlgorithm(None, batch_evaluation=batch_evaluation, **settings())
+                    for depth in range(1, 6):
+                        score_and_move = minimax.alpha_beta(root, depth, seed % 2 == 0)
+                    results.append((score_and_move, minimax.principal_variation, minimax.nodes_searched))
+                self.assertEqual(results[0], results[1], list(settings()))
+        self.assertTrue(BatchedTreeState.batches)
+        self.assertEqual(max(BatchedTreeState.batches), 4)
+
+    def test_plain_minimax(self):
+        root = BatchedTreeState(branching=3, height=5, seed=4)
+        expected = MinimaxAlgorithm(None, batch_evaluation=False).minimax(Node(root), 4, True)
+        self.assertEqual(MinimaxAlgorithm(None).minimax(Node(root), 4, True), expected)
+        self.assertEqual(len(BatchedTreeState.batches), 27)
+
+    def test_budgeted_search(self):
+        root = BatchedTreeState(branching=5, height=20)
+        plain = MinimaxAlgorithm(None, batch_evaluation=False).search(root, node_budget=4000)
+        batched = MinimaxAlgorithm(None).search(root, node_budget=4000)
+        self.assertEqual((batched.score, batched.move, batched.depth, batched.nodes),
+                         (plain.score, plain.move, plain.depth, plain.nodes))
+
+
 if __name__ == "__main__":
     unittest.main()
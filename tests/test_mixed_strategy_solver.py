@@ -0,0 +1,62 @@
+import unittest
+import numpy as np
+from game_theory_algorithm import Game, MinimaxAlgorithm
+from mixed_strategy_solver import MixedStrategySolver, exploitability, simplex
+
+
+class TestMixedStrategySolver(unittest.TestCase):
+
+    def test_matching_pennies(self):
+        solution = MixedStrategySolver(Game([[1, -1], [-1, 1]])).solve()
+        self.assertAlmostEqual(solution.value, 0.0)
+        np.testing.assert_allclose(solution.row_strategy, [0.5, 0.5])
+        np.testing.assert_allclose(solution.column_strategy, [0.5, 0.5])
+
+    def test_game_without_saddle_point(self):
+        # The example game of game_theory_algorithm.py: value 1, Player 1 plays 3/5 of row 0
+        solution = MixedStrategySolver([[3, -1], [-2, 4]]).solve()
+        self.assertAlmostEqual(solution.value, 1.0)
+        np.testing.assert_allclose(solution.row_strategy, [0.6, 0.4])
+        np.testing.assert_allclose(solution.column_strategy, [0.5, 0.5])
+
+    def test_saddle_point(self):
+        solution = MixedStrategySolver([[4, 2, 3], [1, 0, -1]]).solve()
+        self.assertAlmostEqual(solution.value, 2.0)
+        np.testing.assert_allclose(solution.row_strategy, [1, 0])
+        np.testing.assert_allclose(solution.column_strategy, [0, 1, 0])
+
+    def test_exact_solutions_are_equilibria(self):
+        rng = np.random.default_rng(0)
+        for rows, columns in [(3, 7), (20, 20), (50, 30), (150, 120)]:
+            matrix = rng.integers(-10, 10, size=(rows, columns)).astype(float)
+            solution = MixedStrategySolver(matrix).solve_exact()
+            self.assertLess(solution.exploitability, 1e-8)
+            self.assertAlmostEqual(solution.row_strategy.sum(), 1.0)
+            self.assertAlmostEqual(solution.column_strategy.sum(), 1.0)
+            self.assertGreaterEqual(solution.row_strategy.min(), 0.0)
+            self.assertAlmostEqual(solution.value, solution.row_strategy @ matrix @ solution.column_strategy)
+
+    def test_double_oracle_matches_direct_simplex(self):
+        matrix = np.random.default_rng(1).uniform(-1, 1, size=(150, 150))
+        value = simplex(matrix)[0]
+        self.assertAlmostEqual(MixedStrategySolver(matrix).solve_exact().value, value, places=9)
+
+    def test_approximate_methods_reach_epsilon(self):
+        matrix = np.random.default_rng(2).uniform(-1, 1, size=(200, 300))
+        exact = MixedStrategySolver(matrix).solve_exact()
+        for method in ("regret_matching", "multiplicative_weights"):
+            solution = MixedStrategySolver(matrix).solve(method, epsilon=1e-3)
+            self.assertLessEqual(solution.exploitability, 1e-3)
+            self.assertLessEqual(exploitability(matrix, solution.row_strategy, solution.column_strategy), 1e-3)
+            self.assertAlmostEqual(solution.value, exact.value, delta=1e-3)
+
+    def test_minimax_algorithm_mixed_strategies(self):
+        solution = MinimaxAlgorithm(Game([[3, -1], [-2, 4]])).mixed_strategies()
+        self.assertAlmostEqual(solution.value, 1.0)
+
+    def test_unknown_method(self):
+        with self.assertRaises(ValueError):
+            MixedStrategySolver([[1]]).solve("guess")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+from move_server import LatencyHistogram, MoveServer
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+async def with_server(test, **settings):
+    async with MoveServer(**{"workers": 1, **settings}) as server:
+        return await test(server)
+
+
+class TestLatencyHistogram(unittest.TestCase):
+
+    def test_percentiles_are_within_a_bucket(self):
+        histogram = LatencyHistogram()
+        for millisecond in range(1, 101):
+            histogram.record(millisecond / 1000)
+        self.assertEqual(histogram.count, 100)
+        self.assertAlmostEqual(histogram.percentile(50), 0.050, delta=0.005)
+        self.assertAlmostEqual(histogram.percentile(99), 0.099, delta=0.009)
+        self.assertEqual(histogram.percentile(100), 0.1)
+        self.assertEqual(LatencyHistogram().to_dict()["p99_ms"], 0.0)
+
+
+class TestMoveServer(unittest.TestCase):
+
+    def test_best_move(self):
+        async def test(server):
+            return await server.handle({"id": 7, "command": "best_move", "game": "tic_tac_toe",
+                                        "position": "xxbobobbb", "depth": 9})
+
+        response = run(with_server(test))
+        self.assertEqual(response["id"], 7)
+        self.assertEqual(response["result"]["move"], 2)
+        self.assertEqual(response["result"]["score"], 1)
+
+    def test_matrix_games_are_solved_in_batches(self):
+        async def test(server):
+            matrices = [[[1, -1], [-1, 1]], [[3, -1], [-2, 1]], [[1, 2, 3], [0, 1, 0]]] * 20
+            responses = await asyncio.gather(*(server.handle({"id": index, "command": "solve_matrix",
+                                                              "matrix": matrix})
+                                               for index, matrix in enumerate(matrices)))
+            return responses, server.stats()
+
+        responses, stats = run(with_server(test))
+        self.assertEqual([response["id"] for response in responses], list(range(60)))
+        self.assertEqual([response["result"]["value"] for response in responses[:3]], [0.0, 1 / 7, 1.0])
+        self.assertTrue(responses[2]["result"]["saddle_point"])
+        self.assertEqual(stats["completed"], 60)
+        self.assertLess(stats["batches"], 60)
+        self.assertEqual(stats["latency"]["solve_matrix"]["count"], 60)
+        self.assertGreater(stats["latency"]["solve_matrix"]["p99_ms"], 0)
+
+    def test_invalid_requests(self):
+        async def test(server):
+            return [await server.handle_line(line) for line in (
+                b"not json",
+                b'{"command": "fly"}',
+                b'{"id": 1, "command": "best_move", "game": "chess", "position": [], "depth": 1}',
+                b'{"id": 2, "command": "best_move", "game": "connect_four", "position": [9], "depth": 1}',
+                b'{"id": 3, "command": "solve_matrix", "matrix": [1, 2]}',
+                b'{"id": 4, "command": "solve_matrix", "matrix": [[NaN, 0], [0, 1]]}',
+                b'{"id": 5, "command": "solve_matrix", "matrix": [[Infinity, 0], [0, 1]]}',
+            )], server.stats()
+
+        responses, stats = run(with_server(test))
+        self.assertEqual([response["code"] for response in responses], ["invalid_request"] * 7)
+        self.assertEqual([response["id"] for response in responses], [None, None, 1, 2, 3, 4, 5])
+        self.assertEqual((stats["requests"], stats["failed"]), (7, 7))
+
+    def test_deadlines(self):
+        async def test(server):
+            expired = await server.handle({"command": "best_move", "game": "connect_four", "position": [],
+                                           "deadline": 0})
+            # Without a depth, the search stops in time for the deadline
+            searched = await server.handle({"command": "best_move", "game": "connect_four", "position": [],
+                                            "deadline": 0.3})
+            return expired, searched, server.stats()
+
+        expired, searched, stats = run(with_server(test))
+        self.assertEqual(expired["code"], "deadline_exceeded")
+        self.assertIn(searched["result"]["move"], range(7))
+        self.assertFalse(searched["result"]["completed"])
+        self.assertEqual((stats["expired"], stats["completed"]), (1, 1))
+
+    def test_full_queues_refuse_requests(self):
+        async def test(server):
+            searches = [server.handle({"id": index, "command": "best_move", "game": "connect_four",
+                                       "position": [], "time_budget": 0.1}) for index in range(6)]
+            return await asyncio.gather(*searches), server.stats()
+
+        responses, stats = run(with_server(test, queue_size=2, batch_sizes={"best_move": 1}))
+        codes = [response.get("code") for response in responses]
+        self.assertEqual(codes.count(None), 2)
+        self.assertEqual(codes.count("overloaded"), 4)
+        self.assertEqual(stats["rejected"], 4)
+
+    def test_unix_socket(self):
+        async def test(server):
+            with tempfile.TemporaryDirectory() as directory:
+                path = os.path.join(directory, "server.sock")
+                async with await server.serve_socket(path):
+                    reader, writer = await asyncio.open_unix_connection(path)
+                    for request in ({"id": 1, "command": "solve_matrix", "matrix": [[0, 1], [1, 0]]},
+                                    {"id": 2, "command": "stats"}):
+                        writer.write(json.dumps(request).encode() + b"\n")
+                    writer.write_eof()
+                    responses = [json.loads(line) async for line in reader]
+                    writer.close()
+                    return responses
+
+        responses = sorted(run(with_server(test)), key=lambda response: response["id"])
+        self.assertEqual(responses[0]["result"]["value"], 0.5)
+        self.assertEqual(responses[1]["result"]["requests"], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
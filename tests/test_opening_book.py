@@ -0,0 +1,99 @@
+import os
+import pickle
+import tempfile
+import unittest
+import numpy as np
+from expectiminimax import ExpectiminimaxAlgorithm
+from minimax_algorithm import MinimaxAlgorithm
+from opening_book import OpeningBook, OpeningBookBuilder
+from reference_games import ConnectFourState, DiceRaceState
+from self_play import MinimaxPlayer, SelfPlay
+
+
+class TestOpeningBook(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "connect_four.book")
+        self.builder = OpeningBookBuilder(max_ply=4)
+        self.builder.add_tree(ConnectFourState(), 1)
+        game = SelfPlay(ConnectFourState(), MinimaxAlgorithm(None), depth=2, max_moves=6)
+        game.play()
+        self.moves = game.moves
+        self.builder.add_self_play(game)
+        self.builder.add_self_play(game)
+        self.builder.build(self.path, 5)
+        self.book = OpeningBook(self.path)
+
+    def test_entries_match_a_search(self):
+        # The root, its 7 children and the 2 deeper positions of the self-play game
+        self.assertEqual(len(self.book), 10)
+        keys = self.book.records["key"]
+        self.assertTrue(np.all(keys[1:] > keys[:-1]))
+        state = ConnectFourState()
+        for ply, move in enumerate(self.moves[:4]):
+            score, best_move = MinimaxAlgorithm(None).alpha_beta(state, 5, ply % 2 == 0)
+            self.assertEqual(self.book.probe(state, ply % 2 == 0), (score, best_move, 5))
+            self.assertEqual(self.book.lookup(state.hash_key(), ply % 2 == 0)["visits"], 2)
+            state = state.make_move(move)
+        self.assertIsNone(self.book.probe(state, True))
+        self.assertEqual((self.book.hits, self.book.misses), (4, 1))
+
+    def test_engine_plays_from_the_book(self):
+        minimax = MinimaxAlgorithm(None, opening_book=self.book, collect_stats=True)
+        expected = MinimaxAlgorithm(None).alpha_beta(ConnectFourState(), 5, True)
+        self.assertEqual(minimax.alpha_beta(ConnectFourState(), 2, True), expected)
+        self.assertEqual(minimax.nodes_searched, 0)
+        self.assertTrue(minimax.stats.book_hit)
+        result = minimax.search(ConnectFourState(), True, node_budget=10)
+        self.assertEqual((result.move, result.depth, result.nodes), (expected[1], 5, 0))
+        # Positions out of the book are searched
+        deep = ConnectFourState().make_move(0).make_move(0).make_move(0)
+        self.assertEqual(minimax.alpha_beta(deep, 3, False), MinimaxAlgorithm(None).alpha_beta(deep, 3, False))
+        self.assertFalse(minimax.stats.book_hit)
+        self.assertGreater(minimax.search(deep, False, node_budget=2000).nodes, 0)
+        self.assertEqual((self.book.hits, self.book.misses), (2, 2))
+
+    def test_positions_are_known_for_one_side(self):
+        # The book has the empty board with player 1 to move, not with the minimizing side to move
+        self.assertIsNone(self.book.probe(ConnectFourState(), False))
+        minimax = MinimaxAlgorithm(None, opening_book=self.book)
+        expected = MinimaxAlgorithm(None).alpha_beta(ConnectFourState(), 3, False)
+        self.assertEqual(minimax.alpha_beta(ConnectFourState(), 3, False), expected)
+        self.assertGreater(minimax.nodes_searched, 0)
+
+    def test_self_play_uses_the_book(self):
+        player = MinimaxPlayer(MinimaxAlgorithm(None, opening_book=self.book), depth=3)
+        game = SelfPlay(ConnectFourState(), players=(player, player), max_moves=6)
+        game.play()
+        self.assertEqual(game.nodes_searched[0], 0)
+        self.assertGreater(self.book.hit_rate(), 0)
+
+    def test_minimum_depth_and_pickling(self):
+        self.assertIsNone(OpeningBook(self.path, min_depth=6).probe(ConnectFourState()))
+        book = pickle.loads(pickle.dumps(self.book))
+        self.assertEqual(book.probe(ConnectFourState()), self.book.probe(ConnectFourState()))
+
+    def test_chance_states_are_expanded_not_added(self):
+        state = DiceRaceState(20, 1)
+        builder = OpeningBookBuilder()
+        builder.add_tree(state, 2)
+        # The start and the positions after every roll of player 1's die: 5 scores and a bust
+        self.assertEqual(len(builder.positions), 7)
+        self.assertFalse(any(entry[0].is_chance() for entry in builder.positions.values()))
+        self.assertEqual(sorted(entry[1] for entry in builder.positions.values()), [False] * 6 + [True])
+        search = ExpectiminimaxAlgorithm(None, state.bounds)
+        builder.build(self.path, 3, search)
+        rolled = state.make_move(1).make_move((4,))
+        self.assertEqual(OpeningBook(self.path).probe(rolled, False)[:2], search.alpha_beta(rolled, 3, False))
+
+    def test_invalid_files_are_refused(self):
+        with open(self.path, "wb") as file:
+            file.write(b"GTTB")
+        with self.assertRaises(ValueError):
+            OpeningBook(self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
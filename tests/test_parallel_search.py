@@ -0,0 +1,132 @@
+import logging
+import unittest
+from minimax_algorithm import GameState, MinimaxAlgorithm
+from move_ordering import HistoryHeuristic, KillerMoves, PreviousBestMove
+from parallel_search import ParallelSearch, RootRotation, _initialize_worker
+from reference_games import UniformTreeState
+from transposition_table import TranspositionTable
+
+
+class ListTreeState(GameState):
+    # A game tree given as nested lists, with the scores of the leaves as numbers
+    def __init__(self, tree):
+        super().__init__()
+        self.tree = tree
+
+    def is_terminal(self):
+        return not isinstance(self.tree, list)
+
+    def evaluate(self):
+        return self.tree
+
+    def get_possible_moves(self):
+        return list(range(len(self.tree)))
+
+    def make_move(self, move):
+        return ListTreeState(self.tree[move])
+
+
+class LastFirstExecutor:
+    # Runs the submitted searches in this process, the last one first, as a slow worker would leave them
+    def __init__(self):
+        self.pending = []
+
+    def submit(self, function, *args):
+        call = LastFirstCall(self, function, args)
+        self.pending.append(call)
+        return call
+
+    def run(self):
+        while self.pending:
+            call = self.pending.pop()
+            call.value = call.function(*call.args)
+
+    def shutdown(self):
+        self.pending = []
+
+
+class LastFirstCall:
+
+    def __init__(self, executor, function, args):
+        self.executor = executor
+        self.function = function
+        self.args = args
+        self.value = None
+
+    def result(self):
+        self.executor.run()
+        return self.value
+
+
+def ordered_search():
+    return MinimaxAlgorithm(None, move_ordering=[PreviousBestMove(), KillerMoves(), HistoryHeuristic()],
+                            transposition_table=TranspositionTable(1 << 12))
+
+
+class TestParallelSearch(unittest.TestCase):
+
+    def test_root_split_matches_serial_score(self):
+        with ParallelSearch(MinimaxAlgorithm(None), workers=2) as search:
+            for seed in range(3):
+                for maximizing_player in (True, False):
+                    root = UniformTreeState(branching=5, height=6, seed=seed)
+                    expected, _ = MinimaxAlgorithm(None).alpha_beta(root, 5, maximizing_player)
+                    result = search.search(root, 5, maximizing_player)
+                    self.assertEqual(result.score, expected)
+                    # The principal variation leads to a leaf with the reported score
+                    state = root
+                    for move in result.principal_variation:
+                        state = state.make_move(move)
+                    self.assertEqual(state.evaluate(), expected)
+                    self.assertEqual(result.principal_variation[0], result.move)
+
+    def test_root_split_ties_with_failed_searches(self):
+        # Move 2 is searched first and scores 5; move 1 is then searched against that bound and fails low
+        # with a score of 5 too, although its real score is 1
+        root = ListTreeState([[0, 0], [5, 1], [5, 7]])
+        with ParallelSearch(MinimaxAlgorithm(None), workers=2) as search:
+            search._executor = LastFirstExecutor()
+            _initialize_worker(MinimaxAlgorithm(None), search._shared_bound, search._stop, None)
+            self.addCleanup(logging.disable, logging.NOTSET)
+            result = search.search(root, 2, True)
+        self.assertEqual((result.score, result.move, result.principal_variation), (5, 2, [2, 0]))
+
+    def test_deterministic_root_split(self):
+        root = UniformTreeState(branching=6, height=8, seed=4)
+        serial_score, serial_move = MinimaxAlgorithm(None).alpha_beta(root, 5, True)
+        results = []
+        for workers in (1, 3, 3):
+            with ParallelSearch(ordered_search(), workers=workers, deterministic=True) as search:
+                # A previous search must not change the next one
+                search.search(root.make_move(0), 4, False)
+                result = search.search(root, 5, True)
+                results.append((result.score, result.move, result.principal_variation, result.nodes))
+        self.assertEqual(results[1], results[2])
+        # The move is the first one with the best score, whatever the number of workers
+        self.assertEqual(results[0][:2], results[1][:2])
+        self.assertEqual(results[0][:2], (serial_score, serial_move))
+
+    def test_lazy_smp(self):
+        # Helpers search deeper than the main search, so the tree ends at the main search depth
+        root = UniformTreeState(branching=6, height=5, seed=2)
+        expected, _ = MinimaxAlgorithm(None).alpha_beta(root, 5, True)
+        with ParallelSearch(ordered_search(), workers=3, mode="lazy_smp", shared_table_size=1 << 12) as search:
+            result = search.search(root, 5, True)
+            self.assertEqual(result.depth, 5)
+            self.assertGreater(search.table.hits, 0)
+        self.assertEqual(result.score, expected)
+
+    def test_invalid_settings(self):
+        with self.assertRaises(ValueError):
+            ParallelSearch(MinimaxAlgorithm(None), mode="tree_split")
+        with self.assertRaises(ValueError):
+            ParallelSearch(MinimaxAlgorithm(None), mode="lazy_smp", deterministic=True)
+
+    def test_root_rotation(self):
+        rotation = RootRotation(2)
+        self.assertEqual(rotation.order([0, 1, 2, 3], 0, []), [2, 3, 0, 1])
+        self.assertEqual(rotation.order([0, 1, 2, 3], 1, [0]), [0, 1, 2, 3])
+
+
+if __name__ == '__main__':
+    unittest.main()
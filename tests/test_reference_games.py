@@ -0,0 +1,56 @@
+import random
+import unittest
+from minimax_algorithm import MinimaxAlgorithm, Node
+from reference_games import ConnectFourState
+
+
+def play(moves):
+    state = ConnectFourState()
+    for move in moves:
+        state = state.make_move(move)
+    return state
+
+
+class TestConnectFourState(unittest.TestCase):
+
+    def test_wins_in_every_direction(self):
+        self.assertEqual(play([0, 1, 0, 1, 0, 1, 0]).evaluate(), ConnectFourState.WIN_SCORE)
+        self.assertEqual(play([0, 0, 1, 1, 2, 2, 3]).evaluate(), ConnectFourState.WIN_SCORE)
+        self.assertEqual(play([0, 1, 1, 2, 2, 3, 2, 3, 3, 6, 3]).evaluate(), ConnectFourState.WIN_SCORE)
+        self.assertEqual(play([2, 3, 1, 2, 1, 1, 0, 0, 0, 0]).evaluate(), -ConnectFourState.WIN_SCORE)
+        self.assertTrue(play([0, 1, 0, 1, 0, 1, 0]).is_terminal())
+
+    def test_lines_do_not_wrap_between_columns(self):
+        # Pieces at the top of one column and the bottom of the next are not aligned
+        state = play([0, 1, 0, 1, 0, 1, 2, 0, 2, 0, 2, 0, 1])
+        self.assertFalse(state.is_terminal())
+
+    def test_full_columns_are_not_playable(self):
+        state = play([3] * 6)
+        self.assertNotIn(3, state.get_possible_moves())
+        self.assertEqual(state.get_possible_moves()[:3], [2, 4, 1])
+
+    def test_in_place_moves_match_copies(self):
+        rng = random.Random(1)
+        state = ConnectFourState()
+        copy = ConnectFourState()
+        played = []
+        while not copy.is_terminal():
+            move = rng.choice(copy.get_possible_moves())
+            copy = copy.make_move(move)
+            state.apply_move(move)
+            played.append(move)
+            self.assertEqual((state.boards, state.hash_key()), (copy.boards, copy.hash_key()))
+        for move in reversed(played):
+            state.undo_move(move)
+        self.assertEqual(state.boards, [0, 0])
+        self.assertEqual(state.hash_key(), ConnectFourState().hash_key())
+
+    def test_alpha_beta_matches_minimax(self):
+        state = play([3, 3, 2])
+        expected = MinimaxAlgorithm(None).minimax(Node(state), 4, False)
+        self.assertEqual(MinimaxAlgorithm(None).alpha_beta(state, 4, False), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
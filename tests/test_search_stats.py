@@ -0,0 +1,97 @@
+import io
+import json
+import unittest
+from minimax_algorithm import MinimaxAlgorithm
+from move_ordering import KillerMoves
+from reference_games import UniformTreeState
+from search_stats import JsonLinesExporter, SearchHooks, SearchStats
+from transposition_table import TranspositionTable
+
+
+class RecordingHooks(SearchHooks):
+
+    def __init__(self):
+        self.events = []
+
+    def search_started(self, state, stats):
+        self.events.append("started")
+
+    def iteration_completed(self, stats):
+        self.events.append(stats.iterations[-1]["depth"])
+
+    def search_completed(self, stats):
+        self.events.append("completed")
+
+
+class TestSearchStats(unittest.TestCase):
+
+    def test_disabled_by_default(self):
+        minimax = MinimaxAlgorithm(None)
+        minimax.alpha_beta(UniformTreeState(branching=3, height=4), 4, True)
+        self.assertIsNone(minimax.stats)
+
+    def test_alpha_beta_stats(self):
+        for in_place_moves in (False, True):
+            root = UniformTreeState(branching=4, height=5)
+            plain = MinimaxAlgorithm(None, in_place_moves=in_place_moves, move_ordering=[KillerMoves()])
+            expected = plain.alpha_beta(root, 5, True)
+            minimax = MinimaxAlgorithm(None, in_place_moves=in_place_moves, move_ordering=[KillerMoves()],
+                                       collect_stats=True)
+            self.assertEqual(minimax.alpha_beta(root, 5, True), expected)
+            stats = minimax.stats
+            self.assertEqual(stats.nodes, plain.nodes_searched)
+            self.assertEqual(len(stats.nodes_per_ply), 6)
+            self.assertEqual(stats.nodes_per_ply[0], 1)
+            self.assertEqual(stats.nodes_per_ply[1], 4)
+            self.assertEqual(stats.evaluate_calls, stats.nodes_per_ply[5])
+            self.assertEqual(stats.move_generation_calls, sum(stats.nodes_per_ply[:5]))
+            self.assertEqual(stats.make_move_calls, stats.nodes - 1)
+            self.assertGreater(stats.cutoffs, 0)
+            self.assertLessEqual(stats.first_move_cutoffs, stats.cutoffs)
+            self.assertGreater(stats.evaluate_time, 0)
+            self.assertEqual((stats.score, stats.move, stats.depth), (*expected, 5))
+            self.assertEqual(stats.principal_variation, minimax.principal_variation)
+            self.assertGreater(stats.effective_branching_factor(), 1)
+
+    def test_search_iterations_and_table_hits(self):
+        hooks = RecordingHooks()
+        minimax = MinimaxAlgorithm(None, depth_limit=4, transposition_table=TranspositionTable(), hooks=[hooks])
+        result = minimax.search(UniformTreeState(branching=4, height=8))
+        stats = minimax.stats
+        self.assertEqual(hooks.events, ["started", 1, 2, 3, 4, "completed"])
+        self.assertEqual([iteration["depth"] for iteration in stats.iterations], [1, 2, 3, 4])
+        self.assertEqual(sum(iteration["nodes"] for iteration in stats.iterations), result.nodes)
+        self.assertEqual(stats.nodes, result.nodes)
+        self.assertEqual((stats.score, stats.move, stats.depth), (result.score, result.move, 4))
+        self.assertGreater(stats.table_hits, 0)
+        self.assertEqual(stats.table_hit_rate(), stats.table_hits / stats.table_probes)
+        self.assertEqual(stats.effective_branching_factor(),
+                         stats.iterations[3]["nodes"] / stats.iterations[2]["nodes"])
+
+    def test_stopped_search(self):
+        minimax = MinimaxAlgorithm(None, collect_stats=True)
+        result = minimax.search(UniformTreeState(branching=4, height=10), node_budget=3000)
+        self.assertFalse(minimax.stats.completed)
+        self.assertEqual(minimax.stats.nodes, result.nodes)
+        self.assertEqual(minimax.stats.depth, result.depth)
+
+    def test_json_lines(self):
+        output = io.StringIO()
+        minimax = MinimaxAlgorithm(None, depth_limit=3, hooks=[JsonLinesExporter(output, release="1.0")])
+        minimax.search(UniformTreeState(branching=3, height=6))
+        minimax.alpha_beta(UniformTreeState(branching=3, height=6), 2, True)
+        lines = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEqual(len(lines), 2)
+        self.assertEqual(lines[0]["release"], "1.0")
+        self.assertEqual(len(lines[0]["iterations"]), 3)
+        self.assertEqual(lines[1]["depth"], 2)
+        self.assertIn("effective_branching_factor", lines[1])
+
+    def test_infinite_scores_are_exported(self):
+        stats = SearchStats()
+        stats.score = float('-inf')
+        self.assertEqual(json.loads(stats.to_json())["score"], "-inf")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import os
+import pickle
+import tempfile
+import unittest
+from minimax_algorithm import MinimaxAlgorithm, Node
+from tablebase import DRAW, LOSS, WIN, Tablebase, build_tablebase
+from tic_tac_toe import TicTacToeIndex, TicTacToeState, TicTacToeTable
+
+
+class TestTablebase(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.path = os.path.join(cls.directory.name, "tic_tac_toe.tb")
+        cls.game = TicTacToeIndex()
+        cls.positions, cls.max_distance = build_tablebase(cls.game, cls.path)
+        cls.solved = TicTacToeTable.solve()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.directory.cleanup()
+
+    def legal_states(self):
+        for index in range(self.game.size()):
+            state = self.game.state(index)
+            if state is not None:
+                yield state
+
+    def test_compact_file(self):
+        self.assertEqual(self.positions, 5478)
+        # One byte per index, as every distance is below 64
+        self.assertEqual(os.path.getsize(self.path), 16 + 3 ** 9)
+
+    def test_results_match_forward_search(self):
+        tablebase = Tablebase(self.path, self.game)
+        for state in self.legal_states():
+            self.assertEqual(tablebase.probe(state)[0], self.solved.value(state))
+        self.assertEqual(tablebase.lookup(TicTacToeState()), (DRAW, 0))
+        self.assertIsNone(tablebase.lookup(TicTacToeState(0b11, 0)))
+
+    def test_distances(self):
+        tablebase = Tablebase(self.path, self.game)
+        # X completes the top row at once
+        self.assertEqual(tablebase.lookup(TicTacToeState.from_cells("x x b o o b b b b".split())), (WIN, 1))
+        # O has just completed a line: X has lost, with nothing left to play
+        self.assertEqual(tablebase.lookup(TicTacToeState.from_cells("o o o x x b x b b".split())), (LOSS, 0))
+        for state in self.legal_states():
+            result, distance = tablebase.lookup(state)
+            if state.is_terminal() or result == DRAW:
+                continue
+            child = tablebase.lookup(state.make_move(tablebase.probe(state)[1]))
+            # The winner's best move wins one move sooner, the loser's best move loses as late as possible
+            self.assertEqual(child, ({WIN: LOSS, LOSS: WIN}[result], distance - 1))
+
+    def test_probe_hook_ends_searches(self):
+        tablebase = Tablebase(self.path, self.game, cache_size=64)
+        minimax = MinimaxAlgorithm(None, tablebase=tablebase)
+        state = TicTacToeState().make_move(0).make_move(1)
+        score, move = minimax.alpha_beta(state, 9, True)
+        self.assertEqual(minimax.nodes_searched, 1)
+        self.assertEqual(score, 1)
+        self.assertEqual((score, move), minimax.minimax(Node(state), 9, True))
+        self.assertGreater(tablebase.hit_rate(), 0)
+        self.assertLessEqual(len(tablebase._cache), 64)
+
+    def test_shared_between_processes_by_path(self):
+        tablebase = Tablebase(self.path, self.game)
+        copy = pickle.loads(pickle.dumps(tablebase))
+        self.assertEqual(copy.path, self.path)
+        state = TicTacToeState().make_move(4)
+        self.assertEqual(copy.probe(state), tablebase.probe(state))
+
+
+if __name__ == '__main__':
+    unittest.main()
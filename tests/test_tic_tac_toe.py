@@ -0,0 +1,108 @@
+import os
+import random
+import tempfile
+import unittest
+from minimax_algorithm import MinimaxAlgorithm, Node
+from tic_tac_toe import SYMMETRIES, TicTacToeState, TicTacToeTable
+
+
+def random_position(rng, moves):
+    state = TicTacToeState()
+    for _ in range(moves):
+        if state.is_terminal():
+            break
+        state = state.make_move(rng.choice(state.get_possible_moves()))
+    return state
+
+
+class TestTicTacToeState(unittest.TestCase):
+
+    def test_rules(self):
+        state = TicTacToeState.from_cells("x x x o o b b b b".split())
+        self.assertTrue(state.is_terminal())
+        self.assertEqual(state.evaluate(), 1)
+        self.assertEqual(state.current_player, 2)
+        state = TicTacToeState.from_cells("x o x x o o o x x".split())
+        self.assertTrue(state.is_terminal())
+        self.assertEqual(state.evaluate(), 0)
+        state = TicTacToeState().make_move(4)
+        self.assertFalse(state.is_terminal())
+        self.assertEqual(state.get_possible_moves(), [0, 1, 2, 3, 5, 6, 7, 8])
+        self.assertEqual(state.current_player, 2)
+
+    def test_in_place_moves(self):
+        state = TicTacToeState().make_move(0).make_move(4)
+        copy = TicTacToeState(state.x, state.o)
+        state.apply_move(8)
+        self.assertEqual(state, copy.make_move(8))
+        state.undo_move(8)
+        self.assertEqual(state, copy)
+        self.assertEqual(state.current_player, copy.current_player)
+
+    def test_symmetric_positions_share_a_key(self):
+        corner = TicTacToeState().make_move(0)
+        for other in (2, 6, 8):
+            self.assertEqual(TicTacToeState().make_move(other).canonical_key(), corner.canonical_key())
+        self.assertNotEqual(TicTacToeState().make_move(1).canonical_key(), corner.canonical_key())
+        rng = random.Random(1)
+        for _ in range(50):
+            state = random_position(rng, rng.randint(0, 9))
+            images = {TicTacToeState(symmetry[state.x], symmetry[state.o]) for symmetry in SYMMETRIES}
+            self.assertEqual({image.canonical_key() for image in images}, {state.canonical_key()})
+
+
+class TestTicTacToeTable(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.table = TicTacToeTable.solve()
+
+    def test_validates_against_dataset(self):
+        self.assertEqual(self.table.validate(), 958)
+        # 765 positions are reachable up to symmetry
+        self.assertEqual(len(self.table), 765)
+        self.assertEqual(self.table.value(TicTacToeState()), 0)
+
+    def test_validation_rejects_wrong_labels(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "dataset.csv")
+            with open(path, "w") as file:
+                file.write("TL,TM,TR,ML,MM,MR,BL,BM,BR,class\n")
+                file.write("x,x,x,o,o,b,b,b,b,false\n")
+            with self.assertRaises(ValueError):
+                self.table.validate(path)
+
+    def test_matches_search(self):
+        rng = random.Random(7)
+        for _ in range(30):
+            state = random_position(rng, rng.randint(2, 6))
+            maximizing_player = state.current_player == 1
+            expected, _ = MinimaxAlgorithm(None).minimax(Node(state), 9, maximizing_player)
+            self.assertEqual(self.table.value(state), expected)
+
+    def test_tablebase_answers_searches(self):
+        minimax = MinimaxAlgorithm(None, tablebase=self.table)
+        rng = random.Random(3)
+        for _ in range(30):
+            state = random_position(rng, rng.randint(0, 6))
+            if state.is_terminal():
+                continue
+            maximizing_player = state.current_player == 1
+            score, move = minimax.alpha_beta(state, 9, maximizing_player)
+            self.assertEqual(minimax.nodes_searched, 1)
+            # The move keeps the value of the position
+            self.assertEqual(score, self.table.value(state))
+            self.assertEqual(self.table.value(state.make_move(move)), score)
+            self.assertEqual(minimax.minimax(Node(state), 9, maximizing_player), (score, move))
+
+    def test_perfect_play_draws(self):
+        minimax = MinimaxAlgorithm(None, tablebase=self.table)
+        state = TicTacToeState()
+        while not state.is_terminal():
+            _, move = minimax.alpha_beta(state, 9, state.current_player == 1)
+            state = state.make_move(move)
+        self.assertEqual(state.evaluate(), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+import unittest
+from functools import partial
+from minimax_algorithm import MinimaxAlgorithm
+from move_ordering import HistoryHeuristic, KillerMoves, PreviousBestMove
+from reference_games import DiceRaceState, UniformTreeState
+from self_play import MinimaxPlayer, SelfPlay, GameStateExample
+from tic_tac_toe import TicTacToeState
+from transposition_table import TranspositionTable
+from tournament import PlayerSettings, Tournament, game_seed, play_game
+
+small_tree = partial(UniformTreeState, branching=3, height=6)
+
+
+def strip_time(records):
+    return [(record.game, record.seed, record.moves, record.outcome, record.nodes) for record in records]
+
+
+class TestSelfPlay(unittest.TestCase):
+
+    def test_configurable_depth_and_move_limit(self):
+        self_play = SelfPlay(GameStateExample(), MinimaxAlgorithm(None), depth=2, max_moves=4)
+        self_play.play()
+        self.assertEqual(len(self_play.moves), 4)
+        self.assertTrue(all(nodes > 0 for nodes in self_play.nodes_searched))
+
+    def test_players_per_side(self):
+        shallow = MinimaxPlayer(depth=1)
+        deep = MinimaxPlayer(depth=5)
+        self_play = SelfPlay(small_tree(), players=(shallow, deep))
+        self_play.play()
+        self.assertEqual(len(self_play.moves), 6)
+        self.assertLess(self_play.nodes_searched[0], self_play.nodes_searched[1])
+
+    def test_perfect_play_reaches_minimax_value(self):
+        root = small_tree()
+        value, _ = MinimaxAlgorithm(None).alpha_beta(root, 6, True)
+        self_play = SelfPlay(root, players=(MinimaxPlayer(depth=6), MinimaxPlayer(depth=6)))
+        self_play.play()
+        self.assertEqual(self_play.final_state.evaluate(), value)
+
+    def test_unknown_algorithm(self):
+        with self.assertRaises(ValueError):
+            MinimaxPlayer(algorithm="random")
+
+    def test_search_state_is_kept_between_moves(self):
+        def player(reuse_search):
+            minimax = MinimaxAlgorithm(None, move_ordering=[PreviousBestMove(), KillerMoves(), HistoryHeuristic()],
+                                       transposition_table=TranspositionTable())
+            return MinimaxPlayer(minimax, depth=5, algorithm="search", reuse_search=reuse_search)
+
+        warm = SelfPlay(TicTacToeState(), players=(player(True), player(True)))
+        warm.play()
+        # Cold searches of the same positions
+        cold = player(False)
+        state = TicTacToeState()
+        cold_nodes = 0
+        for move in warm.moves:
+            cold.select_move(state, state.current_player == 1)
+            cold_nodes += cold.nodes_searched
+            state = state.make_move(move)
+        self.assertLess(sum(warm.nodes_searched), cold_nodes)
+
+
+class TestTournament(unittest.TestCase):
+
+    def test_game_seeds_are_reproducible_and_distinct(self):
+        self.assertEqual(game_seed(3, 7), game_seed(3, 7))
+        self.assertEqual(len({game_seed(3, game) for game in range(100)}), 100)
+
+    def test_records(self):
+        records = Tournament(small_tree, PlayerSettings(depth=2), PlayerSettings(depth=3),
+                             opening_moves=2, workers=1).run(10)
+        self.assertEqual([record.game for record in records], list(range(10)))
+        for record in records:
+            self.assertEqual(len(record.moves), 6)
+            self.assertIn(record.outcome, (-1, 0, 1))
+            self.assertTrue(all(nodes > 0 for nodes in record.nodes))
+        # The random openings make the games different
+        self.assertGreater(len({record.moves[:2] for record in records}), 1)
+
+    def test_same_records_with_any_number_of_workers(self):
+        settings = dict(player_1=PlayerSettings(depth=3, move_ordering=True, transposition_table_size=1 << 10),
+                        player_2=PlayerSettings(depth=2), seed=5, opening_moves=1)
+        serial = Tournament(small_tree, workers=1, **settings).run(12)
+        parallel = Tournament(small_tree, workers=2, chunk_size=3, **settings).run(12)
+        self.assertEqual(strip_time(serial), strip_time(parallel))
+
+    def test_play_game_matches_tournament(self):
+        players = (PlayerSettings(depth=2), PlayerSettings(depth=2))
+        record = play_game(small_tree, players, 4, seed=1, opening_moves=1)
+        records = Tournament(small_tree, *players, seed=1, opening_moves=1, workers=1).run(2, first_game=3)
+        self.assertEqual(strip_time([record]), strip_time(records[1:]))
+
+    def test_games_with_chance_moves(self):
+        game = partial(DiceRaceState, 20, 2)
+        players = (PlayerSettings(depth=3), PlayerSettings(depth=1))
+        records = [play_game(game, players, 0, seed=1, opening_moves=3) for _ in range(2)]
+        self.assertEqual(strip_time(records[:1]), strip_time(records[1:]))
+        # The opening is a choice, a roll and a choice: self-play starts with the roll of player 2's dice
+        record = records[0]
+        self.assertEqual([isinstance(move, tuple) for move in record.moves[:4]], [False, True, False, True])
+        self.assertTrue(game().make_move(record.moves[0]).make_move(record.moves[1]).make_move(record.moves[2])
+                        .is_chance())
+        # Searches are credited to the side that made them, not to whoever moves on alternate plies
+        self.assertGreater(record.nodes[1], 0)
+        self.assertGreater(record.nodes[0], record.nodes[1])
+        swapped = play_game(game, players[::-1], 0, seed=1, opening_moves=3)
+        self.assertLess(swapped.nodes[0], swapped.nodes[1])
+
+    def test_move_limit(self):
+        records = Tournament(GameStateExample, PlayerSettings(depth=2), max_moves=5, workers=1).run(3)
+        self.assertTrue(all(len(record.moves) == 5 for record in records))
+
+    def test_budgeted_search(self):
+        settings = PlayerSettings(depth=None, node_budget=50, algorithm="search")
+        records = Tournament(small_tree, settings, workers=1).run(2)
+        self.assertTrue(all(len(record.moves) == 6 for record in records))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,178 @@
+import pickle
+import random
+import unittest
+from minimax_algorithm import MinimaxAlgorithm, Node, GameState
+from transposition_table import SharedTranspositionTable, TranspositionTable, ZobristHash, EXACT, LOWER_BOUND
+
+
+class ClaimGameState(GameState):
+    # Players alternately claim free cells; many move orders reach the same position
+    def __init__(self, weights, zobrist, owners=None, key=0):
+        super().__init__()
+        self.weights = weights
+        self.zobrist = zobrist
+        self.owners = owners or [0] * len(weights)
+        self.key = key
+        self.current_player = 1 + self.owners.count(1) - self.owners.count(2)
+
+    def is_terminal(self):
+        return self.owners.count(0) <= 2
+
+    def evaluate(self):
+        score = 0
+        for cell, owner in enumerate(self.owners):
+            if owner:
+                score += self.weights[cell] if owner == 1 else -self.weights[cell] * 0.5
+        return score
+
+    def get_possible_moves(self):
+        return [cell for cell, owner in enumerate(self.owners) if owner == 0]
+
+    def make_move(self, move):
+        owners = list(self.owners)
+        owners[move] = self.current_player
+        key = self.key ^ self.zobrist.keys[2 * move + self.current_player - 1]
+        return ClaimGameState(self.weights, self.zobrist, owners, key)
+
+    def hash_key(self):
+        return self.key
+
+
+def claim_game(seed, cells=7):
+    rng = random.Random(seed)
+    return ClaimGameState([rng.randint(-9, 9) for _ in range(cells)], ZobristHash(2 * cells, seed))
+
+
+class TestTranspositionTable(unittest.TestCase):
+
+    def test_store_and_probe(self):
+        table = TranspositionTable(size=8)
+        self.assertIsNone(table.probe(42))
+        table.store(42, 3, 1.5, EXACT, "a")
+        self.assertEqual(table.probe(42), (1.5, 3, EXACT, "a"))
+        self.assertEqual((table.hits, table.misses), (1, 1))
+
+    def test_depth_preferred_and_always_replace(self):
+        table = TranspositionTable(size=8)
+        table.store(1, 5, 1.0, EXACT, "deep")
+        table.store(9, 2, 2.0, LOWER_BOUND, "shallow")  # same bucket, shallower: goes to the always-replace slot
+        table.store(17, 1, 3.0, EXACT, "newest")        # replaces the always-replace slot only
+        self.assertEqual(table.probe(1)[3], "deep")
+        self.assertIsNone(table.probe(9))
+        self.assertEqual(table.probe(17)[3], "newest")
+        self.assertEqual(table.collisions, 1)
+
+    def test_old_entries_are_replaced_by_new_searches(self):
+        table = TranspositionTable(size=8)
+        table.store(1, 5, 1.0, EXACT, "old")
+        table.new_search()
+        table.store(9, 2, 2.0, EXACT, "new")
+        table.store(17, 1, 3.0, EXACT, "newest")
+        # The stale deep entry made room in the depth-preferred slot, so both new entries are kept
+        self.assertIsNone(table.probe(1))
+        self.assertEqual(table.probe(9)[3], "new")
+        self.assertEqual(table.probe(17)[3], "newest")
+
+    def test_zobrist_hash_is_incremental(self):
+        state = claim_game(3)
+        for move in (4, 0, 6):
+            state = state.make_move(move)
+        features = [2 * cell + owner - 1 for cell, owner in enumerate(state.owners) if owner]
+        self.assertEqual(state.hash_key(), state.zobrist.hash(features))
+
+    def test_search_matches_plain_minimax(self):
+        for seed in range(10):
+            root = claim_game(seed)
+            expected = MinimaxAlgorithm(None).minimax(Node(root), 7, True)
+            minimax = MinimaxAlgorithm(None, transposition_table=TranspositionTable())
+            self.assertEqual(minimax.alpha_beta(root, 7, True), expected)
+            # A second search is answered largely from the table kept from the first one
+            first_search_nodes = minimax.nodes_searched
+            self.assertEqual(minimax.alpha_beta(root, 7, True), expected)
+            self.assertLess(minimax.nodes_searched, first_search_nodes)
+            self.assertGreater(minimax.transposition_table.hits, 0)
+
+    def test_transpositions_reduce_search(self):
+        root = claim_game(1)
+        without_table = MinimaxAlgorithm(None)
+        with_table = MinimaxAlgorithm(None, transposition_table=TranspositionTable())
+        self.assertEqual(without_table.alpha_beta(root, 7, True), with_table.alpha_beta(root, 7, True))
+        self.assertLess(with_table.nodes_searched, without_table.nodes_searched)
+
+    def test_iterative_deepening_shares_table(self):
+        class Game:
+            root = claim_game(5)
+        minimax = MinimaxAlgorithm(Game(), depth_limit=5, transposition_table=TranspositionTable())
+        self.assertEqual(minimax.iterative_deepening(), MinimaxAlgorithm(None).minimax(Node(Game.root), 5, True))
+        self.assertGreater(minimax.transposition_table.hit_rate(), 0)
+
+    def test_search_stops_when_the_game_is_solved(self):
+        # The claim game ends after 5 moves: table cutoffs on solved positions must not hide that
+        for table in (TranspositionTable(), SharedTranspositionTable(size=64)):
+            with self.subTest(table=type(table).__name__):
+                if isinstance(table, SharedTranspositionTable):
+                    self.addCleanup(table.close)
+                root = claim_game(2)
+                result = MinimaxAlgorithm(None, transposition_table=table).search(root)
+                self.assertTrue(result.completed)
+                self.assertLessEqual(result.depth, 6)
+                self.assertEqual(result.score, MinimaxAlgorithm(None).minimax(Node(root), 5, True)[0])
+                self.assertGreater(table.hits, 0)
+
+
+class TestSharedTranspositionTable(unittest.TestCase):
+
+    def setUp(self):
+        self.table = SharedTranspositionTable(size=8)
+        self.addCleanup(self.table.close)
+
+    def test_store_and_probe(self):
+        table = self.table
+        self.assertIsNone(table.probe(42))
+        table.store(42, 3, 1.5, EXACT, 7)
+        table.store(43, 1, float('-inf'), LOWER_BOUND, None)
+        self.assertEqual(table.probe(42), (1.5, 3, EXACT, 7))
+        self.assertEqual(table.probe(43), (float('-inf'), 1, LOWER_BOUND, None))
+        # Keys of alpha-beta search carry the side to move, one bit more than a 64-bit hash
+        table.store((1 << 64) + 5, 2, 4.0, EXACT, 0)
+        self.assertEqual(table.probe((1 << 64) + 5)[3], 0)
+
+    def test_same_replacement_policy(self):
+        table = self.table
+        table.store(1, 5, 1.0, EXACT, 1)
+        table.store(9, 2, 2.0, LOWER_BOUND, 2)
+        table.store(17, 1, 3.0, EXACT, 3)
+        self.assertEqual(table.probe(1)[3], 1)
+        self.assertIsNone(table.probe(9))
+        self.assertEqual(table.probe(17)[3], 3)
+        table.new_search()
+        table.store(25, 1, 4.0, EXACT, 4)
+        self.assertIsNone(table.probe(1))
+
+    def test_torn_entries_are_misses(self):
+        table = self.table
+        table.store(3, 4, 2.0, EXACT, 1)
+        # Another process overwrote the score but not yet the check word
+        table._scores[3 * 6 + 1] = 9.0
+        self.assertIsNone(table.probe(3))
+
+    def test_attached_tables_share_entries(self):
+        other = pickle.loads(pickle.dumps(self.table))
+        self.addCleanup(other.close)
+        other.store(11, 2, -1.0, EXACT, 5)
+        self.assertEqual(self.table.probe(11), (-1.0, 2, EXACT, 5))
+        self.table.clear()
+        self.assertIsNone(other.probe(11))
+
+    def test_search_matches_plain_minimax(self):
+        for seed in range(3):
+            root = claim_game(seed)
+            expected = MinimaxAlgorithm(None).minimax(Node(root), 6, True)
+            minimax = MinimaxAlgorithm(None, transposition_table=SharedTranspositionTable(1 << 10))
+            self.addCleanup(minimax.transposition_table.close)
+            self.assertEqual(minimax.alpha_beta(root, 6, True), expected)
+            self.assertEqual(minimax.alpha_beta(root, 6, True), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()